@@ -3,14 +3,13 @@ API adapters for backend.
 
 These adapters provide orchestration layer between API routes and services.
 Moved from ui/api/ to backend/api/adapters/ for better architecture.
+
+Adapters are imported lazily so that importing one adapter (e.g.
+backend.api.adapters.jobs_adapter) does not load pandas/Playwright through
+AnalyticsAPI.
 """
 
-from backend.api.adapters.jobs_adapter import JobsAPI
-from backend.api.adapters.accounts_adapter import AccountsAPI
-from backend.api.adapters.analytics_adapter import AnalyticsAPI
-from backend.api.adapters.metrics_adapter import MetricsAPI
-from backend.api.adapters.safety_adapter import SafetyAPI
-from backend.api.adapters.selectors_adapter import SelectorsAPI
+from utils.lazy_exports import lazy_exports
 
 __all__ = [
     "JobsAPI",
@@ -20,3 +19,14 @@ __all__ = [
     "SafetyAPI",
     "SelectorsAPI",
 ]
+
+_LAZY_EXPORTS = {
+    "JobsAPI": "backend.api.adapters.jobs_adapter",
+    "AccountsAPI": "backend.api.adapters.accounts_adapter",
+    "AnalyticsAPI": "backend.api.adapters.analytics_adapter",
+    "MetricsAPI": "backend.api.adapters.metrics_adapter",
+    "SafetyAPI": "backend.api.adapters.safety_adapter",
+    "SelectorsAPI": "backend.api.adapters.selectors_adapter",
+}
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
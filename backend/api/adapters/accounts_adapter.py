@@ -5,6 +5,7 @@ API wrapper cho account operations (orchestration layer giữa UI ↔ Scheduler
 """
 
 # Standard library
+from collections import Counter
 from pathlib import Path
 from typing import List, Dict, Optional
 
@@ -105,76 +106,6 @@ class AccountsAPI:
             )
             return None
     
-    def _get_jobs_count_from_mysql(self, account_id: str) -> int:
-        """
-        Get jobs count from MySQL directly (source of truth).
-        
-        Args:
-            account_id: Account ID
-        
-        Returns:
-            Jobs count
-        """
-        if not self.account_storage:
-            return 0
-        
-        try:
-            import pymysql
-            from services.storage.connection_pool import get_connection_pool
-            from config.storage_config_loader import get_storage_config_from_env
-            
-            storage_config = get_storage_config_from_env()
-            mysql_config = storage_config.mysql
-            
-            pool = get_connection_pool(
-                host=mysql_config.host,
-                port=mysql_config.port,
-                user=mysql_config.user,
-                password=mysql_config.password,
-                database=mysql_config.database
-            )
-            
-            with pool.get_connection() as conn:
-                # Use DictCursor to get named results
-                import pymysql.cursors
-                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
-                    # Query all jobs for this account (all statuses)
-                    query = "SELECT COUNT(*) as count FROM jobs WHERE account_id = %s"
-                    cursor.execute(query, (account_id,))
-                    result = cursor.fetchone()
-                    
-                    # pymysql DictCursor returns dict with column names as keys
-                    if result and isinstance(result, dict):
-                        count = result.get('count', 0)
-                    elif result and isinstance(result, (list, tuple)):
-                        # Fallback for tuple cursor
-                        count = result[0] if len(result) > 0 else 0
-                    else:
-                        count = 0
-                    
-                    # Also verify with a direct query to debug
-                    cursor.execute("SELECT COUNT(*) as total FROM jobs")
-                    total_jobs = cursor.fetchone()
-                    total_count = total_jobs.get('count', 0) if isinstance(total_jobs, dict) else (total_jobs[0] if total_jobs else 0)
-                    
-                    self.logger.log_step(
-                        step="GET_JOBS_COUNT_FROM_MYSQL",
-                        result="SUCCESS",
-                        account_id=account_id,
-                        jobs_count=count,
-                        total_jobs_in_db=total_count
-                    )
-                    return int(count) if count else 0
-        except Exception as e:
-            self.logger.log_step(
-                step="GET_JOBS_COUNT_FROM_MYSQL",
-                result="WARNING",
-                error=f"Failed to get jobs count from MySQL: {str(e)}",
-                account_id=account_id,
-                error_type=type(e).__name__
-            )
-            return 0
-    
     def list_accounts(self) -> List[Dict]:
         """
         List tất cả accounts.
@@ -215,25 +146,22 @@ class AccountsAPI:
         """
         List accounts from MySQL.
         
+        Hai queries: accounts + một GROUP BY (account_id, status) trên jobs.
+        
         Returns:
-            List of account dicts with jobs_count
+            List of account dicts with jobs_count và jobs_by_status
         """
-        mysql_accounts = self.account_storage.list_accounts()
-        accounts = []
-        
-        for account in mysql_accounts:
-            account_id = account["account_id"]
-            jobs_count = self._get_jobs_count_from_mysql(account_id)
-            
-            account_dict = {
-                "account_id": account_id,
-                "jobs_count": jobs_count,
+        mysql_accounts = self.account_storage.list_accounts_with_job_counts()
+        accounts = [
+            {
+                "account_id": account["account_id"],
+                "jobs_count": account["jobs_count"],
+                "jobs_by_status": account["jobs_by_status"],
                 "profile_path": account.get("profile_path"),
                 "metadata": account.get("metadata")
             }
-            
-            self.logger.debug(f"Account {account_id}: jobs_count={jobs_count}")
-            accounts.append(account_dict)
+            for account in mysql_accounts
+        ]
         
         self.logger.log_step(
             step="LIST_ACCOUNTS",
@@ -243,57 +171,50 @@ class AccountsAPI:
         )
         return accounts
     
-    def _get_account_jobs_count(self, account_id: str, scheduler) -> int:
+    def _get_jobs_counts(self, scheduler) -> Dict[str, int]:
         """
-        Get jobs count for account (MySQL or scheduler fallback).
+        Get jobs count của tất cả accounts trong một lần (MySQL GROUP BY hoặc scheduler fallback).
         
         Args:
-            account_id: Account ID
             scheduler: Scheduler instance (may be None)
         
         Returns:
-            Jobs count
+            {account_id: jobs_count}
         """
-        if self.use_mysql and self.account_storage:
-            # Use MySQL as source of truth
-            return self._get_jobs_count_from_mysql(account_id)
-        elif scheduler:
-            # Fallback to scheduler
-            try:
-                return len(scheduler.list_jobs(account_id=account_id))
-            except Exception as e:
-                self.logger.log_step(
-                    step="LIST_ACCOUNTS_GET_JOBS_COUNT",
-                    result="WARNING",
-                    error=f"Could not get jobs count: {str(e)}",
-                    error_type=type(e).__name__,
-                    account_id=account_id
-                )
-                return 0
-        return 0
+        try:
+            if self.use_mysql and self.account_storage:
+                # Use MySQL as source of truth
+                counts = self.account_storage.get_job_counts_by_account()
+                return {account_id: sum(by_status.values()) for account_id, by_status in counts.items()}
+            if scheduler:
+                return dict(Counter(job.account_id for job in scheduler.list_jobs()))
+        except Exception as e:
+            self.logger.log_step(
+                step="LIST_ACCOUNTS_GET_JOBS_COUNT",
+                result="WARNING",
+                error=f"Could not get jobs count: {str(e)}",
+                error_type=type(e).__name__
+            )
+        return {}
     
-    def _get_account_metadata(self, account_id: str) -> Optional[Dict]:
+    def _get_accounts_metadata(self) -> Dict[str, Optional[Dict]]:
         """
-        Get account metadata from MySQL if available.
-        
-        Args:
-            account_id: Account ID
+        Get metadata của tất cả accounts từ MySQL (một query).
         
         Returns:
-            Metadata dict or None
+            {account_id: metadata}, rỗng nếu MySQL không available
         """
         if not (self.use_mysql and self.account_storage):
-            return None
+            return {}
         
         try:
-            account_from_db = self.account_storage.get_account(account_id)
-            if account_from_db:
-                return account_from_db.get("metadata")
+            return {
+                account["account_id"]: account.get("metadata")
+                for account in self.account_storage.list_accounts()
+            }
         except Exception:
             # Ignore errors, continue without metadata
-            pass
-        
-        return None
+            return {}
     
     def _build_account_dict(
         self,
@@ -334,6 +255,8 @@ class AccountsAPI:
             return accounts
         
         scheduler = self._get_active_scheduler()
+        jobs_counts = self._get_jobs_counts(scheduler)
+        accounts_metadata = self._get_accounts_metadata()
         
         for profile_dir in self.profiles_dir.iterdir():
             try:
@@ -342,18 +265,14 @@ class AccountsAPI:
                 
                 account_id = profile_dir.name
                 
-                # Get jobs count
-                jobs_count = self._get_account_jobs_count(account_id, scheduler)
-                
-                # Get metadata
-                metadata = self._get_account_metadata(account_id)
+                jobs_count = jobs_counts.get(account_id, 0)
                 
                 # Build account dict
                 account_dict = self._build_account_dict(
                     account_id=account_id,
                     profile_path=str(profile_dir),
                     jobs_count=jobs_count,
-                    metadata=metadata
+                    metadata=accounts_metadata.get(account_id)
                 )
                 
                 self.logger.debug(
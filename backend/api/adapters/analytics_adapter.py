@@ -5,13 +5,39 @@ Cung cấp API để lấy analytics data cho dashboard.
 """
 
 # Standard library
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta
 
+# Third-party
+import numpy as np
+import pandas as pd
+
 # Local
 from services.analytics.storage import MetricsStorage
 from services.analytics.service import MetricsService
 from services.logger import StructuredLogger
+from services.utils.datetime_utils import VIETNAM_TZ
+
+# Basic emoji pattern (covers most common emojis); mỗi chuỗi emoji liền nhau tính là 1
+_EMOJI_PATTERN = (
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags
+    "\U00002702-\U000027B0"  # dingbats
+    "\U000024C2-\U0001F251"
+    "]+"
+)
+_HASHTAG_PATTERN = r"#\w+"
+
+# Content features dùng cho correlation với engagement
+_CORRELATION_FEATURES = ("content_length", "word_count", "hashtag_count", "emoji_count", "posting_hour")
+
+# Giới hạn tuổi cache (window `days` trượt theo thời gian kể cả khi không có metrics mới)
+_CORRELATION_CACHE_TTL_SECONDS = 300
 
 
 class AnalyticsAPI:
@@ -48,6 +74,13 @@ class AnalyticsAPI:
             self.storage = MetricsStorage(logger=self.logger)
         
         self.service = MetricsService(storage=self.storage, logger=self.logger)
+        
+        # Job storage để lấy content của top posts (lazy, xem _get_thread_contents)
+        self._job_storage = None
+        
+        # Correlation cache: (account_id, days) -> (metrics version, jobs fingerprint, stored_at, result)
+        self._correlation_cache: Dict[Tuple[str, int], Tuple[Any, int, float, Dict[str, Any]]] = {}
+        self._correlation_cache_lock = threading.Lock()
     
     def get_account_dashboard_data(
         self,
@@ -65,11 +98,21 @@ class AnalyticsAPI:
             Dict với summary, top_posts, charts data
         """
         try:
-            # Calculate date range
+            # Calculate date range: bắt đầu từ 00:00 để ngày đầu tiên không bị cắt dở
+            # (account_metrics_daily chỉ có granularity theo ngày, raw path phải khớp)
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
+            start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+            
+            # Fast path: đọc từ rollup tables (không phụ thuộc độ dài metrics history)
+            rollup_data = self._get_dashboard_data_from_rollups(
+                account_id=account_id,
+                start_date=start_date,
+                end_date=end_date
+            )
+            if rollup_data is not None:
+                return rollup_data
             
-            # Get all metrics for account
+            # Fallback: rollups chưa khả dụng -> tính từ toàn bộ metrics history
             metrics_history = self.storage.get_account_metrics_history(
                 account_id=account_id,
                 start_date=start_date,
@@ -77,25 +120,7 @@ class AnalyticsAPI:
             )
             
             if not metrics_history:
-                return {
-                    "summary": {
-                        "total_posts": 0,
-                        "total_likes": 0,
-                        "total_replies": 0,
-                        "total_reposts": 0,
-                        "total_shares": 0,
-                        "total_views": 0,
-                        "avg_likes_per_post": 0.0,
-                        "avg_replies_per_post": 0.0,
-                        "avg_engagement_rate": 0.0
-                    },
-                    "top_posts": [],
-                    "charts": {
-                        "likes_over_time": [],
-                        "replies_over_time": [],
-                        "engagement_over_time": []
-                    }
-                }
+                return self._empty_dashboard_data()
             
             # Calculate summary
             summary = self._calculate_summary(metrics_history)
@@ -121,6 +146,125 @@ class AnalyticsAPI:
             )
             raise
     
+    def _empty_dashboard_data(self) -> Dict[str, Any]:
+        """Dashboard data khi account chưa có metrics."""
+        return {
+            "summary": {
+                "total_posts": 0,
+                "total_likes": 0,
+                "total_replies": 0,
+                "total_reposts": 0,
+                "total_shares": 0,
+                "total_views": 0,
+                "avg_likes_per_post": 0.0,
+                "avg_replies_per_post": 0.0,
+                "avg_engagement_rate": 0.0
+            },
+            "top_posts": [],
+            "charts": {
+                "likes_over_time": [],
+                "replies_over_time": [],
+                "engagement_over_time": []
+            }
+        }
+    
+    def _get_dashboard_data_from_rollups(
+        self,
+        account_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        top_limit: int = 10
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build dashboard data từ rollup tables (thread_metrics_latest, account_metrics_daily).
+        
+        Args:
+            account_id: Account ID
+            start_date: Start of range
+            end_date: End of range
+            top_limit: Số top posts
+        
+        Returns:
+            Dashboard dict, hoặc None nếu rollups không khả dụng (caller fallback)
+        """
+        totals = self.storage.get_account_rollup_summary(
+            account_id=account_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        if totals is None:
+            return None
+        
+        total_posts = totals.get("total_posts", 0)
+        if total_posts == 0:
+            return self._empty_dashboard_data()
+        
+        top_threads = self.storage.get_account_top_threads(
+            account_id=account_id,
+            limit=top_limit,
+            start_date=start_date,
+            end_date=end_date
+        )
+        daily_rows = self.storage.get_account_daily_metrics(
+            account_id=account_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        if top_threads is None or daily_rows is None:
+            return None
+        
+        summary = {
+            "total_posts": total_posts,
+            "total_likes": totals["total_likes"],
+            "total_replies": totals["total_replies"],
+            "total_reposts": totals["total_reposts"],
+            "total_shares": totals["total_shares"],
+            "total_views": totals["total_views"],
+            "avg_likes_per_post": round(totals["total_likes"] / total_posts, 2),
+            "avg_replies_per_post": round(totals["total_replies"] / total_posts, 2),
+            "avg_engagement_rate": round(totals["total_engagement"] / total_posts, 2)
+        }
+        
+        thread_content_map = self._get_thread_contents(
+            [row["thread_id"] for row in top_threads]
+        )
+        top_posts = [
+            {
+                "thread_id": row["thread_id"],
+                "account_id": row.get("account_id"),
+                "content": thread_content_map.get(row["thread_id"], ""),
+                "likes": row.get("likes", 0),
+                "replies": row.get("replies", 0),
+                "reposts": row.get("reposts", 0),
+                "shares": row.get("shares", 0),
+                "views": row.get("views"),
+                "engagement": row.get("engagement", 0),
+                "fetched_at": row.get("fetched_at")
+            }
+            for row in top_threads
+        ]
+        
+        charts = {
+            "likes_over_time": [
+                {"date": str(row["metric_date"]), "likes": row["max_likes"]}
+                for row in daily_rows
+            ],
+            "replies_over_time": [
+                {"date": str(row["metric_date"]), "replies": row["max_replies"]}
+                for row in daily_rows
+            ],
+            "engagement_over_time": [
+                {"date": str(row["metric_date"]), "engagement": row["max_engagement"]}
+                for row in daily_rows
+            ]
+        }
+        
+        return {
+            "summary": summary,
+            "top_posts": top_posts,
+            "charts": charts
+        }
+    
     def get_thread_details(
         self,
         thread_id: str
@@ -301,38 +445,6 @@ class AnalyticsAPI:
         # Get latest metrics for each thread (reuse helper method)
         latest_metrics = self._get_latest_metrics_per_thread(metrics_history)
         
-        # Get job content from database
-        try:
-            from services.scheduler.storage.mysql_storage import MySQLJobStorage
-            from services.scheduler.models import JobStatus
-            from config.storage_config_loader import get_storage_config_from_env
-            
-            storage_config = get_storage_config_from_env()
-            mysql_config = storage_config.mysql
-            
-            job_storage = MySQLJobStorage(
-                host=mysql_config.host,
-                port=mysql_config.port,
-                user=mysql_config.user,
-                password=mysql_config.password,
-                database=mysql_config.database
-            )
-            
-            # Get all completed jobs và tạo dict thread_id -> content
-            jobs = job_storage.get_jobs_by_status(JobStatus.COMPLETED)
-            thread_content_map = {}
-            for job in jobs:
-                if job.thread_id:
-                    thread_content_map[job.thread_id] = job.content
-        except Exception as e:
-            self.logger.log_step(
-                step="GET_TOP_POSTS_CONTENT",
-                result="WARNING",
-                error=f"Failed to load job content: {str(e)}",
-                note="Top posts will be shown without content"
-            )
-            thread_content_map = {}
-        
         # Calculate engagement for each post
         posts_with_engagement = []
         for thread_id, metric in latest_metrics.items():
@@ -341,14 +453,10 @@ class AnalyticsAPI:
                 metric.get('replies', 0) +
                 metric.get('shares', 0)
             )
-            # Trả về content thực tế cho UI
-            # CHỈ sanitize trong logs, KHÔNG sanitize trong API responses
-            content = thread_content_map.get(thread_id, "")
-            
             posts_with_engagement.append({
                 "thread_id": thread_id,
                 "account_id": metric.get('account_id'),
-                "content": content,
+                "content": "",
                 "likes": metric.get('likes', 0),
                 "replies": metric.get('replies', 0),
                 "reposts": metric.get('reposts', 0),
@@ -360,8 +468,50 @@ class AnalyticsAPI:
         
         # Sort by engagement
         posts_with_engagement.sort(key=lambda x: x['engagement'], reverse=True)
+        top_posts = posts_with_engagement[:limit]
         
-        return posts_with_engagement[:limit]
+        # Lấy content chỉ cho top posts (indexed lookup theo thread_id)
+        # Trả về content thực tế cho UI
+        # CHỈ sanitize trong logs, KHÔNG sanitize trong API responses
+        thread_content_map = self._get_thread_contents([p["thread_id"] for p in top_posts])
+        for post in top_posts:
+            post["content"] = thread_content_map.get(post["thread_id"], "")
+        
+        return top_posts
+    
+    def _get_thread_contents(self, thread_ids: List[str]) -> Dict[str, str]:
+        """
+        Get content của các threads từ jobs (MySQLJobStorage), không qua MetricsStorage.
+        
+        Lỗi chỉ log WARNING: top posts vẫn được trả về, content rỗng.
+        """
+        if not thread_ids:
+            return {}
+        
+        try:
+            if self._job_storage is None:
+                from services.scheduler.storage.mysql_storage import MySQLJobStorage
+                from config.storage_config_loader import get_storage_config_from_env
+                
+                mysql_config = get_storage_config_from_env().mysql
+                self._job_storage = MySQLJobStorage(
+                    host=mysql_config.host,
+                    port=mysql_config.port,
+                    user=mysql_config.user,
+                    password=mysql_config.password,
+                    database=mysql_config.database,
+                    logger=self.logger
+                )
+            return self._job_storage.get_contents_by_thread_ids(thread_ids)
+        except Exception as e:
+            self.logger.log_step(
+                step="GET_TOP_POSTS_CONTENT",
+                result="WARNING",
+                error=f"Failed to load job content: {str(e)}",
+                error_type=type(e).__name__,
+                note="Top posts will be shown without content"
+            )
+            return {}
     
     def _prepare_charts_data(self, metrics_history: List[Dict]) -> Dict[str, List]:
         """Prepare data for charts."""
@@ -452,6 +602,7 @@ class AnalyticsAPI:
         
         return trend
     
+    
     def get_content_performance_correlation(
         self,
         account_id: str,
@@ -461,6 +612,9 @@ class AnalyticsAPI:
         """
         Analyze correlation between content features and engagement metrics.
         
+        Features được tính vectorized trên DataFrame; kết quả cache theo
+        (account_id, days) cho tới khi metrics của account hoặc nội dung jobs thay đổi.
+        
         Args:
             account_id: Account ID
             jobs: List of job dicts (with content)
@@ -470,20 +624,18 @@ class AnalyticsAPI:
             Dict với correlation data cho charts
         """
         try:
-            import re
-            from datetime import datetime, timedelta
+            cache_key = (account_id, days)
+            version = self.storage.get_account_metrics_version(account_id)
+            jobs_fingerprint = self._jobs_fingerprint(jobs)
+            cached = self._get_cached_correlation(cache_key, version, jobs_fingerprint)
+            if cached is not None:
+                return cached
             
-            # Get metrics history
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            metrics_history = self.storage.get_account_metrics_history(
-                account_id=account_id,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            if not metrics_history:
+            metrics = self._load_latest_metrics_frame(account_id, start_date, end_date)
+            if metrics.empty:
                 return {
                     "correlation_data": [],
                     "insights": {
@@ -496,66 +648,17 @@ class AnalyticsAPI:
                     }
                 }
             
-            # Get latest metrics per thread
-            latest_metrics = self._get_latest_metrics_per_thread(metrics_history)
-            
-            # Combine jobs with metrics
-            correlation_data = []
-            top_posts_engagement = []
+            frame = self._build_correlation_frame(jobs, metrics)
             
-            for job in jobs:
-                thread_id = job.get('thread_id')
-                if not thread_id:
-                    continue
-                
-                metrics = latest_metrics.get(thread_id)
-                if not metrics:
-                    continue
-                
-                content = job.get('content', '')
-                if not content:
-                    continue
-                
-                # Calculate content features
-                length = len(content)
-                word_count = len(content.split())
-                hashtag_count = len(re.findall(r'#\w+', content))
-                emoji_count = self._count_emojis(content)
-                
-                # Get engagement
-                likes = metrics.get('likes', 0)
-                replies = metrics.get('replies', 0)
-                shares = metrics.get('shares', 0)
-                engagement = likes + replies + shares
-                
-                correlation_data.append({
-                    "thread_id": thread_id,
-                    "content_length": length,
-                    "word_count": word_count,
-                    "hashtag_count": hashtag_count,
-                    "emoji_count": emoji_count,
-                    "likes": likes,
-                    "replies": replies,
-                    "shares": shares,
-                    "engagement": engagement,
-                    "completed_at": job.get('completed_at')
-                })
-                
-                if engagement > 0:
-                    top_posts_engagement.append({
-                        "length": length,
-                        "hashtag_count": hashtag_count,
-                        "emoji_count": emoji_count,
-                        "engagement": engagement
-                    })
+            result = {
+                "correlation_data": self._correlation_frame_to_records(frame),
+                "insights": self._calculate_correlation_insights(frame)
+            }
             
-            # Calculate insights
-            insights = self._calculate_correlation_insights(correlation_data, top_posts_engagement)
+            with self._correlation_cache_lock:
+                self._correlation_cache[cache_key] = (version, jobs_fingerprint, time.monotonic(), result)
             
-            return {
-                "correlation_data": correlation_data,
-                "insights": insights
-            }
+            return result
             
         except Exception as e:
             self.logger.log_step(
@@ -569,58 +672,201 @@ class AnalyticsAPI:
                 "insights": {}
             }
     
-    def _count_emojis(self, text: str) -> int:
-        """Count emojis in text."""
-        import re
-        # Basic emoji pattern (covers most common emojis)
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map symbols
-            "\U0001F1E0-\U0001F1FF"  # flags
-            "\U00002702-\U000027B0"  # dingbats
-            "\U000024C2-\U0001F251"
-            "]+",
-            flags=re.UNICODE
-        )
-        return len(emoji_pattern.findall(text))
+    def invalidate_correlation_cache(self, account_id: Optional[str] = None) -> None:
+        """
+        Xóa cached correlation results.
+        
+        Args:
+            account_id: Chỉ xóa của account này (None = xóa toàn bộ)
+        """
+        with self._correlation_cache_lock:
+            if account_id is None:
+                self._correlation_cache.clear()
+                return
+            for key in [k for k in self._correlation_cache if k[0] == account_id]:
+                del self._correlation_cache[key]
     
-    def _calculate_correlation_insights(
+    def _get_cached_correlation(
         self,
-        correlation_data: List[Dict],
-        top_posts: List[Dict]
-    ) -> Dict[str, Any]:
-        """Calculate insights from correlation data."""
+        cache_key: Tuple[str, int],
+        version: Optional[Tuple[Any, ...]],
+        jobs_fingerprint: int
+    ) -> Optional[Dict[str, Any]]:
+        """Get cached result nếu metrics version và nội dung jobs chưa đổi."""
+        with self._correlation_cache_lock:
+            entry = self._correlation_cache.get(cache_key)
+        
+        if entry is None:
+            return None
+        
+        cached_version, cached_fingerprint, stored_at, result = entry
+        if (
+            version is None
+            or cached_version != version
+            or cached_fingerprint != jobs_fingerprint
+            or time.monotonic() - stored_at > _CORRELATION_CACHE_TTL_SECONDS
+        ):
+            return None
+        
+        return result
+    
+    def _jobs_fingerprint(self, jobs: List[Dict]) -> int:
+        """Fingerprint các fields của jobs dùng trong correlation (thread_id, content, completed_at)."""
+        return hash(tuple(
+            (job.get('thread_id'), job.get('content'), str(job.get('completed_at')))
+            for job in jobs
+        ))
+    
+    def _load_latest_metrics_frame(
+        self,
+        account_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> pd.DataFrame:
+        """
+        Load latest metrics per thread thành DataFrame (thread_id, likes, replies, shares).
         
-        if not correlation_data:
+        Đọc từ thread_metrics_latest; fallback về metrics history nếu rollups không khả dụng.
+        """
+        columns = ["thread_id", "likes", "replies", "shares"]
+        
+        rows = self.storage.get_account_latest_metrics(
+            account_id=account_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        
+        if rows is None:
+            history = self.storage.get_account_metrics_history(
+                account_id=account_id,
+                start_date=start_date,
+                end_date=end_date
+            )
+            if not history:
+                return pd.DataFrame(columns=columns)
+            
+            # History đã sort theo fetched_at ASC -> giữ bản ghi cuối mỗi thread
+            rows = (
+                pd.DataFrame(history)
+                .sort_values("fetched_at", kind="stable")
+                .drop_duplicates("thread_id", keep="last")
+            )
+        
+        metrics = pd.DataFrame(rows, columns=columns)
+        if metrics.empty:
+            return metrics
+        
+        for column in ("likes", "replies", "shares"):
+            metrics[column] = pd.to_numeric(metrics[column], errors="coerce").fillna(0).astype(np.int64)
+        
+        return metrics
+    
+    def _build_correlation_frame(self, jobs: List[Dict], metrics: pd.DataFrame) -> pd.DataFrame:
+        """
+        Join jobs với latest metrics và tính content features (vectorized).
+        
+        Columns: thread_id, content, completed_at, likes, replies, shares, engagement,
+        content_length, word_count, hashtag_count, emoji_count, posting_hour.
+        """
+        thread_ids = [job.get('thread_id') for job in jobs]
+        contents = [job.get('content') for job in jobs]
+        completed = [job.get('completed_at') for job in jobs]
+        
+        jobs_frame = pd.DataFrame({
+            "thread_id": pd.Series(thread_ids, dtype=object),
+            "content": pd.Series(contents, dtype=object),
+            "completed_at": pd.Series(completed, dtype=object)
+        })
+        
+        # Bỏ jobs không có thread_id / content (giữ nguyên thứ tự jobs)
+        valid = (
+            jobs_frame["thread_id"].notna()
+            & (jobs_frame["thread_id"] != "")
+            & jobs_frame["content"].notna()
+            & (jobs_frame["content"] != "")
+        )
+        frame = jobs_frame[valid].merge(metrics, on="thread_id", how="inner", sort=False)
+        
+        content = frame["content"].astype(str)
+        frame["content_length"] = content.str.len()
+        frame["word_count"] = content.str.count(r"\S+")
+        frame["hashtag_count"] = content.str.count(_HASHTAG_PATTERN)
+        frame["emoji_count"] = content.str.count(_EMOJI_PATTERN)
+        frame["engagement"] = frame["likes"] + frame["replies"] + frame["shares"]
+        
+        completed_at = pd.to_datetime(frame["completed_at"], errors="coerce", format="ISO8601", utc=True)
+        # DB lưu UTC; giờ đăng tính theo giờ Việt Nam (UTC+7)
+        frame["posting_hour"] = completed_at.dt.tz_convert(VIETNAM_TZ).dt.hour
+        
+        return frame
+    
+    def _correlation_frame_to_records(self, frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert correlation frame thành list of dicts (Python native types)."""
+        if frame.empty:
+            return []
+        
+        posting_hours = [
+            int(hour) if hour == hour else None
+            for hour in frame["posting_hour"].tolist()
+        ]
+        
+        return [
+            {
+                "thread_id": thread_id,
+                "content_length": length,
+                "word_count": word_count,
+                "hashtag_count": hashtag_count,
+                "emoji_count": emoji_count,
+                "posting_hour": posting_hour,
+                "likes": likes,
+                "replies": replies,
+                "shares": shares,
+                "engagement": engagement,
+                "completed_at": completed_at
+            }
+            for (
+                thread_id, length, word_count, hashtag_count, emoji_count, posting_hour,
+                likes, replies, shares, engagement, completed_at
+            ) in zip(
+                frame["thread_id"].tolist(),
+                frame["content_length"].tolist(),
+                frame["word_count"].tolist(),
+                frame["hashtag_count"].tolist(),
+                frame["emoji_count"].tolist(),
+                posting_hours,
+                frame["likes"].tolist(),
+                frame["replies"].tolist(),
+                frame["shares"].tolist(),
+                frame["engagement"].tolist(),
+                frame["completed_at"].tolist()
+            )
+        ]
+    
+    def _calculate_correlation_insights(self, frame: pd.DataFrame) -> Dict[str, Any]:
+        """Calculate insights from correlation frame."""
+        
+        if frame.empty:
             return {}
         
-        if not top_posts:
+        top_posts = frame[frame["engagement"] > 0]
+        if top_posts.empty:
             return {}
         
         # Calculate optimal values from top performers (top 20% by engagement)
-        top_posts_sorted = sorted(top_posts, key=lambda x: x['engagement'], reverse=True)
-        top_20_percent = max(1, int(len(top_posts_sorted) * 0.2))
-        top_performers = top_posts_sorted[:top_20_percent]
-        
-        if top_performers:
-            avg_length_top = sum(p['length'] for p in top_performers) / len(top_performers)
-            avg_hashtags_top = sum(p['hashtag_count'] for p in top_performers) / len(top_performers)
-            avg_emojis_top = sum(p['emoji_count'] for p in top_performers) / len(top_performers)
-        else:
-            avg_length_top = None
-            avg_hashtags_top = None
-            avg_emojis_top = None
+        top_20_percent = max(1, int(len(top_posts) * 0.2))
+        top_performers = top_posts.sort_values(
+            "engagement", ascending=False, kind="stable"
+        ).head(top_20_percent)
+        
+        avg_length_top = float(top_performers["content_length"].mean())
+        avg_hashtags_top = float(top_performers["hashtag_count"].mean())
+        avg_emojis_top = float(top_performers["emoji_count"].mean())
         
         # Calculate overall averages for comparison
-        avg_length_all = sum(d['content_length'] for d in correlation_data) / len(correlation_data)
+        avg_length_all = float(frame["content_length"].mean())
         
         # Determine optimal range (top performers average ± 20%)
         optimal_length = None
-        optimal_hashtags = None
-        optimal_emojis = None
-        
         if avg_length_top:
             optimal_length = {
                 "min": int(avg_length_top * 0.8),
@@ -628,26 +874,50 @@ class AnalyticsAPI:
                 "avg": int(avg_length_top)
             }
         
-        if avg_hashtags_top is not None:
-            optimal_hashtags = {
-                "min": max(0, int(avg_hashtags_top * 0.8)),
-                "max": int(avg_hashtags_top * 1.2),
-                "avg": round(avg_hashtags_top, 1)
-            }
+        optimal_hashtags = {
+            "min": max(0, int(avg_hashtags_top * 0.8)),
+            "max": int(avg_hashtags_top * 1.2),
+            "avg": round(avg_hashtags_top, 1)
+        }
+        
+        optimal_emojis = {
+            "min": max(0, int(avg_emojis_top * 0.8)),
+            "max": int(avg_emojis_top * 1.2),
+            "avg": round(avg_emojis_top, 1)
+        }
+        
+        # Pearson correlation của từng feature với engagement (NaN -> None)
+        correlation_matrix = frame[list(_CORRELATION_FEATURES) + ["engagement"]].astype(float).corr()
+        correlations = {
+            feature: (round(float(value), 3) if value == value else None)
+            for feature, value in correlation_matrix["engagement"].drop("engagement").items()
+        }
         
-        if avg_emojis_top is not None:
-            optimal_emojis = {
-                "min": max(0, int(avg_emojis_top * 0.8)),
-                "max": int(avg_emojis_top * 1.2),
-                "avg": round(avg_emojis_top, 1)
+        # Engagement trung bình theo giờ đăng
+        hourly = (
+            frame.dropna(subset=["posting_hour"])
+            .groupby("posting_hour")["engagement"]
+            .agg(["count", "mean"])
+        )
+        hourly_performance = [
+            {
+                "hour": int(hour),
+                "posts": int(row["count"]),
+                "avg_engagement": round(float(row["mean"]), 1)
             }
+            for hour, row in hourly.iterrows()
+        ]
+        best_posting_hour = int(hourly["mean"].idxmax()) if not hourly.empty else None
         
         return {
             "optimal_length": optimal_length,
             "optimal_hashtags": optimal_hashtags,
             "optimal_emojis": optimal_emojis,
             "avg_length_top_posts": int(avg_length_top) if avg_length_top else None,
-            "avg_hashtags_top_posts": round(avg_hashtags_top, 1) if avg_hashtags_top is not None else None,
-            "avg_emojis_top_posts": round(avg_emojis_top, 1) if avg_emojis_top is not None else None,
-            "avg_length_all": int(avg_length_all) if correlation_data else None
+            "avg_hashtags_top_posts": round(avg_hashtags_top, 1),
+            "avg_emojis_top_posts": round(avg_emojis_top, 1),
+            "avg_length_all": int(avg_length_all),
+            "correlations": correlations,
+            "hourly_performance": hourly_performance,
+            "best_posting_hour": best_posting_hour
         }
@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Any, Dict, Optional
 
 from services.scheduler.models import Platform
+from services.scheduler.job_codec import enum_value
 from utils.sanitize import sanitize_error
 from utils.datetime import format_datetime_vn
 
@@ -46,7 +47,7 @@ def _enum_to_value(value: Any) -> Optional[str]:
     if not value:
         return None
     try:
-        return value.value if hasattr(value, "value") else str(value)
+        return enum_value(value)
     except Exception:
         return str(value)
 
@@ -13,7 +13,6 @@ from fastapi import APIRouter, Query
 
 # Local
 from backend.api.adapters.jobs_adapter import JobsAPI
-from backend.api.adapters.analytics_adapter import AnalyticsAPI
 from backend.api.dependencies import get_jobs_api, get_analytics_api
 from backend.app.core.responses import success_response
 from backend.app.core.exceptions import InternalError
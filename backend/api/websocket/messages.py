@@ -42,4 +42,8 @@ EVENT_AUTOMATION_STEP = "automation.step"
 EVENT_AUTOMATION_ACTION = "automation.action"
 EVENT_AUTOMATION_START = "automation.start"
 EVENT_AUTOMATION_COMPLETE = "automation.complete"
-EVENT_AUTOMATION_ERROR = "automation.error"
\ No newline at end of file
+EVENT_AUTOMATION_ERROR = "automation.error"
+
+# Batch interaction event types
+EVENT_INTERACTION_RESULT = "interaction.result"
+EVENT_INTERACTION_BATCH_COMPLETE = "interaction.batch_complete"
\ No newline at end of file
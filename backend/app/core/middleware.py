@@ -8,14 +8,15 @@ Provides request/response processing, logging, and other cross-cutting concerns.
 from typing import Callable
 import time
 import uuid
-import threading
 
 # Third-party
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 
 # Local
+from backend.app.core.rate_limit import create_rate_limiter
 from services.logger import StructuredLogger
 from utils.sanitize import sanitize_error
 
@@ -145,55 +146,37 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
-    Simple rate limiting middleware.
+    Rate limiting middleware.
     
-    Limits requests per IP address to prevent DoS attacks.
+    Limits requests per IP address to prevent DoS attacks. Uses a per-process
+    token bucket by default, or a Redis counter shared by all gunicorn workers
+    when RATE_LIMIT_REDIS_URL is set (see backend/app/core/rate_limit.py).
     """
     
-    def __init__(self, app, requests_per_minute: int = 100):
+    def __init__(self, app, requests_per_minute: int = 100, limiter=None):
         """
         Initialize rate limiting middleware.
         
         Args:
             app: FastAPI application
             requests_per_minute: Maximum requests per minute per IP
+            limiter: Rate limiter with allow(key) (default: create_rate_limiter())
         """
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
-        self.request_counts = {}  # IP -> list of timestamps
-        self._lock = threading.Lock()
+        self.limiter = limiter or create_rate_limiter(requests_per_minute)
     
-    def _cleanup_old_requests(self, ip: str, current_time: float) -> None:
-        """Remove requests older than 1 minute."""
-        if ip in self.request_counts:
-            # Keep only requests from the last minute
-            cutoff_time = current_time - 60.0
-            self.request_counts[ip] = [
-                ts for ts in self.request_counts[ip] if ts > cutoff_time
-            ]
-    
-    def _check_rate_limit(self, ip: str) -> bool:
+    async def _check_rate_limit(self, ip: str) -> bool:
         """
         Check if IP has exceeded rate limit.
         
         Returns:
             True if within limit, False if exceeded
         """
-        current_time = time.time()
-        
-        with self._lock:
-            self._cleanup_old_requests(ip, current_time)
-            
-            if ip not in self.request_counts:
-                self.request_counts[ip] = []
-            
-            # Check if limit exceeded
-            if len(self.request_counts[ip]) >= self.requests_per_minute:
-                return False
-            
-            # Add current request
-            self.request_counts[ip].append(current_time)
-            return True
+        if self.limiter.blocking:
+            # Network-backed limiter: keep the event loop free
+            return await run_in_threadpool(self.limiter.allow, ip)
+        return self.limiter.allow(ip)
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Check rate limit before processing request."""
@@ -210,7 +193,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         client_ip = request.client.host if request.client else "unknown"
         
         # Check rate limit
-        if not self._check_rate_limit(client_ip):
+        if not await self._check_rate_limit(client_ip):
             logger.log_step(
                 step="RATE_LIMIT_EXCEEDED",
                 result="WARNING",
@@ -0,0 +1,241 @@
+"""
+Rate limiters for the API rate limiting middleware.
+
+- InMemoryRateLimiter: per-process token bucket, O(1) per request, sharded locks,
+  bounded number of tracked keys with periodic eviction of idle keys
+- RedisRateLimiter: fixed-window counter shared by all gunicorn workers
+  (enabled with RATE_LIMIT_REDIS_URL, needs the optional `redis` package;
+  falls back to in-memory on Redis errors)
+"""
+
+# Standard library
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+# Third-party
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+# Local
+from services.logger import StructuredLogger
+
+logger = StructuredLogger(name="api_rate_limit")
+
+RATE_LIMIT_REDIS_URL_ENV = "RATE_LIMIT_REDIS_URL"
+DEFAULT_SHARDS = 16
+DEFAULT_MAX_KEYS = 10_000
+# Redis calls happen on the request path: fail fast and fall back to in-memory
+REDIS_SOCKET_TIMEOUT_SECONDS = 0.1
+# After a Redis error, skip Redis (in-memory only) for this long before retrying
+REDIS_RETRY_AFTER_SECONDS = 5.0
+
+
+class _Shard:
+    """Buckets of one shard: key -> [tokens, last_seen], ordered least recently seen first."""
+
+    __slots__ = ("lock", "buckets", "next_sweep")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.next_sweep = 0.0
+
+
+class InMemoryRateLimiter:
+    """
+    Token bucket rate limiter (per process).
+
+    Each key gets a bucket of `limit` tokens refilled at limit / window_seconds tokens
+    per second. Keys are spread over shards so concurrent requests from different
+    clients rarely share a lock.
+    """
+
+    blocking = False
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float = 60.0,
+        shards: int = DEFAULT_SHARDS,
+        max_keys: int = DEFAULT_MAX_KEYS
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            limit: Maximum requests per window per key (bucket capacity)
+            window_seconds: Window length in seconds
+            shards: Number of lock shards
+            max_keys: Maximum tracked keys (least recently seen keys are evicted first)
+        """
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._rate = limit / window_seconds
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._max_keys_per_shard = max(1, max_keys // len(self._shards))
+
+    def allow(self, key: str) -> bool:
+        """
+        Consume one token for key.
+
+        Returns:
+            True if within limit, False if exceeded
+        """
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.limit), now]
+                shard.buckets[key] = bucket
+                if len(shard.buckets) > self._max_keys_per_shard:
+                    shard.buckets.popitem(last=False)
+            else:
+                bucket[0] = min(float(self.limit), bucket[0] + (now - bucket[1]) * self._rate)
+                bucket[1] = now
+                shard.buckets.move_to_end(key)
+
+            allowed = bucket[0] >= 1.0
+            if allowed:
+                bucket[0] -= 1.0
+
+            if now >= shard.next_sweep:
+                self._evict_idle(shard, now)
+
+        return allowed
+
+    def tracked_keys(self) -> int:
+        """Number of keys currently tracked (all shards)."""
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def _evict_idle(self, shard: _Shard, now: float) -> None:
+        """Drop keys idle for a full window (their bucket is full again). Caller holds shard.lock."""
+        cutoff = now - self.window_seconds
+        buckets = shard.buckets
+        while buckets:
+            key, bucket = next(iter(buckets.items()))
+            if bucket[1] > cutoff:
+                break
+            del buckets[key]
+        shard.next_sweep = now + self.window_seconds
+
+
+class RedisRateLimiter:
+    """
+    Fixed-window counter rate limiter stored in Redis (shared across workers).
+
+    One INCR + EXPIRE round trip per request; window keys expire on their own.
+    On Redis errors the fallback limiter is used so the API keeps serving, and
+    Redis is not contacted again for retry_after_seconds (circuit breaker), so an
+    outage does not add a socket timeout to every request.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        client,
+        limit: int,
+        window_seconds: int = 60,
+        fallback: Optional[InMemoryRateLimiter] = None,
+        key_prefix: str = "rate_limit:",
+        retry_after_seconds: float = REDIS_RETRY_AFTER_SECONDS
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            client: Redis client
+            limit: Maximum requests per window per key
+            window_seconds: Window length in seconds
+            fallback: Limiter used while Redis is unavailable
+            key_prefix: Prefix for Redis keys
+            retry_after_seconds: How long to use only the fallback after a Redis error
+        """
+        self.limit = limit
+        self.window_seconds = int(window_seconds)
+        self._client = client
+        self._fallback = fallback or InMemoryRateLimiter(limit, window_seconds)
+        self._key_prefix = key_prefix
+        self._retry_after_seconds = retry_after_seconds
+        self._backend_failed = False
+        # time.monotonic() until which Redis is skipped (circuit open)
+        self._retry_at = 0.0
+
+    def allow(self, key: str) -> bool:
+        """
+        Count one request for key in the current window.
+
+        Returns:
+            True if within limit, False if exceeded
+        """
+        if self._backend_failed and time.monotonic() < self._retry_at:
+            return self._fallback.allow(key)
+
+        window = int(time.time()) // self.window_seconds
+        redis_key = f"{self._key_prefix}{key}:{window}"
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.incr(redis_key)
+            pipe.expire(redis_key, self.window_seconds * 2)
+            count, _ = pipe.execute()
+        except Exception as e:
+            self._retry_at = time.monotonic() + self._retry_after_seconds
+            if not self._backend_failed:
+                # Log once per outage, not once per request
+                self._backend_failed = True
+                logger.log_step(
+                    step="RATE_LIMIT_BACKEND",
+                    result="WARNING",
+                    error=f"Redis rate limit backend unavailable, using in-memory: {e}",
+                    error_type=type(e).__name__
+                )
+            return self._fallback.allow(key)
+
+        self._backend_failed = False
+        return count <= self.limit
+
+
+def create_rate_limiter(requests_per_minute: int, redis_url: Optional[str] = None):
+    """
+    Create rate limiter for RateLimitMiddleware.
+
+    Uses Redis when redis_url (or RATE_LIMIT_REDIS_URL) is set and redis is installed,
+    otherwise a per-process in-memory limiter.
+
+    Args:
+        requests_per_minute: Maximum requests per minute per key
+        redis_url: Redis URL (default: RATE_LIMIT_REDIS_URL env)
+
+    Returns:
+        InMemoryRateLimiter or RedisRateLimiter
+    """
+    local = InMemoryRateLimiter(requests_per_minute, window_seconds=60.0)
+
+    if redis_url is None:
+        redis_url = os.getenv(RATE_LIMIT_REDIS_URL_ENV, "").strip()
+    if not redis_url:
+        return local
+
+    if not REDIS_AVAILABLE:
+        logger.log_step(
+            step="RATE_LIMIT_BACKEND",
+            result="WARNING",
+            error=f"{RATE_LIMIT_REDIS_URL_ENV} is set but redis is not installed, using in-memory rate limiting"
+        )
+        return local
+
+    client = redis.Redis.from_url(
+        redis_url,
+        socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS
+    )
+    return RedisRateLimiter(client, requests_per_minute, window_seconds=60, fallback=local)
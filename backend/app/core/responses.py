@@ -177,7 +177,8 @@ def paginated_response(
     limit: int,
     total: int,
     message: Optional[str] = None,
-    request_id: Optional[str] = None
+    request_id: Optional[str] = None,
+    next_cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Create paginated response.
@@ -189,6 +190,7 @@ def paginated_response(
         total: Total number of items
         message: Optional success message
         request_id: Optional request ID for tracing
+        next_cursor: Optional keyset cursor cho trang tiếp theo (chỉ thêm vào pagination khi có)
     
     Returns:
         Dict with paginated response format including pagination metadata
@@ -203,16 +205,20 @@ def paginated_response(
     """
     total_pages = (total + limit - 1) // limit if limit > 0 else 0
     
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1
+    }
+    if next_cursor:
+        pagination["next_cursor"] = next_cursor
+    
     return success_response(
         data=data,
         message=message,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        },
+        pagination=pagination,
         request_id=request_id
     )
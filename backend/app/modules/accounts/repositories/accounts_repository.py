@@ -5,6 +5,7 @@ Data access layer for accounts. Wraps AccountStorage.
 """
 
 # Standard library
+from collections import Counter
 from typing import List, Dict, Optional
 from pathlib import Path
 
@@ -88,51 +89,22 @@ class AccountsRepository(BaseRepository):
             )
             return None
     
-    def _get_jobs_count_from_mysql(self, account_id: str) -> int:
-        """Get jobs count from MySQL directly."""
-        if not self.account_storage:
-            return 0
-        
+    def _get_jobs_counts(self, scheduler) -> Dict[str, int]:
+        """Get jobs count của tất cả accounts (một GROUP BY query hoặc scheduler fallback)."""
         try:
-            import pymysql
-            from services.storage.connection_pool import get_connection_pool
-            from config.storage_config_loader import get_storage_config_from_env
-            
-            storage_config = get_storage_config_from_env()
-            mysql_config = storage_config.mysql
-            
-            pool = get_connection_pool(
-                host=mysql_config.host,
-                port=mysql_config.port,
-                user=mysql_config.user,
-                password=mysql_config.password,
-                database=mysql_config.database
-            )
-            
-            with pool.get_connection() as conn:
-                import pymysql.cursors
-                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
-                    query = "SELECT COUNT(*) as count FROM jobs WHERE account_id = %s"
-                    cursor.execute(query, (account_id,))
-                    result = cursor.fetchone()
-                    
-                    if result and isinstance(result, dict):
-                        count = result.get('count', 0)
-                    elif result and isinstance(result, (list, tuple)):
-                        count = result[0] if len(result) > 0 else 0
-                    else:
-                        count = 0
-                    
-                    return int(count) if count else 0
+            if self.use_mysql and self.account_storage:
+                counts = self.account_storage.get_job_counts_by_account()
+                return {account_id: sum(by_status.values()) for account_id, by_status in counts.items()}
+            if scheduler:
+                return dict(Counter(job.account_id for job in scheduler.list_jobs()))
         except Exception as e:
             self.logger.log_step(
-                step="GET_JOBS_COUNT_FROM_MYSQL",
+                step="GET_JOBS_COUNTS",
                 result="WARNING",
-                error=f"Failed to get jobs count from MySQL: {str(e)}",
-                account_id=account_id,
+                error=f"Failed to get jobs counts: {str(e)}",
                 error_type=type(e).__name__
             )
-            return 0
+        return {}
     
     def get_all(
         self,
@@ -171,20 +143,18 @@ class AccountsRepository(BaseRepository):
         # Use MySQL if available
         if self.use_mysql and self.account_storage:
             try:
-                mysql_accounts = self.account_storage.list_accounts()
+                mysql_accounts = self.account_storage.list_accounts_with_job_counts()
                 
-                accounts = []
-                for account in mysql_accounts:
-                    account_id = account["account_id"]
-                    jobs_count = self._get_jobs_count_from_mysql(account_id)
-                    
-                    account_dict = {
-                        "account_id": account_id,
-                        "jobs_count": jobs_count,
+                accounts = [
+                    {
+                        "account_id": account["account_id"],
+                        "jobs_count": account["jobs_count"],
+                        "jobs_by_status": account["jobs_by_status"],
                         "profile_path": account.get("profile_path"),
                         "metadata": account.get("metadata")
                     }
-                    accounts.append(account_dict)
+                    for account in mysql_accounts
+                ]
                 
                 self.logger.log_step(
                     step="LIST_ACCOUNTS",
@@ -209,37 +179,29 @@ class AccountsRepository(BaseRepository):
                 return accounts
             
             scheduler = self._get_active_scheduler()
+            jobs_counts = self._get_jobs_counts(scheduler)
+            
+            # Metadata của tất cả accounts trong một query
+            accounts_metadata = {}
+            if self.use_mysql and self.account_storage:
+                try:
+                    accounts_metadata = {
+                        account["account_id"]: account.get("metadata")
+                        for account in self.account_storage.list_accounts()
+                    }
+                except Exception:
+                    pass
             
             for profile_dir in self.profiles_dir.iterdir():
                 try:
                     if profile_dir.is_dir() and not profile_dir.name.startswith('.'):
                         account_id = profile_dir.name
                         
-                        # Get jobs count
-                        jobs_count = 0
-                        if self.use_mysql and self.account_storage:
-                            jobs_count = self._get_jobs_count_from_mysql(account_id)
-                        elif scheduler:
-                            try:
-                                jobs_count = len(scheduler.list_jobs(account_id=account_id))
-                            except Exception:
-                                jobs_count = 0
-                        
-                        # Get metadata from MySQL if available
-                        metadata = None
-                        if self.use_mysql and self.account_storage:
-                            try:
-                                account_from_db = self.account_storage.get_account(account_id)
-                                if account_from_db:
-                                    metadata = account_from_db.get("metadata")
-                            except Exception:
-                                pass
-                        
                         account_dict = {
                             "account_id": account_id,
-                            "jobs_count": jobs_count,
+                            "jobs_count": jobs_counts.get(account_id, 0),
                             "profile_path": str(profile_dir),
-                            "metadata": metadata
+                            "metadata": accounts_metadata.get(account_id)
                         }
                         accounts.append(account_dict)
                 except (PermissionError, OSError) as e:
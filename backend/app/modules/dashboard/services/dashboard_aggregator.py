@@ -0,0 +1,123 @@
+"""
+Dashboard aggregator.
+
+Single-pass aggregation engine for dashboard views.
+Computes status/platform counts, daily timeline, hourly distribution
+and activity ordering from ScheduledJob objects in one pass.
+"""
+
+# Standard library
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local
+from services.scheduler.models import Platform
+
+
+@dataclass
+class DashboardSnapshot:
+    """Aggregated dashboard data for one account filter."""
+    total_jobs: int = 0
+    jobs_by_status: Dict[str, int] = field(default_factory=dict)
+    jobs_by_platform: Dict[str, int] = field(default_factory=dict)
+    posts_timeline: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    hourly_distribution: Dict[str, int] = field(default_factory=dict)
+    # Jobs sorted by created_at (newest first) - serialized lazily for activity
+    recent_jobs: List[Any] = field(default_factory=list)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Build stats dict (same shape as DashboardService.get_stats)."""
+        completed_jobs = self.jobs_by_status.get("completed", 0)
+        return {
+            "total_jobs": self.total_jobs,
+            "pending_jobs": self.jobs_by_status.get("pending", 0),
+            "completed_jobs": completed_jobs,
+            "failed_jobs": self.jobs_by_status.get("failed", 0),
+            "success_rate": (completed_jobs / self.total_jobs * 100) if self.total_jobs > 0 else 0
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Build metrics dict (same shape as DashboardService.get_metrics, without analytics)."""
+        return {
+            "jobs_by_status": dict(self.jobs_by_status),
+            "jobs_by_platform": dict(self.jobs_by_platform),
+            "posts_timeline": [dict(item) for item in self.posts_timeline.values()],
+            "hourly_distribution": dict(self.hourly_distribution)
+        }
+
+
+def _enum_value(value: Any) -> Optional[str]:
+    """Enum -> value string (giống job_serializer)."""
+    if not value:
+        return None
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def _parse_created_at(created_at: Any) -> Optional[datetime]:
+    """Parse created_at (datetime hoặc ISO string)."""
+    if isinstance(created_at, datetime):
+        return created_at
+    if isinstance(created_at, str) and created_at:
+        try:
+            return datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return None
+
+
+def _created_at_sort_key(created_at: Any) -> str:
+    """Sort key giống serialized created_at (ISO string, '' nếu không có)."""
+    if not created_at:
+        return ""
+    if hasattr(created_at, "isoformat"):
+        return created_at.isoformat()
+    return str(created_at)
+
+
+def aggregate_jobs(jobs: List[Any]) -> DashboardSnapshot:
+    """
+    Aggregate jobs thành DashboardSnapshot trong một lần duyệt.
+
+    Args:
+        jobs: List of ScheduledJob objects
+
+    Returns:
+        DashboardSnapshot
+    """
+    snapshot = DashboardSnapshot(total_jobs=len(jobs))
+    by_status = snapshot.jobs_by_status
+    by_platform = snapshot.jobs_by_platform
+    timeline = snapshot.posts_timeline
+    hourly = snapshot.hourly_distribution
+    sortable: List[Tuple[str, Any]] = []
+
+    for job in jobs:
+        status = _enum_value(getattr(job, "status", None)) or "unknown"
+        platform = _enum_value(getattr(job, "platform", None)) or Platform.THREADS.value
+        created_at = getattr(job, "created_at", None)
+
+        by_status[status] = by_status.get(status, 0) + 1
+        by_platform[platform] = by_platform.get(platform, 0) + 1
+
+        date_obj = _parse_created_at(created_at)
+        if date_obj is not None:
+            date_str = date_obj.strftime("%Y-%m-%d")
+
+            # Timeline: dict lookup theo ngày thay vì tìm tuyến tính trong list
+            item = timeline.get(date_str)
+            if item is None:
+                timeline[date_str] = {"date": date_str, platform: 1}
+            else:
+                item[platform] = item.get(platform, 0) + 1
+
+            hour = str(date_obj.hour)
+            hourly[hour] = hourly.get(hour, 0) + 1
+
+        sortable.append((_created_at_sort_key(created_at), job))
+
+    # Newest first (sort ổn định: jobs cùng created_at giữ thứ tự ban đầu)
+    sortable.sort(key=lambda entry: entry[0], reverse=True)
+    snapshot.recent_jobs = [entry[1] for entry in sortable]
+
+    return snapshot
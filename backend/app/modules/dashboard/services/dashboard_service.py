@@ -1,207 +1,197 @@
-"""
-Dashboard service.
-
-Business logic layer for dashboard operations.
-Handles stats calculation, metrics aggregation, and timeline processing.
-"""
-
-# Standard library
-from typing import Dict, List, Optional
-from datetime import datetime
-
-# Local
-from services.logger import StructuredLogger
-from backend.app.shared.base_service import BaseService
-from backend.app.modules.jobs.services.jobs_service import JobsService
-from backend.app.core.exceptions import InternalError
-
-
-class DashboardService(BaseService):
-    """
-    Service for dashboard business logic.
-    
-    Handles:
-    - Stats calculation
-    - Metrics aggregation
-    - Timeline processing
-    - Analytics integration
-    """
-    
-    def __init__(self, jobs_service: Optional[JobsService] = None):
-        """
-        Initialize dashboard service.
-        
-        Args:
-            jobs_service: JobsService instance. If None, creates new instance.
-        """
-        super().__init__("dashboard_service")
-        self.jobs_service = jobs_service or JobsService()
-    
-    def get_stats(self, account_id: Optional[str] = None) -> Dict:
-        """
-        Get dashboard statistics.
-        
-        Args:
-            account_id: Optional account ID filter
-        
-        Returns:
-            Dictionary with stats (total_jobs, pending_jobs, completed_jobs, failed_jobs, success_rate)
-        """
-        try:
-            # Get jobs using JobsService (not JobsAPI)
-            jobs = self.jobs_service.get_all_jobs(
-                account_id=account_id,
-                reload=False
-            )
-            
-            # Calculate stats
-            total_jobs = len(jobs)
-            pending_jobs = len([j for j in jobs if j.get("status") == "pending"])
-            completed_jobs = len([j for j in jobs if j.get("status") == "completed"])
-            failed_jobs = len([j for j in jobs if j.get("status") == "failed"])
-            
-            stats = {
-                "total_jobs": total_jobs,
-                "pending_jobs": pending_jobs,
-                "completed_jobs": completed_jobs,
-                "failed_jobs": failed_jobs,
-                "success_rate": (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
-            }
-            
-            return stats
-        except Exception as e:
-            self.logger.log_step(
-                step="GET_DASHBOARD_STATS",
-                result="ERROR",
-                error=f"Failed to get dashboard stats: {str(e)}",
-                account_id=account_id,
-                error_type=type(e).__name__
-            )
-            raise InternalError(message=f"Failed to retrieve dashboard stats: {str(e)}")
-    
-    def get_metrics(self, account_id: Optional[str] = None) -> Dict:
-        """
-        Get dashboard metrics.
-        
-        Args:
-            account_id: Optional account ID filter
-        
-        Returns:
-            Dictionary with metrics (jobs_by_status, jobs_by_platform, posts_timeline, hourly_distribution, analytics)
-        """
-        try:
-            # Get jobs using JobsService
-            jobs = self.jobs_service.get_all_jobs(
-                account_id=account_id,
-                reload=False
-            )
-            
-            # Calculate basic metrics from jobs
-            metrics = {
-                "jobs_by_status": {},
-                "jobs_by_platform": {},
-                "posts_timeline": [],
-                "hourly_distribution": {}
-            }
-            
-            for job in jobs:
-                status = job.get("status", "unknown")
-                platform = job.get("platform", "unknown")
-                
-                metrics["jobs_by_status"][status] = metrics["jobs_by_status"].get(status, 0) + 1
-                metrics["jobs_by_platform"][platform] = metrics["jobs_by_platform"].get(platform, 0) + 1
-                
-                # Timeline data
-                created_at = job.get("created_at")
-                if created_at:
-                    try:
-                        if isinstance(created_at, str):
-                            date_obj = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        else:
-                            date_obj = created_at
-                        date_str = date_obj.strftime("%Y-%m-%d")
-                        hour = date_obj.hour
-                        
-                        # Add to timeline
-                        found = False
-                        for item in metrics["posts_timeline"]:
-                            if item.get("date") == date_str:
-                                item[platform] = item.get(platform, 0) + 1
-                                found = True
-                                break
-                        if not found:
-                            metrics["posts_timeline"].append({
-                                "date": date_str,
-                                platform: 1
-                            })
-                        
-                        # Hourly distribution
-                        metrics["hourly_distribution"][str(hour)] = metrics["hourly_distribution"].get(str(hour), 0) + 1
-                    except Exception:
-                        pass
-            
-            # If account_id provided, try to get analytics data
-            if account_id:
-                try:
-                    from backend.api.dependencies import get_analytics_api
-                    analytics_api = get_analytics_api()
-                    analytics_data = analytics_api.get_account_dashboard_data(account_id=account_id, days=30)
-                    metrics["analytics"] = analytics_data
-                except Exception as e:
-                    # Fallback if analytics not available
-                    self.logger.log_step(
-                        step="GET_DASHBOARD_METRICS_ANALYTICS",
-                        result="WARNING",
-                        error=f"Analytics not available: {str(e)}",
-                        account_id=account_id,
-                        error_type=type(e).__name__
-                    )
-                    pass
-            
-            return metrics
-        except Exception as e:
-            self.logger.log_step(
-                step="GET_DASHBOARD_METRICS",
-                result="ERROR",
-                error=f"Failed to get dashboard metrics: {str(e)}",
-                account_id=account_id,
-                error_type=type(e).__name__
-            )
-            raise InternalError(message=f"Failed to retrieve dashboard metrics: {str(e)}")
-    
-    def get_activity(self, account_id: Optional[str] = None, limit: int = 10) -> List[Dict]:
-        """
-        Get recent activity.
-        
-        Args:
-            account_id: Optional account ID filter
-            limit: Number of activities to return
-        
-        Returns:
-            List of recent jobs sorted by created_at
-        """
-        try:
-            # Get jobs using JobsService
-            jobs = self.jobs_service.get_all_jobs(
-                account_id=account_id,
-                reload=False
-            )
-            
-            # Sort by created_at and limit
-            sorted_jobs = sorted(
-                jobs,
-                key=lambda x: x.get("created_at", ""),
-                reverse=True
-            )[:limit]
-            
-            return sorted_jobs
-        except Exception as e:
-            self.logger.log_step(
-                step="GET_DASHBOARD_ACTIVITY",
-                result="ERROR",
-                error=f"Failed to get dashboard activity: {str(e)}",
-                account_id=account_id,
-                limit=limit,
-                error_type=type(e).__name__
-            )
-            raise InternalError(message=f"Failed to retrieve recent activity: {str(e)}")
+"""
+Dashboard service.
+
+Business logic layer for dashboard operations.
+Handles stats calculation, metrics aggregation, and timeline processing.
+"""
+
+# Standard library
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Local
+from services.logger import StructuredLogger
+from backend.app.shared.base_service import BaseService
+from backend.app.modules.jobs.services.jobs_service import JobsService
+from backend.app.modules.dashboard.services.dashboard_aggregator import (
+    DashboardSnapshot,
+    aggregate_jobs,
+)
+from backend.app.core.exceptions import InternalError
+from backend.api.adapters.job_serializer import serialize_job
+
+# Tuổi tối đa của snapshot: bound độ trễ cho thay đổi của process khác
+# (scheduler worker) mà jobs version của process này không thấy
+SNAPSHOT_TTL_SECONDS = 30.0
+
+
+class DashboardService(BaseService):
+    """
+    Service for dashboard business logic.
+    
+    Handles:
+    - Stats calculation
+    - Metrics aggregation
+    - Timeline processing
+    - Analytics integration
+    
+    Stats, metrics và activity dùng chung một DashboardSnapshot (một lần duyệt
+    jobs), cache theo account_id và invalidate khi jobs version thay đổi hoặc
+    sau SNAPSHOT_TTL_SECONDS.
+    """
+    
+    def __init__(self, jobs_service: Optional[JobsService] = None):
+        """
+        Initialize dashboard service.
+        
+        Args:
+            jobs_service: JobsService instance. If None, creates new instance.
+        """
+        super().__init__("dashboard_service")
+        self.jobs_service = jobs_service or JobsService()
+        
+        # account_id -> (jobs version, created monotonic time, snapshot)
+        self._snapshots: Dict[Optional[str], Tuple[Optional[int], float, DashboardSnapshot]] = {}
+        self._snapshots_lock = threading.Lock()
+    
+    def invalidate_cache(self, account_id: Optional[str] = None) -> None:
+        """
+        Drop cached dashboard snapshots.
+        
+        Args:
+            account_id: Only drop this account's snapshot (None = drop all)
+        """
+        with self._snapshots_lock:
+            if account_id is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(account_id, None)
+    
+    def _get_snapshot(self, account_id: Optional[str] = None) -> DashboardSnapshot:
+        """
+        Get aggregated snapshot (cached until jobs change).
+        
+        Jobs version là counter của Scheduler trong process này: load/save của
+        chính process được thấy ngay, còn status do process khác (scheduler
+        worker) ghi vào storage chỉ hiện ra khi snapshot hết hạn, tức dashboard
+        có thể cũ tối đa SNAPSHOT_TTL_SECONDS.
+        
+        Args:
+            account_id: Optional account ID filter
+        
+        Returns:
+            DashboardSnapshot
+        """
+        key = str(account_id).strip() if account_id else None
+        version = self.jobs_service.get_jobs_version()
+        
+        with self._snapshots_lock:
+            entry = self._snapshots.get(key)
+        
+        if entry is not None:
+            cached_version, created_at, snapshot = entry
+            if (
+                version is not None
+                and cached_version == version
+                and time.monotonic() - created_at < SNAPSHOT_TTL_SECONDS
+            ):
+                return snapshot
+        
+        snapshot = aggregate_jobs(self.jobs_service.get_job_objects(account_id=key))
+        
+        with self._snapshots_lock:
+            self._snapshots[key] = (version, time.monotonic(), snapshot)
+        
+        return snapshot
+    
+    def get_stats(self, account_id: Optional[str] = None) -> Dict:
+        """
+        Get dashboard statistics.
+        
+        Args:
+            account_id: Optional account ID filter
+        
+        Returns:
+            Dictionary with stats (total_jobs, pending_jobs, completed_jobs, failed_jobs, success_rate)
+        """
+        try:
+            return self._get_snapshot(account_id).get_stats()
+        except Exception as e:
+            self.logger.log_step(
+                step="GET_DASHBOARD_STATS",
+                result="ERROR",
+                error=f"Failed to get dashboard stats: {str(e)}",
+                account_id=account_id,
+                error_type=type(e).__name__
+            )
+            raise InternalError(message=f"Failed to retrieve dashboard stats: {str(e)}")
+    
+    def get_metrics(self, account_id: Optional[str] = None) -> Dict:
+        """
+        Get dashboard metrics.
+        
+        Args:
+            account_id: Optional account ID filter
+        
+        Returns:
+            Dictionary with metrics (jobs_by_status, jobs_by_platform, posts_timeline, hourly_distribution, analytics)
+        """
+        try:
+            # Status/platform/timeline/hourly từ snapshot (một lần duyệt jobs)
+            metrics = self._get_snapshot(account_id).get_metrics()
+            
+            # If account_id provided, try to get analytics data
+            if account_id:
+                try:
+                    from backend.api.dependencies import get_analytics_api
+                    analytics_api = get_analytics_api()
+                    analytics_data = analytics_api.get_account_dashboard_data(account_id=account_id, days=30)
+                    metrics["analytics"] = analytics_data
+                except Exception as e:
+                    # Fallback if analytics not available
+                    self.logger.log_step(
+                        step="GET_DASHBOARD_METRICS_ANALYTICS",
+                        result="WARNING",
+                        error=f"Analytics not available: {str(e)}",
+                        account_id=account_id,
+                        error_type=type(e).__name__
+                    )
+                    pass
+            
+            return metrics
+        except Exception as e:
+            self.logger.log_step(
+                step="GET_DASHBOARD_METRICS",
+                result="ERROR",
+                error=f"Failed to get dashboard metrics: {str(e)}",
+                account_id=account_id,
+                error_type=type(e).__name__
+            )
+            raise InternalError(message=f"Failed to retrieve dashboard metrics: {str(e)}")
+    
+    def get_activity(self, account_id: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """
+        Get recent activity.
+        
+        Args:
+            account_id: Optional account ID filter
+            limit: Number of activities to return
+        
+        Returns:
+            List of recent jobs sorted by created_at
+        """
+        try:
+            # Snapshot đã sort theo created_at; chỉ serialize `limit` jobs
+            recent_jobs = self._get_snapshot(account_id).recent_jobs[:limit]
+            return [serialize_job(job) for job in recent_jobs]
+        except Exception as e:
+            self.logger.log_step(
+                step="GET_DASHBOARD_ACTIVITY",
+                result="ERROR",
+                error=f"Failed to get dashboard activity: {str(e)}",
+                account_id=account_id,
+                limit=limit,
+                error_type=type(e).__name__
+            )
+            raise InternalError(message=f"Failed to retrieve recent activity: {str(e)}")
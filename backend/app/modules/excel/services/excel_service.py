@@ -14,6 +14,7 @@ import asyncio
 
 # Third-party
 import aiofiles
+import pandas as pd
 
 # Local
 from services.logger import StructuredLogger
@@ -22,6 +23,7 @@ from backend.app.modules.excel.repositories.excel_repository import ExcelReposit
 from backend.app.modules.jobs.services.jobs_service import JobsService
 from backend.app.core.exceptions import NotFoundError, InternalError, ValidationError
 from content.excel_loader import ExcelLoader, ExcelLoadError
+from services.utils.datetime_utils import vn_to_utc
 
 
 class ExcelService(BaseService):
@@ -95,9 +97,8 @@ class ExcelService(BaseService):
             min_delay_seconds = 5.0
             safety_buffer_multiplier = 2.0  # Use 2x minimum delay for safety buffer
             try:
-                from services.safety_guard import SafetyConfig
-                safety_config = SafetyConfig()
-                min_delay_seconds = safety_config.min_delay_between_posts_seconds
+                from services.safety_guard import get_shared_safety_guard
+                min_delay_seconds = get_shared_safety_guard().config.min_delay_between_posts_seconds
             except Exception:
                 # Fallback to default if can't get config
                 pass
@@ -107,64 +108,11 @@ class ExcelService(BaseService):
             
             # 3. Sort scheduled posts by scheduled_time and adjust spacing
             # This ensures jobs don't violate SafetyGuard action spacing requirements
-            from services.utils.datetime_utils import normalize_to_utc
-            
-            # Sort posts by scheduled_time
-            scheduled_posts_with_datetime = []
-            for post in scheduled_posts:
-                scheduled_time = post["scheduled_time"]
-                if isinstance(scheduled_time, datetime):
-                    scheduled_time_utc = normalize_to_utc(scheduled_time)
-                else:
-                    # Parse string to datetime
-                    try:
-                        scheduled_time_utc = datetime.fromisoformat(str(scheduled_time).replace('Z', '+00:00'))
-                        if scheduled_time_utc.tzinfo is None:
-                            scheduled_time_utc = scheduled_time_utc.replace(tzinfo=timezone.utc)
-                    except Exception:
-                        # If parsing fails, use current time + delay
-                        scheduled_time_utc = datetime.now(timezone.utc) + timedelta(seconds=spacing_seconds)
-                
-                scheduled_posts_with_datetime.append({
-                    "post": post,
-                    "scheduled_time": scheduled_time_utc
-                })
-            
-            # Sort by scheduled_time
-            scheduled_posts_with_datetime.sort(key=lambda x: x["scheduled_time"])
-            
-            # Adjust scheduled_time to ensure minimum spacing between jobs
-            adjusted_posts = []
-            last_scheduled_time = None
-            
-            for item in scheduled_posts_with_datetime:
-                post = item["post"]
-                scheduled_time = item["scheduled_time"]
-                
-                # If this is not the first post and scheduled_time is too close to previous
-                if last_scheduled_time is not None:
-                    time_diff = (scheduled_time - last_scheduled_time).total_seconds()
-                    
-                    # If scheduled_time is too close, adjust it
-                    if time_diff < spacing_seconds:
-                        # Adjust to be at least spacing_seconds after the previous job
-                        scheduled_time = last_scheduled_time + timedelta(seconds=spacing_seconds)
-                        
-                        self.logger.log_step(
-                            step="ADJUST_SCHEDULED_TIME_FOR_SPACING",
-                            result="SUCCESS",
-                            account_id=account_id,
-                            original_time=item["scheduled_time"].isoformat(),
-                            adjusted_time=scheduled_time.isoformat(),
-                            spacing_seconds=spacing_seconds,
-                            min_delay_seconds=min_delay_seconds
-                        )
-                
-                adjusted_posts.append({
-                    "post": post,
-                    "scheduled_time": scheduled_time
-                })
-                last_scheduled_time = scheduled_time
+            adjusted_posts = self._space_scheduled_posts(
+                scheduled_posts,
+                spacing_seconds=spacing_seconds,
+                account_id=account_id
+            )
             
             # 4. Create jobs for scheduled posts (now with adjusted times)
             jobs_created = 0
@@ -397,6 +345,67 @@ class ExcelService(BaseService):
             )
             raise InternalError(message=f"Failed to upload Excel file: {str(e)}")
     
+    def _space_scheduled_posts(
+        self,
+        scheduled_posts: List[Dict],
+        spacing_seconds: float,
+        account_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Convert scheduled_time (giờ VN) sang UTC, sort và giãn cách tối thiểu spacing_seconds.
+        
+        Parse từng giá trị bằng vn_to_utc (naive = giờ VN, aware giữ timezone) để input
+        lẫn naive/aware vẫn hợp lệ; phần giãn cách được vectorize:
+        adjusted[i] = max(t[i], adjusted[i-1] + spacing) = i * spacing + cummax(t[j] - j * spacing).
+        
+        Args:
+            scheduled_posts: Posts có scheduled_time
+            spacing_seconds: Khoảng cách tối thiểu giữa 2 jobs
+            account_id: Account ID (logging)
+        
+        Returns:
+            List of {"post", "scheduled_time" (UTC aware datetime)} theo thứ tự thời gian
+        """
+        if not scheduled_posts:
+            return []
+        
+        times = pd.Series(
+            pd.to_datetime([self._scheduled_time_to_utc(post["scheduled_time"]) for post in scheduled_posts], utc=True)
+        )
+        # Không parse được: dùng now + spacing (như trước)
+        times = times.fillna(pd.Timestamp(datetime.now(timezone.utc) + timedelta(seconds=spacing_seconds)))
+        
+        order = times.argsort(kind="stable").to_numpy()
+        sorted_times = times.iloc[order].reset_index(drop=True)
+        offsets = pd.Series(range(len(sorted_times))) * pd.Timedelta(seconds=spacing_seconds)
+        adjusted = (sorted_times - offsets).cummax() + offsets
+        
+        adjusted_count = int((adjusted != sorted_times).sum())
+        if adjusted_count:
+            self.logger.log_step(
+                step="ADJUST_SCHEDULED_TIME_FOR_SPACING",
+                result="SUCCESS",
+                account_id=account_id,
+                adjusted_posts=adjusted_count,
+                total_posts=len(sorted_times),
+                spacing_seconds=spacing_seconds
+            )
+        
+        return [
+            {"post": scheduled_posts[index], "scheduled_time": scheduled_time.to_pydatetime()}
+            for index, scheduled_time in zip(order, adjusted)
+        ]
+    
+    @staticmethod
+    def _scheduled_time_to_utc(value) -> Optional[datetime]:
+        """scheduled_time (datetime hoặc ISO string, naive = giờ VN) -> UTC; None nếu không parse được."""
+        if not isinstance(value, datetime):
+            try:
+                value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        return vn_to_utc(value)
+    
     def get_template_path(self) -> Path:
         """
         Get template file path.
@@ -6,22 +6,28 @@ Transforms service responses to API responses.
 """
 
 # Standard library
-from typing import Dict, Optional
-from fastapi.responses import StreamingResponse
+import asyncio
+import uuid
+from typing import Dict, Optional, Set
+from fastapi.responses import Response
 import httpx
 
 # Local
 from backend.app.core.responses import success_response
 from backend.app.core.exceptions import NotFoundError, ValidationError, InternalError
+from backend.app.modules.feed.services.batch_interactions import BatchInteractionRunner
 from backend.app.modules.feed.services.feed_service import FeedService
+from backend.app.modules.feed.services.media_prefetcher import MediaPrefetcher
 from backend.app.modules.feed.schemas import (
     FeedFilters,
     PostInteractionRequest,
     BrowseCommentConfig,
     SelectUserCommentConfig,
     BulkLoginRequest,
-    UserCommentPostsConfig
+    UserCommentPostsConfig,
+    BatchInteractionRequest
 )
+from services.exceptions import InvalidCursorError
 
 
 class FeedController:
@@ -43,6 +49,26 @@ class FeedController:
             service: FeedService instance. If None, creates new instance.
         """
         self.service = service or FeedService()
+        # MediaService dùng chung giữa các request (resize pool, request coalescing, avatar cache)
+        self._media_service = None
+        # Prefetch media sau get_feed/refresh_feed (bật bằng MEDIA_PREFETCH_ENABLED)
+        if getattr(self.service, "media_prefetcher", None) is None:
+            self.service.media_prefetcher = MediaPrefetcher.from_env(self._get_media_service)
+        # Batch interactions chạy ở background (giữ reference tới khi xong)
+        self._batch_tasks: Set["asyncio.Task"] = set()
+    
+    def _get_media_service(self):
+        """Get shared MediaService (lazy init)."""
+        if self._media_service is None:
+            from backend.app.modules.feed.services.media_service import MediaService
+            self._media_service = MediaService()
+        return self._media_service
+    
+    async def close(self):
+        """Close shared MediaService (HTTP/2 client, resize pool) nếu đã được tạo."""
+        media_service, self._media_service = self._media_service, None
+        if media_service is not None:
+            await media_service.close()
     
     async def get_feed(
         self,
@@ -489,6 +515,48 @@ class FeedController:
         except Exception as e:
             raise InternalError(f"Failed to bulk login: {str(e)}")
     
+    async def batch_interactions(
+        self,
+        request: BatchInteractionRequest,
+        wait: bool = False
+    ) -> Dict:
+        """
+        Run batch of interactions (like/repost/follow/...).
+        
+        Mặc định chạy ở background và trả về batch_id ngay; kết quả từng action
+        được stream qua WebSocket (room "feed", event interaction.result).
+        
+        Args:
+            request: Batch interaction request
+            wait: Chờ batch chạy xong và trả về toàn bộ kết quả
+        """
+        runner = BatchInteractionRunner(self.service)
+        batch_id = uuid.uuid4().hex
+        try:
+            if wait:
+                result = await runner.run(
+                    request.actions,
+                    continue_on_error=request.continue_on_error,
+                    batch_id=batch_id
+                )
+                return success_response(data=result)
+            
+            task = asyncio.ensure_future(runner.run(
+                request.actions,
+                continue_on_error=request.continue_on_error,
+                batch_id=batch_id
+            ))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+            return success_response(data={
+                "batch_id": batch_id,
+                "total": len(request.actions),
+                "accounts": len(runner.group_by_account(request.actions)),
+                "status": "running"
+            })
+        except Exception as e:
+            raise InternalError(f"Failed to run batch interactions: {str(e)}")
+    
     async def comment_user_posts(
         self,
         username: str,
@@ -513,7 +581,8 @@ class FeedController:
         account_id: Optional[str] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
-        filters: Optional["FeedFilters"] = None
+        filters: Optional["FeedFilters"] = None,
+        cursor: Optional[str] = None
     ) -> Dict:
         """Get saved feed items from database."""
         try:
@@ -530,7 +599,8 @@ class FeedController:
                         account_id=account_id,
                         limit=limit,
                         offset=offset,
-                        filters=filters
+                        filters=filters,
+                        cursor=cursor
                     )
                 ),
                 timeout=25.0
@@ -544,6 +614,8 @@ class FeedController:
             )
         except asyncio.TimeoutError:
             raise InternalError("Database query timeout. Please check database connection and query performance.")
+        except InvalidCursorError as e:
+            raise ValidationError(message=str(e), details={"cursor": cursor})
         except Exception as e:
             raise InternalError(f"Failed to get saved feed: {str(e)}")
     
@@ -567,12 +639,16 @@ class FeedController:
     async def proxy_media(
         self,
         url: str,
-        account_id: Optional[str] = None
-    ) -> StreamingResponse:
+        account_id: Optional[str] = None,
+        range_header: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ) -> Response:
         """
         Proxy media from external URL (e.g., Threads CDN) to bypass CORS.
         
-        Fetches media from the provided URL and serves it with proper CORS headers.
+        Streams media through the shared MediaService client (write-through to
+        the media cache, Range support for videos) with proper CORS headers.
+        Only hosts in PROXY_ALLOWED_HOST_SUFFIXES are proxied; no database access.
         """
         from urllib.parse import urlparse, unquote
         
@@ -583,52 +659,19 @@ class FeedController:
             # Validate URL
             parsed = urlparse(url)
             if not parsed.scheme or not parsed.netloc:
-                raise ValidationError(f"Invalid media URL: {url}")
-            
-            # Only allow HTTPS URLs for security
-            if parsed.scheme != 'https':
-                raise ValidationError("Only HTTPS URLs are allowed")
+                raise ValidationError(message=f"Invalid media URL: {url}")
             
-            print(f"[FeedController] proxy_media: Fetching media from {url}")
+            # Only allow HTTPS Threads/Instagram CDN URLs (proxy ghi vào media cache)
+            from backend.app.modules.feed.services.media_service import is_proxy_allowed_url
+            if not is_proxy_allowed_url(url):
+                raise ValidationError(message="Only HTTPS Threads/Instagram CDN URLs are allowed")
             
-            # Fetch media with timeout
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                print(f"[FeedController] proxy_media: Successfully fetched media, status={response.status_code}, content-type={response.headers.get('content-type')}")
-                
-                # Determine content type from response headers or URL
-                content_type = response.headers.get('content-type', 'image/jpeg')
-                
-                # If content-type is not set, try to detect from URL
-                if 'image' not in content_type and 'video' not in content_type:
-                    if url.lower().endswith(('.jpg', '.jpeg')) or '.jpg' in url.lower():
-                        content_type = 'image/jpeg'
-                    elif url.lower().endswith('.png') or '.png' in url.lower():
-                        content_type = 'image/png'
-                    elif url.lower().endswith('.gif') or '.gif' in url.lower():
-                        content_type = 'image/gif'
-                    elif url.lower().endswith('.webp') or '.webp' in url.lower():
-                        content_type = 'image/webp'
-                    elif url.lower().endswith(('.mp4', '.mov')) or '.mp4' in url.lower():
-                        content_type = 'video/mp4'
-                    elif url.lower().endswith('.webm') or '.webm' in url.lower():
-                        content_type = 'video/webm'
-                    else:
-                        content_type = 'image/jpeg'  # Default fallback
-                
-                # Create streaming response with CORS headers
-                return StreamingResponse(
-                    iter([response.content]),
-                    media_type=content_type,
-                    headers={
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'GET',
-                        'Access-Control-Allow-Headers': '*',
-                        'Cache-Control': 'public, max-age=3600',  # Cache for 1 hour
-                    }
-                )
+            media_service = self._get_media_service()
+            return await media_service.proxy_media(
+                url=url,
+                range_header=range_header,
+                if_none_match=if_none_match
+            )
         except httpx.HTTPStatusError as e:
             print(f"[FeedController] proxy_media: HTTP error {e.response.status_code} for {url}")
             raise NotFoundError(f"Failed to fetch media: HTTP {e.response.status_code}")
@@ -646,47 +689,45 @@ class FeedController:
         post_id: str,
         index: int,
         width: Optional[int] = None,
-        height: Optional[int] = None
-    ) -> StreamingResponse:
+        height: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Response:
         """
         Serve media file for a post.
         
         Looks up media URL from database, downloads if needed, and serves.
         Supports optional width/height for thumbnail generation.
         """
-        from backend.app.modules.feed.services.media_service import MediaService
-        
-        media_service = MediaService()
-        try:
-            return await media_service.serve_media(
-                post_id=post_id,
-                index=index,
-                width=width,
-                height=height
-            )
-        finally:
-            await media_service.close()
+        media_service = self._get_media_service()
+        return await media_service.serve_media(
+            post_id=post_id,
+            index=index,
+            width=width,
+            height=height,
+            if_none_match=if_none_match,
+            accept=accept
+        )
     
     async def serve_avatar(
         self,
         user_id: str,
         width: Optional[int] = None,
-        height: Optional[int] = None
-    ) -> StreamingResponse:
+        height: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Response:
         """
         Serve avatar file for a user.
         
         Looks up avatar URL from database, downloads if needed, and serves.
         Supports optional width/height for thumbnail generation.
         """
-        from backend.app.modules.feed.services.media_service import MediaService
-        
-        media_service = MediaService()
-        try:
-            return await media_service.serve_avatar(
-                user_id=user_id,
-                width=width,
-                height=height
-            )
-        finally:
-            await media_service.close()
\ No newline at end of file
+        media_service = self._get_media_service()
+        return await media_service.serve_avatar(
+            user_id=user_id,
+            width=width,
+            height=height,
+            if_none_match=if_none_match,
+            accept=accept
+        )
\ No newline at end of file
@@ -5,7 +5,6 @@ Data access layer for feed items. Wraps FeedStorage.
 """
 
 # Standard library
-import json
 from typing import List, Dict, Optional
 
 # Local
@@ -106,7 +105,8 @@ class FeedRepository(BaseRepository):
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         order_by: str = "fetched_at DESC",
-        filters: Optional["FeedFilters"] = None
+        filters: Optional["FeedFilters"] = None,
+        cursor: Optional[str] = None
     ) -> List[FeedItem]:
         """
         Get feed items from database.
@@ -119,6 +119,7 @@ class FeedRepository(BaseRepository):
             offset: Offset for pagination
             order_by: Order by clause
             filters: Optional FeedFilters object for advanced filtering
+            cursor: Keyset cursor from previous page (next_cursor)
         
         Returns:
             FeedItemsList wrapper with FeedItem objects and metadata
@@ -141,7 +142,8 @@ class FeedRepository(BaseRepository):
             limit=limit,
             offset=offset,
             order_by=order_by,
-            filters=filters_dict
+            filters=filters_dict,
+            cursor=cursor
         )
         
         # Handle both old format (list) and new format (dict with items and total)
@@ -149,11 +151,13 @@ class FeedRepository(BaseRepository):
             items_dicts = result["items"]
             total_count = result.get("total", len(items_dicts))
             filtered_total = result.get("filtered_total", total_count)
+            next_cursor = result.get("next_cursor")
         else:
             # Backward compatibility: if result is a list
             items_dicts = result if isinstance(result, list) else []
             total_count = len(items_dicts)
             filtered_total = total_count
+            next_cursor = None
         
         # Convert dicts to FeedItem objects
         feed_items = [FeedItem(**item) for item in items_dicts]
@@ -161,16 +165,13 @@ class FeedRepository(BaseRepository):
         # Store total count and filtered_total as attributes for access by service layer
         # Use a wrapper class or store in a way that doesn't break list operations
         class FeedItemsList(list):
-            def __init__(self, items, total_count, filtered_total):
+            def __init__(self, items, total_count, filtered_total, next_cursor=None):
                 super().__init__(items)
                 self._total_count = total_count
                 self._filtered_total = filtered_total
+                self._next_cursor = next_cursor
         
-        result_list = FeedItemsList(feed_items, total_count, filtered_total)
-        # #region agent log
-        with open("/home/zusem/threads/.cursor/debug.log", "a") as f:
-            f.write(json.dumps({"location":"feed_repository.py:165","message":"Returning FeedItemsList","data":{"total_count":total_count,"filtered_total":filtered_total,"items_count":len(feed_items),"_total_count":result_list._total_count,"_filtered_total":result_list._filtered_total},"timestamp":int(__import__("time").time()*1000),"runId":"run1","hypothesisId":"D"})+"\n")
-        # #endregion
+        result_list = FeedItemsList(feed_items, total_count, filtered_total, next_cursor)
         return result_list
     
     def get_latest_feed_items(
@@ -16,7 +16,8 @@ from backend.app.modules.feed.schemas import (
     FeedFilters,
     PostInteractionRequest,
     BrowseCommentConfig,
-    SelectUserCommentConfig
+    SelectUserCommentConfig,
+    BatchInteractionRequest
 )
 
 router = APIRouter()
@@ -296,35 +297,49 @@ async def serve_media(
     post_id: str = Path(..., description="Post ID"),
     index: int = Path(..., description="Media index (0-based)"),
     w: Optional[int] = Query(None, description="Width in pixels (for thumbnails)"),
-    h: Optional[int] = Query(None, description="Height in pixels (for thumbnails)")
+    h: Optional[int] = Query(None, description="Height in pixels (for thumbnails)"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    accept: Optional[str] = Header(None, alias="Accept")
 ):
     """
     Serve media file for a post.
     
     Downloads media from Instagram CDN if not cached, then serves from filesystem.
     Supports optional width/height parameters for thumbnail generation.
+    Returns 304 when If-None-Match matches the cached file's ETag.
     """
-    return await controller.serve_media(post_id=post_id, index=index, width=w, height=h)
+    return await controller.serve_media(
+        post_id=post_id, index=index, width=w, height=h,
+        if_none_match=if_none_match, accept=accept
+    )
 
 @router.get("/avatar/{user_id}")
 async def serve_avatar(
     user_id: str = Path(..., description="User ID"),
     w: Optional[int] = Query(None, description="Width in pixels (for thumbnails)"),
-    h: Optional[int] = Query(None, description="Height in pixels (for thumbnails)")
+    h: Optional[int] = Query(None, description="Height in pixels (for thumbnails)"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    accept: Optional[str] = Header(None, alias="Accept")
 ):
     """
     Serve avatar file for a user.
     
     Downloads avatar from Instagram CDN if not cached, then serves from filesystem.
     Supports optional width/height parameters for thumbnail generation.
+    Returns 304 when If-None-Match matches the cached file's ETag.
     """
-    return await controller.serve_avatar(user_id=user_id, width=w, height=h)
+    return await controller.serve_avatar(
+        user_id=user_id, width=w, height=h,
+        if_none_match=if_none_match, accept=accept
+    )
 
 # Media Proxy Endpoint (Legacy - kept for backward compatibility)
 @router.get("/media/proxy")
 async def proxy_media(
     url: str = Query(..., description="Media URL to proxy"),
-    account_id: Optional[str] = Query(None, description="Account ID for logging")
+    account_id: Optional[str] = Query(None, description="Account ID for logging"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
     """
     Proxy media from external URLs (e.g., Threads CDN) to bypass CORS.
@@ -338,7 +353,10 @@ async def proxy_media(
     logger = logging.getLogger(__name__)
     logger.info(f"[FeedRoutes] proxy_media called with url={url[:100]}..., account_id={account_id}")
     print(f"[FeedRoutes] proxy_media called with url={url[:100]}..., account_id={account_id}")
-    return await controller.proxy_media(url=url, account_id=account_id)
+    return await controller.proxy_media(
+        url=url, account_id=account_id,
+        range_header=range_header, if_none_match=if_none_match
+    )
 
 
 # Saved Feed Endpoints (MUST be defined BEFORE /{post_id} route to avoid route conflict)
@@ -346,7 +364,8 @@ async def proxy_media(
 async def get_saved_feed(
     account_id: Optional[str] = Query(None, description="Account ID filter"),
     limit: Optional[int] = Query(100, description="Limit number of results"),
-    offset: Optional[int] = Query(0, description="Offset for pagination"),
+    offset: Optional[int] = Query(0, description="Offset for pagination (ignored when cursor is provided)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from previous page (meta.next_cursor)"),
     min_likes: Optional[int] = Query(None, description="Minimum like count"),
     max_likes: Optional[int] = Query(None, description="Maximum like count"),
     min_replies: Optional[int] = Query(None, description="Minimum reply count"),
@@ -356,6 +375,7 @@ async def get_saved_feed(
     has_media: Optional[bool] = Query(None, description="Only posts with media"),
     username: Optional[str] = Query(None, description="Filter by username (exact match)"),
     text_contains: Optional[str] = Query(None, description="Filter posts containing text"),
+    search: Optional[str] = Query(None, description="Full-text search (text, hashtags, mentions, usernames), ranked by relevance"),
     after_timestamp: Optional[int] = Query(None, description="Posts after timestamp"),
     before_timestamp: Optional[int] = Query(None, description="Posts before timestamp")
 ):
@@ -363,7 +383,7 @@ async def get_saved_feed(
     # Build FeedFilters from query parameters
     filters = None
     if any([min_likes, max_likes, min_replies, min_reposts, min_shares, max_shares, 
-            has_media is not None, username, text_contains, after_timestamp, before_timestamp]):
+            has_media is not None, username, text_contains, search, after_timestamp, before_timestamp]):
         filters = FeedFilters(
             min_likes=min_likes,
             max_likes=max_likes,
@@ -374,6 +394,7 @@ async def get_saved_feed(
             has_media=has_media,
             username=username,
             text_contains=text_contains,
+            search=search,
             after_timestamp=after_timestamp,
             before_timestamp=before_timestamp
         )
@@ -382,7 +403,8 @@ async def get_saved_feed(
         account_id=account_id,
         limit=limit,
         offset=offset,
-        filters=filters
+        filters=filters,
+        cursor=cursor
     )
 
 
@@ -1109,6 +1131,20 @@ async def get_user_follow_status(
     return await controller.get_user_follow_status(username=username, account_id=final_account_id, profile_path=final_profile_path)
 
 
+@router.post("/interactions/batch")
+async def batch_interactions(
+    request: BatchInteractionRequest = Body(..., description="Batch interaction request"),
+    wait: bool = Query(False, description="Wait for completion and return all results")
+):
+    """
+    Run many like/repost/follow/... actions in one request.
+    
+    Actions được group theo account_id (tuần tự trong account, có SafetyGuard
+    spacing; song song giữa các accounts). Kết quả stream qua WebSocket room "feed".
+    """
+    return await controller.batch_interactions(request=request, wait=wait)
+
+
 @router.post("/user/{username}/comment-posts")
 async def comment_user_posts(
     username: str = Path(..., description="Username (with or without @)"),
@@ -28,6 +28,11 @@ class FeedFilters(BaseModel):
     text_contains: Optional[str] = Field(
         None, description="Filter posts containing text"
     )
+    search: Optional[str] = Field(
+        None,
+        description="Full-text search on text, hashtags, mentions and usernames (saved feed, ranked by relevance)",
+        max_length=200
+    )
     after_timestamp: Optional[int] = Field(
         None, description="Posts after timestamp (Unix seconds)", ge=0
     )
@@ -429,6 +434,92 @@ class SelectUserCommentConfig(BaseModel):
         }
 
 
+# Actions hỗ trợ trong batch interactions
+INTERACTION_ACTIONS = (
+    "like", "unlike", "comment", "repost", "unrepost", "quote", "share", "follow", "unfollow"
+)
+USER_INTERACTION_ACTIONS = ("follow", "unfollow")
+
+
+class InteractionAction(BaseModel):
+    """Schema for one action in a batch interaction request."""
+
+    action: str = Field(..., description="Action: " + ", ".join(INTERACTION_ACTIONS))
+    account_id: str = Field(..., description="Account ID thực hiện action", min_length=1)
+    post_id: Optional[str] = Field(None, description="Post ID (post actions)")
+    username: Optional[str] = Field(
+        None, description="Target username (follow/unfollow) hoặc username cho post URL"
+    )
+    shortcode: Optional[str] = Field(None, description="Shortcode for post URL")
+    post_url: Optional[str] = Field(None, description="Post URL (highest priority)")
+    comment: Optional[str] = Field(None, description="Comment text (comment)")
+    quote: Optional[str] = Field(None, description="Quote text (quote)")
+    platform: Optional[str] = Field("copy", description="Platform for share")
+    profile_path: Optional[str] = Field(None, description="Browser profile path (client-side)")
+
+    @validator("action")
+    def validate_action(cls, v):
+        """Validate action name."""
+        if v not in INTERACTION_ACTIONS:
+            raise ValueError(f"action must be one of: {', '.join(INTERACTION_ACTIONS)}")
+        return v
+
+    @validator("post_id", always=True)
+    def validate_post_id(cls, v, values):
+        """Post actions cần post_id."""
+        action = values.get("action")
+        if action and action not in USER_INTERACTION_ACTIONS and not v:
+            raise ValueError(f"post_id is required for action '{action}'")
+        return v
+
+    @validator("username", always=True)
+    def validate_username(cls, v, values):
+        """follow/unfollow cần username."""
+        if values.get("action") in USER_INTERACTION_ACTIONS and not v:
+            raise ValueError(f"username is required for action '{values.get('action')}'")
+        return v
+
+    @validator("comment", always=True)
+    def validate_comment(cls, v, values):
+        """comment cần comment text."""
+        if values.get("action") == "comment" and not v:
+            raise ValueError("comment is required for action 'comment'")
+        return v
+
+    @validator("quote", always=True)
+    def validate_quote(cls, v, values):
+        """quote cần quote text."""
+        if values.get("action") == "quote" and not v:
+            raise ValueError("quote is required for action 'quote'")
+        return v
+
+
+class BatchInteractionRequest(BaseModel):
+    """Schema for batch interaction request."""
+
+    actions: List[InteractionAction] = Field(
+        ..., description="Actions (chạy tuần tự theo account, song song giữa các accounts)",
+        min_items=1, max_items=500
+    )
+    continue_on_error: bool = Field(
+        True, description="Tiếp tục các actions còn lại của account khi một action lỗi"
+    )
+
+    class Config:
+        """Pydantic config."""
+
+        json_schema_extra = {
+            "example": {
+                "actions": [
+                    {"action": "like", "account_id": "account_01", "post_id": "3312345678"},
+                    {"action": "follow", "account_id": "account_01", "username": "may__lily"},
+                    {"action": "repost", "account_id": "account_02", "post_id": "3312345678"},
+                ],
+                "continue_on_error": True,
+            }
+        }
+
+
 class BulkLoginAccount(BaseModel):
     """Schema for a single account in bulk login."""
 
@@ -0,0 +1,252 @@
+"""
+Batch interactions for feed module.
+
+Chạy nhiều like/repost/follow/... actions trong một request: group theo
+account, mỗi account chạy tuần tự trên cùng browser context (qrtools giữ
+context theo account_id) với SafetyGuard spacing, các accounts chạy song
+song. Kết quả từng action được stream qua WebSocket.
+"""
+
+# Standard library
+import asyncio
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Local
+from backend.api.websocket.messages import (
+    EVENT_INTERACTION_BATCH_COMPLETE,
+    EVENT_INTERACTION_RESULT,
+    create_message
+)
+from backend.app.modules.feed.schemas import InteractionAction
+from services.logger import StructuredLogger
+from services.safety_guard import SafetyGuard, get_shared_safety_guard
+
+# WebSocket room nhận kết quả batch interactions
+INTERACTION_ROOM = "feed"
+
+# Số accounts chạy đồng thời tối đa (mỗi account = một browser context bên qrtools)
+MAX_CONCURRENT_ACCOUNTS = 4
+
+Broadcaster = Callable[[str, Dict[str, Any], Optional[str]], Awaitable[None]]
+
+
+async def _broadcast_to_websocket(event_type: str, data: Dict[str, Any], account_id: Optional[str]) -> None:
+    """Broadcast tới room INTERACTION_ROOM (bỏ qua nếu WebSocket không khả dụng)."""
+    try:
+        from backend.api.websocket.connection_manager import manager
+    except ImportError:
+        return
+    await manager.broadcast_to_room(
+        create_message(event_type, data, account_id=account_id),
+        room=INTERACTION_ROOM,
+        account_id=account_id
+    )
+
+
+class BatchInteractionRunner:
+    """
+    Runner cho batch interactions.
+
+    - Actions của cùng account chạy tuần tự theo thứ tự gửi lên, cách nhau
+      bởi SafetyGuard spacing (min..max delay), dừng nếu account bị pause
+    - Các accounts chạy song song (tối đa MAX_CONCURRENT_ACCOUNTS)
+    - Mỗi kết quả được broadcast ngay khi có (event interaction.result)
+    """
+
+    def __init__(
+        self,
+        feed_service: Any,
+        safety_guard: Optional[SafetyGuard] = None,
+        broadcaster: Optional[Broadcaster] = None,
+        max_concurrent_accounts: int = MAX_CONCURRENT_ACCOUNTS,
+        logger: Optional[StructuredLogger] = None
+    ):
+        """
+        Initialize runner.
+
+        Args:
+            feed_service: FeedService (thực hiện từng action qua QrtoolsClient)
+            safety_guard: SafetyGuard (default: shared singleton)
+            broadcaster: async (event_type, data, account_id) -> None (default: WebSocket room "feed")
+            max_concurrent_accounts: Số accounts chạy đồng thời
+            logger: Structured logger (optional)
+        """
+        self.feed_service = feed_service
+        self.safety_guard = safety_guard or get_shared_safety_guard()
+        self.broadcaster = broadcaster or _broadcast_to_websocket
+        self.max_concurrent_accounts = max(1, max_concurrent_accounts)
+        self.logger = logger or StructuredLogger(name="batch_interactions")
+
+    @staticmethod
+    def group_by_account(actions: List[InteractionAction]) -> Dict[str, List[tuple]]:
+        """Group actions theo account_id, giữ thứ tự và index gốc."""
+        groups: Dict[str, List[tuple]] = {}
+        for index, action in enumerate(actions):
+            groups.setdefault(action.account_id, []).append((index, action))
+        return groups
+
+    async def run(
+        self,
+        actions: List[InteractionAction],
+        continue_on_error: bool = True,
+        batch_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Chạy batch.
+
+        Args:
+            actions: Actions (đã validate)
+            continue_on_error: Tiếp tục actions còn lại của account khi một action lỗi
+            batch_id: Batch ID (default: uuid mới)
+
+        Returns:
+            Dict với batch_id, results (theo thứ tự actions) và summary
+        """
+        batch_id = batch_id or uuid.uuid4().hex
+        groups = self.group_by_account(actions)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+        semaphore = asyncio.Semaphore(self.max_concurrent_accounts)
+        started = time.monotonic()
+
+        async def run_group(account_id: str, items: List[tuple]) -> None:
+            async with semaphore:
+                await self._run_account(batch_id, account_id, items, results, continue_on_error)
+
+        await asyncio.gather(*(run_group(account_id, items) for account_id, items in groups.items()))
+
+        summary = {
+            "total": len(actions),
+            "succeeded": sum(1 for r in results if r and r["status"] == "success"),
+            "failed": sum(1 for r in results if r and r["status"] == "failed"),
+            "skipped": sum(1 for r in results if r and r["status"] == "skipped"),
+            "accounts": len(groups),
+            "duration_seconds": round(time.monotonic() - started, 3),
+        }
+        self.logger.log_step(
+            step="BATCH_INTERACTIONS",
+            result="SUCCESS" if not summary["failed"] else "PARTIAL",
+            batch_id=batch_id,
+            **summary
+        )
+        await self._emit(EVENT_INTERACTION_BATCH_COMPLETE, {"batch_id": batch_id, "summary": summary}, None)
+        return {"batch_id": batch_id, "results": results, "summary": summary}
+
+    async def _run_account(
+        self,
+        batch_id: str,
+        account_id: str,
+        items: List[tuple],
+        results: List[Optional[Dict[str, Any]]],
+        continue_on_error: bool
+    ) -> None:
+        """Chạy tuần tự các actions của một account."""
+        config = self.safety_guard.config
+        last_action_at: Optional[float] = None
+        stop_reason: Optional[str] = None
+
+        for index, action in items:
+            if stop_reason is None:
+                allowed, error = self.safety_guard.check_rate_limit(account_id)
+                if not allowed:
+                    stop_reason = error
+            if stop_reason is not None:
+                await self._record(batch_id, index, action, results, "skipped", error=stop_reason)
+                continue
+
+            # Spacing giữa các actions cùng account (không delay trước action đầu tiên)
+            if last_action_at is not None:
+                delay = random.uniform(
+                    config.min_delay_between_posts_seconds,
+                    max(config.min_delay_between_posts_seconds, config.max_delay_between_posts_seconds)
+                )
+                remaining = delay - (time.monotonic() - last_action_at)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+
+            try:
+                data = await self._execute(action)
+                last_action_at = time.monotonic()
+                if isinstance(data, dict) and data.get("success") is False:
+                    raise RuntimeError(data.get("error") or "Qrtools returned success=false")
+                self.safety_guard.record_action(account_id)
+                await self._record(batch_id, index, action, results, "success", data=data)
+            except Exception as e:
+                last_action_at = time.monotonic()
+                self.safety_guard.record_post_error(account_id, type(e).__name__, str(e))
+                await self._record(batch_id, index, action, results, "failed", error=str(e))
+                if not continue_on_error:
+                    stop_reason = f"Stopped after failed action #{index}"
+
+    async def _execute(self, action: InteractionAction) -> Dict[str, Any]:
+        """Gọi FeedService method tương ứng với action."""
+        service = self.feed_service
+        account_id = action.account_id
+        profile_path = action.profile_path
+        hints = {
+            key: value
+            for key, value in (
+                ("username", action.username),
+                ("shortcode", action.shortcode),
+                ("post_url", action.post_url),
+            )
+            if value
+        }
+
+        if action.action == "like":
+            return await service.like_post(action.post_id, account_id, profile_path=profile_path, **hints)
+        if action.action == "unlike":
+            return await service.unlike_post(action.post_id, account_id, profile_path=profile_path)
+        if action.action == "comment":
+            return await service.comment_on_post(action.post_id, action.comment, account_id, profile_path=profile_path, **hints)
+        if action.action == "repost":
+            return await service.repost_post(action.post_id, account_id, profile_path=profile_path, **hints)
+        if action.action == "unrepost":
+            return await service.unrepost_post(action.post_id, account_id, profile_path=profile_path)
+        if action.action == "quote":
+            return await service.quote_post(action.post_id, action.quote, account_id, profile_path=profile_path, **hints)
+        if action.action == "share":
+            return await service.share_post(action.post_id, account_id, platform=action.platform or "copy", profile_path=profile_path)
+        if action.action == "follow":
+            return await service.follow_user(action.username, account_id, profile_path=profile_path)
+        if action.action == "unfollow":
+            return await service.unfollow_user(action.username, account_id, profile_path=profile_path)
+        raise ValueError(f"Unsupported action: {action.action}")
+
+    async def _record(
+        self,
+        batch_id: str,
+        index: int,
+        action: InteractionAction,
+        results: List[Optional[Dict[str, Any]]],
+        status: str,
+        data: Any = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Lưu kết quả action và broadcast."""
+        result = {
+            "index": index,
+            "action": action.action,
+            "account_id": action.account_id,
+            "post_id": action.post_id,
+            "username": action.username,
+            "status": status,
+            "data": data,
+            "error": error,
+        }
+        results[index] = result
+        await self._emit(EVENT_INTERACTION_RESULT, {"batch_id": batch_id, **result}, action.account_id)
+
+    async def _emit(self, event_type: str, data: Dict[str, Any], account_id: Optional[str]) -> None:
+        """Broadcast, không để lỗi WebSocket làm hỏng batch."""
+        try:
+            await self.broadcaster(event_type, data, account_id)
+        except Exception as e:
+            self.logger.log_step(
+                step="BATCH_INTERACTIONS_BROADCAST",
+                result="WARNING",
+                error=str(e),
+                error_type=type(e).__name__
+            )
@@ -23,7 +23,8 @@ class FeedService:
     def __init__(
         self,
         qrtools_client: Optional[QrtoolsClient] = None,
-        feed_repository: Optional[FeedRepository] = None
+        feed_repository: Optional[FeedRepository] = None,
+        media_prefetcher: Optional[Any] = None
     ):
         """
         Initialize feed service.
@@ -31,9 +32,12 @@ class FeedService:
         Args:
             qrtools_client: QrtoolsClient instance. If None, creates new instance.
             feed_repository: FeedRepository instance. If None, creates new instance.
+            media_prefetcher: MediaPrefetcher (optional). Nếu có, media/avatars của
+                feed items mới fetch được tải trước vào media cache ở background.
         """
         self.qrtools_client = qrtools_client or QrtoolsClient()
         self.feed_repository = feed_repository or FeedRepository()
+        self.media_prefetcher = media_prefetcher
         self.logger = StructuredLogger(name="feed_service")
     
     def _normalize_media_type(self, media_type: Any) -> Optional[int]:
@@ -99,6 +103,20 @@ class FeedService:
         
         return normalized
     
+    def _schedule_prefetch(self, feed_items: List[FeedItem]) -> None:
+        """Tải trước media/avatars ở background (không ảnh hưởng response)."""
+        if not self.media_prefetcher or not feed_items:
+            return
+        try:
+            self.media_prefetcher.schedule(feed_items)
+        except Exception as e:
+            self.logger.log_step(
+                step="FEED_SERVICE_PREFETCH",
+                result="FAILED",
+                error=str(e),
+                error_type=type(e).__name__
+            )
+    
     async def get_feed(
         self,
         filters: Optional[FeedFilters] = None,
@@ -149,9 +167,11 @@ class FeedService:
             # Transform response
             if response.get("success"):
                 feed_items = [FeedItem(**self._normalize_feed_item_data(item)) for item in response.get("data", [])]
+                # Response cache hit: auto-save và prefetch đã chạy khi response được fetch
+                from_cache = bool(response.get("from_cache"))
                 
                 # AUTO-SAVE: Lưu vào database ngay sau khi fetch thành công
-                if account_id and feed_items:
+                if account_id and feed_items and not from_cache:
                     try:
                         saved_count = self.feed_repository.save_feed_items(
                             account_id=account_id,
@@ -174,6 +194,9 @@ class FeedService:
                             total_items=len(feed_items)
                         )
                 
+                if not from_cache:
+                    self._schedule_prefetch(feed_items)
+                
                 # Convert FeedItem to FeedItemResponse (exclude URLs)
                 feed_items_response = [FeedItemResponse.from_feed_item(item) for item in feed_items]
                 
@@ -321,6 +344,7 @@ class FeedService:
             
             if response.get("success"):
                 feed_items = [FeedItem(**self._normalize_feed_item_data(item)) for item in response.get("data", [])]
+                self._schedule_prefetch(feed_items)
                 # Convert FeedItem to FeedItemResponse (exclude URLs)
                 feed_items_response = [FeedItemResponse.from_feed_item(item) for item in feed_items]
                 return FeedResponse(
@@ -1083,7 +1107,8 @@ class FeedService:
         account_id: Optional[str] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
-        filters: Optional[FeedFilters] = None
+        filters: Optional[FeedFilters] = None,
+        cursor: Optional[str] = None
     ) -> FeedResponse:
         """
         Get saved feed items from database.
@@ -1093,8 +1118,9 @@ class FeedService:
         Args:
             account_id: Account ID filter
             limit: Limit number of results
-            offset: Offset for pagination
+            offset: Offset for pagination (ignored when cursor is provided)
             filters: Optional FeedFilters for advanced filtering
+            cursor: Keyset cursor from previous page's meta.next_cursor
         
         Returns:
             FeedResponse with saved feed items
@@ -1116,19 +1142,24 @@ class FeedService:
             print(f"[INFO] FEED_SERVICE_GET_SAVED_FEED CALLED - Database only, NO browser")
             print(f"[INFO] account_id={account_id}, filters={filters.dict(exclude_none=True) if filters else None}, stack_trace:\n{stack_trace}")
             
+            # Search: xếp theo relevance (offset pagination), còn lại keyset theo fetched_at
+            ranked = bool(filters and filters.search)
+            
             # Get feed items from repository (database only)
             feed_items = self.feed_repository.get_feed_items(
                 account_id=account_id,
                 limit=limit,
                 offset=offset,
-                order_by="fetched_at DESC",
-                filters=filters
+                order_by="relevance DESC" if ranked else "fetched_at DESC",
+                filters=filters,
+                cursor=cursor
             )
             
             # Get total count and filtered_total from repository result
             # feed_items is a FeedItemsList wrapper with _total_count and _filtered_total attributes
             total_count = feed_items._total_count if hasattr(feed_items, '_total_count') else len(feed_items)
             filtered_total = feed_items._filtered_total if hasattr(feed_items, '_filtered_total') else total_count
+            next_cursor = getattr(feed_items, '_next_cursor', None)
             
             self.logger.log_step(
                 step="FEED_SERVICE_GET_SAVED_FEED",
@@ -1155,7 +1186,11 @@ class FeedService:
                     "count": len(feed_items),
                     "limit": limit or 100,
                     "offset": offset or 0,
-                    "has_more": (offset or 0) + len(feed_items) < filtered_total if limit else False
+                    "has_more": (
+                        ((offset or 0) + len(feed_items) < filtered_total if ranked else next_cursor is not None)
+                        if limit else False
+                    ),
+                    "next_cursor": next_cursor
                 },
                 timestamp=datetime.utcnow().isoformat()
             )
@@ -0,0 +1,284 @@
+"""
+Media cache for feed items.
+
+Content-addressed blob store: sha256(CDN URL + variant) -> file, with an
+in-memory index rebuilt from disk at startup, LRU eviction under a byte
+budget and alias lookups (post_id, index, size) -> blob.
+"""
+
+# Standard library
+import hashlib
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable, Optional
+
+# Local
+from services.logger import StructuredLogger
+
+# Content type theo extension của blob (index rebuild từ tên file)
+CONTENT_TYPES = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'avif': 'image/avif',
+    'mp4': 'video/mp4',
+    'mov': 'video/mp4',
+    'webm': 'video/webm',
+}
+
+# Số alias tối đa giữ trong memory (alias chỉ là shortcut, mất thì tính lại key)
+MAX_ALIASES = 50000
+
+# File tạm (.part) cũ hơn ngưỡng này được dọn khi rebuild index
+STALE_TEMP_FILE_SECONDS = 3600
+
+
+@dataclass
+class CacheEntry:
+    """One cached blob."""
+    key: str
+    path: Path
+    size: int
+    content_type: str
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag: key là hash của URL + variant nên nội dung không đổi."""
+        return f'"{self.key[:32]}"'
+
+
+class MediaCache:
+    """
+    Content-addressed media cache với LRU eviction.
+
+    Layout: {root}/{key[:2]}/{key}.{ext}. Index (key -> CacheEntry) nằm trong
+    memory theo thứ tự LRU, được rebuild bằng một lần scan khi khởi tạo, nên
+    mỗi request chỉ cần một lookup dict thay vì probe nhiều extension trên disk.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int,
+        logger: Optional[StructuredLogger] = None
+    ):
+        """
+        Initialize cache and rebuild index from disk.
+
+        Args:
+            root: Cache directory
+            max_bytes: Disk budget (bytes); blobs ít dùng nhất bị xoá khi vượt
+            logger: Structured logger (optional)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True, mode=0o755)
+        self.max_bytes = max_bytes
+        self.logger = logger or StructuredLogger(name="media_cache")
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._aliases: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self._rebuild_index()
+
+    @staticmethod
+    def make_key(url: str, variant: str = "") -> str:
+        """Build content key từ CDN URL và variant (vd. "w200_h200_webp")."""
+        return hashlib.sha256(f"{url}\n{variant}".encode("utf-8")).hexdigest()
+
+    def blob_path(self, key: str, extension: str) -> Path:
+        """Path cho blob mới (tạo shard directory nếu cần)."""
+        shard_dir = self.root / key[:2]
+        shard_dir.mkdir(exist_ok=True, mode=0o755)
+        return shard_dir / f"{key}.{extension}"
+
+    @property
+    def total_bytes(self) -> int:
+        """Tổng size các blobs trong index."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Lookup blob theo key (đánh dấu most-recently-used).
+
+        Không stat file: caller mở file và gọi `discard(key)` khi gặp
+        FileNotFoundError (blob bị xoá ngoài cache).
+
+        Returns:
+            CacheEntry, hoặc None nếu chưa cache
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def discard(self, key: str) -> None:
+        """Bỏ entry có file đã bị xoá ngoài cache khỏi index."""
+        with self._lock:
+            self._drop(key, unlink=False)
+
+    def put(self, key: str, path: Path) -> CacheEntry:
+        """
+        Đăng ký blob vừa ghi xong (file đã ở vị trí cuối) và evict nếu vượt budget.
+
+        Args:
+            key: Content key
+            path: Blob path (từ `blob_path`)
+
+        Returns:
+            CacheEntry
+        """
+        entry = self._make_entry(key, path)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key, unlink=False)
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+            self._evict()
+        return entry
+
+    def get_alias(self, alias: Hashable) -> Optional[CacheEntry]:
+        """Lookup blob qua alias, vd. ("media", post_id, index, variant)."""
+        with self._lock:
+            key = self._aliases.get(alias)
+            if key is None:
+                return None
+            self._aliases.move_to_end(alias)
+        entry = self.get(key)
+        if entry is None:
+            with self._lock:
+                self._aliases.pop(alias, None)
+        return entry
+
+    def set_alias(self, alias: Hashable, key: str) -> None:
+        """Map alias -> key (LRU, tối đa MAX_ALIASES)."""
+        with self._lock:
+            self._aliases[alias] = key
+            self._aliases.move_to_end(alias)
+            while len(self._aliases) > MAX_ALIASES:
+                self._aliases.popitem(last=False)
+
+    def _make_entry(self, key: str, path: Path) -> CacheEntry:
+        extension = path.suffix.lstrip('.').lower()
+        return CacheEntry(
+            key=key,
+            path=path,
+            size=path.stat().st_size,
+            content_type=CONTENT_TYPES.get(extension, 'application/octet-stream')
+        )
+
+    def _drop(self, key: str, unlink: bool = True) -> None:
+        """Xoá entry khỏi index (caller giữ lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size
+        if unlink:
+            try:
+                entry.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        """Evict blobs ít dùng nhất cho tới khi dưới budget (caller giữ lock)."""
+        evicted = 0
+        freed = 0
+        # Luôn giữ blob mới nhất, kể cả khi riêng nó vượt budget
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = next(iter(self._entries.items()))
+            freed += entry.size
+            self._drop(key)
+            evicted += 1
+
+        if evicted:
+            self.logger.log_step(
+                step="MEDIA_CACHE_EVICT",
+                result="SUCCESS",
+                evicted=evicted,
+                freed_bytes=freed,
+                total_bytes=self._total_bytes
+            )
+
+    def _rebuild_index(self) -> None:
+        """Scan root một lần, sort theo atime (cũ nhất trước) để khôi phục thứ tự LRU."""
+        found = []
+        for shard_dir in self.root.iterdir():
+            if not shard_dir.is_dir():
+                continue
+            for path in shard_dir.iterdir():
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if path.name.startswith('.'):
+                    # File tạm của download/resize bị ngắt giữa chừng
+                    if time.time() - stat.st_mtime > STALE_TEMP_FILE_SECONDS:
+                        path.unlink(missing_ok=True)
+                    continue
+                found.append((stat.st_atime, path))
+
+        found.sort(key=lambda item: item[0])
+        with self._lock:
+            for _, path in found:
+                key = path.name.split('.', 1)[0]
+                entry = self._make_entry(key, path)
+                self._entries[key] = entry
+                self._total_bytes += entry.size
+            self._evict()
+
+        self.logger.log_step(
+            step="MEDIA_CACHE_INDEX",
+            result="SUCCESS",
+            entries=len(self._entries),
+            total_bytes=self._total_bytes,
+            max_bytes=self.max_bytes
+        )
+
+
+def remove_legacy_media_dirs(media_dir: Path, cache_root: Path, logger: StructuredLogger) -> int:
+    """
+    Xoá layout cũ (media/{post_id}/, media/avatars/) nằm cạnh cache root.
+
+    Files cũ được đặt tên theo post_id/user_id, không theo CDN URL, nên không
+    import được vào content-addressed store; chúng chỉ chiếm disk ngoài budget.
+    Sau lần chạy đầu chỉ còn cache root nên chi phí là một lần iterdir.
+
+    Args:
+        media_dir: Thư mục media (parent của cache root)
+        cache_root: Cache root (được giữ lại)
+        logger: Structured logger
+
+    Returns:
+        Số thư mục đã xoá
+    """
+    removed = 0
+    try:
+        children = list(Path(media_dir).iterdir())
+    except OSError:
+        return 0
+    for path in children:
+        if path == Path(cache_root) or not path.is_dir() or path.is_symlink():
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+
+    if removed:
+        logger.log_step(
+            step="MEDIA_CACHE_REMOVE_LEGACY",
+            result="SUCCESS",
+            removed_dirs=removed,
+            media_dir=str(media_dir)
+        )
+    return removed
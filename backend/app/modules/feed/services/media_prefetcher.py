@@ -0,0 +1,236 @@
+"""
+Media prefetcher for feed items.
+
+Background pipeline that downloads media and avatars of freshly fetched feed
+items into the media cache and pre-generates the standard thumbnails, so the
+first scroll through a feed is served from local disk.
+"""
+
+# Standard library
+import os
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+# Third-party
+import httpx
+
+# Local
+from services.logger import StructuredLogger
+
+# Thumbnail sizes FeedExplorer yêu cầu (getMediaUrl / getAvatarUrl 'thumbnail')
+MEDIA_THUMBNAIL_SIZES: Tuple[Tuple[int, int], ...] = ((200, 200),)
+AVATAR_THUMBNAIL_SIZES: Tuple[Tuple[int, int], ...] = ((56, 56),)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class PrefetchJob:
+    """One URL to prefetch."""
+    kind: str  # "media" | "avatar"
+    url: str
+    post_id: Optional[str] = None
+    index: int = 0
+    user_id: Optional[str] = None
+
+
+def _field(item: Any, name: str) -> Any:
+    """Đọc field từ FeedItem (pydantic) hoặc dict."""
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def build_prefetch_jobs(feed_items: Iterable[Any]) -> List[PrefetchJob]:
+    """
+    Build danh sách jobs (dedup theo URL) từ feed items.
+
+    Args:
+        feed_items: FeedItem objects hoặc dicts
+
+    Returns:
+        List of PrefetchJob
+    """
+    jobs: List[PrefetchJob] = []
+    seen: Set[str] = set()
+
+    for item in feed_items:
+        post_id = _field(item, "post_id")
+        for index, url in enumerate(_field(item, "media_urls") or []):
+            if isinstance(url, str) and url.startswith("https://") and url not in seen:
+                seen.add(url)
+                jobs.append(PrefetchJob(kind="media", url=url, post_id=post_id, index=index))
+
+        avatar_url = _field(item, "user_avatar_url")
+        user_id = _field(item, "user_id")
+        if avatar_url and user_id and avatar_url.startswith("https://") and avatar_url not in seen:
+            seen.add(avatar_url)
+            jobs.append(PrefetchJob(kind="avatar", url=avatar_url, user_id=user_id))
+
+    return jobs
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Lỗi mạng/timeout/5xx/429 thì retry; 4xx khác và file quá lớn thì không."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, httpx.TransportError)
+
+
+class MediaPrefetcher:
+    """
+    Bounded-concurrency prefetch pipeline.
+
+    - Giới hạn tổng (`concurrency`) và theo host (`per_host_limit`)
+    - Retry với exponential backoff cho lỗi tạm thời
+    - Dedup: URL đã có trong media cache hoặc đang được fetch thì không tải lại
+      (MediaService coalesce theo content key)
+    - Pre-generate thumbnail sizes chuẩn sau khi tải bản gốc
+    """
+
+    def __init__(
+        self,
+        media_service_factory: Callable[[], Any],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        logger: Optional[StructuredLogger] = None
+    ):
+        """
+        Initialize prefetcher.
+
+        Args:
+            media_service_factory: Trả về MediaService dùng chung (lazy)
+            concurrency: Số downloads đồng thời tối đa
+            per_host_limit: Số downloads đồng thời tối đa mỗi host
+            max_attempts: Số lần thử mỗi URL
+            backoff_seconds: Delay cơ sở giữa các lần retry (nhân đôi mỗi lần)
+            logger: Structured logger (optional)
+        """
+        self._media_service_factory = media_service_factory
+        self.concurrency = max(1, concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.logger = logger or StructuredLogger(name="media_prefetcher")
+
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Set["asyncio.Task"] = set()
+
+    @classmethod
+    def from_env(cls, media_service_factory: Callable[[], Any]) -> Optional["MediaPrefetcher"]:
+        """
+        Tạo prefetcher nếu MEDIA_PREFETCH_ENABLED bật, None nếu tắt.
+
+        Env: MEDIA_PREFETCH_CONCURRENCY, MEDIA_PREFETCH_PER_HOST
+        """
+        enabled = os.getenv("MEDIA_PREFETCH_ENABLED", "").strip().lower()
+        if enabled not in ("1", "true", "yes", "on"):
+            return None
+        return cls(
+            media_service_factory,
+            concurrency=int(os.getenv("MEDIA_PREFETCH_CONCURRENCY", str(DEFAULT_CONCURRENCY))),
+            per_host_limit=int(os.getenv("MEDIA_PREFETCH_PER_HOST", str(DEFAULT_PER_HOST_LIMIT)))
+        )
+
+    def schedule(self, feed_items: Iterable[Any]) -> Optional["asyncio.Task"]:
+        """
+        Chạy prefetch ở background cho feed items (không block request).
+
+        Returns:
+            asyncio.Task, hoặc None nếu không có gì để tải
+        """
+        jobs = build_prefetch_jobs(feed_items)
+        if not jobs:
+            return None
+
+        task = asyncio.ensure_future(self.run(jobs))
+        # Giữ reference tới khi xong (tránh task bị GC giữa chừng)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def run(self, jobs: List[PrefetchJob]) -> Dict[str, int]:
+        """
+        Prefetch toàn bộ jobs.
+
+        Returns:
+            Dict counters: downloaded, failed
+        """
+        media_service = self._media_service_factory()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._run_job(media_service, semaphore, job) for job in jobs)
+        )
+
+        stats = {
+            "downloaded": sum(1 for ok in results if ok),
+            "failed": sum(1 for ok in results if not ok),
+        }
+        self.logger.log_step(
+            step="MEDIA_PREFETCH",
+            result="SUCCESS" if not stats["failed"] else "PARTIAL",
+            jobs=len(jobs),
+            **stats
+        )
+        return stats
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def _run_job(self, media_service: Any, semaphore: asyncio.Semaphore, job: PrefetchJob) -> bool:
+        """Download (retry/backoff) + thumbnails cho một job. Trả về True nếu thành công."""
+        max_size = media_service.max_image_size if job.kind == "avatar" else None
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                async with semaphore, self._host_semaphore(job.url):
+                    entry = await media_service._download_to_cache(job.url, max_size=max_size)
+                break
+            except Exception as e:
+                if attempt >= self.max_attempts or not _is_retryable(e):
+                    self.logger.log_step(
+                        step="MEDIA_PREFETCH_JOB",
+                        result="ERROR",
+                        error=str(e),
+                        error_type=type(e).__name__,
+                        kind=job.kind,
+                        attempts=attempt,
+                        post_id=job.post_id,
+                        user_id=job.user_id
+                    )
+                    return False
+                await asyncio.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+
+        if job.kind == "media":
+            media_service.cache.set_alias(("media", job.post_id, job.index, ""), entry.key)
+
+        if not entry.content_type.startswith("image/"):
+            return True
+
+        sizes = MEDIA_THUMBNAIL_SIZES if job.kind == "media" else AVATAR_THUMBNAIL_SIZES
+        for width, height in sizes:
+            variant, image_format = media_service._thumbnail_variant(width, height, None)
+            thumbnail = await media_service._resize_cached(
+                entry, job.url, variant, width, height, image_format,
+                step="PREFETCH_THUMBNAIL", kind=job.kind, post_id=job.post_id, user_id=job.user_id
+            )
+            if job.kind == "media":
+                media_service.cache.set_alias(
+                    ("media", job.post_id, job.index, variant),
+                    (thumbnail or entry).key
+                )
+
+        return True
@@ -7,19 +7,191 @@ Handles downloading, caching, and serving media from Instagram CDN.
 # Standard library
 import os
 import json
+import uuid
+import asyncio
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Tuple
 from urllib.parse import urlparse
 
 # Third-party
 import httpx
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 # Local
 from services.logger import StructuredLogger
 from services.storage.feed_storage import FeedStorage
 from config.storage_config_loader import get_storage_config_from_env
+from backend.app.modules.feed.services.media_cache import MediaCache, CacheEntry, remove_legacy_media_dirs
+
+# Pillow decode/resize/encode nhả GIL -> thread pool đủ để chạy song song, ngoài event loop
+RESIZE_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Download được stream xuống file tạm theo từng chunk rồi rename atomic
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Disk budget mặc định của media cache (override: MEDIA_CACHE_MAX_MB)
+DEFAULT_MEDIA_CACHE_MAX_MB = 2048
+
+# Connection pool của HTTP client (download + proxy)
+PROXY_MAX_CONNECTIONS = 100
+PROXY_MAX_KEEPALIVE_CONNECTIONS = 20
+PROXY_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Thời gian tối đa request chờ fetch đang chạy của request khác cùng URL
+PROXY_FOLLOWER_TIMEOUT_SECONDS = 30.0
+
+# Hosts được proxy (và ghi vào media cache): CDN của Threads/Instagram và subdomains
+PROXY_ALLOWED_HOST_SUFFIXES = ("cdninstagram.com", "fbcdn.net")
+
+# Response headers upstream được chuyển tiếp khi proxy (Range/206)
+PROXY_PASSTHROUGH_HEADERS = ("content-length", "content-range", "accept-ranges", "last-modified")
+
+# Format transcode thumbnail hỗ trợ (MEDIA_THUMBNAIL_FORMAT); "" = giữ format gốc
+THUMBNAIL_FORMATS = ("webp", "avif")
+
+
+def is_proxy_allowed_url(url: str) -> bool:
+    """URL HTTPS thuộc CDN Threads/Instagram (PROXY_ALLOWED_HOST_SUFFIXES)."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    return parsed.scheme == "https" and any(
+        host == suffix or host.endswith(f".{suffix}") for suffix in PROXY_ALLOWED_HOST_SUFFIXES
+    )
+
+
+async def _primed(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Chạy generator tới `yield b""` đầu tiên (bên trong try) trước khi trả response.
+
+    Từ đó `finally` của generator luôn chạy: khi stream xong, khi client ngắt,
+    hoặc khi response không bao giờ được gửi (asyncio aclose() generator bị GC).
+    """
+    await body.__anext__()
+    return body
+
+
+def _http2_available() -> bool:
+    """HTTP/2 cần package `h2` (httpx[http2]); thiếu thì dùng HTTP/1.1 keep-alive."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _pillow_supports(feature: str) -> bool:
+    """Pillow có encoder cho format (webp/avif) không."""
+    try:
+        from PIL import features
+        return bool(features.check(feature))
+    except Exception:
+        return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """So khớp If-None-Match (list ETags, weak/strong, hoặc "*") với ETag."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _resize_image_file(
+    source_path: Path,
+    resized_path: Path,
+    width: Optional[int],
+    height: Optional[int],
+    image_format: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Resize image bằng Pillow (blocking - chạy trong worker thread).
+    
+    Ghi ra file tạm cùng thư mục rồi os.replace(), nên request khác không
+    bao giờ đọc được file resize ghi dở.
+    
+    Args:
+        source_path: Path to original image
+        resized_path: Target path for resized image
+        width: Target width (pixels)
+        height: Target height (pixels)
+        image_format: Output format ("WEBP"/"AVIF"); None = theo format gốc
+    
+    Returns:
+        Dict với path/original_size/resized_size, hoặc None nếu không cần resize
+    
+    Raises:
+        ImportError: Nếu chưa cài Pillow
+    """
+    from PIL import Image
+    
+    with Image.open(source_path) as img:
+        # Get original dimensions
+        orig_width, orig_height = img.size
+        
+        # Calculate target dimensions maintaining aspect ratio
+        if width and height:
+            # Both specified - maintain aspect ratio, fit within bounds
+            ratio = min(width / orig_width, height / orig_height)
+            target_width = int(orig_width * ratio)
+            target_height = int(orig_height * ratio)
+        elif width:
+            # Only width specified
+            ratio = width / orig_width
+            target_width = width
+            target_height = int(orig_height * ratio)
+        elif height:
+            # Only height specified
+            ratio = height / orig_height
+            target_width = int(orig_width * ratio)
+            target_height = height
+        else:
+            # No resize needed
+            return None
+        
+        # Don't upscale - only resize if smaller
+        if target_width >= orig_width and target_height >= orig_height:
+            return None
+        
+        # Resize image (use LANCZOS for better quality)
+        resized_img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+    
+    resized_path.parent.mkdir(parents=True, exist_ok=True, mode=0o755)
+    
+    # Determine format
+    suffix = source_path.suffix.lower()
+    if image_format in ('WEBP', 'AVIF'):
+        save_args = (image_format, {'quality': 80})
+    elif suffix in ['.jpg', '.jpeg']:
+        save_args = ('JPEG', {'quality': 85, 'optimize': True})
+    elif suffix == '.png':
+        save_args = ('PNG', {'optimize': True})
+    elif suffix == '.webp':
+        save_args = ('WEBP', {'quality': 85, 'method': 6})
+    else:
+        # Default to JPEG
+        resized_path = resized_path.with_suffix('.jpg')
+        save_args = ('JPEG', {'quality': 85, 'optimize': True})
+        if resized_img.mode not in ('RGB', 'L'):
+            resized_img = resized_img.convert('RGB')
+    
+    image_format, options = save_args
+    tmp_path = resized_path.with_name(f".{resized_path.name}.{uuid.uuid4().hex}.part")
+    try:
+        resized_img.save(tmp_path, image_format, **options)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, resized_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    
+    return {
+        "path": resized_path,
+        "original_size": f"{orig_width}x{orig_height}",
+        "resized_size": f"{target_width}x{target_height}",
+    }
 
 
 class MediaService:
@@ -35,123 +207,159 @@ class MediaService:
         Initialize media service.
         
         Args:
-            feed_storage: FeedStorage instance. If None, creates new instance.
+            feed_storage: FeedStorage instance. If None, created on first lookup
+                (proxy_media không cần MySQL, chỉ dùng media cache + HTTP client).
         """
         self.logger = StructuredLogger(name="media_service")
-        
-        # Initialize feed storage
-        if feed_storage:
-            self.feed_storage = feed_storage
-        else:
-            try:
-                storage_config = get_storage_config_from_env()
-                mysql_config = storage_config.mysql
-                self.feed_storage = FeedStorage(
-                    host=mysql_config.host,
-                    port=mysql_config.port,
-                    user=mysql_config.user,
-                    password=mysql_config.password,
-                    database=mysql_config.database,
-                    charset=mysql_config.charset,
-                    logger=self.logger
-                )
-            except Exception as e:
-                self.logger.log_step(
-                    step="INIT_MEDIA_SERVICE",
-                    result="ERROR",
-                    error=f"Failed to initialize FeedStorage: {str(e)}"
-                )
-                raise
+        self._feed_storage = feed_storage
         
         # Media storage directory
         self.media_dir = Path("./media")
         self.media_dir.mkdir(exist_ok=True, mode=0o755)
         
+        # Content-addressed cache (disk budget + LRU); index được rebuild một lần ở đây
+        cache_max_mb = int(os.getenv("MEDIA_CACHE_MAX_MB", str(DEFAULT_MEDIA_CACHE_MAX_MB)))
+        remove_legacy_media_dirs(self.media_dir, self.media_dir / "cache", self.logger)
+        self.cache = MediaCache(
+            self.media_dir / "cache",
+            max_bytes=cache_max_mb * 1024 * 1024,
+            logger=self.logger
+        )
+        
+        # Thumbnail transcode (webp/avif) khi client Accept format đó
+        thumbnail_format = os.getenv("MEDIA_THUMBNAIL_FORMAT", "").strip().lower()
+        self.thumbnail_format = thumbnail_format if thumbnail_format in THUMBNAIL_FORMATS else ""
+        if self.thumbnail_format == "avif" and not _pillow_supports("avif"):
+            self.logger.log_step(
+                step="INIT_MEDIA_SERVICE",
+                result="WARNING",
+                error="Pillow built without AVIF support, using WebP thumbnails"
+            )
+            self.thumbnail_format = "webp"
+        
         # Max file sizes (bytes)
         self.max_image_size = 10 * 1024 * 1024  # 10MB
         self.max_video_size = 50 * 1024 * 1024  # 50MB
         
-        # HTTP client for downloads
+        # HTTP client for downloads/proxy: dùng chung, keep-alive, HTTP/2 nếu có `h2`
         self.client = httpx.AsyncClient(
             timeout=30.0,
             follow_redirects=True,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=PROXY_MAX_CONNECTIONS,
+                max_keepalive_connections=PROXY_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=PROXY_KEEPALIVE_EXPIRY_SECONDS
+            ),
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 "Referer": "https://www.threads.net/",
                 "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
             }
         )
-    
-    def _get_media_path(self, post_id: str, index: int, extension: Optional[str] = None) -> Path:
-        """
-        Get filesystem path for media file.
-        
-        Args:
-            post_id: Post ID
-            index: Media index (0-based)
-            extension: File extension (e.g., 'jpg', 'png'). If None, will be detected.
         
-        Returns:
-            Path object for media file
-        """
-        # Sanitize post_id to prevent path traversal
-        safe_post_id = self._sanitize_path_component(post_id)
-        
-        # Create post directory
-        post_dir = self.media_dir / safe_post_id
-        post_dir.mkdir(exist_ok=True, mode=0o755)
-        
-        # Build filename
-        if extension:
-            filename = f"{index}.{extension}"
-        else:
-            filename = str(index)
+        # Resize chạy trong bounded thread pool (không block event loop)
+        self._resize_executor = ThreadPoolExecutor(
+            max_workers=RESIZE_MAX_WORKERS,
+            thread_name_prefix="media-resize"
+        )
         
-        return post_dir / filename
+        # Request coalescing: key -> task đang chạy (download/resize cùng file dùng chung)
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
     
-    def _get_avatar_path(self, user_id: str, extension: Optional[str] = None) -> Path:
+    @property
+    def feed_storage(self) -> FeedStorage:
+        """FeedStorage cho lookup media/avatar URL (lazy init)."""
+        if self._feed_storage is None:
+            try:
+                storage_config = get_storage_config_from_env()
+                mysql_config = storage_config.mysql
+                self._feed_storage = FeedStorage(
+                    host=mysql_config.host,
+                    port=mysql_config.port,
+                    user=mysql_config.user,
+                    password=mysql_config.password,
+                    database=mysql_config.database,
+                    charset=mysql_config.charset,
+                    logger=self.logger
+                )
+            except Exception as e:
+                self.logger.log_step(
+                    step="INIT_MEDIA_SERVICE",
+                    result="ERROR",
+                    error=f"Failed to initialize FeedStorage: {str(e)}"
+                )
+                raise
+        return self._feed_storage
+    
+    async def _coalesce(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
         """
-        Get filesystem path for avatar file.
+        Chạy `factory()` một lần cho mỗi key đang in-flight.
         
-        Args:
-            user_id: User ID
-            extension: File extension. If None, will be detected.
-        
-        Returns:
-            Path object for avatar file
+        Các request đồng thời cùng key await chung một task. Task được shield
+        nên client disconnect không huỷ job của các request khác.
         """
-        # Sanitize user_id to prevent path traversal
-        safe_user_id = self._sanitize_path_component(user_id)
-        
-        # Create avatars directory
-        avatars_dir = self.media_dir / "avatars"
-        avatars_dir.mkdir(exist_ok=True, mode=0o755)
-        
-        # Build filename
-        if extension:
-            filename = f"{safe_user_id}.{extension}"
-        else:
-            filename = safe_user_id
-        
-        return avatars_dir / filename
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
     
-    def _sanitize_path_component(self, component: str) -> str:
+    async def _stream_to_file(
+        self,
+        cdn_url: str,
+        path_for_extension: Callable[[str], Path],
+        max_size: Optional[int] = None
+    ) -> Tuple[Path, str, int]:
         """
-        Sanitize path component to prevent directory traversal.
+        Stream download xuống file tạm theo chunk, rồi rename atomic.
         
         Args:
-            component: Path component to sanitize
+            cdn_url: CDN URL to download from
+            path_for_extension: Build target path từ extension đã detect
+            max_size: Giới hạn size (None = theo content-type: image/video)
         
         Returns:
-            Sanitized path component
+            Tuple of (file_path, content_type, size)
+        
+        Raises:
+            httpx.HTTPStatusError / httpx.TimeoutException: Lỗi download
+            ValueError: File vượt quá giới hạn size
         """
-        # Remove any path separators
-        sanitized = component.replace("/", "_").replace("\\", "_")
-        # Remove any other dangerous characters
-        sanitized = "".join(c for c in sanitized if c.isalnum() or c in "._-")
-        # Limit length
-        sanitized = sanitized[:255]
-        return sanitized
+        async with self.client.stream("GET", cdn_url) as response:
+            response.raise_for_status()
+            headers = dict(response.headers)
+            
+            if max_size is None:
+                max_size = self.max_video_size if 'video' in headers.get('content-type', '') else self.max_image_size
+            
+            # Check content length
+            content_length = headers.get('content-length')
+            if content_length and int(content_length) > max_size:
+                raise ValueError(f"File too large: {content_length} bytes")
+            
+            # Detect content type and extension
+            content_type, extension = self._detect_content_type(cdn_url, headers)
+            file_path = path_for_extension(extension)
+            file_path.parent.mkdir(parents=True, exist_ok=True, mode=0o755)
+            
+            tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.part")
+            size = 0
+            try:
+                with open(tmp_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_size:
+                            raise ValueError(f"File too large: more than {max_size} bytes")
+                        f.write(chunk)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, file_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+        
+        return file_path, content_type, size
     
     def _detect_extension_from_url(self, url: str) -> str:
         """
@@ -241,8 +449,9 @@ class MediaService:
             Media URL or None if not found
         """
         try:
-            # Query database for media_urls
-            result = self.feed_storage.get_feed_items(
+            # Query database for media_urls (blocking I/O -> worker thread)
+            result = await asyncio.to_thread(
+                self.feed_storage.get_feed_items,
                 post_id=post_id,
                 limit=1
             )
@@ -303,38 +512,42 @@ class MediaService:
         Returns:
             Avatar URL or None if not found
         """
-        try:
-            # Query database for user_avatar_url
-            result = self.feed_storage.get_feed_items(
-                limit=100  # Get recent items
-            )
-            
-            items = result.get("items", [])
-            for item in items:
-                if item.get("user_id") == user_id:
-                    avatar_url = item.get("user_avatar_url")
-                    if avatar_url:
-                        return avatar_url
-            
+        # FeedStorage: LRU cache + indexed lookup trên user_profiles (sync pymysql -> thread)
+        avatar_url = await asyncio.to_thread(self.feed_storage.get_avatar_url, user_id)
+        if not avatar_url:
             self.logger.log_step(
                 step="GET_AVATAR_URL",
                 result="NOT_FOUND",
                 user_id=user_id
             )
-            return None
-            
-        except Exception as e:
-            self.logger.log_step(
-                step="GET_AVATAR_URL",
-                result="ERROR",
-                error=str(e),
-                user_id=user_id
+        return avatar_url
+    
+    async def _download_to_cache(self, cdn_url: str, max_size: Optional[int] = None) -> CacheEntry:
+        """
+        Download CDN URL vào content-addressed cache (coalesce theo URL).
+        
+        Raises:
+            httpx.HTTPStatusError / httpx.TimeoutException: Lỗi download
+            ValueError: File vượt quá giới hạn size
+        """
+        key = MediaCache.make_key(cdn_url)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry
+        
+        async def fetch() -> CacheEntry:
+            file_path, _, _ = await self._stream_to_file(
+                cdn_url,
+                lambda extension: self.cache.blob_path(key, extension),
+                max_size=max_size
             )
-            return None
+            return self.cache.put(key, file_path)
+        
+        return await self._coalesce(("download", key), fetch)
     
-    async def download_media(self, post_id: str, index: int, cdn_url: str) -> Optional[Path]:
+    async def download_media(self, post_id: str, index: int, cdn_url: str) -> Optional[CacheEntry]:
         """
-        Download media from CDN and save to filesystem.
+        Download media from CDN into the media cache.
         
         Args:
             post_id: Post ID
@@ -342,7 +555,7 @@ class MediaService:
             cdn_url: CDN URL to download from
         
         Returns:
-            Path to downloaded file or None if download failed
+            CacheEntry of downloaded file or None if download failed
         """
         try:
             self.logger.log_step(
@@ -353,50 +566,19 @@ class MediaService:
                 url_length=len(cdn_url)
             )
             
-            # Download media
-            response = await self.client.get(cdn_url)
-            response.raise_for_status()
-            
-            # Check content length
-            content_length = response.headers.get('content-length')
-            if content_length:
-                size = int(content_length)
-                max_size = self.max_video_size if 'video' in response.headers.get('content-type', '') else self.max_image_size
-                if size > max_size:
-                    self.logger.log_step(
-                        step="DOWNLOAD_MEDIA",
-                        result="ERROR",
-                        error=f"File too large: {size} bytes",
-                        post_id=post_id,
-                        index=index
-                    )
-                    return None
-            
-            # Detect content type and extension
-            content_type, extension = self._detect_content_type(cdn_url, dict(response.headers))
-            
-            # Get file path
-            file_path = self._get_media_path(post_id, index, extension)
-            
-            # Save to filesystem
-            file_path.parent.mkdir(parents=True, exist_ok=True, mode=0o755)
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            # Set file permissions
-            os.chmod(file_path, 0o644)
+            entry = await self._download_to_cache(cdn_url)
             
             self.logger.log_step(
                 step="DOWNLOAD_MEDIA",
                 result="SUCCESS",
                 post_id=post_id,
                 index=index,
-                file_path=str(file_path),
-                content_type=content_type,
-                size=len(response.content)
+                file_path=str(entry.path),
+                content_type=entry.content_type,
+                size=entry.size
             )
             
-            return file_path
+            return entry
             
         except httpx.HTTPStatusError as e:
             self.logger.log_step(
@@ -426,16 +608,16 @@ class MediaService:
             )
             return None
     
-    async def download_avatar(self, user_id: str, cdn_url: str) -> Optional[Path]:
+    async def download_avatar(self, user_id: str, cdn_url: str) -> Optional[CacheEntry]:
         """
-        Download avatar from CDN and save to filesystem.
+        Download avatar from CDN into the media cache.
         
         Args:
             user_id: User ID
             cdn_url: CDN URL to download from
         
         Returns:
-            Path to downloaded file or None if download failed
+            CacheEntry of downloaded file or None if download failed
         """
         try:
             self.logger.log_step(
@@ -445,47 +627,18 @@ class MediaService:
                 url_length=len(cdn_url)
             )
             
-            # Download avatar
-            response = await self.client.get(cdn_url)
-            response.raise_for_status()
-            
-            # Check content length
-            content_length = response.headers.get('content-length')
-            if content_length:
-                size = int(content_length)
-                if size > self.max_image_size:
-                    self.logger.log_step(
-                        step="DOWNLOAD_AVATAR",
-                        result="ERROR",
-                        error=f"File too large: {size} bytes",
-                        user_id=user_id
-                    )
-                    return None
-            
-            # Detect content type and extension
-            content_type, extension = self._detect_content_type(cdn_url, dict(response.headers))
-            
-            # Get file path
-            file_path = self._get_avatar_path(user_id, extension)
-            
-            # Save to filesystem
-            file_path.parent.mkdir(parents=True, exist_ok=True, mode=0o755)
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            # Set file permissions
-            os.chmod(file_path, 0o644)
+            entry = await self._download_to_cache(cdn_url, max_size=self.max_image_size)
             
             self.logger.log_step(
                 step="DOWNLOAD_AVATAR",
                 result="SUCCESS",
                 user_id=user_id,
-                file_path=str(file_path),
-                content_type=content_type,
-                size=len(response.content)
+                file_path=str(entry.path),
+                content_type=entry.content_type,
+                size=entry.size
             )
             
-            return file_path
+            return entry
             
         except httpx.HTTPStatusError as e:
             self.logger.log_step(
@@ -511,167 +664,187 @@ class MediaService:
             )
             return None
     
-    def _get_resized_path(
+    def _thumbnail_variant(
         self,
-        post_id: str,
-        index: int,
         width: Optional[int],
-        height: Optional[int]
-    ) -> Optional[Path]:
+        height: Optional[int],
+        accept: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
         """
-        Get path for resized image.
-        
-        Args:
-            post_id: Post ID
-            index: Media index
-            width: Width in pixels
-            height: Height in pixels
+        Build variant name và output format cho thumbnail.
         
         Returns:
-            Path to resized image or None if original not found
+            Tuple of (variant, image_format). variant "" = file gốc;
+            image_format None = giữ format gốc
         """
-        # Get original path to determine extension
-        original_path = None
-        for ext in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-            test_path = self._get_media_path(post_id, index, ext)
-            if test_path.exists():
-                original_path = test_path
-                break
-        
-        if not original_path:
-            return None
-        
-        # Build resized filename: {index}_w{width}_h{height}.{ext}
-        width_str = f"w{width}" if width else ""
-        height_str = f"h{height}" if height else ""
-        size_suffix = f"_{width_str}_{height_str}".strip('_')
-        
-        resized_filename = f"{index}_{size_suffix}{original_path.suffix}"
-        return original_path.parent / resized_filename
+        if not (width or height):
+            return "", None
+        
+        variant = f"w{width or ''}_h{height or ''}"
+        fmt = self.thumbnail_format
+        if fmt and (accept is None or f"image/{fmt}" in accept):
+            return f"{variant}_{fmt}", fmt.upper()
+        return variant, None
     
-    async def _resize_image(
+    async def _run_resize(
         self,
-        image_path: Path,
-        post_id: str,
-        index: int,
+        source_path: Path,
+        resized_path: Path,
         width: Optional[int],
-        height: Optional[int]
-    ) -> Optional[Path]:
+        height: Optional[int],
+        image_format: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
-        Resize image using Pillow and cache result.
+        Resize trong worker pool; request đồng thời cùng thumbnail dùng chung một job.
         
-        Args:
-            image_path: Path to original image
-            post_id: Post ID
-            index: Media index
-            width: Target width (pixels)
-            height: Target height (pixels)
+        Returns:
+            Kết quả của `_resize_image_file` (None nếu không cần resize)
+        """
+        loop = asyncio.get_running_loop()
+        return await self._coalesce(
+            ("resize", str(resized_path)),
+            lambda: loop.run_in_executor(
+                self._resize_executor,
+                _resize_image_file,
+                source_path,
+                resized_path,
+                width,
+                height,
+                image_format
+            )
+        )
+    
+    async def _resize_cached(
+        self,
+        source: CacheEntry,
+        cdn_url: str,
+        variant: str,
+        width: Optional[int],
+        height: Optional[int],
+        image_format: Optional[str],
+        step: str,
+        **log_fields
+    ) -> Optional[CacheEntry]:
+        """
+        Lấy thumbnail variant từ cache, resize (off-loop) nếu chưa có.
         
         Returns:
-            Path to resized image or None if failed
+            CacheEntry của thumbnail, hoặc None nếu không cần resize / lỗi
         """
+        key = MediaCache.make_key(cdn_url, variant)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry
+        
         try:
-            # Try to import Pillow
-            try:
-                from PIL import Image
-            except ImportError:
-                self.logger.log_step(
-                    step="RESIZE_IMAGE",
-                    result="ERROR",
-                    error="Pillow not installed. Install with: pip install Pillow",
-                    post_id=post_id,
-                    index=index
-                )
+            extension = image_format.lower() if image_format else source.path.suffix.lstrip('.')
+            result = await self._run_resize(
+                source.path,
+                self.cache.blob_path(key, extension),
+                width,
+                height,
+                image_format
+            )
+            if not result:
                 return None
             
-            # Get resized path
-            resized_path = self._get_resized_path(post_id, index, width, height)
-            if not resized_path:
-                return None
+            entry = self.cache.put(key, result["path"])
             
-            # Skip if resized version already exists
-            if resized_path.exists():
-                return resized_path
+            self.logger.log_step(
+                step=step,
+                result="SUCCESS",
+                original_size=result["original_size"],
+                resized_size=result["resized_size"],
+                file_path=str(entry.path),
+                **log_fields
+            )
             
-            # Open and resize image
-            with Image.open(image_path) as img:
-                # Get original dimensions
-                orig_width, orig_height = img.size
-                
-                # Calculate target dimensions maintaining aspect ratio
-                if width and height:
-                    # Both specified - maintain aspect ratio, fit within bounds
-                    ratio = min(width / orig_width, height / orig_height)
-                    target_width = int(orig_width * ratio)
-                    target_height = int(orig_height * ratio)
-                elif width:
-                    # Only width specified
-                    ratio = width / orig_width
-                    target_width = width
-                    target_height = int(orig_height * ratio)
-                elif height:
-                    # Only height specified
-                    ratio = height / orig_height
-                    target_width = int(orig_width * ratio)
-                    target_height = height
-                else:
-                    # No resize needed
-                    return None
-                
-                # Don't upscale - only resize if smaller
-                if target_width >= orig_width and target_height >= orig_height:
-                    return None
-                
-                # Resize image
-                resized_img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
-                
-                # Save resized image
-                resized_path.parent.mkdir(parents=True, exist_ok=True, mode=0o755)
-                
-                # Determine format and save
-                if image_path.suffix.lower() in ['.jpg', '.jpeg']:
-                    resized_img.save(resized_path, 'JPEG', quality=85, optimize=True)
-                elif image_path.suffix.lower() == '.png':
-                    resized_img.save(resized_path, 'PNG', optimize=True)
-                elif image_path.suffix.lower() == '.webp':
-                    resized_img.save(resized_path, 'WEBP', quality=85, method=6)
-                else:
-                    # Default to JPEG
-                    resized_path = resized_path.with_suffix('.jpg')
-                    resized_img.save(resized_path, 'JPEG', quality=85, optimize=True)
-                
-                # Set file permissions
-                os.chmod(resized_path, 0o644)
-                
-                self.logger.log_step(
-                    step="RESIZE_IMAGE",
-                    result="SUCCESS",
-                    post_id=post_id,
-                    index=index,
-                    original_size=f"{orig_width}x{orig_height}",
-                    resized_size=f"{target_width}x{target_height}",
-                    file_path=str(resized_path)
-                )
-                
-                return resized_path
-                
+            return entry
+            
+        except ImportError:
+            self.logger.log_step(
+                step=step,
+                result="ERROR",
+                error="Pillow not installed. Install with: pip install Pillow",
+                **log_fields
+            )
+            return None
         except Exception as e:
             self.logger.log_step(
-                step="RESIZE_IMAGE",
+                step=step,
                 result="ERROR",
                 error=str(e),
-                post_id=post_id,
-                index=index
+                **log_fields
             )
             return None
     
+    def _cached_response(
+        self,
+        entry: CacheEntry,
+        if_none_match: Optional[str] = None,
+        vary_accept: bool = False
+    ) -> Response:
+        """
+        Build response cho cached blob (304 nếu If-None-Match khớp ETag).
+        
+        Raises:
+            FileNotFoundError: Blob đã bị xoá ngoài cache (entry được discard,
+                caller fetch lại)
+        """
+        headers = {
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET',
+            'Access-Control-Allow-Headers': '*',
+            'Cache-Control': 'public, max-age=3600',
+            'ETag': entry.etag,
+        }
+        if vary_accept:
+            headers['Vary'] = 'Accept'
+        
+        if if_none_match and _etag_matches(if_none_match, entry.etag):
+            return Response(status_code=304, headers=headers)
+        
+        try:
+            stat_result = os.stat(entry.path)
+        except FileNotFoundError:
+            self.cache.discard(entry.key)
+            raise
+        
+        return FileResponse(
+            path=entry.path,
+            media_type=entry.content_type,
+            headers=headers,
+            stat_result=stat_result
+        )
+    
+    async def _serve_resolved(
+        self,
+        resolve: Callable[[], Awaitable[CacheEntry]],
+        if_none_match: Optional[str],
+        vary_accept: bool
+    ) -> Tuple[CacheEntry, Response]:
+        """
+        Resolve entry (download/resize nếu cần) rồi build response.
+        
+        Blob bị xoá ngoài cache (vd. process khác dùng chung thư mục evict) đã
+        được discard trong _cached_response: resolve lại một lần để tải lại.
+        """
+        entry = await resolve()
+        try:
+            return entry, self._cached_response(entry, if_none_match, vary_accept)
+        except FileNotFoundError:
+            entry = await resolve()
+            return entry, self._cached_response(entry, if_none_match, vary_accept)
+    
     async def serve_media(
         self,
         post_id: str,
         index: int,
         width: Optional[int] = None,
-        height: Optional[int] = None
-    ) -> StreamingResponse:
+        height: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Response:
         """
         Serve media file, downloading if necessary.
         
@@ -680,18 +853,32 @@ class MediaService:
             index: Media index (0-based)
             width: Optional width for thumbnail (pixels)
             height: Optional height for thumbnail (pixels)
+            if_none_match: If-None-Match request header (ETag revalidation)
+            accept: Accept request header (WebP/AVIF thumbnail negotiation)
         
         Returns:
-            StreamingResponse with media file
+            FileResponse with media file (304 Response nếu ETag khớp)
         """
         # Validate inputs
         if not post_id or not isinstance(post_id, str):
             from backend.app.core.exceptions import ValidationError
-            raise ValidationError("Invalid post_id")
+            raise ValidationError(message="Invalid post_id")
         
         if not isinstance(index, int) or index < 0:
             from backend.app.core.exceptions import ValidationError
-            raise ValidationError("Invalid index")
+            raise ValidationError(message="Invalid index")
+        
+        variant, image_format = self._thumbnail_variant(width, height, accept)
+        vary_accept = bool(variant and self.thumbnail_format)
+        
+        # Alias hit: không cần query DB hay probe filesystem
+        alias = ("media", post_id, index, variant)
+        entry = self.cache.get_alias(alias)
+        if entry is not None:
+            try:
+                return self._cached_response(entry, if_none_match, vary_accept)
+            except FileNotFoundError:
+                pass
         
         # Get media URL from database
         cdn_url = await self.get_media_url(post_id, index)
@@ -699,221 +886,32 @@ class MediaService:
             from backend.app.core.exceptions import NotFoundError
             raise NotFoundError(f"Media not found for post_id={post_id}, index={index}")
         
-        # Check if resized version exists (if width/height provided)
-        resized_path = None
-        if width or height:
-            resized_path = self._get_resized_path(post_id, index, width, height)
-            if resized_path and resized_path.exists():
-                content_type, _ = self._detect_content_type(str(resized_path))
-                return FileResponse(
-                    path=resized_path,
-                    media_type=content_type,
-                    headers={
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'GET',
-                        'Access-Control-Allow-Headers': '*',
-                        'Cache-Control': 'public, max-age=3600',
-                    }
-                )
-        
-        # Check if media is cached
-        # Try common extensions
-        cached_path = None
-        for ext in ['jpg', 'jpeg', 'png', 'gif', 'webp', 'mp4', 'mov', 'webm']:
-            test_path = self._get_media_path(post_id, index, ext)
-            if test_path.exists():
-                cached_path = test_path
-                break
-        
-        # If not cached, download
-        if not cached_path:
-            cached_path = await self.download_media(post_id, index, cdn_url)
-            if not cached_path:
+        async def resolve() -> CacheEntry:
+            # Original (download nếu chưa có trong cache)
+            original = await self.download_media(post_id, index, cdn_url)
+            if not original:
                 from backend.app.core.exceptions import InternalError
                 raise InternalError("Failed to download media")
-        
-        # If width/height provided and it's an image, resize and cache
-        if (width or height) and cached_path.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-            resized_path = await self._resize_image(cached_path, post_id, index, width, height)
-            if resized_path:
-                content_type, _ = self._detect_content_type(str(resized_path))
-                return FileResponse(
-                    path=resized_path,
-                    media_type=content_type,
-                    headers={
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'GET',
-                        'Access-Control-Allow-Headers': '*',
-                        'Cache-Control': 'public, max-age=3600',
-                    }
-                )
-        
-        # Serve original file
-        content_type, _ = self._detect_content_type(str(cached_path))
-        return FileResponse(
-            path=cached_path,
-            media_type=content_type,
-            headers={
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET',
-                'Access-Control-Allow-Headers': '*',
-                'Cache-Control': 'public, max-age=3600',
-            }
-        )
-    
-    def _get_resized_avatar_path(
-        self,
-        user_id: str,
-        width: Optional[int],
-        height: Optional[int]
-    ) -> Optional[Path]:
-        """
-        Get path for resized avatar.
-        
-        Args:
-            user_id: User ID
-            width: Width in pixels
-            height: Height in pixels
-        
-        Returns:
-            Path to resized avatar or None if original not found
-        """
-        # Get original path to determine extension
-        original_path = None
-        for ext in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-            test_path = self._get_avatar_path(user_id, ext)
-            if test_path.exists():
-                original_path = test_path
-                break
-        
-        if not original_path:
-            return None
-        
-        # Build resized filename: {user_id}_w{width}_h{height}.{ext}
-        width_str = f"w{width}" if width else ""
-        height_str = f"h{height}" if height else ""
-        size_suffix = f"_{width_str}_{height_str}".strip('_')
-        
-        resized_filename = f"{self._sanitize_path_component(user_id)}_{size_suffix}{original_path.suffix}"
-        return original_path.parent / resized_filename
-    
-    async def _resize_avatar(
-        self,
-        avatar_path: Path,
-        user_id: str,
-        width: Optional[int],
-        height: Optional[int]
-    ) -> Optional[Path]:
-        """
-        Resize avatar image using Pillow and cache result.
-        
-        Args:
-            avatar_path: Path to original avatar
-            user_id: User ID
-            width: Target width (pixels)
-            height: Target height (pixels)
-        
-        Returns:
-            Path to resized avatar or None if failed
-        """
-        try:
-            # Try to import Pillow
-            try:
-                from PIL import Image
-            except ImportError:
-                self.logger.log_step(
-                    step="RESIZE_AVATAR",
-                    result="ERROR",
-                    error="Pillow not installed. Install with: pip install Pillow",
-                    user_id=user_id
-                )
-                return None
-            
-            # Get resized path
-            resized_path = self._get_resized_avatar_path(user_id, width, height)
-            if not resized_path:
-                return None
             
-            # Skip if resized version already exists
-            if resized_path.exists():
-                return resized_path
-            
-            # Open and resize image
-            with Image.open(avatar_path) as img:
-                # Get original dimensions
-                orig_width, orig_height = img.size
-                
-                # Calculate target dimensions maintaining aspect ratio
-                if width and height:
-                    # Both specified - maintain aspect ratio, fit within bounds
-                    ratio = min(width / orig_width, height / orig_height)
-                    target_width = int(orig_width * ratio)
-                    target_height = int(orig_height * ratio)
-                elif width:
-                    # Only width specified
-                    ratio = width / orig_width
-                    target_width = width
-                    target_height = int(orig_height * ratio)
-                elif height:
-                    # Only height specified
-                    ratio = height / orig_height
-                    target_width = int(orig_width * ratio)
-                    target_height = height
-                else:
-                    # No resize needed
-                    return None
-                
-                # Don't upscale - only resize if smaller
-                if target_width >= orig_width and target_height >= orig_height:
-                    return None
-                
-                # Resize image (use LANCZOS for better quality)
-                resized_img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
-                
-                # Save resized image
-                resized_path.parent.mkdir(parents=True, exist_ok=True, mode=0o755)
-                
-                # Determine format and save
-                if avatar_path.suffix.lower() in ['.jpg', '.jpeg']:
-                    resized_img.save(resized_path, 'JPEG', quality=85, optimize=True)
-                elif avatar_path.suffix.lower() == '.png':
-                    resized_img.save(resized_path, 'PNG', optimize=True)
-                elif avatar_path.suffix.lower() == '.webp':
-                    resized_img.save(resized_path, 'WEBP', quality=85, method=6)
-                else:
-                    # Default to JPEG
-                    resized_path = resized_path.with_suffix('.jpg')
-                    resized_img.save(resized_path, 'JPEG', quality=85, optimize=True)
-                
-                # Set file permissions
-                os.chmod(resized_path, 0o644)
-                
-                self.logger.log_step(
-                    step="RESIZE_AVATAR",
-                    result="SUCCESS",
-                    user_id=user_id,
-                    original_size=f"{orig_width}x{orig_height}",
-                    resized_size=f"{target_width}x{target_height}",
-                    file_path=str(resized_path)
-                )
-                
-                return resized_path
-                
-        except Exception as e:
-            self.logger.log_step(
-                step="RESIZE_AVATAR",
-                result="ERROR",
-                error=str(e),
-                user_id=user_id
-            )
-            return None
+            if variant and original.content_type.startswith('image/'):
+                return await self._resize_cached(
+                    original, cdn_url, variant, width, height, image_format,
+                    step="RESIZE_IMAGE", post_id=post_id, index=index
+                ) or original
+            return original
+        
+        entry, response = await self._serve_resolved(resolve, if_none_match, vary_accept)
+        self.cache.set_alias(alias, entry.key)
+        return response
     
     async def serve_avatar(
         self,
         user_id: str,
         width: Optional[int] = None,
-        height: Optional[int] = None
-    ) -> StreamingResponse:
+        height: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Response:
         """
         Serve avatar file, downloading if necessary.
         
@@ -921,83 +919,237 @@ class MediaService:
             user_id: User ID
             width: Optional width for thumbnail (pixels)
             height: Optional height for thumbnail (pixels)
+            if_none_match: If-None-Match request header (ETag revalidation)
+            accept: Accept request header (WebP/AVIF thumbnail negotiation)
         
         Returns:
-            StreamingResponse with avatar file
+            FileResponse with avatar file (304 Response nếu ETag khớp)
         """
         # Validate inputs
         if not user_id or not isinstance(user_id, str):
             from backend.app.core.exceptions import ValidationError
-            raise ValidationError("Invalid user_id")
+            raise ValidationError(message="Invalid user_id")
         
-        # Get avatar URL from database
+        variant, image_format = self._thumbnail_variant(width, height, accept)
+        vary_accept = bool(variant and self.thumbnail_format)
+        
+        # Get avatar URL (LRU cache trong FeedStorage) - URL đổi thì key cache đổi theo
         cdn_url = await self.get_avatar_url(user_id)
         if not cdn_url:
             from backend.app.core.exceptions import NotFoundError
             raise NotFoundError(f"Avatar not found for user_id={user_id}")
         
-        # Check if resized version exists (if width/height provided)
-        resized_path = None
-        if width or height:
-            resized_path = self._get_resized_avatar_path(user_id, width, height)
-            if resized_path and resized_path.exists():
-                content_type, _ = self._detect_content_type(str(resized_path))
-                return FileResponse(
-                    path=resized_path,
-                    media_type=content_type,
-                    headers={
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'GET',
-                        'Access-Control-Allow-Headers': '*',
-                        'Cache-Control': 'public, max-age=3600',
-                    }
-                )
-        
-        # Check if avatar is cached
-        # Try common extensions
-        cached_path = None
-        for ext in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-            test_path = self._get_avatar_path(user_id, ext)
-            if test_path.exists():
-                cached_path = test_path
-                break
-        
-        # If not cached, download
-        if not cached_path:
-            cached_path = await self.download_avatar(user_id, cdn_url)
-            if not cached_path:
+        async def resolve() -> CacheEntry:
+            # Original (download nếu chưa có trong cache)
+            original = await self.download_avatar(user_id, cdn_url)
+            if not original:
                 from backend.app.core.exceptions import InternalError
                 raise InternalError("Failed to download avatar")
+            
+            if variant and original.content_type.startswith('image/'):
+                return await self._resize_cached(
+                    original, cdn_url, variant, width, height, image_format,
+                    step="RESIZE_AVATAR", user_id=user_id
+                ) or original
+            return original
+        
+        _, response = await self._serve_resolved(resolve, if_none_match, vary_accept)
+        return response
+    
+    async def proxy_media(
+        self,
+        url: str,
+        range_header: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ) -> Response:
+        """
+        Proxy media URL qua media cache.
+        
+        - Cache hit: serve từ disk (FileResponse hỗ trợ Range/206 và ETag)
+        - Đang có fetch cùng URL: chờ write-through đó rồi serve từ cache
+        - Range request khi miss: stream đúng range từ upstream, fill cache ở background
+        - Còn lại: stream upstream tới client theo chunk và ghi đồng thời vào cache
+        
+        Args:
+            url: HTTPS media URL trên CDN Threads/Instagram
+            range_header: Range request header (video seeking)
+            if_none_match: If-None-Match request header
         
-        # If width/height provided, resize and cache
-        if (width or height) and cached_path.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-            resized_path = await self._resize_avatar(cached_path, user_id, width, height)
-            if resized_path:
-                content_type, _ = self._detect_content_type(str(resized_path))
-                return FileResponse(
-                    path=resized_path,
-                    media_type=content_type,
-                    headers={
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'GET',
-                        'Access-Control-Allow-Headers': '*',
-                        'Cache-Control': 'public, max-age=3600',
-                    }
+        Returns:
+            Response (FileResponse / StreamingResponse / 304)
+        
+        Raises:
+            ValueError: URL không thuộc PROXY_ALLOWED_HOST_SUFFIXES
+            httpx.HTTPStatusError / httpx.TimeoutException: Lỗi upstream
+        """
+        if not is_proxy_allowed_url(url):
+            raise ValueError("Only HTTPS Threads/Instagram CDN URLs can be proxied")
+        key = MediaCache.make_key(url)
+        entry = self.cache.get(key)
+        if entry is not None:
+            try:
+                return self._cached_response(entry, if_none_match)
+            except FileNotFoundError:
+                pass
+        
+        inflight_key = ("download", key)
+        inflight = self._inflight.get(inflight_key)
+        if inflight is not None:
+            try:
+                entry = await asyncio.wait_for(asyncio.shield(inflight), PROXY_FOLLOWER_TIMEOUT_SECONDS)
+            except Exception:
+                # Fetch của leader lỗi/bị huỷ/không được consume -> tự download
+                if self._inflight.get(inflight_key) is inflight:
+                    self._inflight.pop(inflight_key, None)
+                entry = await self._download_to_cache(url)
+            return self._cached_response(entry, if_none_match)
+        
+        if range_header:
+            self._schedule_cache_fill(url)
+            return await self._stream_upstream(url, range_header)
+        
+        return await self._stream_and_cache(url, key)
+    
+    def _schedule_cache_fill(self, url: str) -> None:
+        """Download toàn bộ URL vào cache ở background (coalesced, lỗi chỉ log)."""
+        async def fill() -> None:
+            try:
+                await self._download_to_cache(url)
+            except Exception as e:
+                self.logger.log_step(
+                    step="PROXY_CACHE_FILL",
+                    result="ERROR",
+                    error=str(e),
+                    url_length=len(url)
                 )
         
-        # Serve original file
-        content_type, _ = self._detect_content_type(str(cached_path))
-        return FileResponse(
-            path=cached_path,
+        asyncio.ensure_future(fill())
+    
+    async def _open_upstream(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """Gửi GET (stream=True); raise trước khi response được trả cho client."""
+        request = self.client.build_request("GET", url, headers=headers)
+        response = await self.client.send(request, stream=True)
+        if not is_proxy_allowed_url(str(response.url)):
+            # Redirect ra ngoài allowlist
+            await response.aclose()
+            raise ValueError("Upstream redirected outside the media CDN allowlist")
+        if response.status_code >= 400:
+            await response.aclose()
+            response.raise_for_status()
+        return response
+    
+    def _proxy_headers(self, url: str, upstream: httpx.Response) -> Tuple[str, Dict[str, str]]:
+        """Content type + response headers (CORS, cache, passthrough Range headers)."""
+        content_type = upstream.headers.get('content-type', '')
+        if 'image' not in content_type and 'video' not in content_type:
+            content_type, _ = self._detect_content_type(url)
+        
+        headers = {
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET',
+            'Access-Control-Allow-Headers': '*',
+            'Cache-Control': 'public, max-age=3600',
+        }
+        for name in PROXY_PASSTHROUGH_HEADERS:
+            if name in upstream.headers:
+                headers[name] = upstream.headers[name]
+        return content_type, headers
+    
+    async def _stream_upstream(self, url: str, range_header: str) -> StreamingResponse:
+        """Stream một range từ upstream (không cache)."""
+        upstream = await self._open_upstream(url, headers={"Range": range_header})
+        content_type, headers = self._proxy_headers(url, upstream)
+        
+        async def body():
+            try:
+                yield b""  # _primed()
+                async for chunk in upstream.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
+            finally:
+                await upstream.aclose()
+        
+        return StreamingResponse(
+            await _primed(body()),
+            status_code=upstream.status_code,
             media_type=content_type,
-            headers={
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET',
-                'Access-Control-Allow-Headers': '*',
-                'Cache-Control': 'public, max-age=3600',
-            }
+            headers=headers
+        )
+    
+    async def _stream_and_cache(self, url: str, key: str) -> StreamingResponse:
+        """
+        Stream upstream tới client và ghi đồng thời (tee) vào cache.
+        
+        Request đồng thời cùng URL chờ future của fetch này thay vì gọi upstream lần nữa.
+        Nếu client ngắt giữa chừng hoặc file vượt giới hạn, file tạm bị bỏ và
+        future báo lỗi (các request đang chờ tự download lại). Generator được
+        _primed() nên response không được stream (client ngắt sớm, response bị
+        drop) cũng chạy finally: giải phóng future và đóng upstream.
+        """
+        inflight_key = ("download", key)
+        done: "asyncio.Future" = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = done
+        
+        try:
+            upstream = await self._open_upstream(url)
+        except BaseException as e:
+            self._inflight.pop(inflight_key, None)
+            done.set_exception(e if isinstance(e, Exception) else RuntimeError("Proxy fetch cancelled"))
+            # Không ai chờ thì tránh cảnh báo "exception was never retrieved"
+            done.exception()
+            raise
+        
+        content_type, headers = self._proxy_headers(url, upstream)
+        _, extension = self._detect_content_type(url, dict(upstream.headers))
+        max_size = self.max_video_size if content_type.startswith('video/') else self.max_image_size
+        file_path = self.cache.blob_path(key, extension)
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.part")
+        
+        async def body():
+            size = 0
+            tmp_file = None
+            try:
+                yield b""  # _primed()
+                tmp_file = open(tmp_path, 'wb')
+                async for chunk in upstream.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    if tmp_file is not None:
+                        size += len(chunk)
+                        if size > max_size:
+                            # Quá lớn để cache: tiếp tục stream nhưng bỏ file tạm
+                            tmp_file.close()
+                            tmp_file = None
+                        else:
+                            tmp_file.write(chunk)
+                    yield chunk
+                
+                if tmp_file is None:
+                    raise ValueError(f"File too large to cache: more than {max_size} bytes")
+                tmp_file.close()
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, file_path)
+                done.set_result(self.cache.put(key, file_path))
+            except BaseException as e:
+                if not done.done():
+                    done.set_exception(e if isinstance(e, Exception) else RuntimeError("Proxy stream cancelled"))
+                    done.exception()
+                if not isinstance(e, ValueError):
+                    raise
+            finally:
+                if tmp_file is not None and not tmp_file.closed:
+                    tmp_file.close()
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                if self._inflight.get(inflight_key) is done:
+                    del self._inflight[inflight_key]
+                await upstream.aclose()
+        
+        return StreamingResponse(
+            await _primed(body()),
+            status_code=upstream.status_code,
+            media_type=content_type,
+            headers=headers
         )
     
     async def close(self):
-        """Close HTTP client."""
+        """Close HTTP client and resize pool."""
         await self.client.aclose()
+        self._resize_executor.shutdown(wait=False)
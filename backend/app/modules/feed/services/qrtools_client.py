@@ -11,6 +11,13 @@ from typing import Optional, Dict, List, Any
 import httpx
 
 # Local
+from backend.app.modules.feed.services.response_cache import (
+    DEFAULT_STALE_SECONDS,
+    DEFAULT_TTL_SECONDS,
+    CacheKey,
+    ResponseCache,
+    normalize_params
+)
 from services.logger import StructuredLogger
 
 
@@ -78,6 +85,13 @@ class QrtoolsClient:
         
         self.client = httpx.AsyncClient(timeout=timeout)
         
+        # Cache responses của feed reads (mỗi lần gọi qrtools là một lần scrape bằng browser)
+        self.response_cache = ResponseCache(
+            ttl_seconds=float(os.getenv("QRTOOLS_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS))),
+            stale_seconds=float(os.getenv("QRTOOLS_CACHE_STALE_SECONDS", str(DEFAULT_STALE_SECONDS))),
+            logger=self.logger
+        )
+        
         # Log successful initialization
         self.logger.log_step(
             step="QRTOOLS_CLIENT_INIT",
@@ -130,13 +144,27 @@ class QrtoolsClient:
     # Feed Extraction Endpoints
     async def get_feed(self, filters: Optional[Dict] = None, account_id: Optional[str] = None, profile_path: Optional[str] = None) -> Dict:
         """
-        Get feed items với filters.
+        Get feed items với filters (cached, xem `response_cache`).
+        
+        Response đã được trả cho request khác (cache hit, join fetch đang chạy) có
+        `from_cache: True` để caller bỏ qua side effects đã chạy cho response đó.
         
         Args:
             filters: Feed filters
             account_id: Account ID for browser context
             profile_path: Browser profile path (client-side, optional)
         """
+        key = CacheKey("feed", account_id, profile_path, params=normalize_params(filters))
+        response, fresh = await self.response_cache.get_or_fetch_with_source(
+            key, lambda: self._fetch_feed(filters, account_id, profile_path)
+        )
+        if fresh or not isinstance(response, dict):
+            return response
+        # Copy: không sửa dict đang nằm trong cache
+        return {**response, "from_cache": True}
+    
+    async def _fetch_feed(self, filters: Optional[Dict], account_id: Optional[str], profile_path: Optional[str]) -> Dict:
+        """GET /feed (không qua cache)."""
         params = self._prepare_params(account_id=account_id, profile_path=profile_path, **(filters or {}))
         # #region agent log
         import json
@@ -174,13 +202,20 @@ class QrtoolsClient:
     
     async def get_feed_post(self, post_id: str, account_id: Optional[str] = None, profile_path: Optional[str] = None) -> Dict:
         """
-        Get một post cụ thể theo ID.
+        Get một post cụ thể theo ID (cached).
         
         Args:
             post_id: Post ID
             account_id: Account ID for browser context
             profile_path: Browser profile path (client-side, optional)
         """
+        key = CacheKey("feed_post", account_id, profile_path, resource=post_id)
+        return await self.response_cache.get_or_fetch(
+            key, lambda: self._fetch_feed_post(post_id, account_id, profile_path)
+        )
+    
+    async def _fetch_feed_post(self, post_id: str, account_id: Optional[str], profile_path: Optional[str]) -> Dict:
+        """GET /feed/{post_id} (không qua cache)."""
         params = self._prepare_params(account_id=account_id, profile_path=profile_path)
         headers = self._prepare_headers(account_id=account_id, profile_path=profile_path)
         try:
@@ -200,7 +235,7 @@ class QrtoolsClient:
     
     async def get_user_posts(self, username: str, filters: Optional[Dict] = None, account_id: Optional[str] = None, profile_path: Optional[str] = None) -> Dict:
         """
-        Get posts từ user profile.
+        Get posts từ user profile (cached).
         
         Args:
             username: Username
@@ -208,6 +243,16 @@ class QrtoolsClient:
             account_id: Account ID for browser context
             profile_path: Browser profile path (client-side, optional)
         """
+        key = CacheKey(
+            "user_posts", account_id, profile_path,
+            resource=username.lstrip('@').lower(), params=normalize_params(filters)
+        )
+        return await self.response_cache.get_or_fetch(
+            key, lambda: self._fetch_user_posts(username, filters, account_id, profile_path)
+        )
+    
+    async def _fetch_user_posts(self, username: str, filters: Optional[Dict], account_id: Optional[str], profile_path: Optional[str]) -> Dict:
+        """GET /user/{username}/posts (không qua cache)."""
         params = self._prepare_params(account_id=account_id, profile_path=profile_path, **(filters or {}))
         headers = self._prepare_headers(account_id=account_id, profile_path=profile_path)
         try:
@@ -235,8 +280,11 @@ class QrtoolsClient:
         - Query params (highest priority)
         - Request body
         - Headers (X-Account-ID, X-Profile-Path)
+        
+        Invalidate cached feed responses của account trước khi refresh.
         """
-        data = filters or {}
+        self.response_cache.invalidate(endpoint="feed", account_id=account_id)
+        data = dict(filters or {})
         if account_id:
             data['account_id'] = account_id  # Also in body for POST requests
         if profile_path:
@@ -267,6 +315,10 @@ class QrtoolsClient:
             account_id: Account ID for session isolation (optional)
             profile_path: Browser profile path (client-side, optional)
         """
+        if username:
+            self.response_cache.invalidate(endpoint="user_posts", resource=username.lstrip('@').lower())
+        else:
+            self.response_cache.invalidate(account_id=account_id)
         params = {}
         if username:
             params['username'] = username.lstrip('@')
@@ -0,0 +1,234 @@
+"""
+Response cache for Qrtools feed calls.
+
+TTL cache với single-flight (requests giống nhau đang chạy dùng chung một
+fetch) và stale-while-revalidate (entry hết TTL nhưng còn trong stale window
+được trả ngay, fetch lại ở background).
+"""
+
+# Standard library
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+# Local
+from services.logger import StructuredLogger
+
+DEFAULT_TTL_SECONDS = 30.0
+DEFAULT_STALE_SECONDS = 120.0
+DEFAULT_MAX_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Key của một response: endpoint + browser context + tham số đã normalize."""
+    endpoint: str
+    account_id: Optional[str] = None
+    profile_path: Optional[str] = None
+    resource: Optional[str] = None
+    params: str = ""
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> str:
+    """Normalize filters thành string ổn định (bỏ None, sort keys)."""
+    if not params:
+        return ""
+    cleaned = {k: v for k, v in params.items() if v is not None}
+    return json.dumps(cleaned, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class ResponseCache:
+    """
+    Async TTL cache với single-flight và stale-while-revalidate.
+
+    - Fresh (tuổi < ttl): trả từ cache
+    - Stale (ttl <= tuổi < ttl + stale): trả từ cache, revalidate ở background
+    - Quá hạn / chưa có: fetch (dùng chung với requests đang chạy cùng key)
+
+    Chỉ cache responses có `success` truthy. Invalidate bump generation nên
+    fetch đang chạy từ trước không ghi đè dữ liệu đã bị invalidate.
+
+    `get_or_fetch_with_source` cho biết response có mới từ upstream với caller
+    hay không, để side effects (auto-save, prefetch) chỉ chạy một lần mỗi fetch.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        stale_seconds: float = DEFAULT_STALE_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        logger: Optional[StructuredLogger] = None
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Thời gian entry còn fresh (0 = tắt cache, chỉ single-flight)
+            stale_seconds: Stale window sau TTL (0 = tắt stale-while-revalidate)
+            max_entries: Số entries tối đa (LRU)
+            logger: Structured logger (optional)
+        """
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.stale_seconds = max(0.0, stale_seconds)
+        self.max_entries = max(1, max_entries)
+        self.logger = logger or StructuredLogger(name="qrtools_response_cache")
+
+        # key -> (stored_at, value)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, "asyncio.Future"] = {}
+        # Entries từ background revalidate chưa được trả cho caller nào
+        self._unseen: Set[CacheKey] = set()
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Lấy response từ cache hoặc fetch (single-flight).
+
+        Args:
+            key: Cache key
+            fetch: Coroutine factory gọi Qrtools
+
+        Returns:
+            Response dict
+        """
+        value, _ = await self.get_or_fetch_with_source(key, fetch)
+        return value
+
+    async def get_or_fetch_with_source(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Như `get_or_fetch`, kèm cờ `fresh`.
+
+        `fresh` là True đúng một lần cho mỗi response mới từ upstream: với caller
+        khởi động fetch, hoặc lần đầu response của background revalidate được trả ra.
+        Cache hits và requests join fetch đang chạy nhận False.
+
+        Returns:
+            (response, fresh)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return entry[1], self._take_unseen(key)
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._entries.move_to_end(key)
+                fresh = self._take_unseen(key)
+                if key not in self._inflight:
+                    self._start_fetch(key, fetch, background=True).add_done_callback(
+                        lambda future: self._log_revalidate_error(key, future)
+                    )
+                return entry[1], fresh
+            self._drop(key)
+
+        future = self._inflight.get(key)
+        leader = future is None
+        if leader:
+            future = self._start_fetch(key, fetch)
+        # shield: một caller bị cancel không huỷ fetch của các caller khác
+        return await asyncio.shield(future), leader
+
+    def invalidate(
+        self,
+        endpoint: Optional[str] = None,
+        account_id: Optional[str] = None,
+        resource: Optional[str] = None
+    ) -> int:
+        """
+        Xoá entries khớp với các điều kiện đã cho (None = khớp tất cả).
+
+        Returns:
+            Số entries đã xoá
+        """
+        def matches(key: CacheKey) -> bool:
+            return (
+                (endpoint is None or key.endpoint == endpoint)
+                and (account_id is None or key.account_id == account_id)
+                and (resource is None or key.resource == resource)
+            )
+
+        self._generation += 1
+        removed = [key for key in self._entries if matches(key)]
+        for key in removed:
+            self._drop(key)
+        # Requests mới sau invalidate không join fetch cũ
+        for key in [key for key in self._inflight if matches(key)]:
+            del self._inflight[key]
+        return len(removed)
+
+    def clear(self) -> None:
+        """Xoá toàn bộ cache."""
+        self.invalidate()
+
+    def _start_fetch(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Awaitable[Any]],
+        background: bool = False
+    ) -> "asyncio.Future":
+        generation = self._generation
+
+        async def run() -> Any:
+            value = await fetch()
+            if (
+                self.ttl_seconds > 0
+                and generation == self._generation
+                and isinstance(value, dict)
+                and value.get("success")
+            ):
+                self._store(key, value)
+                if background:
+                    self._unseen.add(key)
+            return value
+
+        future = asyncio.ensure_future(run())
+        self._inflight[key] = future
+
+        def done(_: "asyncio.Future") -> None:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.add_done_callback(done)
+        return future
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        self._unseen.discard(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: CacheKey) -> None:
+        del self._entries[key]
+        self._unseen.discard(key)
+
+    def _take_unseen(self, key: CacheKey) -> bool:
+        """True nếu entry (từ background revalidate) được trả lần đầu."""
+        if key in self._unseen:
+            self._unseen.discard(key)
+            return True
+        return False
+
+    def _log_revalidate_error(self, key: CacheKey, future: "asyncio.Future") -> None:
+        """Background revalidate lỗi: giữ stale entry, chỉ log."""
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        self.logger.log_step(
+            step="QRTOOLS_CACHE_REVALIDATE",
+            result="FAILED",
+            error=str(error),
+            error_type=type(error).__name__,
+            endpoint=key.endpoint,
+            account_id=key.account_id
+        )
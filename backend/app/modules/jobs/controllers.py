@@ -45,6 +45,7 @@ class JobsController:
         page: Optional[int] = None,
         limit: Optional[int] = None,
         reload: bool = False,
+        cursor: Optional[str] = None,
     ) -> Dict:
         """
         List jobs endpoint with optional filters and pagination.
@@ -58,6 +59,7 @@ class JobsController:
             page: Optional page number for pagination
             limit: Optional items per page for pagination
             reload: Whether to reload jobs from storage
+            cursor: Optional keyset cursor (pagination.next_cursor của trang trước)
 
         Returns:
             Standard success response with jobs data (paginated if page/limit provided)
@@ -72,6 +74,7 @@ class JobsController:
                 page=page,
                 limit=limit,
                 reload=reload,
+                cursor=cursor,
             )
 
             # Handle response format (could be list or dict with data and pagination)
@@ -85,6 +88,7 @@ class JobsController:
                         limit=pagination_meta.get("limit", limit or 20),
                         total=pagination_meta.get("total", len(result["data"])),
                         message="Jobs retrieved successfully",
+                        next_cursor=pagination_meta.get("next_cursor"),
                     )
                 elif page is not None and limit is not None:
                     # No pagination metadata but page/limit requested - add pagination
@@ -132,6 +136,8 @@ class JobsController:
                 return success_response(
                     data=result, message="Jobs retrieved successfully"
                 )
+        except ValidationError:
+            raise
         except Exception as e:
             raise InternalError(
                 message=f"Failed to retrieve jobs: {str(e)}",
@@ -5,11 +5,15 @@ Data access layer for jobs. Interacts with scheduler storage.
 """
 
 # Standard library
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
 # Local
 from services.scheduler import Scheduler
+from services.scheduler.job_stats import JobStatsCounters
 from services.scheduler.models import ScheduledJob, JobStatus, JobPriority, Platform
+from services.scheduler.storage.base import JobQuery, JobStorageBase, filter_jobs
 from services.exceptions import JobNotFoundError
 from services.logger import StructuredLogger
 from backend.app.shared.base_repository import BaseRepository
@@ -95,7 +99,10 @@ class JobsRepository(BaseRepository[ScheduledJob]):
         offset: Optional[int] = None
     ) -> List[ScheduledJob]:
         """
-        Get all jobs, optionally filtered.
+        Get all jobs, optionally filtered, sorted by (priority, scheduled_time, job_id) descending.
+        
+        Filtered/paginated queries chạy trong storage (SQL, indexed) nếu storage
+        hỗ trợ; còn lại (hoặc storage lỗi) filter trên jobs trong memory.
         
         Args:
             filters: Optional filter criteria:
@@ -104,6 +111,8 @@ class JobsRepository(BaseRepository[ScheduledJob]):
                 - platform: Filter by platform
                 - scheduled_from: Filter jobs scheduled after this date (YYYY-MM-DD)
                 - scheduled_to: Filter jobs scheduled before this date (YYYY-MM-DD)
+                - after: (priority, scheduled_time, job_id) của job cuối trang trước (keyset
+                  pagination, thay cho offset)
             limit: Optional limit on number of results
             offset: Optional offset for pagination
         
@@ -111,250 +120,35 @@ class JobsRepository(BaseRepository[ScheduledJob]):
             List of ScheduledJob objects
         """
         try:
-            from datetime import datetime, date
-            from services.utils.datetime_utils import normalize_to_utc
-            
-            account_id = filters.get("account_id") if filters else None
-            status = filters.get("status") if filters else None
-            platform = filters.get("platform") if filters else None
-            scheduled_from = filters.get("scheduled_from") if filters else None
-            scheduled_to = filters.get("scheduled_to") if filters else None
-            
-            # Get jobs from scheduler (don't pass status to list_jobs - we'll filter after)
-            # We filter status ourselves to have more control
-            try:
-                jobs = self.scheduler.list_jobs(account_id=account_id, status=None)
-            except Exception as e:
-                self.logger.log_step(
-                    step="GET_ALL_JOBS",
-                    result="ERROR",
-                    error=f"Error getting jobs from scheduler: {str(e)}",
-                    account_id=account_id,
-                    error_type=type(e).__name__
-                )
-                return []
-            
-            # Filter by status if provided
-            if status:
-                status_str = str(status).strip() if status else None
-                status_enum = None
-                
-                if status_str:
-                    try:
-                        # Convert to enum: "scheduled" -> JobStatus.SCHEDULED
-                        status_enum = JobStatus[status_str.upper()]
-                        self.logger.log_step(
-                            step="GET_ALL_JOBS",
-                            result="DEBUG",
-                            note=f"Filtering by status: '{status_str}' -> {status_enum} (value: {status_enum.value})",
-                            account_id=account_id,
-                            jobs_before_filter=len(jobs)
-                        )
-                    except (KeyError, AttributeError) as e:
-                        self.logger.log_step(
-                            step="GET_ALL_JOBS",
-                            result="WARNING",
-                            error=f"Invalid status filter: {status_str} (error: {str(e)})",
-                            account_id=account_id
-                        )
-                        status_enum = None
-                elif isinstance(status, JobStatus):
-                    # Already an enum
-                    status_enum = status
-                
-                if status_enum:
-                    jobs_before = len(jobs)
-                    
-                    # Filter jobs by status with robust comparison
-                    # Handle both enum and string status values
-                    filtered_jobs = []
-                    status_matches = 0
-                    status_mismatches = 0
-                    
-                    for j in jobs:
-                        try:
-                            job_status = j.status
-                            match = False
-                            
-                            # Handle enum comparison
-                            if isinstance(job_status, JobStatus):
-                                match = (job_status == status_enum)
-                            # Handle string comparison (if status was loaded as string from JSON)
-                            elif isinstance(job_status, str):
-                                match = (job_status.lower() == status_enum.value.lower())
-                            # Handle case where status might be stored as enum value
-                            elif hasattr(job_status, 'value'):
-                                match = (job_status.value.lower() == status_enum.value.lower())
-                            # Fallback: compare string representations
-                            else:
-                                match = (str(job_status).lower() == status_enum.value.lower())
-                            
-                            if match:
-                                filtered_jobs.append(j)
-                                status_matches += 1
-                            else:
-                                status_mismatches += 1
-                                # Log first few mismatches for debugging
-                                if status_mismatches <= 3:
-                                    self.logger.log_step(
-                                        step="GET_ALL_JOBS",
-                                        result="DEBUG",
-                                        note=f"Job {getattr(j, 'job_id', 'unknown')} status mismatch: {job_status} (type: {type(job_status).__name__}) != {status_enum} (value: {status_enum.value})",
-                                        account_id=account_id,
-                                        job_id=getattr(j, 'job_id', None)
-                                    )
-                        except Exception as e:
-                            # Skip jobs that error during status comparison
-                            self.logger.log_step(
-                                step="GET_ALL_JOBS",
-                                result="WARNING",
-                                error=f"Error comparing status for job {getattr(j, 'job_id', 'unknown')}: {str(e)}",
-                                account_id=account_id,
-                                error_type=type(e).__name__
-                            )
-                            continue
-                    
-                    jobs = filtered_jobs
-                    
-                    self.logger.log_step(
-                        step="GET_ALL_JOBS",
-                        result="DEBUG",
-                        note=f"Status filter applied: {jobs_before} -> {len(jobs)} jobs (filter: {status_enum.value}, matches: {status_matches}, mismatches: {status_mismatches})",
-                        account_id=account_id,
-                        status_filter=status_enum.value,
-                        jobs_before=jobs_before,
-                        jobs_after=len(jobs),
-                        matches=status_matches,
-                        mismatches=status_mismatches
-                    )
+            query = self._build_query(filters, limit=limit, offset=offset)
             
-            # Filter by platform if provided
-            if platform:
-                platform_str = str(platform).strip().upper()
-                platform_enum = None
-                
+            storage = self._query_storage(query)
+            if storage is not None:
                 try:
-                    platform_enum = Platform[platform_str]
-                except (KeyError, AttributeError) as e:
+                    return storage.query_jobs(query)
+                except Exception as e:
                     self.logger.log_step(
                         step="GET_ALL_JOBS",
                         result="WARNING",
-                        error=f"Invalid platform filter: {platform} (error: {str(e)})",
-                        account_id=account_id
+                        error=f"Storage query failed, filtering in memory: {str(e)}",
+                        account_id=query.account_id,
+                        error_type=type(e).__name__
                     )
-                    platform_enum = None
-                
-                if platform_enum:
-                    filtered_platform_jobs = []
-                    for j in jobs:
-                        try:
-                            job_platform = j.platform
-                            match = False
-                            
-                            # Handle both enum and string comparison
-                            if isinstance(job_platform, Platform):
-                                match = (job_platform == platform_enum)
-                            elif isinstance(job_platform, str):
-                                match = (job_platform.upper() == platform_str)
-                            elif hasattr(job_platform, 'value'):
-                                match = (job_platform.value.upper() == platform_str)
-                            else:
-                                match = (str(job_platform).upper() == platform_str)
-                            
-                            if match:
-                                filtered_platform_jobs.append(j)
-                        except Exception as e:
-                            # Skip jobs that error during platform comparison
-                            self.logger.log_step(
-                                step="GET_ALL_JOBS",
-                                result="WARNING",
-                                error=f"Error comparing platform for job {getattr(j, 'job_id', 'unknown')}: {str(e)}",
-                                account_id=account_id
-                            )
-                            continue
-                    
-                    jobs = filtered_platform_jobs
-            
-            # Filter by scheduled_time range if provided
-            if scheduled_from or scheduled_to:
-                filtered_jobs = []
-                for job in jobs:
-                    try:
-                        if not hasattr(job, 'scheduled_time') or not job.scheduled_time:
-                            continue
-                        
-                        job_scheduled_utc = normalize_to_utc(job.scheduled_time)
-                        job_date = job_scheduled_utc.date()
-                        
-                        # Parse filter dates
-                        from_date = None
-                        to_date = None
-                        
-                        if scheduled_from:
-                            try:
-                                from_date = datetime.strptime(scheduled_from, "%Y-%m-%d").date()
-                            except (ValueError, TypeError) as e:
-                                self.logger.log_step(
-                                    step="GET_ALL_JOBS",
-                                    result="WARNING",
-                                    error=f"Invalid scheduled_from date format: {scheduled_from} (error: {str(e)})",
-                                    account_id=account_id
-                                )
-                                # Skip this filter if date is invalid
-                                from_date = None
-                        
-                        if scheduled_to:
-                            try:
-                                to_date = datetime.strptime(scheduled_to, "%Y-%m-%d").date()
-                            except (ValueError, TypeError) as e:
-                                self.logger.log_step(
-                                    step="GET_ALL_JOBS",
-                                    result="WARNING",
-                                    error=f"Invalid scheduled_to date format: {scheduled_to} (error: {str(e)})",
-                                    account_id=account_id
-                                )
-                                # Skip this filter if date is invalid
-                                to_date = None
-                        
-                        # Apply date filters
-                        if from_date and job_date < from_date:
-                            continue
-                        if to_date and job_date > to_date:
-                            continue
-                        
-                        filtered_jobs.append(job)
-                    except Exception as e:
-                        # Skip jobs that error during date comparison
-                        self.logger.log_step(
-                            step="GET_ALL_JOBS",
-                            result="WARNING",
-                            error=f"Error comparing scheduled_time for job {getattr(job, 'job_id', 'unknown')}: {str(e)}",
-                            account_id=account_id,
-                            error_type=type(e).__name__
-                        )
-                        continue
-                
-                jobs = filtered_jobs
             
-            # Apply pagination with error handling
             try:
-                jobs_before_pagination = len(jobs)
-                
-                if offset is not None and offset > 0:
-                    jobs = jobs[offset:]
-                if limit is not None and limit > 0:
-                    jobs = jobs[:limit]
-            except (IndexError, TypeError) as e:
+                jobs = self.scheduler.list_jobs(account_id=query.account_id)
+            except Exception as e:
                 self.logger.log_step(
                     step="GET_ALL_JOBS",
-                    result="WARNING",
-                    error=f"Error applying pagination (offset={offset}, limit={limit}): {str(e)}",
-                    account_id=account_id
+                    result="ERROR",
+                    error=f"Error getting jobs from scheduler: {str(e)}",
+                    account_id=query.account_id,
+                    error_type=type(e).__name__
                 )
-                # Return empty list if pagination fails
                 return []
             
-            return jobs
+            # list_jobs đã filter account_id
+            return filter_jobs(jobs, replace(query, account_id=None))
         
         except Exception as e:
             self.logger.log_step(
@@ -379,6 +173,20 @@ class JobsRepository(BaseRepository[ScheduledJob]):
             Total count of matching jobs
         """
         try:
+            query = self._build_query(filters)
+            storage = self._query_storage(query)
+            if storage is not None:
+                try:
+                    return storage.count_jobs(query)
+                except Exception as e:
+                    self.logger.log_step(
+                        step="GET_JOBS_COUNT",
+                        result="WARNING",
+                        error=f"Storage count failed, counting in memory: {str(e)}",
+                        account_id=query.account_id,
+                        error_type=type(e).__name__
+                    )
+            
             # Get all jobs with filters but without pagination
             jobs = self.get_all(filters=filters, limit=None, offset=None)
             return len(jobs)
@@ -391,6 +199,96 @@ class JobsRepository(BaseRepository[ScheduledJob]):
             )
             return 0
     
+    def _query_storage(self, query: JobQuery) -> Optional[JobStorageBase]:
+        """
+        Storage để chạy query trong database, None nếu nên filter trong memory.
+        
+        Chỉ dùng storage khi query có filter hoặc pagination (list toàn bộ jobs
+        từ memory rẻ hơn đọc lại cả bảng).
+        """
+        storage = getattr(self.scheduler, "storage", None)
+        if not isinstance(storage, JobStorageBase) or not storage.supports_queries:
+            return None
+        if query == JobQuery():
+            return None
+        return storage
+    
+    def _build_query(
+        self,
+        filters: Optional[Dict],
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> JobQuery:
+        """
+        Convert API filters -> JobQuery.
+        
+        Status/platform/date không hợp lệ được bỏ qua (log WARNING), giống trước.
+        """
+        filters = filters or {}
+        account_id = filters.get("account_id")
+        
+        status_enum = None
+        status = filters.get("status")
+        if isinstance(status, JobStatus):
+            status_enum = status
+        elif status:
+            status_str = str(status).strip()
+            try:
+                # Convert to enum: "scheduled" -> JobStatus.SCHEDULED
+                status_enum = JobStatus[status_str.upper()]
+            except KeyError as e:
+                self.logger.log_step(
+                    step="GET_ALL_JOBS",
+                    result="WARNING",
+                    error=f"Invalid status filter: {status_str} (error: {str(e)})",
+                    account_id=account_id
+                )
+        
+        platform_enum = None
+        platform = filters.get("platform")
+        if isinstance(platform, Platform):
+            platform_enum = platform
+        elif platform:
+            try:
+                platform_enum = Platform[str(platform).strip().upper()]
+            except KeyError as e:
+                self.logger.log_step(
+                    step="GET_ALL_JOBS",
+                    result="WARNING",
+                    error=f"Invalid platform filter: {platform} (error: {str(e)})",
+                    account_id=account_id
+                )
+        
+        # Date filters (YYYY-MM-DD, UTC) -> [from 00:00, to + 1 ngày 00:00)
+        scheduled_from = self._parse_filter_date(filters.get("scheduled_from"), "scheduled_from", account_id)
+        scheduled_to = self._parse_filter_date(filters.get("scheduled_to"), "scheduled_to", account_id)
+        
+        return JobQuery(
+            account_id=account_id,
+            status=status_enum,
+            platform=platform_enum,
+            scheduled_from=scheduled_from,
+            scheduled_before=scheduled_to + timedelta(days=1) if scheduled_to else None,
+            after=filters.get("after"),
+            limit=limit if limit is not None and limit > 0 else None,
+            offset=offset if offset is not None and offset > 0 else None
+        )
+    
+    def _parse_filter_date(self, value: Optional[str], name: str, account_id: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except (ValueError, TypeError) as e:
+            self.logger.log_step(
+                step="GET_ALL_JOBS",
+                result="WARNING",
+                error=f"Invalid {name} date format: {value} (error: {str(e)})",
+                account_id=account_id
+            )
+            # Skip this filter if date is invalid
+            return None
+    
     def create(self, entity_data: Dict) -> ScheduledJob:
         """
         Create new job.
@@ -533,6 +431,24 @@ class JobsRepository(BaseRepository[ScheduledJob]):
             )
             return False
     
+    def get_version(self) -> Optional[int]:
+        """
+        Get jobs version của scheduler (tăng sau mỗi lần load/save jobs).
+        
+        Returns:
+            Version number, hoặc None nếu scheduler không hỗ trợ
+        """
+        return getattr(self.scheduler, "jobs_version", None)
+    
+    def get_job_stats(self) -> Optional[JobStatsCounters]:
+        """
+        Get stats counters của scheduler (cập nhật theo job transitions).
+        
+        Returns:
+            JobStatsCounters, hoặc None nếu scheduler không hỗ trợ
+        """
+        return getattr(self.scheduler, "job_stats", None)
+    
     def reload_jobs(self, force: bool = False) -> None:
         """
         Reload jobs from storage.
@@ -8,8 +8,10 @@ Thin layer that calls controller.
 # Standard library
 from typing import Optional
 from fastapi import APIRouter, Query
+from fastapi.responses import Response
 
 # Local
+from services.scheduler.job_codec import encode_json
 from backend.app.modules.jobs.controllers import JobsController
 from backend.app.modules.jobs.schemas import JobCreate, JobUpdate
 
@@ -26,10 +28,16 @@ async def list_jobs(
     scheduled_to: Optional[str] = Query(None, description="Filter jobs scheduled before this date (YYYY-MM-DD)"),
     page: Optional[int] = Query(None, description="Page number (1-based) for pagination"),
     limit: Optional[int] = Query(None, description="Items per page for pagination"),
-    reload: bool = Query(False, description="Reload jobs from storage")
+    reload: bool = Query(False, description="Reload jobs from storage"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (pagination.next_cursor from previous page)")
 ):
-    """List all jobs with optional filters and pagination."""
-    return await controller.list_jobs(
+    """
+    List all jobs with optional filters and pagination.
+
+    Response được encode trực tiếp (orjson nếu có) thay vì qua jsonable_encoder:
+    job dicts đã là JSON-safe, encoder mặc định chậm với danh sách lớn.
+    """
+    result = await controller.list_jobs(
         account_id=account_id,
         status=status,
         platform=platform,
@@ -37,8 +45,12 @@ async def list_jobs(
         scheduled_to=scheduled_to,
         page=page,
         limit=limit,
-        reload=reload
+        reload=reload,
+        cursor=cursor
     )
+    if isinstance(result, Response):
+        return result
+    return Response(content=encode_json(result), media_type="application/json")
 
 
 @router.get("/{job_id}")
@@ -6,13 +6,16 @@ Handles validation, orchestration, and business rules.
 """
 
 # Standard library
-from typing import Dict, List, Optional
+import base64
+import binascii
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 # Local
-from services.scheduler.models import JobPriority, JobStatus, Platform
+from services.scheduler.job_stats import JobStatsCounters
+from services.scheduler.models import JobPriority, JobStatus, Platform, ScheduledJob
+from services.scheduler.storage.base import job_sort_key
 from services.logger import StructuredLogger
-from services.utils.datetime_utils import normalize_to_utc
 from backend.app.shared.base_service import BaseService
 from backend.app.modules.jobs.repositories.jobs_repository import JobsRepository
 from backend.app.core.exceptions import ValidationError, NotFoundError, InternalError
@@ -55,10 +58,15 @@ class JobsService(BaseService):
         page: Optional[int] = None,
         limit: Optional[int] = None,
         reload: bool = False,
+        cursor: Optional[str] = None,
     ) -> Dict:
         """
         Get all jobs with optional filters and pagination.
 
+        Jobs sort giảm dần theo (priority, scheduled_time, job_id). Khi có limit, pagination trả về
+        `next_cursor`; gửi lại qua `cursor` để lấy trang sau bằng keyset
+        pagination (không OFFSET, chi phí không tăng theo số trang).
+
         Args:
             account_id: Account ID to filter by (None = all accounts)
             status: Status to filter by (None = all statuses)
@@ -68,10 +76,16 @@ class JobsService(BaseService):
             page: Page number (1-based) for pagination
             limit: Items per page for pagination
             reload: If True, reload jobs from storage before listing
+            cursor: next_cursor từ trang trước (thay cho page khi tính vị trí)
 
         Returns:
             Dict with 'data' (list of job dictionaries) and 'pagination' metadata
+
+        Raises:
+            ValidationError: Nếu cursor không hợp lệ
         """
+        after = decode_job_cursor(cursor) if cursor else None
+
         try:
             # Reload if requested
             if reload:
@@ -98,10 +112,12 @@ class JobsService(BaseService):
                 filters["scheduled_from"] = scheduled_from
             if scheduled_to:
                 filters["scheduled_to"] = scheduled_to
+            if after:
+                filters["after"] = after
 
-            # Calculate pagination
+            # Calculate pagination (cursor thay cho offset)
             offset = None
-            if page and limit:
+            if page and limit and not after:
                 offset = (page - 1) * limit
 
             # Get jobs from repository (with filters and pagination)
@@ -128,6 +144,7 @@ class JobsService(BaseService):
                     "total_pages": total_pages,
                     "has_next": page < total_pages if total_pages > 0 else False,
                     "has_prev": page > 1,
+                    "next_cursor": encode_job_cursor(jobs[-1]) if jobs and len(jobs) == limit else None,
                 }
 
             self._log_operation(
@@ -157,6 +174,33 @@ class JobsService(BaseService):
             )
             return [] if not (page and limit) else {"data": [], "_pagination": None}
 
+    def get_job_objects(self, account_id: Optional[str] = None) -> List[ScheduledJob]:
+        """
+        Get raw ScheduledJob objects (no serialization).
+
+        Dùng cho aggregation (dashboard) cần duyệt toàn bộ jobs mà không
+        phải serialize từng job thành dict.
+
+        Args:
+            account_id: Account ID to filter by (None = all accounts)
+
+        Returns:
+            List of ScheduledJob objects
+        """
+        filters = {}
+        if account_id:
+            filters["account_id"] = str(account_id).strip()
+        return self.repository.get_all(filters=filters)
+
+    def get_jobs_version(self) -> Optional[int]:
+        """
+        Get jobs version (thay đổi mỗi khi jobs được load/save).
+
+        Returns:
+            Version number, hoặc None nếu không hỗ trợ
+        """
+        return self.repository.get_version()
+
     def get_job_by_id(self, job_id: str) -> Optional[Dict]:
         """
         Get job by ID.
@@ -341,6 +385,9 @@ class JobsService(BaseService):
         """
         Get job statistics.
 
+        Đọc từ scheduler stats counters (O(1)), reconcile với storage mỗi
+        STATS_RECONCILE_SECONDS. Repository không có counters -> đếm từ jobs.
+
         Args:
             account_id: Account ID to filter by (None = all accounts)
 
@@ -348,47 +395,23 @@ class JobsService(BaseService):
             Dictionary with statistics
         """
         try:
-            # Get jobs
-            filters = {}
-            if account_id:
-                filters["account_id"] = str(account_id).strip()
+            account_key = str(account_id).strip() if account_id else None
+            counters = self.repository.get_job_stats()
 
-            jobs = self.repository.get_all(filters=filters)
+            if not isinstance(counters, JobStatsCounters):
+                filters = {"account_id": account_key} if account_key else {}
+                counters = JobStatsCounters()
+                counters.reconcile(self.repository.get_all(filters=filters))
+                return counters.get_stats()
 
-            # Calculate stats
-            total = len(jobs)
-            completed = sum(1 for j in jobs if j.status == JobStatus.COMPLETED)
-            failed = sum(1 for j in jobs if j.status == JobStatus.FAILED)
-            pending = sum(
-                1 for j in jobs if j.status in [JobStatus.PENDING, JobStatus.SCHEDULED]
-            )
-            running = sum(1 for j in jobs if j.status == JobStatus.RUNNING)
-
-            # Count today's posts (using UTC for consistent date comparison)
-            today = datetime.now(timezone.utc).date()
-            today_posts = sum(
-                1
-                for j in jobs
-                if (
-                    j.status == JobStatus.COMPLETED
-                    and j.completed_at
-                    and hasattr(j.completed_at, "date")
-                    and normalize_to_utc(j.completed_at).date() == today
-                )
-            )
+            if counters.reconcile_due():
+                # Reload từ storage -> scheduler reconcile counters
+                self.repository.reload_jobs()
+                if counters.reconcile_due():
+                    # Reload bị skip (vừa save) hoặc lỗi -> reconcile với jobs in-memory
+                    counters.reconcile(self.repository.get_all())
 
-            # Calculate success rate
-            success_rate = (completed / total * 100) if total > 0 else 0.0
-
-            return {
-                "total": total,
-                "completed": completed,
-                "failed": failed,
-                "pending": pending,
-                "running": running,
-                "today_posts": today_posts,
-                "success_rate": success_rate,
-            }
+            return counters.get_stats(account_key)
 
         except Exception as e:
             self._handle_error("GET_STATS", e, {"account_id": account_id})
@@ -490,3 +513,28 @@ class JobsService(BaseService):
         except Exception:
             # Sync is optional, don't fail if it doesn't work
             pass
+
+
+def encode_job_cursor(job: ScheduledJob) -> str:
+    """Keyset cursor (opaque) từ job cuối trang: base64url("<priority>|<scheduled_time ISO UTC>|<job_id>")."""
+    priority, scheduled_time, job_id = job_sort_key(job)
+    raw = f"{priority}|{scheduled_time.isoformat()}|{job_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_job_cursor(cursor: str) -> Tuple[int, datetime, str]:
+    """
+    Decode cursor từ encode_job_cursor().
+
+    Raises:
+        ValidationError: Nếu cursor không hợp lệ
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        priority, scheduled_time, job_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 2)
+        return int(priority), datetime.fromisoformat(scheduled_time), job_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValidationError(
+            message="Invalid pagination cursor",
+            details={"cursor": cursor}
+        ) from e
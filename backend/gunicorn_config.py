@@ -16,6 +16,11 @@ worker_connections = 1000
 timeout = 30
 keepalive = 2
 
+# Rate limiting: mỗi worker có limiter in-memory riêng (limit thực tế = limit * workers).
+# Set RATE_LIMIT_REDIS_URL (cần package redis, optional: pip install "redis>=5.0") để các workers
+# dùng chung một counter; thiếu package thì fallback về in-memory (log WARNING).
+rate_limit_redis_url = os.getenv("RATE_LIMIT_REDIS_URL", "").strip()
+
 # Logging
 accesslog = "-"
 errorlog = "-"
@@ -36,3 +41,12 @@ tmp_upload_dir = None
 # SSL (if needed)
 keyfile = None
 certfile = None
+
+
+def when_ready(server):
+    """Cảnh báo khi nhiều workers không dùng shared rate limit backend."""
+    if workers > 1 and not rate_limit_redis_url:
+        server.log.warning(
+            "Rate limiting is per worker (%d workers); set RATE_LIMIT_REDIS_URL to share limits",
+            workers
+        )
@@ -450,8 +450,21 @@ async def shutdown_event():
     except Exception as e:
         logger.log_step(step="SHUTDOWN_BROWSER_CLEANUP", result="WARNING", error=str(e))
 
+    # Đóng MediaService dùng chung của feed controller (httpx client + resize pool)
+    try:
+        from backend.app.modules.feed.routes import controller as feed_controller
+
+        await feed_controller.close()
+    except Exception as e:
+        logger.log_step(step="SHUTDOWN_MEDIA_CLEANUP", result="WARNING", error=str(e))
+
     logger.log_step(step="SHUTDOWN", result="SUCCESS", note="Cleanup completed")
 
+    # Flush và đóng log handlers (file handles) sau log cuối cùng
+    from services.logger import shutdown_loggers
+
+    shutdown_loggers()
+
 
 if __name__ == "__main__":
     # Get port from environment variable or default to 8000
@@ -0,0 +1,135 @@
+"""
+Unit tests for API rate limiters.
+"""
+
+# Standard library
+from unittest.mock import MagicMock
+
+# Third-party
+import pytest
+
+# Local
+from backend.app.core import rate_limit
+from backend.app.core.rate_limit import InMemoryRateLimiter, RedisRateLimiter, create_rate_limiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the limiter module."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestInMemoryRateLimiter:
+    """Test token bucket limiter."""
+
+    def test_limit_and_refill(self, clock):
+        """Allows `limit` requests per key, then refills at limit per window."""
+        # Arrange
+        limiter = InMemoryRateLimiter(limit=3, window_seconds=60.0)
+
+        # Act
+        burst = [limiter.allow("1.1.1.1") for _ in range(4)]
+        other_key = limiter.allow("2.2.2.2")
+        clock[0] += 20.0
+        after_refill = [limiter.allow("1.1.1.1") for _ in range(2)]
+
+        # Assert
+        assert burst == [True, True, True, False]
+        assert other_key is True
+        assert after_refill == [True, False]
+
+    def test_idle_keys_evicted(self, clock):
+        """Keys idle for a full window are dropped on the next sweep."""
+        # Arrange
+        limiter = InMemoryRateLimiter(limit=5, window_seconds=60.0, shards=1)
+        for i in range(10):
+            limiter.allow(f"10.0.0.{i}")
+
+        # Act
+        clock[0] += 61.0
+        limiter.allow("10.0.1.1")
+
+        # Assert
+        assert limiter.tracked_keys() == 1
+
+    def test_max_keys_bounded(self, clock):
+        """Tracked keys never exceed max_keys."""
+        # Arrange
+        limiter = InMemoryRateLimiter(limit=5, window_seconds=60.0, shards=4, max_keys=40)
+
+        # Act
+        for i in range(1000):
+            limiter.allow(f"10.0.{i // 256}.{i % 256}")
+
+        # Assert
+        assert limiter.tracked_keys() <= 40
+
+
+class TestRedisRateLimiter:
+    """Test shared Redis limiter."""
+
+    def test_counts_in_redis(self):
+        """Uses the INCR result against the limit."""
+        # Arrange
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = [[1, True], [2, True], [3, True]]
+        limiter = RedisRateLimiter(client, limit=2, window_seconds=60)
+
+        # Act
+        results = [limiter.allow("1.1.1.1") for _ in range(3)]
+
+        # Assert
+        assert results == [True, True, False]
+        redis_key = client.pipeline.return_value.incr.call_args[0][0]
+        assert redis_key.startswith("rate_limit:1.1.1.1:")
+
+    def test_falls_back_on_error(self):
+        """Redis errors fall back to the in-memory limiter."""
+        # Arrange
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        fallback = InMemoryRateLimiter(limit=1, window_seconds=60.0)
+        limiter = RedisRateLimiter(client, limit=100, fallback=fallback)
+
+        # Act
+        results = [limiter.allow("1.1.1.1") for _ in range(2)]
+
+        # Assert
+        assert results == [True, False]
+
+    def test_skips_redis_while_circuit_open(self, clock):
+        """After an error Redis is not called until retry_after_seconds have passed."""
+        # Arrange
+        client = MagicMock()
+        execute = client.pipeline.return_value.execute
+        execute.side_effect = ConnectionError("down")
+        limiter = RedisRateLimiter(client, limit=100, retry_after_seconds=5.0)
+
+        # Act
+        during_outage = [limiter.allow("1.1.1.1") for _ in range(10)]
+        calls_during_outage = execute.call_count
+        clock[0] += 5.0
+        execute.side_effect = None
+        execute.return_value = [1, True]
+        after_retry = [limiter.allow("1.1.1.1") for _ in range(2)]
+
+        # Assert
+        assert all(during_outage)
+        assert calls_during_outage == 1
+        assert after_retry == [True, True]
+        assert execute.call_count == 3
+
+
+def test_create_rate_limiter_defaults_to_in_memory(monkeypatch):
+    """Without RATE_LIMIT_REDIS_URL the limiter is per-process."""
+    # Arrange
+    monkeypatch.delenv(rate_limit.RATE_LIMIT_REDIS_URL_ENV, raising=False)
+
+    # Act
+    limiter = create_rate_limiter(100)
+
+    # Assert
+    assert isinstance(limiter, InMemoryRateLimiter)
+    assert limiter.limit == 100
@@ -0,0 +1,3 @@
+"""
+Dashboard module tests.
+"""
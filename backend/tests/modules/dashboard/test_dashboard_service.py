@@ -0,0 +1,98 @@
+"""
+Unit tests for DashboardService.
+"""
+
+# Standard library
+from unittest.mock import Mock
+from datetime import datetime
+
+# Third-party
+import pytest
+
+# Local
+from backend.app.modules.dashboard.services.dashboard_service import DashboardService
+from backend.app.modules.jobs.services.jobs_service import JobsService
+from services.scheduler.models import ScheduledJob, JobStatus, JobPriority, Platform
+
+
+def _make_job(job_id, status, platform, created_at):
+    """Create ScheduledJob with fixed created_at."""
+    job = ScheduledJob(
+        job_id=job_id,
+        account_id="account_001",
+        content="content",
+        scheduled_time=created_at,
+        priority=JobPriority.NORMAL,
+        status=status,
+        platform=platform
+    )
+    job.created_at = created_at
+    return job
+
+
+@pytest.fixture
+def sample_jobs():
+    """Create sample jobs across two days."""
+    return [
+        _make_job("job_001", JobStatus.COMPLETED, Platform.THREADS, datetime(2026, 1, 1, 9)),
+        _make_job("job_002", JobStatus.FAILED, Platform.FACEBOOK, datetime(2026, 1, 1, 10)),
+        _make_job("job_003", JobStatus.PENDING, Platform.THREADS, datetime(2026, 1, 2, 9)),
+        _make_job("job_004", JobStatus.COMPLETED, Platform.THREADS, datetime(2026, 1, 2, 11)),
+    ]
+
+
+@pytest.fixture
+def mock_jobs_service(sample_jobs):
+    """Create mock JobsService returning sample jobs."""
+    service = Mock(spec=JobsService)
+    service.get_job_objects.return_value = sample_jobs
+    service.get_jobs_version.return_value = 1
+    return service
+
+
+@pytest.fixture
+def dashboard_service(mock_jobs_service):
+    """Create DashboardService with mock JobsService."""
+    return DashboardService(jobs_service=mock_jobs_service)
+
+
+class TestDashboardService:
+    """Test DashboardService."""
+
+    def test_get_stats(self, dashboard_service):
+        """Test stats are computed from snapshot."""
+        stats = dashboard_service.get_stats()
+
+        assert stats["total_jobs"] == 4
+        assert stats["completed_jobs"] == 2
+        assert stats["failed_jobs"] == 1
+        assert stats["pending_jobs"] == 1
+        assert stats["success_rate"] == 50.0
+
+    def test_get_metrics_timeline(self, dashboard_service):
+        """Test timeline and hourly distribution aggregation."""
+        metrics = dashboard_service.get_metrics()
+
+        assert metrics["jobs_by_platform"] == {"threads": 3, "facebook": 1}
+        assert metrics["posts_timeline"] == [
+            {"date": "2026-01-01", "threads": 1, "facebook": 1},
+            {"date": "2026-01-02", "threads": 2},
+        ]
+        assert metrics["hourly_distribution"] == {"9": 2, "10": 1, "11": 1}
+
+    def test_get_activity_sorted_and_limited(self, dashboard_service):
+        """Test activity returns newest jobs first."""
+        activity = dashboard_service.get_activity(limit=2)
+
+        assert [job["job_id"] for job in activity] == ["job_004", "job_003"]
+
+    def test_snapshot_cached_until_version_changes(self, dashboard_service, mock_jobs_service):
+        """Test stats, metrics and activity share one aggregation pass."""
+        dashboard_service.get_stats()
+        dashboard_service.get_metrics()
+        dashboard_service.get_activity()
+        assert mock_jobs_service.get_job_objects.call_count == 1
+
+        mock_jobs_service.get_jobs_version.return_value = 2
+        dashboard_service.get_stats()
+        assert mock_jobs_service.get_job_objects.call_count == 2
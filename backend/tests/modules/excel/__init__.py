@@ -0,0 +1,3 @@
+"""
+Excel module tests.
+"""
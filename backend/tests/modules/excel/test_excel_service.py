@@ -0,0 +1,85 @@
+"""
+Unit tests for ExcelService scheduled post spacing.
+"""
+
+# Standard library
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+# Third-party
+import pytest
+
+# Local
+from backend.app.modules.excel.services.excel_service import ExcelService
+
+
+def _utc(hour, minute=0, second=0):
+    return datetime(2026, 1, 5, hour, minute, second, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def excel_service():
+    """Create ExcelService with mock repository and jobs service."""
+    return ExcelService(repository=Mock(), jobs_service=Mock())
+
+
+class TestSpaceScheduledPosts:
+    """Test ExcelService._space_scheduled_posts."""
+
+    def test_collisions_spaced_from_vn_time(self, excel_service):
+        """Naive VN times 09:00, 09:00:01, 09:00:05 become 02:00:00, 02:00:10, 02:00:20 UTC."""
+        # Arrange
+        posts = [
+            {"content": "a", "scheduled_time": "2026-01-05T09:00:00"},
+            {"content": "b", "scheduled_time": "2026-01-05T09:00:01"},
+            {"content": "c", "scheduled_time": "2026-01-05T09:00:05"},
+        ]
+
+        # Act
+        result = excel_service._space_scheduled_posts(posts, spacing_seconds=10.0)
+
+        # Assert
+        assert [item["post"]["content"] for item in result] == ["a", "b", "c"]
+        assert [item["scheduled_time"] for item in result] == [_utc(2), _utc(2, 0, 10), _utc(2, 0, 20)]
+        assert all(isinstance(item["scheduled_time"], datetime) for item in result)
+
+    def test_unsorted_input_sorted_and_gaps_kept(self, excel_service):
+        """Output is in time order; posts already far enough apart are not moved."""
+        # Arrange
+        posts = [
+            {"content": "late", "scheduled_time": "2026-01-05T10:00:00"},
+            {"content": "second", "scheduled_time": "2026-01-05T09:00:03"},
+            {"content": "first", "scheduled_time": "2026-01-05T09:00:00"},
+        ]
+
+        # Act
+        result = excel_service._space_scheduled_posts(posts, spacing_seconds=10.0)
+
+        # Assert
+        assert [item["post"]["content"] for item in result] == ["first", "second", "late"]
+        assert [item["scheduled_time"] for item in result] == [_utc(2), _utc(2, 0, 10), _utc(3)]
+
+    def test_naive_and_aware_times_mixed(self, excel_service):
+        """Naive values are VN time; aware values (strings or datetimes) keep their timezone."""
+        # Arrange
+        posts = [
+            {"content": "naive", "scheduled_time": "2026-01-05T09:00:00"},
+            {"content": "utc_string", "scheduled_time": "2026-01-05T02:00:00Z"},
+            {"content": "aware_datetime", "scheduled_time": _utc(1, 59, 55)},
+            {"content": "naive_datetime", "scheduled_time": datetime(2026, 1, 5, 9, 30)},
+        ]
+
+        # Act
+        result = excel_service._space_scheduled_posts(posts, spacing_seconds=10.0)
+
+        # Assert
+        assert [item["post"]["content"] for item in result] == [
+            "aware_datetime", "naive", "utc_string", "naive_datetime"
+        ]
+        assert [item["scheduled_time"] for item in result] == [
+            _utc(1, 59, 55), _utc(2, 0, 5), _utc(2, 0, 15), _utc(2, 30)
+        ]
+
+    def test_empty(self, excel_service):
+        """No scheduled posts -> empty list."""
+        assert excel_service._space_scheduled_posts([], spacing_seconds=10.0) == []
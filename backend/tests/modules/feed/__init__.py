@@ -0,0 +1,3 @@
+"""
+Feed module tests.
+"""
@@ -0,0 +1,119 @@
+"""
+Unit tests for BatchInteractionRunner.
+"""
+
+# Standard library
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+# Third-party
+import pytest
+
+# Local
+from backend.app.modules.feed.schemas import BatchInteractionRequest
+from backend.app.modules.feed.services.batch_interactions import BatchInteractionRunner
+from services.safety_guard import SafetyConfig, SafetyGuard
+
+
+@pytest.fixture
+def safety_guard():
+    """SafetyGuard without spacing delay and in-memory duplicate index."""
+    return SafetyGuard(SafetyConfig(
+        min_delay_between_posts_seconds=0,
+        max_delay_between_posts_seconds=0,
+        duplicate_index_dir=None
+    ))
+
+
+@pytest.fixture
+def events():
+    """Captured broadcast events."""
+    return []
+
+
+@pytest.fixture
+def feed_service():
+    """Mock FeedService with interaction methods."""
+    service = Mock()
+    service.like_post = AsyncMock(return_value={"success": True})
+    service.follow_user = AsyncMock(return_value={"success": True})
+    service.repost_post = AsyncMock(side_effect=RuntimeError("Repost button not found"))
+    return service
+
+
+@pytest.fixture
+def runner(feed_service, safety_guard, events):
+    """Runner capturing broadcasts."""
+    async def broadcaster(event_type, data, account_id):
+        events.append((event_type, data, account_id))
+    return BatchInteractionRunner(feed_service, safety_guard=safety_guard, broadcaster=broadcaster)
+
+
+def _request(actions, **kwargs):
+    return BatchInteractionRequest(actions=actions, **kwargs)
+
+
+class TestBatchInteractionRunner:
+    """Test BatchInteractionRunner."""
+
+    @pytest.mark.asyncio
+    async def test_runs_actions_and_streams_results(self, runner, feed_service, safety_guard, events):
+        """Results keep request order, each result is broadcast, actions count towards rate limit."""
+        request = _request([
+            {"action": "like", "account_id": "acc1", "post_id": "p1", "username": "author"},
+            {"action": "follow", "account_id": "acc2", "username": "someone"},
+            {"action": "like", "account_id": "acc1", "post_id": "p2"},
+        ])
+
+        result = await runner.run(request.actions)
+
+        assert [r["status"] for r in result["results"]] == ["success"] * 3
+        assert result["summary"]["accounts"] == 2
+        feed_service.like_post.assert_any_await("p1", "acc1", profile_path=None, username="author")
+        feed_service.follow_user.assert_awaited_once_with("someone", "acc2", profile_path=None)
+        assert [e[0] for e in events].count("interaction.result") == 3
+        assert events[-1][0] == "interaction.batch_complete"
+        assert len(safety_guard.get_account_health("acc1").action_timestamps) == 2
+
+    @pytest.mark.asyncio
+    async def test_actions_of_one_account_run_sequentially(self, runner, feed_service):
+        """One account never has two actions in flight; different accounts overlap."""
+        active = {}
+        peak = {}
+
+        async def like(post_id, account_id, **kwargs):
+            active[account_id] = active.get(account_id, 0) + 1
+            peak[account_id] = max(peak.get(account_id, 0), active[account_id])
+            await asyncio.sleep(0.01)
+            active[account_id] -= 1
+            return {"success": True}
+
+        feed_service.like_post = AsyncMock(side_effect=like)
+        request = _request([
+            {"action": "like", "account_id": f"acc{i % 2}", "post_id": f"p{i}"} for i in range(6)
+        ])
+
+        await runner.run(request.actions)
+
+        assert peak == {"acc0": 1, "acc1": 1}
+
+    @pytest.mark.asyncio
+    async def test_stop_on_error_skips_rest_of_account(self, runner, safety_guard):
+        """With continue_on_error=False a failure skips remaining actions of that account only."""
+        request = _request([
+            {"action": "repost", "account_id": "acc1", "post_id": "p1"},
+            {"action": "like", "account_id": "acc1", "post_id": "p2"},
+            {"action": "like", "account_id": "acc2", "post_id": "p3"},
+        ], continue_on_error=False)
+
+        result = await runner.run(request.actions, continue_on_error=request.continue_on_error)
+
+        assert [r["status"] for r in result["results"]] == ["failed", "skipped", "success"]
+        assert safety_guard.get_account_health("acc1").consecutive_errors == 1
+
+    def test_request_validation(self):
+        """Post actions require post_id, follow requires username."""
+        with pytest.raises(ValueError):
+            _request([{"action": "like", "account_id": "acc1"}])
+        with pytest.raises(ValueError):
+            _request([{"action": "follow", "account_id": "acc1"}])
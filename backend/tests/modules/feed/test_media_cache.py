@@ -0,0 +1,94 @@
+"""
+Unit tests for MediaCache.
+"""
+
+# Standard library
+import os
+from unittest.mock import Mock
+
+# Third-party
+import pytest
+
+# Local
+from backend.app.modules.feed.services.media_cache import MediaCache, remove_legacy_media_dirs
+
+
+def _write_blob(cache, url, size, extension="jpg"):
+    """Write a blob of `size` bytes for url and register it."""
+    key = MediaCache.make_key(url)
+    path = cache.blob_path(key, extension)
+    path.write_bytes(b"x" * size)
+    return cache.put(key, path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create MediaCache with a 250-byte budget."""
+    return MediaCache(tmp_path / "cache", max_bytes=250, logger=Mock())
+
+
+class TestMediaCache:
+    """Test MediaCache."""
+
+    def test_put_and_get(self, cache):
+        """Blobs are addressed by URL hash and typed by extension."""
+        entry = _write_blob(cache, "https://cdn/a.jpg", 10)
+
+        assert cache.get(MediaCache.make_key("https://cdn/a.jpg")) == entry
+        assert entry.content_type == "image/jpeg"
+        assert entry.etag.startswith('"')
+        assert cache.get(MediaCache.make_key("https://cdn/a.jpg", "w100_h")) is None
+
+    def test_lru_eviction_under_budget(self, cache):
+        """Least recently used blobs are deleted when over budget."""
+        a = _write_blob(cache, "https://cdn/a", 100)
+        b = _write_blob(cache, "https://cdn/b", 100)
+        cache.get(a.key)  # a becomes most recently used
+        _write_blob(cache, "https://cdn/c", 100)
+
+        assert cache.get(b.key) is None
+        assert not b.path.exists()
+        assert cache.get(a.key) is not None
+        assert cache.total_bytes == 200
+
+    def test_alias_lookup(self, cache):
+        """Aliases resolve to blobs and are dropped once the blob is discarded."""
+        entry = _write_blob(cache, "https://cdn/a", 10)
+        cache.set_alias(("media", "post", 0, ""), entry.key)
+
+        assert cache.get_alias(("media", "post", 0, "")) == entry
+
+        entry.path.unlink()
+        cache.discard(entry.key)
+        assert cache.get_alias(("media", "post", 0, "")) is None
+        assert cache.total_bytes == 0
+
+    def test_index_rebuilt_from_disk(self, cache, tmp_path):
+        """A new instance recovers entries, sizes and LRU order from disk."""
+        old = _write_blob(cache, "https://cdn/old", 100)
+        new = _write_blob(cache, "https://cdn/new", 100, extension="png")
+        os.utime(old.path, (1, 1))
+        stale_temp = new.path.with_name(".partial.part")
+        stale_temp.write_bytes(b"x")
+        os.utime(stale_temp, (1, 1))
+
+        rebuilt = MediaCache(tmp_path / "cache", max_bytes=150, logger=Mock())
+
+        assert len(rebuilt) == 1
+        assert rebuilt.get(new.key).content_type == "image/png"
+        assert not old.path.exists()
+        assert not stale_temp.exists()
+
+    def test_remove_legacy_media_dirs(self, cache, tmp_path):
+        """Per-post and avatar dirs of the old layout are deleted; the cache root stays."""
+        entry = _write_blob(cache, "https://cdn/a", 10)
+        (tmp_path / "post_1").mkdir()
+        (tmp_path / "post_1" / "0.jpg").write_bytes(b"x")
+        (tmp_path / "avatars").mkdir()
+        (tmp_path / "avatars" / "u1.jpg").write_bytes(b"x")
+
+        removed = remove_legacy_media_dirs(tmp_path, tmp_path / "cache", Mock())
+
+        assert removed == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["cache"]
+        assert entry.path.exists()
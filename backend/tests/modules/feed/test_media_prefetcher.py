@@ -0,0 +1,135 @@
+"""
+Unit tests for MediaPrefetcher (dedup, retry, per-host limits, thumbnails).
+"""
+
+# Standard library
+import asyncio
+import io
+from unittest.mock import Mock
+
+# Third-party
+import httpx
+import pytest
+from PIL import Image
+
+# Local
+from backend.app.modules.feed.services.media_cache import MediaCache
+from backend.app.modules.feed.services.media_prefetcher import MediaPrefetcher, build_prefetch_jobs
+from backend.app.modules.feed.services.media_service import MediaService
+
+
+def _jpeg_bytes(size=(400, 400)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=(10, 200, 10)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _item(post_id, media_urls, user_id="u1", avatar="https://cdn.example.com/avatar.jpg"):
+    """Feed item dict (builder đọc được cả FeedItem lẫn dict)."""
+    return {"post_id": post_id, "user_id": user_id, "media_urls": media_urls, "user_avatar_url": avatar}
+
+
+@pytest.fixture
+def media_service(tmp_path, monkeypatch):
+    """Create MediaService with mock FeedStorage and media dir under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    service = MediaService(feed_storage=Mock())
+    service.thumbnail_format = ""
+    return service
+
+
+class TestBuildPrefetchJobs:
+    """Test job extraction from feed items."""
+
+    def test_dedups_urls_across_items(self):
+        """Shared media and avatar URLs produce one job each."""
+        items = [
+            _item("p1", ["https://cdn.example.com/a.jpg", "https://cdn.example.com/b.jpg"]),
+            _item("p2", ["https://cdn.example.com/a.jpg"]),
+        ]
+
+        jobs = build_prefetch_jobs(items)
+
+        assert [(job.kind, job.url) for job in jobs] == [
+            ("media", "https://cdn.example.com/a.jpg"),
+            ("media", "https://cdn.example.com/b.jpg"),
+            ("avatar", "https://cdn.example.com/avatar.jpg"),
+        ]
+
+
+class TestMediaPrefetcher:
+    """Test prefetch pipeline against a mock CDN."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_caches_originals_and_thumbnails(self, media_service):
+        """Originals and standard thumbnails are cached and aliased; cached URLs are not refetched."""
+        body = _jpeg_bytes()
+        calls = []
+
+        def handler(request):
+            calls.append(str(request.url))
+            return httpx.Response(200, content=body, headers={"content-type": "image/jpeg"})
+
+        media_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        prefetcher = MediaPrefetcher(lambda: media_service, backoff_seconds=0)
+        items = [_item("p1", ["https://cdn.example.com/a.jpg"])]
+
+        stats = await prefetcher.schedule(items)
+
+        assert stats == {"downloaded": 2, "failed": 0}
+        thumb = media_service.cache.get_alias(("media", "p1", 0, "w200_h200"))
+        assert thumb is not None
+        with Image.open(thumb.path) as img:
+            assert img.size == (200, 200)
+        avatar_key = MediaCache.make_key("https://cdn.example.com/avatar.jpg", "w56_h56")
+        assert media_service.cache.get(avatar_key) is not None
+
+        await prefetcher.schedule(items)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors_only(self, media_service):
+        """5xx is retried with backoff; 404 fails without retry."""
+        attempts = {}
+
+        def handler(request):
+            url = str(request.url)
+            attempts[url] = attempts.get(url, 0) + 1
+            if url.endswith("flaky.jpg") and attempts[url] < 3:
+                return httpx.Response(503)
+            if url.endswith("missing.jpg"):
+                return httpx.Response(404)
+            return httpx.Response(200, content=_jpeg_bytes((100, 100)), headers={"content-type": "image/jpeg"})
+
+        media_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        prefetcher = MediaPrefetcher(lambda: media_service, max_attempts=3, backoff_seconds=0)
+        items = [_item("p1", ["https://cdn.example.com/flaky.jpg", "https://cdn.example.com/missing.jpg"], avatar=None)]
+
+        stats = await prefetcher.schedule(items)
+
+        assert stats == {"downloaded": 1, "failed": 1}
+        assert attempts["https://cdn.example.com/flaky.jpg"] == 3
+        assert attempts["https://cdn.example.com/missing.jpg"] == 1
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self, media_service):
+        """No more than per_host_limit downloads run against one host at a time."""
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, content=b"video", headers={"content-type": "video/mp4"})
+
+        media_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        prefetcher = MediaPrefetcher(lambda: media_service, concurrency=8, per_host_limit=2)
+        urls = [f"https://cdn.example.com/v{i}.mp4" for i in range(6)]
+
+        stats = await prefetcher.schedule([_item("p1", urls, avatar=None)])
+
+        assert stats == {"downloaded": 6, "failed": 0}
+        assert peak == 2
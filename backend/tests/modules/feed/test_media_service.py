@@ -0,0 +1,271 @@
+"""
+Unit tests for MediaService resizing, request coalescing, cached responses and proxy.
+"""
+
+# Standard library
+import asyncio
+import gc
+import threading
+from unittest.mock import AsyncMock, Mock
+
+# Third-party
+import httpx
+import pytest
+from PIL import Image
+
+# Local
+from backend.app.modules.feed.controllers import FeedController
+from backend.app.modules.feed.services import media_service as media_module
+from backend.app.core.exceptions import ValidationError
+from backend.app.modules.feed.services.media_service import MediaService, _resize_image_file, is_proxy_allowed_url
+
+
+@pytest.fixture
+def media_service(tmp_path, monkeypatch):
+    """Create MediaService with mock FeedStorage and media dir under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    return MediaService(feed_storage=Mock())
+
+
+@pytest.fixture
+def source_image(tmp_path):
+    """Create a 400x200 JPEG."""
+    path = tmp_path / "source.jpg"
+    Image.new("RGB", (400, 200), color=(200, 10, 10)).save(path, "JPEG")
+    return path
+
+
+class TestResizeImageFile:
+    """Test blocking resize worker."""
+
+    def test_resize_keeps_aspect_ratio(self, tmp_path, source_image):
+        """Width-only resize keeps aspect ratio and leaves no temp files."""
+        target = tmp_path / "out" / "0_w100.jpg"
+
+        result = _resize_image_file(source_image, target, 100, None)
+
+        assert result["resized_size"] == "100x50"
+        with Image.open(target) as img:
+            assert img.size == (100, 50)
+        assert [p.name for p in target.parent.iterdir()] == ["0_w100.jpg"]
+
+    def test_no_upscale(self, tmp_path, source_image):
+        """Requested size larger than original returns None."""
+        assert _resize_image_file(source_image, tmp_path / "big.jpg", 800, None) is None
+        assert not (tmp_path / "big.jpg").exists()
+
+    def test_transcode_webp(self, tmp_path, source_image):
+        """Thumbnails can be transcoded to WebP."""
+        target = tmp_path / "thumb.webp"
+
+        _resize_image_file(source_image, target, 100, None, "WEBP")
+
+        with Image.open(target) as img:
+            assert img.format == "WEBP"
+
+
+class TestMediaServiceResize:
+    """Test resize pool and coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_resizes_share_one_job(self, media_service, source_image, tmp_path, monkeypatch):
+        """Concurrent requests for the same thumbnail run the worker once."""
+        calls = []
+        release = threading.Event()
+
+        def slow_resize(*args):
+            calls.append(args)
+            release.wait(5)
+            return _resize_image_file(*args)
+
+        monkeypatch.setattr(media_module, "_resize_image_file", slow_resize)
+        target = tmp_path / "thumb.jpg"
+
+        tasks = [
+            asyncio.create_task(media_service._run_resize(source_image, target, 100, None))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert len(calls) == 1
+        assert all(result["path"] == target for result in results)
+        assert media_service._inflight == {}
+        await media_service.close()
+
+
+class TestMediaServiceServe:
+    """Test serving from the media cache."""
+
+    @pytest.mark.asyncio
+    async def test_serve_media_uses_alias_and_etag(self, media_service, source_image):
+        """Second request skips the DB lookup; matching If-None-Match returns 304."""
+        key = media_service.cache.make_key("https://cdn/p1.jpg")
+        blob = media_service.cache.blob_path(key, "jpg")
+        blob.write_bytes(source_image.read_bytes())
+        media_service.cache.put(key, blob)
+        media_service.get_media_url = AsyncMock(return_value="https://cdn/p1.jpg")
+
+        first = await media_service.serve_media("p1", 0, width=100)
+        etag = first.headers["etag"]
+        second = await media_service.serve_media("p1", 0, width=100, if_none_match=etag)
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert media_service.get_media_url.call_count == 1
+        await media_service.close()
+
+    @pytest.mark.asyncio
+    async def test_serve_media_refetches_blob_deleted_outside_cache(self, media_service, source_image):
+        """A blob removed by another process is discarded and downloaded again."""
+        body = source_image.read_bytes()
+        downloads = []
+
+        async def handler(request):
+            downloads.append(str(request.url))
+            return httpx.Response(200, headers={"content-type": "image/jpeg"}, content=body)
+
+        media_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        media_service.get_media_url = AsyncMock(return_value="https://cdn/p1.jpg")
+        first = await media_service.serve_media("p1", 0)
+        first.path.unlink()
+
+        second = await media_service.serve_media("p1", 0)
+
+        assert second.status_code == 200
+        assert second.path.read_bytes() == body
+        assert len(downloads) == 2
+        await media_service.close()
+
+
+class TestMediaServiceProxy:
+    """Test streaming proxy with write-through cache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_proxy_requests_share_one_fetch(self, media_service):
+        """Followers wait for the leader's write-through instead of refetching."""
+        body = b"v" * 200000
+        upstream_calls = []
+
+        async def handler(request):
+            upstream_calls.append(request.headers.get("range"))
+            return httpx.Response(200, headers={"content-type": "video/mp4"}, content=body)
+
+        media_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        leader = await media_service.proxy_media("https://scontent.cdninstagram.com/v.mp4")
+        followers = [
+            asyncio.create_task(media_service.proxy_media("https://scontent.cdninstagram.com/v.mp4"))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        streamed = b"".join([chunk async for chunk in leader.body_iterator])
+        responses = await asyncio.gather(*followers)
+
+        assert streamed == body
+        assert upstream_calls == [None]
+        assert all(response.status_code == 200 for response in responses)
+        assert responses[0].path.read_bytes() == body
+        await media_service.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("drop", ["closed", "garbage_collected"])
+    async def test_unconsumed_proxy_response_releases_fetch(self, media_service, drop):
+        """A response that is never streamed frees the in-flight entry, fails waiters and closes upstream."""
+        closed = []
+
+        class TrackingStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"v" * 100
+
+            async def aclose(self):
+                closed.append(True)
+
+        async def handler(request):
+            return httpx.Response(200, headers={"content-type": "video/mp4"}, stream=TrackingStream())
+
+        media_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        response = await media_service.proxy_media("https://video.fbcdn.net/never.mp4")
+        done = next(iter(media_service._inflight.values()))
+        if drop == "closed":
+            # Client ngắt trước khi body được stream
+            await response.body_iterator.aclose()
+        else:
+            del response
+            gc.collect()
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+        assert media_service._inflight == {}
+        assert isinstance(done.exception(), RuntimeError)
+        assert closed == [True]
+        await media_service.close()
+
+
+    def test_proxy_allowlist(self):
+        """Only HTTPS Threads/Instagram CDN hosts are proxied."""
+        assert is_proxy_allowed_url("https://scontent-sin6-2.cdninstagram.com/v/t51/a.jpg")
+        assert is_proxy_allowed_url("https://video.xx.fbcdn.net/o1/v.mp4")
+        assert not is_proxy_allowed_url("http://scontent.cdninstagram.com/a.jpg")
+        assert not is_proxy_allowed_url("https://example.com/a.jpg")
+        assert not is_proxy_allowed_url("https://evilcdninstagram.com/a.jpg")
+        assert not is_proxy_allowed_url("https://cdninstagram.com.evil.net/a.jpg")
+
+    @pytest.mark.asyncio
+    async def test_proxy_rejects_other_hosts(self, media_service):
+        """Non-CDN URLs never reach upstream or the cache."""
+        handler = Mock()
+        media_service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with pytest.raises(ValueError):
+            await media_service.proxy_media("https://example.com/a.jpg")
+
+        handler.assert_not_called()
+        await media_service.close()
+
+    @pytest.mark.asyncio
+    async def test_proxy_without_feed_storage(self, tmp_path, monkeypatch):
+        """Proxying builds only the cache and HTTP client, never FeedStorage (MySQL)."""
+        monkeypatch.chdir(tmp_path)
+        feed_storage_cls = Mock(side_effect=AssertionError("FeedStorage must not be created"))
+        monkeypatch.setattr(media_module, "FeedStorage", feed_storage_cls)
+        service = MediaService()
+
+        async def handler(request):
+            return httpx.Response(200, headers={"content-type": "image/jpeg"}, content=b"jpg")
+
+        service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        response = await service.proxy_media("https://scontent.cdninstagram.com/a.jpg")
+
+        assert b"".join([chunk async for chunk in response.body_iterator]) == b"jpg"
+        feed_storage_cls.assert_not_called()
+        await service.close()
+
+
+class TestFeedControllerClose:
+    """Test shutdown of the shared MediaService."""
+
+    @pytest.mark.asyncio
+    async def test_close_shared_media_service_once(self):
+        """close() closes the lazily created MediaService and forgets it."""
+        controller = FeedController(service=Mock())
+        media = Mock(close=AsyncMock())
+        controller._media_service = media
+
+        await controller.close()
+        await controller.close()
+
+        media.close.assert_awaited_once()
+        assert controller._media_service is None
+
+    @pytest.mark.asyncio
+    async def test_proxy_rejects_non_cdn_url(self):
+        """Controller validates the host before creating the MediaService."""
+        controller = FeedController(service=Mock())
+
+        with pytest.raises(ValidationError):
+            await controller.proxy_media(url="https://example.com/a.jpg")
+
+        assert controller._media_service is None
@@ -0,0 +1,147 @@
+"""
+Unit tests for ResponseCache (TTL, single-flight, stale-while-revalidate, invalidation).
+"""
+
+# Standard library
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+# Third-party
+import pytest
+
+# Local
+from backend.app.modules.feed.services import response_cache as cache_module
+from backend.app.modules.feed.services.qrtools_client import QrtoolsClient
+from backend.app.modules.feed.services.response_cache import CacheKey, ResponseCache, normalize_params
+
+
+class FakeClock:
+    """Controllable time.monotonic replacement."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch time used by response_cache (not the event loop clock)."""
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def _counting_fetch(calls, delay=0.0):
+    async def fetch():
+        calls.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        return {"success": True, "data": [len(calls)]}
+    return fetch
+
+
+class TestResponseCache:
+    """Test ResponseCache."""
+
+    def test_normalize_params_is_order_independent(self):
+        """Filter order and None values do not change the key."""
+        assert normalize_params({"limit": 10, "a": None, "min_likes": 5}) == normalize_params({"min_likes": 5, "limit": 10})
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_fetch(self, clock):
+        """Identical in-flight requests are coalesced."""
+        cache = ResponseCache(ttl_seconds=30, stale_seconds=0)
+        calls = []
+        key = CacheKey("feed", "acc1")
+
+        results = await asyncio.gather(*(cache.get_or_fetch(key, _counting_fetch(calls, 0.01)) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(result == {"success": True, "data": [1]} for result in results)
+
+        await cache.get_or_fetch(key, _counting_fetch(calls))
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, clock):
+        """Stale entries are served immediately and refreshed in the background."""
+        cache = ResponseCache(ttl_seconds=30, stale_seconds=60)
+        calls = []
+        key = CacheKey("feed", "acc1")
+        await cache.get_or_fetch(key, _counting_fetch(calls))
+
+        clock.now += 45
+        stale = await cache.get_or_fetch(key, _counting_fetch(calls))
+        assert stale["data"] == [1]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        fresh = await cache.get_or_fetch(key, _counting_fetch(calls))
+        assert fresh["data"] == [2]
+        assert len(calls) == 2
+
+        clock.now += 200
+        expired = await cache.get_or_fetch(key, _counting_fetch(calls))
+        assert expired["data"] == [3]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_and_failures_not_cached(self, clock):
+        """Invalidation is scoped by endpoint/account; failed responses are not cached."""
+        cache = ResponseCache(ttl_seconds=30)
+        calls = []
+        feed_key = CacheKey("feed", "acc1")
+        other_key = CacheKey("feed", "acc2")
+        await cache.get_or_fetch(feed_key, _counting_fetch(calls))
+        await cache.get_or_fetch(other_key, _counting_fetch(calls))
+
+        assert cache.invalidate(endpoint="feed", account_id="acc1") == 1
+        assert len(cache) == 1
+
+        async def failing():
+            return {"success": False, "error": "scrape failed"}
+
+        await cache.get_or_fetch(feed_key, failing)
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_flag_once_per_upstream_response(self, clock):
+        """Only the fetching caller, or the first reader of a revalidated entry, sees fresh=True."""
+        cache = ResponseCache(ttl_seconds=30, stale_seconds=60)
+        calls = []
+        key = CacheKey("feed", "acc1")
+
+        results = await asyncio.gather(
+            *(cache.get_or_fetch_with_source(key, _counting_fetch(calls, 0.01)) for _ in range(3))
+        )
+        assert [fresh for _, fresh in results] == [True, False, False]
+        assert (await cache.get_or_fetch_with_source(key, _counting_fetch(calls)))[1] is False
+
+        clock.now += 45
+        stale, stale_fresh = await cache.get_or_fetch_with_source(key, _counting_fetch(calls))
+        assert (stale["data"], stale_fresh) == ([1], False)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        revalidated = [await cache.get_or_fetch_with_source(key, _counting_fetch(calls)) for _ in range(2)]
+        assert [(value["data"], fresh) for value, fresh in revalidated] == [([2], True), ([2], False)]
+
+
+class TestQrtoolsClientFeedCache:
+    """Test cache-hit marking of QrtoolsClient.get_feed."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_marked_from_cache(self, clock):
+        """Cache hits are copies marked from_cache; the cached response is not modified."""
+        client = QrtoolsClient.__new__(QrtoolsClient)
+        client.response_cache = ResponseCache(ttl_seconds=30, stale_seconds=0)
+        client._fetch_feed = AsyncMock(return_value={"success": True, "data": [{"id": "p1"}]})
+
+        first = await client.get_feed(filters={"limit": 10}, account_id="acc1")
+        second = await client.get_feed(filters={"limit": 10}, account_id="acc1")
+
+        assert "from_cache" not in first
+        assert second == {"success": True, "data": [{"id": "p1"}], "from_cache": True}
+        assert client._fetch_feed.await_count == 1
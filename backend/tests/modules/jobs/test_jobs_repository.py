@@ -4,7 +4,7 @@ Integration tests for JobsRepository.
 
 # Standard library
 from unittest.mock import Mock, MagicMock
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Third-party
 import pytest
@@ -13,9 +13,23 @@ import pytest
 from backend.app.modules.jobs.repositories.jobs_repository import JobsRepository
 from services.scheduler import Scheduler
 from services.scheduler.models import ScheduledJob, JobStatus, JobPriority, Platform
+from services.scheduler.storage.base import job_sort_key
+from services.scheduler.storage.sqlite_storage import SQLiteJobStorage
 from services.exceptions import JobNotFoundError
 
 
+def _job(job_id, status=JobStatus.SCHEDULED, day=1):
+    """Create real ScheduledJob."""
+    return ScheduledJob(
+        job_id=job_id,
+        account_id="account_001",
+        content=f"content {job_id}",
+        scheduled_time=datetime(2025, 1, day, 10, 0, tzinfo=timezone.utc),
+        priority=JobPriority.NORMAL,
+        status=status
+    )
+
+
 @pytest.fixture
 def mock_scheduler():
     """Create mock scheduler."""
@@ -66,23 +80,18 @@ class TestJobsRepository:
         assert result is None
     
     def test_get_all_with_filters(self, jobs_repository, mock_scheduler):
-        """Test get_all with filters."""
+        """Test get_all passes account_id to the scheduler and returns newest first."""
         # Arrange
-        job1 = Mock(spec=ScheduledJob)
-        job1.account_id = "account_001"
-        job1.status = JobStatus.PENDING
-        
-        job2 = Mock(spec=ScheduledJob)
-        job2.account_id = "account_002"
-        job2.status = JobStatus.PENDING
-        
-        mock_scheduler.list_jobs.return_value = [job1, job2]
+        mock_scheduler.list_jobs.return_value = [
+            _job("job_a", day=1),
+            _job("job_b", day=2),
+        ]
         
         # Act
         result = jobs_repository.get_all(filters={"account_id": "account_001"})
         
         # Assert
-        assert len(result) == 2  # list_jobs returns both, filtering happens after
+        assert [job.job_id for job in result] == ["job_b", "job_a"]
         mock_scheduler.list_jobs.assert_called_once_with(account_id="account_001")
     
     def test_create_job(self, jobs_repository, mock_scheduler):
@@ -129,3 +138,44 @@ class TestJobsRepository:
         
         # Assert
         assert result is False
+    
+    def test_get_all_pushes_filters_to_storage(self, jobs_repository, mock_scheduler, tmp_path):
+        """Filtered/paginated queries run in queryable storage, not on scheduler jobs."""
+        # Arrange
+        storage = SQLiteJobStorage(db_path=tmp_path / "jobs.db", logger=Mock())
+        storage.save_jobs({
+            "job_a": _job("job_a", day=3),
+            "job_b": _job("job_b", day=1),
+            "job_c": _job("job_c", status=JobStatus.COMPLETED, day=2),
+        })
+        mock_scheduler.storage = storage
+        filters = {"status": "scheduled", "scheduled_from": "2025-01-01", "scheduled_to": "2025-01-03"}
+        
+        # Act
+        first_page = jobs_repository.get_all(filters=filters, limit=1)
+        second_page = jobs_repository.get_all(
+            filters={**filters, "after": job_sort_key(first_page[0])},
+            limit=1
+        )
+        
+        # Assert
+        assert [job.job_id for job in first_page] == ["job_a"]
+        assert [job.job_id for job in second_page] == ["job_b"]
+        assert jobs_repository.get_count(filters=filters) == 2
+        mock_scheduler.list_jobs.assert_not_called()
+        storage.close()
+    
+    def test_get_all_in_memory_filters_and_sorts(self, jobs_repository, mock_scheduler):
+        """Storage without query support filters scheduler jobs in memory."""
+        # Arrange
+        mock_scheduler.list_jobs.return_value = [
+            _job("job_a", day=3),
+            _job("job_b", day=1),
+            _job("job_c", status=JobStatus.COMPLETED, day=2),
+        ]
+        
+        # Act
+        result = jobs_repository.get_all(filters={"status": "scheduled", "scheduled_to": "2025-01-02"})
+        
+        # Assert
+        assert [job.job_id for job in result] == ["job_b"]
@@ -10,8 +10,9 @@ from datetime import datetime, timedelta
 import pytest
 
 # Local
-from backend.app.modules.jobs.services.jobs_service import JobsService
+from backend.app.modules.jobs.services.jobs_service import JobsService, decode_job_cursor
 from backend.app.modules.jobs.repositories.jobs_repository import JobsRepository
+from services.scheduler.job_stats import JobStatsCounters
 from backend.app.core.exceptions import ValidationError, NotFoundError
 from services.scheduler.models import ScheduledJob, JobStatus, JobPriority, Platform
 
@@ -35,6 +36,7 @@ def sample_job():
     job.job_id = "job_001"
     job.account_id = "account_001"
     job.status = JobStatus.PENDING
+    job.priority = JobPriority.NORMAL
     job.scheduled_time = datetime.now() + timedelta(hours=1)
     return job
 
@@ -57,6 +59,31 @@ class TestJobsService:
             assert result[0]["job_id"] == "job_001"
             mock_repository.get_all.assert_called_once()
     
+    def test_get_all_jobs_cursor_pagination(self, jobs_service, mock_repository, sample_job):
+        """next_cursor of a full page is passed back as keyset filter instead of offset."""
+        # Arrange
+        mock_repository.get_all.return_value = [sample_job]
+        mock_repository.get_count.return_value = 5
+        with patch('backend.app.modules.jobs.services.jobs_service.serialize_job', return_value={"job_id": "job_001"}):
+            
+            # Act
+            first = jobs_service.get_all_jobs(page=1, limit=1)
+            next_cursor = first["_pagination"]["next_cursor"]
+            jobs_service.get_all_jobs(page=2, limit=1, cursor=next_cursor)
+        
+        # Assert
+        priority, scheduled_time, job_id = decode_job_cursor(next_cursor)
+        assert (priority, job_id) == (JobPriority.NORMAL.value, "job_001")
+        assert scheduled_time.replace(tzinfo=None) == sample_job.scheduled_time
+        _, kwargs = mock_repository.get_all.call_args
+        assert kwargs["filters"]["after"] == (priority, scheduled_time, "job_001")
+        assert kwargs["offset"] is None
+    
+    def test_get_all_jobs_invalid_cursor(self, jobs_service):
+        """Malformed cursor is a validation error."""
+        with pytest.raises(ValidationError):
+            jobs_service.get_all_jobs(page=1, limit=1, cursor="not-a-cursor")
+    
     def test_get_job_by_id_success(self, jobs_service, mock_repository, sample_job):
         """Test get_job_by_id success."""
         # Arrange
@@ -154,3 +181,21 @@ class TestJobsService:
         assert result["total"] == 2
         assert result["completed"] == 1
         assert "success_rate" in result
+    
+    def test_get_stats_uses_counters(self, jobs_service, mock_repository, sample_job):
+        """Test get_stats reads scheduler counters and reconciles only when due."""
+        # Arrange
+        counters = JobStatsCounters()
+        mock_repository.get_job_stats.return_value = counters
+        mock_repository.get_all.return_value = [sample_job]
+        
+        # Act
+        first = jobs_service.get_stats(account_id="account_001")
+        second = jobs_service.get_stats(account_id="account_001")
+        
+        # Assert
+        assert first == second
+        assert first["total"] == 1
+        assert first["pending"] == 1
+        mock_repository.reload_jobs.assert_called_once()
+        mock_repository.get_all.assert_called_once()
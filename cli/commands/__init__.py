@@ -2,19 +2,12 @@
 CLI commands module.
 
 Chứa các command handlers cho Threads Automation Tool.
+
+Handlers được import lazy theo command: `--list-jobs` không load pandas
+(Excel) hay Playwright (browser) của các commands khác.
 """
 
-from cli.commands.excel import handle_create_template, handle_excel_posts
-from cli.commands.jobs import (
-    handle_list_jobs,
-    handle_remove_job,
-    handle_reset_jobs,
-    handle_reset_status,
-    handle_delete_job_file,
-    handle_reset_job_file
-)
-from cli.commands.post import handle_post_thread
-from cli.commands.schedule import handle_schedule_job, handle_scheduler
+from utils.lazy_exports import lazy_exports
 
 __all__ = [
     # Excel
@@ -33,3 +26,19 @@ __all__ = [
     'handle_schedule_job',
     'handle_scheduler',
 ]
+
+_HANDLER_MODULES = {
+    'handle_create_template': 'cli.commands.excel',
+    'handle_excel_posts': 'cli.commands.excel',
+    'handle_list_jobs': 'cli.commands.jobs',
+    'handle_remove_job': 'cli.commands.jobs',
+    'handle_reset_jobs': 'cli.commands.jobs',
+    'handle_reset_status': 'cli.commands.jobs',
+    'handle_delete_job_file': 'cli.commands.jobs',
+    'handle_reset_job_file': 'cli.commands.jobs',
+    'handle_post_thread': 'cli.commands.post',
+    'handle_schedule_job': 'cli.commands.schedule',
+    'handle_scheduler': 'cli.commands.schedule',
+}
+
+__getattr__ = lazy_exports(__name__, _HANDLER_MODULES)
@@ -8,12 +8,8 @@ import asyncio
 import random
 from typing import List, Dict, Any
 
-from browser.manager import BrowserManager
-from browser.login_guard import LoginGuard
-from threads.composer import ThreadComposer
 from config import Config, RunMode
 from services.scheduler import Scheduler, JobPriority
-from content.excel_loader import ExcelLoader, ExcelLoadError
 
 
 def handle_create_template(template_path: str) -> None:
@@ -23,6 +19,9 @@ def handle_create_template(template_path: str) -> None:
     Args:
         template_path: Đường dẫn file template
     """
+    # pandas chỉ load khi chạy lệnh Excel
+    from content.excel_loader import ExcelLoader
+    
     try:
         ExcelLoader.create_template(template_path)
         print(f"✅ Đã tạo template Excel tại: {template_path}")
@@ -65,6 +64,8 @@ async def handle_excel_posts(
         account_id: ID tài khoản
         config: Config instance
     """
+    from content.excel_loader import ExcelLoader, ExcelLoadError
+    
     try:
         loader = ExcelLoader()
         posts = loader.load_from_file(excel_path)
@@ -153,6 +154,11 @@ async def _handle_immediate_posts(
     config: Config
 ) -> None:
     """Xử lý các bài đăng ngay."""
+    # Playwright chỉ load khi thực sự đăng bài
+    from browser.manager import BrowserManager
+    from browser.login_guard import LoginGuard
+    from threads.composer import ThreadComposer
+    
     print(f"\n🚀 Có {len(posts)} bài sẽ được đăng ngay:\n")
     
     try:
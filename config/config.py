@@ -160,6 +160,10 @@ class AnalyticsConfig:
     
     # Recent metrics check (skip if metrics fetched within this time)
     recent_metrics_hours: int = 1
+    
+    # Batched metrics writes (multi-row upserts)
+    metrics_write_batch_size: int = 50  # Flush khi buffer đạt số rows này
+    metrics_write_flush_interval_seconds: float = 5.0  # Flush khi row cũ nhất chờ quá thời gian này
 
 
 @dataclass
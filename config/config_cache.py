@@ -0,0 +1,190 @@
+"""
+Module: config/config_cache.py
+
+Process-wide cache cho application Config.
+
+Config được load một lần, các lần đọc sau trả về cùng snapshot (không query
+MySQL/đọc file). Snapshot được refresh khi version của nguồn (app_config.updated_at
+hoặc mtime của config.json) thay đổi - version chỉ được kiểm tra tối đa mỗi
+check_interval_seconds - hoặc khi invalidate() được gọi (ví dụ sau save_config).
+Subscribers được notify khi config thay đổi.
+"""
+
+# Standard library
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Local
+from config.config import Config
+from services.logger import StructuredLogger
+
+# Khoảng thời gian tối thiểu giữa hai lần kiểm tra version (giây)
+DEFAULT_CHECK_INTERVAL_SECONDS = 5.0
+
+ConfigLoader = Callable[[], Tuple[Config, Any]]
+VersionProbe = Callable[[], Any]
+ConfigSubscriber = Callable[[Config, Optional[Config]], None]
+
+
+class ConfigCache:
+    """
+    Cache Config với version check và change notification.
+
+    - get(): fast path chỉ là một phép so sánh monotonic time; snapshot trả về
+      được dùng chung giữa các callers và KHÔNG được mutate
+    - Version check (version_probe) chỉ chạy khi đã quá check_interval_seconds
+    - Reload khi version khác version của snapshot hiện tại, notify subscribers
+    """
+
+    def __init__(
+        self,
+        loader: ConfigLoader,
+        version_probe: Optional[VersionProbe] = None,
+        check_interval_seconds: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+        logger: Optional[StructuredLogger] = None
+    ):
+        """
+        Initialize config cache.
+
+        Args:
+            loader: () -> (Config, version) - load config từ nguồn
+            version_probe: () -> version - lấy version hiện tại của nguồn (rẻ hơn loader),
+                cùng format với version của loader. None = không tự refresh
+                (chỉ refresh qua invalidate())
+            check_interval_seconds: Khoảng thời gian tối thiểu giữa hai lần version check
+            logger: Structured logger (optional)
+        """
+        self._loader = loader
+        self._version_probe = version_probe
+        self.check_interval_seconds = max(0.0, check_interval_seconds)
+        self._logger = logger
+
+        self._config: Optional[Config] = None
+        self._version: Any = None
+        self._next_check_at = 0.0
+        self._lock = threading.RLock()
+        self._subscribers: List[ConfigSubscriber] = []
+
+    def get(self) -> Config:
+        """
+        Get config snapshot hiện tại.
+
+        Returns:
+            Config (shared snapshot - không mutate)
+        """
+        config = self._config
+        if config is not None and time.monotonic() < self._next_check_at:
+            return config
+
+        with self._lock:
+            if self._config is None:
+                self._reload()
+            elif time.monotonic() >= self._next_check_at:
+                self._check_version()
+            return self._config
+
+    def invalidate(self, config: Optional[Config] = None) -> None:
+        """
+        Invalidate snapshot.
+
+        Args:
+            config: Config mới (ví dụ vừa save). Nếu có, dùng trực tiếp làm snapshot
+                và notify ngay; nếu None, lần get() tiếp theo sẽ reload từ nguồn.
+        """
+        with self._lock:
+            if config is None:
+                self._next_check_at = 0.0
+                self._version = _FORCE_RELOAD
+                return
+
+            previous = self._config
+            self._config = config
+            self._version = self._probe_version()
+            self._next_check_at = time.monotonic() + self.check_interval_seconds
+        self._notify(config, previous)
+
+    def subscribe(self, callback: ConfigSubscriber) -> Callable[[], None]:
+        """
+        Đăng ký callback(new_config, old_config) khi config thay đổi.
+
+        Returns:
+            Hàm unsubscribe
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache state (debug/monitoring)."""
+        return {
+            "loaded": self._config is not None,
+            "version": None if self._version is _FORCE_RELOAD else self._version,
+            "subscribers": len(self._subscribers),
+            "check_interval_seconds": self.check_interval_seconds,
+        }
+
+    def _check_version(self) -> None:
+        """So sánh version nguồn với snapshot, reload nếu khác (caller giữ lock)."""
+        if self._version is not _FORCE_RELOAD:
+            if self._version_probe is None:
+                self._next_check_at = float("inf")
+                return
+            version = self._probe_version()
+            # None = không lấy được version -> giữ snapshot hiện tại
+            if version is None or version == self._version:
+                self._next_check_at = time.monotonic() + self.check_interval_seconds
+                return
+        self._reload()
+
+    def _reload(self) -> None:
+        """Load config từ nguồn, notify nếu đã có snapshot trước đó (caller giữ lock)."""
+        previous = self._config
+        try:
+            config, version = self._loader()
+        except Exception as e:
+            if previous is None:
+                raise
+            # Giữ snapshot cũ, thử lại sau check_interval
+            self._log("WARNING", error=f"Failed to reload config: {e}", error_type=type(e).__name__)
+            self._next_check_at = time.monotonic() + self.check_interval_seconds
+            return
+
+        self._config = config
+        self._version = version
+        self._next_check_at = time.monotonic() + self.check_interval_seconds
+        if previous is not None:
+            self._log("INFO", note="Config reloaded", version=str(version))
+            self._notify(config, previous)
+
+    def _probe_version(self) -> Any:
+        """Version hiện tại của nguồn (None nếu không lấy được)."""
+        if self._version_probe is None:
+            return None
+        try:
+            return self._version_probe()
+        except Exception as e:
+            self._log("WARNING", error=f"Failed to check config version: {e}", error_type=type(e).__name__)
+            return None
+
+    def _notify(self, config: Config, previous: Optional[Config]) -> None:
+        """Notify subscribers, lỗi của một subscriber không ảnh hưởng subscribers khác."""
+        for callback in list(self._subscribers):
+            try:
+                callback(config, previous)
+            except Exception as e:
+                self._log("WARNING", error=f"Config subscriber failed: {e}", error_type=type(e).__name__)
+
+    def _log(self, result: str, **kwargs: Any) -> None:
+        if self._logger:
+            self._logger.log_step(step="CONFIG_CACHE", result=result, **kwargs)
+
+
+# Sentinel: snapshot phải reload ở lần get() tiếp theo bất kể version
+_FORCE_RELOAD = object()
@@ -6,11 +6,14 @@ Configuration storage and loading utilities.
 
 # Standard library
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 # Local
 from config.config import Config, RunMode
+from config.config_cache import DEFAULT_CHECK_INTERVAL_SECONDS, ConfigCache, ConfigSubscriber
 from config.storage_config_loader import get_storage_config_from_env
 from services.storage.config_storage import ConfigStorage
 from services.logger import StructuredLogger
@@ -19,6 +22,11 @@ from services.logger import StructuredLogger
 CONFIG_FILE = Path("./config.json")
 _USE_MYSQL_CONFIG = True  # Use MySQL by default
 
+# Process-wide config cache (lazy init) và ConfigStorage dùng chung
+_config_cache: Optional[ConfigCache] = None
+_config_storage: Optional[ConfigStorage] = None
+_cache_lock = threading.Lock()
+
 
 def load_config(use_mysql: Optional[bool] = None) -> Config:
     """
@@ -29,54 +37,27 @@ def load_config(use_mysql: Optional[bool] = None) -> Config:
     2. JSON file (config.json)
     3. Defaults
     
+    Với use_mysql=None, config được serve từ process-wide cache (xem
+    get_config_cache()); snapshot trả về được dùng chung - không mutate.
+    
     Args:
-        use_mysql: If True, use MySQL. If None, use default (MySQL).
+        use_mysql: If True, use MySQL. If None, use default (MySQL) qua cache.
     
     Returns:
         Config instance
     """
     if use_mysql is None:
-        use_mysql = _USE_MYSQL_CONFIG
-    
-    # Try MySQL first
-    if use_mysql:
-        try:
-            storage_config = get_storage_config_from_env()
-            mysql_config = storage_config.mysql
-            config_storage = ConfigStorage(
-                host=mysql_config.host,
-                port=mysql_config.port,
-                user=mysql_config.user,
-                password=mysql_config.password,
-                database=mysql_config.database,
-                charset=mysql_config.charset,
-                logger=StructuredLogger(name="config_storage")
-            )
-            config = config_storage.load_config()
-            if config:
-                return config
-        except Exception:
-            # Fall through to JSON file
-            pass
-    
-    # Fallback to JSON file
-    if not CONFIG_FILE.exists():
-        return Config()
-    
-    try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return _dict_to_config(data)
-    except Exception as e:
-        # Return defaults if loading fails
-        print(f"Warning: Failed to load config: {e}, using defaults")
-        return Config()
+        return get_config_cache().get()
+    config, _ = _load_from_sources(use_mysql)
+    return config
 
 
 def save_config(config: Config, use_mysql: Optional[bool] = None) -> None:
     """
     Save configuration to MySQL (if enabled) và JSON file.
     
+    Cache được cập nhật ngay với config mới và subscribers được notify.
+    
     Args:
         config: Config instance to save
         use_mysql: If True, save to MySQL. If None, use default (MySQL).
@@ -87,18 +68,7 @@ def save_config(config: Config, use_mysql: Optional[bool] = None) -> None:
     # Save to MySQL if enabled
     if use_mysql:
         try:
-            storage_config = get_storage_config_from_env()
-            mysql_config = storage_config.mysql
-            config_storage = ConfigStorage(
-                host=mysql_config.host,
-                port=mysql_config.port,
-                user=mysql_config.user,
-                password=mysql_config.password,
-                database=mysql_config.database,
-                charset=mysql_config.charset,
-                logger=StructuredLogger(name="config_storage")
-            )
-            config_storage.save_config(config)
+            _get_config_storage().save_config(config)
         except Exception as e:
             # Log warning but continue to save to JSON file
             print(f"Warning: Failed to save config to MySQL: {e}, saving to JSON file")
@@ -110,6 +80,111 @@ def save_config(config: Config, use_mysql: Optional[bool] = None) -> None:
             json.dump(data, f, indent=2, ensure_ascii=False)
     except Exception as e:
         raise RuntimeError(f"Failed to save config: {e}") from e
+    
+    if _config_cache is not None:
+        _config_cache.invalidate(config)
+
+
+def get_config_cache() -> ConfigCache:
+    """
+    Get process-wide ConfigCache (singleton).
+    
+    Version check interval: env CONFIG_CACHE_CHECK_SECONDS (default 5).
+    """
+    global _config_cache
+    if _config_cache is None:
+        with _cache_lock:
+            if _config_cache is None:
+                _config_cache = ConfigCache(
+                    loader=lambda: _load_from_sources(_USE_MYSQL_CONFIG),
+                    version_probe=lambda: _probe_version(_USE_MYSQL_CONFIG),
+                    check_interval_seconds=float(
+                        os.getenv("CONFIG_CACHE_CHECK_SECONDS", str(DEFAULT_CHECK_INTERVAL_SECONDS))
+                    ),
+                    logger=StructuredLogger(name="config_cache")
+                )
+    return _config_cache
+
+
+def invalidate_config_cache(config: Optional[Config] = None) -> None:
+    """Invalidate process-wide config cache (reload ở lần đọc tiếp theo, hoặc dùng config nếu có)."""
+    get_config_cache().invalidate(config)
+
+
+def subscribe_config_changes(callback: ConfigSubscriber) -> Callable[[], None]:
+    """Đăng ký callback(new_config, old_config) khi config thay đổi. Returns hàm unsubscribe."""
+    return get_config_cache().subscribe(callback)
+
+
+def _get_config_storage() -> ConfigStorage:
+    """ConfigStorage dùng chung (tạo một lần)."""
+    global _config_storage
+    if _config_storage is None:
+        mysql_config = get_storage_config_from_env().mysql
+        _config_storage = ConfigStorage(
+            host=mysql_config.host,
+            port=mysql_config.port,
+            user=mysql_config.user,
+            password=mysql_config.password,
+            database=mysql_config.database,
+            charset=mysql_config.charset,
+            logger=StructuredLogger(name="config_storage")
+        )
+    return _config_storage
+
+
+def _load_from_sources(use_mysql: bool) -> Tuple[Config, Tuple[str, Any]]:
+    """
+    Load config theo priority MySQL -> JSON file -> defaults.
+    
+    Returns:
+        (Config, version) - version cùng format với _probe_version()
+    """
+    # Try MySQL first
+    if use_mysql:
+        try:
+            config_storage = _get_config_storage()
+            version = config_storage.get_version()
+            config = config_storage.load_config()
+            if config:
+                return config, ("mysql", version)
+        except Exception:
+            # Fall through to JSON file
+            pass
+    
+    # Fallback to JSON file
+    file_version = _file_version()
+    if file_version[1] is None:
+        return Config(), file_version
+    
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return _dict_to_config(data), file_version
+    except Exception as e:
+        # Return defaults if loading fails
+        print(f"Warning: Failed to load config: {e}, using defaults")
+        return Config(), file_version
+
+
+def _probe_version(use_mysql: bool) -> Tuple[str, Any]:
+    """Version hiện tại của nguồn config (app_config.updated_at hoặc mtime config.json)."""
+    if use_mysql:
+        try:
+            version = _get_config_storage().get_version()
+            if version is not None:
+                return ("mysql", version)
+        except Exception:
+            pass
+    return _file_version()
+
+
+def _file_version() -> Tuple[str, Any]:
+    """Version của config.json (mtime_ns, None nếu file không tồn tại)."""
+    try:
+        return ("file", CONFIG_FILE.stat().st_mtime_ns)
+    except OSError:
+        return ("file", None)
 
 
 def _config_to_dict(config: Config) -> Dict[str, Any]:
@@ -183,6 +258,8 @@ def _config_to_dict(config: Config) -> Dict[str, Any]:
             "parallel_fetch_enabled": config.analytics.parallel_fetch_enabled,
             "max_concurrent_fetches": config.analytics.max_concurrent_fetches,
             "recent_metrics_hours": config.analytics.recent_metrics_hours,
+            "metrics_write_batch_size": config.analytics.metrics_write_batch_size,
+            "metrics_write_flush_interval_seconds": config.analytics.metrics_write_flush_interval_seconds,
         },
     }
 
@@ -283,6 +360,8 @@ def _dict_to_config(data: Dict[str, Any]) -> Config:
         parallel_fetch_enabled=analytics_data.get("parallel_fetch_enabled", True),
         max_concurrent_fetches=analytics_data.get("max_concurrent_fetches", 3),
         recent_metrics_hours=analytics_data.get("recent_metrics_hours", 1),
+        metrics_write_batch_size=analytics_data.get("metrics_write_batch_size", 50),
+        metrics_write_flush_interval_seconds=analytics_data.get("metrics_write_flush_interval_seconds", 5.0),
     )
     
     mode = RunMode(data.get("mode", data.get("run_mode", "SAFE")))
@@ -44,7 +44,7 @@ def get_storage_config_from_env(
     Get storage config từ environment variables.
     
     Environment variables:
-    - STORAGE_TYPE: "json" or "mysql" (default: "json")
+    - STORAGE_TYPE: "json", "journal", "sqlite" or "mysql" (default: "json")
     - JOBS_DIR: Directory for JSON storage (default: "./jobs")
     - MYSQL_HOST: MySQL host (default: "localhost")
     - MYSQL_PORT: MySQL port (default: 3306)
@@ -7,7 +7,7 @@ Excel loader cho Threads automation.
 
 # Standard library
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 
 # Third-party
@@ -22,10 +22,6 @@ else:
 # Local
 from services.logger import StructuredLogger
 from services.exceptions import ThreadsAutomationError
-from utils.exception_utils import (
-    safe_get_exception_type_name,
-    safe_get_exception_message
-)
 
 
 class ExcelLoadError(ThreadsAutomationError):
@@ -51,6 +47,13 @@ class ExcelLoader:
     OPTIONAL_COLUMNS = ["scheduled_time", "priority", "platform", "link_aff", "cta", "note"]
     VALID_PRIORITIES = ["LOW", "NORMAL", "HIGH", "URGENT"]
     VALID_PLATFORMS = ["THREADS", "FACEBOOK"]  # Tương ứng với Platform enum
+    MAX_CONTENT_LENGTH = 500  # Threads limit (chỉ áp dụng cho content chính, không gồm link_aff)
+    # Formats scheduled_time dạng string: YYYY-MM-DD, YYYY-MM-DD HH:MM[:SS], YYYY-MM-DDTHH:MM:SS
+    SCHEDULED_TIME_PATTERN = r"\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}(?::\d{2})?|T\d{2}:\d{2}:\d{2})?"
+    # File .xlsx lớn hơn ngưỡng này được đọc bằng openpyxl read-only (streaming)
+    STREAMING_THRESHOLD_BYTES = 5 * 1024 * 1024
+    # Số dòng lỗi log chi tiết (còn lại gộp thành một dòng log)
+    MAX_LOGGED_ROW_ERRORS = 20
     
     def __init__(self, logger: Optional[StructuredLogger] = None):
         """
@@ -66,12 +69,14 @@ class ExcelLoader:
         
         self.logger = logger or StructuredLogger(name="excel_loader")
     
-    def load_from_file(self, file_path) -> List[Dict[str, Any]]:
+    def load_from_file(self, file_path, streaming: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
         Load dữ liệu từ Excel file.
         
         Args:
             file_path: Đường dẫn đến file Excel (.xlsx, .xls)
+            streaming: Đọc bằng openpyxl read-only (streaming). None = tự bật cho
+                file .xlsx lớn hơn STREAMING_THRESHOLD_BYTES
         
         Returns:
             List các dict với keys:
@@ -102,28 +107,15 @@ class ExcelLoader:
                 file_path=str(file_path)
             )
             
-            # Đọc Excel file
-            try:
-                df = pd.read_excel(file_path, engine='openpyxl' if file_path.suffix == '.xlsx' else None)
-            except PermissionError as e:
-                raise ExcelLoadError(f"Không có quyền đọc file: {str(e)}") from e
-            except (ValueError, OSError) as e:
-                # ValueError: Invalid file format, corrupted file
-                # OSError: File access issues (includes FileNotFoundError)
-                raise ExcelLoadError(f"Lỗi đọc file Excel: {str(e)}") from e
-            except Exception as e:
-                # Catch any other pandas-specific errors (EmptyDataError, etc.)
-                # Kiểm tra nếu là EmptyDataError
-                error_msg = str(e)
-                if "empty" in error_msg.lower() or "no data" in error_msg.lower():
-                    raise ExcelLoadError("File Excel rỗng, không có dữ liệu") from e
-                else:
-                    raise ExcelLoadError(f"Lỗi đọc file Excel: {error_msg}") from e
+            df = self._read_file(file_path, streaming)
             
             # Kiểm tra có dữ liệu không
             if df.empty:
                 raise ExcelLoadError("File Excel rỗng, không có dữ liệu")
             
+            # Chuẩn hóa tên cột (loại bỏ khoảng trắng, chuyển lowercase)
+            df.columns = df.columns.astype(str).str.strip().str.lower()
+            
             # Kiểm tra cột bắt buộc
             missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
             if missing_columns:
@@ -132,38 +124,18 @@ class ExcelLoader:
                     f"Các cột hiện có: {', '.join(df.columns.tolist())}"
                 )
             
-            # Chuẩn hóa tên cột (loại bỏ khoảng trắng, chuyển lowercase)
-            df.columns = df.columns.str.strip().str.lower()
-            
-            # Xử lý từng dòng
-            posts = []
-            skipped_rows = 0
             try:
-                for index, row in df.iterrows():
-                    try:
-                        post_data = self._process_row(row)  # Process row
-                        if post_data:
-                            posts.append(post_data)
-                    except Exception as e:
-                        skipped_rows += 1
-                        row_num = index + 2  # Excel row number (1-indexed + header)
-                        
-                        # Safe get error type name và message sử dụng utility functions
-                        error_type_name = safe_get_exception_type_name(e)
-                        error_msg = safe_get_exception_message(e, max_length=500)
-                        
-                        self.logger.log_step(
-                            step="LOAD_EXCEL",
-                            result="WARNING",
-                            row=row_num,
-                            error=f"Bỏ qua dòng {row_num}: {error_msg}",
-                            error_type=error_type_name
-                        )
-                        continue
+                posts_df, errors = self.process_dataframe(df)
             except Exception as e:
-                # Nếu iterrows() itself fails, wrap and re-raise
                 raise ExcelLoadError(f"Lỗi khi đọc dữ liệu từ Excel: {str(e)}") from e
             
+            error_mask = errors.notna()
+            skipped_rows = int(error_mask.sum())
+            if skipped_rows:
+                self._log_row_errors(errors[error_mask])
+            
+            posts = self._to_records(posts_df[~error_mask])
+            
             if not posts:
                 error_msg = (
                     f"Không có dòng dữ liệu hợp lệ nào trong file Excel. "
@@ -189,129 +161,259 @@ class ExcelLoader:
             # Catch any other unexpected errors
             raise ExcelLoadError(f"Lỗi không mong đợi khi đọc Excel: {str(e)}") from e
     
-    def _build_content(self, row: "pd.Series") -> str:
+    def _read_file(self, file_path: Path, streaming: Optional[bool] = None) -> "pd.DataFrame":
         """
-        Xây dựng content từ các cột.
+        Đọc Excel file thành DataFrame.
         
-        Format: content + (cta nếu có)
+        Args:
+            file_path: Đường dẫn file
+            streaming: Dùng openpyxl read-only mode (None = tự quyết theo size)
         
-        LƯU Ý: link_aff KHÔNG được append vào content nữa.
-        link_aff sẽ được post riêng trong comment của bài viết.
+        Returns:
+            DataFrame (tên cột chưa chuẩn hóa)
+        """
+        is_xlsx = file_path.suffix.lower() == '.xlsx'
+        if streaming is None:
+            streaming = is_xlsx and file_path.stat().st_size >= self.STREAMING_THRESHOLD_BYTES
+        
+        try:
+            if streaming and is_xlsx:
+                return self._read_streaming(file_path)
+            return pd.read_excel(file_path, engine='openpyxl' if is_xlsx else None)
+        except PermissionError as e:
+            raise ExcelLoadError(f"Không có quyền đọc file: {str(e)}") from e
+        except (ValueError, OSError) as e:
+            # ValueError: Invalid file format, corrupted file
+            # OSError: File access issues (includes FileNotFoundError)
+            raise ExcelLoadError(f"Lỗi đọc file Excel: {str(e)}") from e
+        except Exception as e:
+            # Catch any other pandas-specific errors (EmptyDataError, etc.)
+            error_msg = str(e)
+            if "empty" in error_msg.lower() or "no data" in error_msg.lower():
+                raise ExcelLoadError("File Excel rỗng, không có dữ liệu") from e
+            raise ExcelLoadError(f"Lỗi đọc file Excel: {error_msg}") from e
+    
+    @staticmethod
+    def _read_streaming(file_path: Path) -> "pd.DataFrame":
+        """
+        Đọc sheet đầu tiên bằng openpyxl read-only mode (không load toàn bộ workbook vào memory).
         
         Args:
-            row: Pandas Series chứa dữ liệu
+            file_path: Đường dẫn file .xlsx
         
         Returns:
-            Content đã được build (không bao gồm link_aff)
+            DataFrame (dòng đầu là header)
         """
-        content_parts = []
+        from openpyxl import load_workbook
         
-        # Content chính
-        main_content = row.get("content", "")
-        if not pd.isna(main_content) and str(main_content).strip() and str(main_content).strip().lower() != "nan":
-            content_parts.append(str(main_content).strip())
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            columns = ["" if name is None else str(name) for name in header]
+            records = list(rows)
+            # Bỏ các dòng trống ở cuối sheet (giống pd.read_excel, giữ số dòng Excel khớp)
+            while records and all(value is None for value in records[-1]):
+                records.pop()
+            df = pd.DataFrame.from_records(records, columns=columns) if records else pd.DataFrame(columns=columns)
+        finally:
+            workbook.close()
+        
+        # Bỏ cột không có header (read-only mode trả về đủ max_column)
+        return df.loc[:, [name != "" for name in df.columns]]
+    
+    def process_dataframe(self, df: "pd.DataFrame") -> Tuple["pd.DataFrame", "pd.Series"]:
+        """
+        Validate và chuẩn hóa toàn bộ DataFrame theo cột (vectorized).
         
-        # CTA (nếu có) - vẫn append vào content
-        cta = row.get("cta", "")
-        if not pd.isna(cta) and str(cta).strip() and str(cta).strip().lower() not in ["nan", ""]:
-            # Thêm CTA vào cuối content
-            content_parts.append(str(cta).strip())
+        Args:
+            df: DataFrame với tên cột đã chuẩn hóa (lowercase)
+        
+        Returns:
+            Tuple of (posts_df, errors):
+            - posts_df: cùng index với df, cột content/scheduled_time/priority/platform/link_aff
+              (None = không có giá trị)
+            - errors: Series lỗi theo dòng (None = dòng hợp lệ); `errors.notna()` là error mask
+        """
+        content = self._build_content(df)
+        link_aff = self._clean_text(self._column(df, "link_aff"))
+        scheduled_time, time_errors = self._parse_scheduled_time(self._column(df, "scheduled_time"))
+        priority, priority_errors = self._parse_choice(
+            self._column(df, "priority"), self.VALID_PRIORITIES, "Priority"
+        )
+        platform, platform_errors = self._parse_choice(
+            self._column(df, "platform"), self.VALID_PLATFORMS, "Platform"
+        )
+        
+        lengths = content.str.len()
+        empty_mask = lengths == 0
+        too_long_mask = lengths > self.MAX_CONTENT_LENGTH
+        
+        # Thứ tự ưu tiên giống validate từng dòng: content -> độ dài -> scheduled_time -> priority -> platform
+        errors = pd.Series(None, index=df.index, dtype=object)
+        errors = errors.mask(platform_errors.notna(), platform_errors)
+        errors = errors.mask(priority_errors.notna(), priority_errors)
+        errors = errors.mask(time_errors.notna(), time_errors)
+        if too_long_mask.any():
+            too_long = content[too_long_mask]
+            errors[too_long_mask] = [
+                f"Content quá dài ({len(text)} ký tự), tối đa {self.MAX_CONTENT_LENGTH} ký tự. "
+                f"Preview: {text[:100]}..."
+                for text in too_long
+            ]
+        errors[empty_mask] = "Content không được để trống (sau khi build từ content/cta)"
         
-        # Join tất cả với newline
-        final_content = "\n".join(content_parts)
+        posts_df = pd.DataFrame({
+            "content": content,
+            "scheduled_time": scheduled_time,
+            "priority": priority,
+            "platform": platform,
+            "link_aff": link_aff,
+        }, index=df.index)
         
-        return final_content
+        return posts_df, errors
     
-    def _process_row(self, row: "pd.Series") -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _column(df: "pd.DataFrame", name: str) -> "pd.Series":
+        """Lấy cột (hoặc Series rỗng nếu file không có cột đó)."""
+        if name in df.columns:
+            return df[name]
+        return pd.Series(None, index=df.index, dtype=object)
+    
+    @staticmethod
+    def _clean_text(series: "pd.Series") -> "pd.Series":
+        """
+        Chuẩn hóa cột text: strip, NaN / "" / "nan" -> None.
         """
-        Xử lý một dòng dữ liệu.
+        text = series.astype(object).where(series.notna(), "").astype(str).str.strip()
+        return text.where((text != "") & (text.str.lower() != "nan"), None)
+    
+    def _build_content(self, df: "pd.DataFrame") -> "pd.Series":
+        """
+        Xây dựng content từ các cột (vectorized).
+        
+        Format: content + (cta nếu có), nối bằng newline
+        
+        LƯU Ý: link_aff KHÔNG được append vào content nữa.
+        link_aff sẽ được post riêng trong comment của bài viết.
         
         Args:
-            row: Pandas Series chứa dữ liệu của dòng
+            df: DataFrame chứa dữ liệu
         
         Returns:
-            Dict với post data (content, link_aff riêng, ...) hoặc None nếu dòng không hợp lệ
+            Series content đã build ("" nếu cả content và cta đều trống)
         """
-        # Build content từ các cột (content + cta, KHÔNG bao gồm link_aff)
-        content = self._build_content(row)
-        
-        # Validate content
-        if not content or content.strip() == "":
-            raise ValueError("Content không được để trống (sau khi build từ content/cta)")
-        
-        # Validate độ dài (Threads limit: 500 chars)
-        # LƯU Ý: Validation chỉ áp dụng cho content chính (không bao gồm link_aff)
-        if len(content) > 500:
-            raise ValueError(
-                f"Content quá dài ({len(content)} ký tự), tối đa 500 ký tự. "
-                f"Preview: {content[:100]}..."
-            )
+        main_content = self._clean_text(self._column(df, "content"))
+        cta = self._clean_text(self._column(df, "cta"))
+        
+        content = main_content.fillna("")
+        has_cta = cta.notna()
+        content = content.where(~has_cta, content + "\n" + cta.fillna(""))
+        # Không có content chính -> chỉ CTA (không có newline thừa ở đầu)
+        return content.where(main_content.notna() | ~has_cta, cta)
+    
+    def _parse_scheduled_time(self, series: "pd.Series") -> Tuple["pd.Series", "pd.Series"]:
+        """
+        Parse scheduled_time cho toàn bộ cột trong một lần pd.to_datetime.
         
-        post_data = {
-            "content": content
-        }
+        Hỗ trợ datetime cells và strings dạng YYYY-MM-DD[( |T)HH:MM[:SS]].
         
-        # Xử lý link_aff (tùy chọn) - TÁCH RIÊNG, không append vào content
-        link_aff = row.get("link_aff", "")
-        # Debug: Log để kiểm tra
-        if link_aff is not None and not pd.isna(link_aff):
-            link_aff_str = str(link_aff).strip()
-            if link_aff_str and link_aff_str.lower() not in ["nan", ""]:
-                post_data["link_aff"] = link_aff_str
-                self.logger.log_step(
-                    step="PROCESS_EXCEL_ROW",
-                    result="INFO",
-                    note=f"Found link_aff in row: {link_aff_str[:50]}..."
-                )
+        Returns:
+            Tuple of (scheduled_time Series datetime/None, errors Series)
+        """
+        errors = pd.Series(None, index=series.index, dtype=object)
         
-        # Xử lý scheduled_time (tùy chọn)
-        scheduled_time = row.get('scheduled_time', None)
-        if not pd.isna(scheduled_time) and scheduled_time != '':
-            try:
-                # Hỗ trợ nhiều format
-                if isinstance(scheduled_time, datetime):
-                    post_data["scheduled_time"] = scheduled_time
-                elif isinstance(scheduled_time, str):
-                    scheduled_time_str = scheduled_time.strip()
-                    # Thử các format
-                    for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"]:
-                        try:
-                            post_data["scheduled_time"] = datetime.strptime(scheduled_time_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        raise ValueError(f"Không thể parse scheduled_time: {scheduled_time_str}")
-                else:
-                    # Nếu là pandas Timestamp
-                    post_data["scheduled_time"] = scheduled_time.to_pydatetime()
-            except Exception as e:
-                raise ValueError(f"Scheduled_time không hợp lệ: {str(e)}")
-        
-        # Xử lý priority (tùy chọn)
-        priority = row.get('priority', None)
-        if not pd.isna(priority) and priority != '':
-            priority_str = str(priority).strip().upper()
-            if priority_str not in self.VALID_PRIORITIES:
-                raise ValueError(
-                    f"Priority không hợp lệ: {priority_str}. "
-                    f"Giá trị hợp lệ: {', '.join(self.VALID_PRIORITIES)}"
-                )
-            post_data["priority"] = priority_str
-        
-        # Xử lý platform (tùy chọn) - backward compatible: default THREADS nếu không có
-        platform = row.get('platform', None)
-        if not pd.isna(platform) and platform != '':
-            platform_str = str(platform).strip().upper()
-            if platform_str not in self.VALID_PLATFORMS:
-                raise ValueError(
-                    f"Platform không hợp lệ: {platform_str}. "
-                    f"Giá trị hợp lệ: {', '.join(self.VALID_PLATFORMS)}"
+        if pd.api.types.is_datetime64_any_dtype(series):
+            parsed = series
+            invalid = pd.Series(False, index=series.index)
+        else:
+            values = series.astype(object)
+            present = values.notna() & (values != '')
+            is_datetime = values.map(lambda value: isinstance(value, datetime))
+            is_string = values.map(lambda value: isinstance(value, str))
+            
+            strings = values[is_string & present].str.strip()
+            well_formed = strings.str.fullmatch(self.SCHEDULED_TIME_PATTERN)
+            
+            parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+            if well_formed.any():
+                parsed[well_formed[well_formed].index] = pd.to_datetime(
+                    strings[well_formed], format="ISO8601", errors="coerce"
                 )
-            post_data["platform"] = platform_str
-        # Nếu không có platform, không thêm vào post_data - scheduler sẽ dùng default THREADS
+            if is_datetime.any():
+                parsed[is_datetime] = pd.to_datetime(values[is_datetime])
+            
+            invalid = present & parsed.isna()
+            if invalid.any():
+                errors[invalid] = [
+                    f"Scheduled_time không hợp lệ: Không thể parse scheduled_time: "
+                    f"{value.strip() if isinstance(value, str) else value}"
+                    for value in values[invalid]
+                ]
+        
+        scheduled_time = pd.Series(
+            parsed.dt.to_pydatetime(), index=series.index, dtype=object
+        ).where(parsed.notna(), None)
+        return scheduled_time, errors
+    
+    @staticmethod
+    def _parse_choice(series: "pd.Series", valid_values: List[str], label: str) -> Tuple["pd.Series", "pd.Series"]:
+        """
+        Chuẩn hóa cột enum (strip + upper) và validate theo danh sách giá trị hợp lệ.
         
-        return post_data
+        Returns:
+            Tuple of (values Series, errors Series)
+        """
+        values = series.astype(object)
+        present = values.notna() & (values != '')
+        normalized = values.where(present, "").astype(str).str.strip().str.upper()
+        invalid = present & ~normalized.isin(valid_values)
+        
+        errors = pd.Series(None, index=series.index, dtype=object)
+        if invalid.any():
+            errors[invalid] = [
+                f"{label} không hợp lệ: {value}. Giá trị hợp lệ: {', '.join(valid_values)}"
+                for value in normalized[invalid]
+            ]
+        return normalized.where(present, None), errors
+    
+    def _log_row_errors(self, errors: "pd.Series") -> None:
+        """Log các dòng bị bỏ qua (tối đa MAX_LOGGED_ROW_ERRORS dòng, còn lại gộp)."""
+        for index, error_msg in errors.head(self.MAX_LOGGED_ROW_ERRORS).items():
+            row_num = index + 2  # Excel row number (1-indexed + header)
+            self.logger.log_step(
+                step="LOAD_EXCEL",
+                result="WARNING",
+                row=row_num,
+                error=f"Bỏ qua dòng {row_num}: {error_msg[:500]}",
+                error_type="ValueError"
+            )
+        
+        remaining = len(errors) - self.MAX_LOGGED_ROW_ERRORS
+        if remaining > 0:
+            self.logger.log_step(
+                step="LOAD_EXCEL",
+                result="WARNING",
+                error=f"Bỏ qua thêm {remaining} dòng không hợp lệ",
+                skipped_rows=len(errors)
+            )
+    
+    @staticmethod
+    def _to_records(posts_df: "pd.DataFrame") -> List[Dict[str, Any]]:
+        """
+        Chuyển DataFrame các dòng hợp lệ thành list dict (chỉ giữ keys có giá trị).
+        """
+        optional_columns = ["link_aff", "scheduled_time", "priority", "platform"]
+        posts = []
+        for values in zip(posts_df["content"], *(posts_df[col] for col in optional_columns)):
+            post_data = {"content": values[0]}
+            for col, value in zip(optional_columns, values[1:]):
+                if value is not None and not pd.isna(value):
+                    post_data[col] = value
+            posts.append(post_data)
+        return posts
     
     @staticmethod
     def create_template(output_path) -> None:
@@ -24,6 +24,38 @@ CREATE TABLE IF NOT EXISTS thread_metrics (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
 COMMENT='Thread metrics (views, likes, replies, reposts, shares) over time';
 
+-- Rollup: latest metrics per thread (maintained by MetricsStorage.save_metrics)
+CREATE TABLE IF NOT EXISTS thread_metrics_latest (
+    thread_id VARCHAR(255) PRIMARY KEY,
+    account_id VARCHAR(255) NOT NULL,
+    views INT DEFAULT NULL COMMENT 'Lượt xem',
+    likes INT NOT NULL DEFAULT 0 COMMENT 'Thích',
+    replies INT NOT NULL DEFAULT 0 COMMENT 'Trả lời',
+    reposts INT NOT NULL DEFAULT 0 COMMENT 'Đăng lại',
+    shares INT NOT NULL DEFAULT 0 COMMENT 'Chia sẻ',
+    engagement INT NOT NULL DEFAULT 0 COMMENT 'likes + replies + shares',
+    fetched_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    INDEX idx_account_fetched (account_id, fetched_at),
+    INDEX idx_account_engagement (account_id, engagement)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Rollup: latest metrics per thread (maintained by MetricsStorage.save_metrics)';
+
+-- Rollup: daily metrics aggregates per account
+CREATE TABLE IF NOT EXISTS account_metrics_daily (
+    account_id VARCHAR(255) NOT NULL,
+    metric_date DATE NOT NULL,
+    max_likes INT NOT NULL DEFAULT 0,
+    max_replies INT NOT NULL DEFAULT 0,
+    max_engagement INT NOT NULL DEFAULT 0,
+    samples INT NOT NULL DEFAULT 0 COMMENT 'Số lần fetch trong ngày',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (account_id, metric_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Rollup: daily metrics aggregates per account (maintained by MetricsStorage.save_metrics)';
+
 -- Jobs Table (THAY THẾ JSON files)
 CREATE TABLE IF NOT EXISTS jobs (
     job_id VARCHAR(255) PRIMARY KEY,
@@ -54,7 +86,9 @@ CREATE TABLE IF NOT EXISTS jobs (
     INDEX idx_status_scheduled (status, scheduled_time),
     INDEX idx_platform (platform),
     INDEX idx_job_type (job_type),
-    INDEX idx_account_job_type (account_id, job_type)
+    INDEX idx_account_job_type (account_id, job_type),
+    INDEX idx_status_priority_order (status, priority, scheduled_time, job_id),
+    INDEX idx_account_status_priority_order (account_id, status, priority, scheduled_time, job_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
 COMMENT='All scheduled jobs (replaces JSON files) - supports both POST and ENGAGEMENT jobs';
 
@@ -250,7 +284,7 @@ CREATE TABLE IF NOT EXISTS feed_items (
     account_id VARCHAR(255) NOT NULL,
     username VARCHAR(255) NOT NULL,
     text TEXT,
-    like_count INT DEFAULT 0,
+    like_count INT NOT NULL DEFAULT 0,
     reply_count INT DEFAULT 0,
     repost_count INT DEFAULT 0,
     share_count INT DEFAULT 0,
@@ -276,6 +310,10 @@ CREATE TABLE IF NOT EXISTS feed_items (
     fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'When this feed item was fetched',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    search_text TEXT GENERATED ALWAYS AS (
+        CONCAT_WS(' ', username, user_display_name, text,
+                  CAST(hashtags AS CHAR), CAST(mentions AS CHAR))
+    ) STORED COMMENT 'Search document (username + display name + text + hashtags + mentions)',
     
     UNIQUE KEY unique_post_account_fetch (post_id, account_id, fetched_at),
     INDEX idx_post_id (post_id),
@@ -284,9 +322,27 @@ CREATE TABLE IF NOT EXISTS feed_items (
     INDEX idx_timestamp (timestamp),
     INDEX idx_fetched_at (fetched_at),
     INDEX idx_account_fetched (account_id, fetched_at),
+    INDEX idx_account_fetched_id (account_id, fetched_at, id),
+    INDEX idx_fetched_id (fetched_at, id),
+    INDEX idx_account_likes_id (account_id, like_count, id),
+    INDEX idx_likes_id (like_count, id),
     INDEX idx_thread_id (thread_id),
     INDEX idx_is_reply (is_reply),
     INDEX idx_parent_post_id (parent_post_id),
-    FULLTEXT INDEX idx_text_fulltext (text)
+    FULLTEXT INDEX idx_text_fulltext (text),
+    FULLTEXT INDEX idx_search_fulltext (search_text)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
 COMMENT='Feed items fetched from Threads (with history tracking)';
+
+-- User Profiles Table (avatar/display name mới nhất, maintained by FeedStorage.save_feed_items)
+CREATE TABLE IF NOT EXISTS user_profiles (
+    user_id VARCHAR(255) PRIMARY KEY,
+    username VARCHAR(255) NULL DEFAULT NULL,
+    display_name VARCHAR(255) NULL DEFAULT NULL,
+    avatar_url TEXT NULL DEFAULT NULL,
+    is_verified BOOLEAN DEFAULT FALSE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    INDEX idx_username (username)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Latest user profile data from feed items (maintained by FeedStorage.save_feed_items)';
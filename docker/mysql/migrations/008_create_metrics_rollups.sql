@@ -0,0 +1,72 @@
+-- Migration 008: Create metrics rollup tables
+-- Date: 2026-10
+-- Description: Materialized rollups cho account dashboard.
+--               - thread_metrics_latest: metrics mới nhất của mỗi thread
+--               - account_metrics_daily: aggregate theo ngày cho mỗi account
+--               Được cập nhật incremental bởi MetricsStorage.save_metrics,
+--               dashboard đọc từ đây thay vì quét toàn bộ thread_metrics.
+
+-- Latest metrics per thread
+CREATE TABLE IF NOT EXISTS thread_metrics_latest (
+    thread_id VARCHAR(255) PRIMARY KEY,
+    account_id VARCHAR(255) NOT NULL,
+    views INT DEFAULT NULL COMMENT 'Lượt xem',
+    likes INT NOT NULL DEFAULT 0 COMMENT 'Thích',
+    replies INT NOT NULL DEFAULT 0 COMMENT 'Trả lời',
+    reposts INT NOT NULL DEFAULT 0 COMMENT 'Đăng lại',
+    shares INT NOT NULL DEFAULT 0 COMMENT 'Chia sẻ',
+    engagement INT NOT NULL DEFAULT 0 COMMENT 'likes + replies + shares',
+    fetched_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    INDEX idx_account_fetched (account_id, fetched_at),
+    INDEX idx_account_engagement (account_id, engagement)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Rollup: latest metrics per thread (maintained by MetricsStorage.save_metrics)';
+
+-- Daily aggregates per account (max per day, same semantics as dashboard charts)
+CREATE TABLE IF NOT EXISTS account_metrics_daily (
+    account_id VARCHAR(255) NOT NULL,
+    metric_date DATE NOT NULL,
+    max_likes INT NOT NULL DEFAULT 0,
+    max_replies INT NOT NULL DEFAULT 0,
+    max_engagement INT NOT NULL DEFAULT 0,
+    samples INT NOT NULL DEFAULT 0 COMMENT 'Số lần fetch trong ngày',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (account_id, metric_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Rollup: daily metrics aggregates per account (maintained by MetricsStorage.save_metrics)';
+
+-- Backfill thread_metrics_latest từ history hiện có
+INSERT INTO thread_metrics_latest
+    (thread_id, account_id, views, likes, replies, reposts, shares, engagement, fetched_at)
+SELECT thread_id, account_id, views, likes, replies, reposts, shares,
+       likes + replies + shares, fetched_at
+FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY thread_id ORDER BY fetched_at DESC) as rn
+    FROM thread_metrics
+) m
+WHERE m.rn = 1
+ON DUPLICATE KEY UPDATE
+    account_id = VALUES(account_id),
+    views = VALUES(views),
+    likes = VALUES(likes),
+    replies = VALUES(replies),
+    reposts = VALUES(reposts),
+    shares = VALUES(shares),
+    engagement = VALUES(engagement),
+    fetched_at = VALUES(fetched_at);
+
+-- Backfill account_metrics_daily từ history hiện có
+INSERT INTO account_metrics_daily
+    (account_id, metric_date, max_likes, max_replies, max_engagement, samples)
+SELECT account_id, DATE(fetched_at), MAX(likes), MAX(replies),
+       MAX(likes + replies + shares), COUNT(*)
+FROM thread_metrics
+GROUP BY account_id, DATE(fetched_at)
+ON DUPLICATE KEY UPDATE
+    max_likes = VALUES(max_likes),
+    max_replies = VALUES(max_replies),
+    max_engagement = VALUES(max_engagement),
+    samples = VALUES(samples);
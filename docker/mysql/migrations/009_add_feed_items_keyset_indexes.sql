@@ -0,0 +1,20 @@
+-- Migration 009: Add keyset pagination indexes to feed_items
+-- Date: 2026-10
+-- Description: Composite indexes cho cursor-based pagination của saved feed.
+--               FeedStorage.get_feed_items sort theo (fetched_at, id) hoặc (like_count, id)
+--               và seek bằng cursor thay vì OFFSET, nên mỗi page chỉ đọc `limit` rows
+--               trên index bất kể page sâu tới đâu.
+--               like_count (nullable từ migration 005) được backfill và đổi sang NOT NULL:
+--               predicate `like_count < ?` không match NULL nên rows NULL sẽ biến mất
+--               khỏi mọi page sau page đầu.
+
+UPDATE feed_items SET like_count = 0 WHERE like_count IS NULL;
+
+ALTER TABLE feed_items
+    MODIFY COLUMN like_count INT NOT NULL DEFAULT 0;
+
+ALTER TABLE feed_items
+    ADD INDEX idx_account_fetched_id (account_id, fetched_at, id),
+    ADD INDEX idx_fetched_id (fetched_at, id),
+    ADD INDEX idx_account_likes_id (account_id, like_count, id),
+    ADD INDEX idx_likes_id (like_count, id);
@@ -0,0 +1,15 @@
+-- Migration 010: Add full-text search index to feed_items
+-- Date: 2026-10
+-- Description: Cột generated `search_text` gộp username, display name, text,
+--               hashtags và mentions, kèm FULLTEXT index cho search có xếp hạng.
+--               FeedStorage.get_feed_items(filters={"search": ...}) dùng
+--               MATCH(search_text) AGAINST (... IN BOOLEAN MODE) thay vì LIKE '%...%'.
+
+ALTER TABLE feed_items
+    ADD COLUMN search_text TEXT GENERATED ALWAYS AS (
+        CONCAT_WS(' ', username, user_display_name, text,
+                  CAST(hashtags AS CHAR), CAST(mentions AS CHAR))
+    ) STORED COMMENT 'Search document (username + display name + text + hashtags + mentions)';
+
+ALTER TABLE feed_items
+    ADD FULLTEXT INDEX idx_search_fulltext (search_text);
@@ -0,0 +1,33 @@
+-- Migration 011: Create user_profiles table
+-- Date: 2026-10
+-- Description: Avatar URL / display name mới nhất của mỗi user.
+--               Được upsert bởi FeedStorage.save_feed_items trong cùng transaction với
+--               feed_items; FeedStorage.get_avatar_url lookup theo primary key
+--               thay vì quét 100 feed items gần nhất.
+
+CREATE TABLE IF NOT EXISTS user_profiles (
+    user_id VARCHAR(255) PRIMARY KEY,
+    username VARCHAR(255) NULL DEFAULT NULL,
+    display_name VARCHAR(255) NULL DEFAULT NULL,
+    avatar_url TEXT NULL DEFAULT NULL,
+    is_verified BOOLEAN DEFAULT FALSE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    INDEX idx_username (username)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Latest user profile data from feed items (maintained by FeedStorage.save_feed_items)';
+
+-- Backfill từ feed_items hiện có (row mới nhất có avatar của mỗi user)
+INSERT INTO user_profiles (user_id, username, display_name, avatar_url, is_verified)
+SELECT user_id, username, user_display_name, user_avatar_url, is_verified
+FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY fetched_at DESC, id DESC) as rn
+    FROM feed_items
+    WHERE user_avatar_url IS NOT NULL
+) f
+WHERE f.rn = 1
+ON DUPLICATE KEY UPDATE
+    username = VALUES(username),
+    display_name = VALUES(display_name),
+    avatar_url = VALUES(avatar_url),
+    is_verified = VALUES(is_verified);
@@ -0,0 +1,11 @@
+-- Migration 012: Add job list order indexes to jobs
+-- Date: 2026-10
+-- Description: Composite indexes cho danh sách jobs (build_job_query_sql) sort theo
+--               priority DESC, scheduled_time DESC, job_id DESC.
+--               Page filter theo status hoặc account_id + status đọc thẳng theo thứ tự
+--               index (không filesort) và seek bằng cursor
+--               (priority, scheduled_time, job_id) < (?, ?, ?).
+
+ALTER TABLE jobs
+    ADD INDEX idx_status_priority_order (status, priority, scheduled_time, job_id),
+    ADD INDEX idx_account_status_priority_order (account_id, status, priority, scheduled_time, job_id);
@@ -740,8 +740,9 @@ export function useFeed() {
    * @param {string} [options.account_id] - Account ID filter
    * @param {number} [options.limit] - Limit number of results
    * @param {number} [options.offset] - Offset for pagination
+   * @param {string} [options.cursor] - Keyset cursor from previous page (meta.next_cursor)
    * @param {Object} [options.filters] - Feed filters (min_likes, max_likes, min_replies, etc.)
-   * @returns {Promise<Object>} Object with items and metadata { items, total, filtered_total }
+   * @returns {Promise<Object>} Object with items and metadata { items, total, filtered_total, next_cursor }
    */
   const loadSavedFeed = async (options = {}) => {
     const stackTrace = new Error().stack
@@ -764,6 +765,7 @@ export function useFeed() {
         account_id: options.account_id || accountId.value,
         limit: options.limit || 100,
         offset: options.offset || 0,
+        cursor: options.cursor,
         filters: options.filters
       })
       console.log('[useFeed] loadSavedFeed: Successfully received response from /api/feed/saved', response)
@@ -871,6 +873,7 @@ export function useFeed() {
         items,
         total,
         filtered_total,
+        next_cursor: meta?.next_cursor || null,
         meta
       }
       
@@ -748,12 +748,13 @@ class FeedService extends BaseService {
    * @param {string} [options.account_id] - Account ID filter
    * @param {number} [options.limit] - Limit number of results
    * @param {number} [options.offset] - Offset for pagination
+   * @param {string} [options.cursor] - Keyset cursor from previous page (meta.next_cursor), preferred over offset
    * @param {Object} [options.filters] - Feed filters (min_likes, max_likes, min_replies, etc.)
    * @returns {Promise<Object>} API response with saved feed data
    */
   async getSavedFeed(options = {}) {
     const stackTrace = new Error().stack
-    const { account_id, limit, offset } = options
+    const { account_id, limit, offset, cursor } = options
     console.error('[DEBUG] feedService.getSavedFeed CALLED - Database only, NO browser', {
       options,
       stackTrace: stackTrace?.split('\n').slice(0,15).join(' | ')
@@ -763,6 +764,7 @@ class FeedService extends BaseService {
     if (account_id) params.account_id = account_id
     if (limit !== undefined) params.limit = limit
     if (offset !== undefined) params.offset = offset
+    if (cursor) params.cursor = cursor
     // Add filter parameters if provided
     if (options.filters) {
       Object.assign(params, options.filters)
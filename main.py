@@ -17,24 +17,10 @@ import asyncio
 from typing import Optional, Callable
 
 # Local
-from browser.manager import BrowserManager
-from browser.login_guard import LoginGuard
-from threads.composer import ThreadComposer
+# Handlers (và pandas/Playwright phía sau) được import lazy theo command
 from config import Config, RunMode
+from cli import commands
 from cli.parser import create_parser
-from cli.commands import (
-    handle_create_template,
-    handle_excel_posts,
-    handle_list_jobs,
-    handle_remove_job,
-    handle_reset_jobs,
-    handle_reset_status,
-    handle_delete_job_file,
-    handle_reset_job_file,
-    handle_post_thread,
-    handle_schedule_job,
-    handle_scheduler,
-)
 
 
 async def post_thread_callback(
@@ -55,6 +41,10 @@ async def post_thread_callback(
     Returns:
         PostResult
     """
+    from browser.manager import BrowserManager
+    from browser.login_guard import LoginGuard
+    from threads.composer import ThreadComposer
+    
     config = Config(mode=RunMode.SAFE)
     
     # Create WebSocketLogger for realtime logging
@@ -132,7 +122,7 @@ async def main():
     
     # Route commands đến các handlers
     if args.create_template:
-        handle_create_template(args.create_template)
+        commands.handle_create_template(args.create_template)
         return
     
     # Validate account (bắt buộc cho các lệnh khác)
@@ -141,42 +131,42 @@ async def main():
     
     # Excel commands
     if args.excel:
-        await handle_excel_posts(args.excel, args.account, config)
+        await commands.handle_excel_posts(args.excel, args.account, config)
         return
     
     # Job management commands
     if args.list_jobs:
-        handle_list_jobs(args.account)
+        commands.handle_list_jobs(args.account)
         return
     
     if args.remove_job:
-        handle_remove_job(args.remove_job)
+        commands.handle_remove_job(args.remove_job)
         return
     
     if args.reset_jobs:
-        handle_reset_jobs(args.account)
+        commands.handle_reset_jobs(args.account)
         return
     
     if args.reset_status:
-        handle_reset_status(args.reset_status, args.account)
+        commands.handle_reset_status(args.reset_status, args.account)
         return
     
     if args.delete_job_file:
-        handle_delete_job_file(args.delete_job_file)
+        commands.handle_delete_job_file(args.delete_job_file)
         return
     
     if args.reset_job_file:
-        handle_reset_job_file(args.reset_job_file)
+        commands.handle_reset_job_file(args.reset_job_file)
         return
     
     # Scheduler command
     if args.scheduler:
-        await handle_scheduler(args.account, post_thread_callback)
+        await commands.handle_scheduler(args.account, post_thread_callback)
         return
     
     # Schedule job command
     if args.schedule:
-        handle_schedule_job(args.account, args.content, args.schedule, args.priority)
+        commands.handle_schedule_job(args.account, args.content, args.schedule, args.priority)
         return
     
     # Post thread command (default)
@@ -184,7 +174,7 @@ async def main():
         print("❌ Cần --content để đăng bài hoặc --schedule để lên lịch.")
         return
     
-    await handle_post_thread(args.account, args.content, config)
+    await commands.handle_post_thread(args.account, args.content, config)
 
 
 if __name__ == "__main__":
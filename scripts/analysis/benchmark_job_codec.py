@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark ScheduledJob codec (services/scheduler/job_codec.py).
+
+So sánh với đường cũ (dataclasses.asdict + Enum(value) + FastAPI jsonable_encoder):
+- load: storage dict -> ScheduledJob
+- to_dict: ScheduledJob -> storage dict
+- serialize: ScheduledJob -> /api/jobs JSON bytes
+
+Usage:
+    python -m scripts.analysis.benchmark_job_codec --jobs 100000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+# Setup path using common utility
+from scripts.common import setup_path, print_header
+
+# Add parent directory to path (must be after importing common)
+setup_path()
+
+from services.scheduler.job_codec import ORJSON_AVAILABLE, encode_json, job_from_row, job_to_dict
+from services.scheduler.models import JobPriority, JobStatus, JobType, Platform, ScheduledJob
+from backend.api.adapters.job_serializer import serialize_job
+
+try:
+    from fastapi.encoders import jsonable_encoder
+    FASTAPI_AVAILABLE = True
+except ImportError:
+    FASTAPI_AVAILABLE = False
+
+
+# ============================================================================
+# LEGACY REFERENCE (conversion trước khi có job_codec)
+# ============================================================================
+
+def legacy_from_dict(data: Dict[str, Any]) -> ScheduledJob:
+    """ScheduledJob.from_dict cũ: copy dict, Enum(value) với try/except, kwargs constructor."""
+    job_data = data.copy()
+    if isinstance(job_data.get("scheduled_time"), str):
+        job_data["scheduled_time"] = datetime.fromisoformat(job_data["scheduled_time"])
+    for name in ("created_at", "completed_at", "started_at"):
+        try:
+            if isinstance(job_data.get(name), str):
+                job_data[name] = datetime.fromisoformat(job_data[name])
+        except (ValueError, TypeError):
+            job_data[name] = None
+    for name, enum_cls, types, default in (
+        ("priority", JobPriority, (int, str), JobPriority.NORMAL),
+        ("status", JobStatus, (str,), JobStatus.SCHEDULED),
+        ("platform", Platform, (str,), Platform.THREADS),
+        ("job_type", JobType, (str,), JobType.POST),
+    ):
+        try:
+            value = job_data.get(name)
+            if isinstance(value, enum_cls):
+                job_data[name] = value
+            elif isinstance(value, types):
+                job_data[name] = enum_cls(value)
+            else:
+                job_data[name] = default
+        except (ValueError, KeyError, TypeError):
+            job_data[name] = default
+    engagement_data = job_data.get("engagement_data")
+    job_data["engagement_data"] = json.loads(engagement_data) if isinstance(engagement_data, str) and engagement_data else None
+    return ScheduledJob(**job_data)
+
+
+def legacy_to_dict(job: ScheduledJob) -> Dict[str, Any]:
+    """ScheduledJob.to_dict cũ: asdict (deepcopy) rồi convert từng field."""
+    data = asdict(job)
+    for name in ("scheduled_time", "created_at", "completed_at", "started_at"):
+        if isinstance(data.get(name), datetime):
+            data[name] = data[name].isoformat()
+    for name in ("priority", "status", "platform", "job_type"):
+        value = getattr(job, name)
+        data[name] = value.value if hasattr(value, "value") else str(value)
+    data["engagement_data"] = json.dumps(job.engagement_data, ensure_ascii=False) if job.engagement_data is not None else None
+    return data
+
+
+def legacy_api_response(jobs: List[ScheduledJob]) -> bytes:
+    """FastAPI default: serialize_job -> jsonable_encoder -> json.dumps."""
+    payload = {"success": True, "data": [serialize_job(job) for job in jobs]}
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False).encode("utf-8")
+
+
+def codec_api_response(jobs: List[ScheduledJob]) -> bytes:
+    """Route mới: serialize_job -> encode_json."""
+    return encode_json({"success": True, "data": [serialize_job(job) for job in jobs]})
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def build_jobs(count: int) -> List[ScheduledJob]:
+    """Tạo jobs mẫu (mix status, engagement_data, datetimes)."""
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    statuses = list(JobStatus)
+    return [
+        ScheduledJob(
+            job_id=f"job_{i:06d}",
+            account_id=f"account_{i % 20:02d}",
+            content=f"Nội dung bài viết số {i} " * 5,
+            scheduled_time=base + timedelta(minutes=i),
+            priority=JobPriority.NORMAL,
+            status=statuses[i % len(statuses)],
+            engagement_data={"like_criteria": {"min_likes": i % 50}} if i % 10 == 0 else None,
+            created_at=base,
+            started_at=base + timedelta(minutes=i) if i % 3 == 0 else None,
+            completed_at=base + timedelta(minutes=i + 1) if i % 3 == 0 else None,
+            error="Timeout" if i % 17 == 0 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Thời gian tốt nhất (giây) sau `repeat` lần chạy, GC tắt trong lúc đo."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark ScheduledJob codec")
+    parser.add_argument('--jobs', type=int, default=100000, help='Number of jobs')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print_header(f"SCHEDULED JOB CODEC BENCHMARK ({args.jobs} jobs, orjson={'yes' if ORJSON_AVAILABLE else 'no'})")
+
+    jobs = build_jobs(args.jobs)
+    rows = [job_to_dict(job) for job in jobs]
+    assert rows[:1000] == [legacy_to_dict(job) for job in jobs[:1000]], "job_to_dict output differs from legacy"
+    assert [job_to_dict(job_from_row(row)) for row in rows[:1000]] == rows[:1000], "job_from_row round trip differs"
+
+    cases = [
+        ("load (dict -> job)", lambda: [legacy_from_dict(row) for row in rows], lambda: [job_from_row(row) for row in rows]),
+        ("to_dict (job -> dict)", lambda: [legacy_to_dict(job) for job in jobs], lambda: [job_to_dict(job) for job in jobs]),
+    ]
+    if FASTAPI_AVAILABLE:
+        assert json.loads(legacy_api_response(jobs[:1000])) == json.loads(codec_api_response(jobs[:1000]))
+        cases.append(("serialize (/api/jobs)", lambda: legacy_api_response(jobs), lambda: codec_api_response(jobs)))
+    else:
+        print("fastapi not installed - skipping /api/jobs serialize benchmark")
+
+    print(f"{'case':<24} {'legacy (s)':>12} {'codec (s)':>12} {'speedup':>10}")
+    for name, legacy, codec in cases:
+        legacy_time = best_of(legacy, args.repeat)
+        codec_time = best_of(codec, args.repeat)
+        print(f"{name:<24} {legacy_time:>12.3f} {codec_time:>12.3f} {legacy_time / codec_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Đã hủy bởi user")
+        sys.exit(1)
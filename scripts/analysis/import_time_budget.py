@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Import-time budget cho CLI và backend entry points.
+
+Chạy `python -X importtime -c "import <module>"` trong subprocess sạch cho từng target,
+parse output (stderr) và fail (exit 1) nếu:
+- cumulative import time vượt budget của target
+- target kéo theo module nặng bị cấm (pandas, playwright, ...) lúc import
+
+Usage:
+    python -m scripts.analysis.import_time_budget
+    python -m scripts.analysis.import_time_budget --repeat 5 --scale 2.0
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Setup path using common utility
+from scripts.common import setup_path, print_header
+
+# Add parent directory to path (must be after importing common)
+PROJECT_ROOT = setup_path()
+
+# Module nặng chỉ được load khi command/route thực sự cần
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "playwright", "psutil")
+
+
+@dataclass(frozen=True)
+class ImportBudget:
+    """Budget import-time cho một module entry point."""
+    module: str
+    budget_ms: float
+    forbidden: Tuple[str, ...] = HEAVY_MODULES
+
+
+@dataclass
+class ImportResult:
+    """Kết quả đo import-time của một target."""
+    budget: ImportBudget
+    cumulative_ms: float
+    loaded: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def forbidden_loaded(self) -> List[str]:
+        return sorted(
+            name for name in self.budget.forbidden
+            if name in self.loaded
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.cumulative_ms <= self.budget.budget_ms and not self.forbidden_loaded
+
+
+# CLI commands phải start dưới 1s; budget ở đây là phần import (trước khi command chạy)
+DEFAULT_BUDGETS = (
+    ImportBudget("main", 400),
+    ImportBudget("cli.parser", 100),
+    ImportBudget("cli.commands.jobs", 400),
+    ImportBudget("cli.commands.schedule", 400),
+    ImportBudget("cli.commands.excel", 400),
+    ImportBudget("services.scheduler.models", 150),
+    ImportBudget("backend.api.dependencies", 300),
+)
+
+# "import time:       123 |        456 |   package.module"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(output: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Parse output của `python -X importtime`.
+
+    Args:
+        output: stderr của interpreter
+
+    Returns:
+        (tổng cumulative ms của các import top-level, {module: cumulative ms})
+    """
+    total_us = 0
+    modules: Dict[str, float] = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us = int(match.group(2))
+        indent, name = match.group(3), match.group(4)
+        modules[name] = cumulative_us / 1000
+        # Top-level import: đúng 1 space sau "|" (nested imports thụt thêm 2 spaces mỗi cấp)
+        if len(indent) == 1:
+            total_us += cumulative_us
+    return total_us / 1000, modules
+
+
+def _top_level_names(modules: Sequence[str]) -> List[str]:
+    return sorted({name.split(".", 1)[0] for name in modules})
+
+
+def measure(budget: ImportBudget, repeat: int = 3) -> ImportResult:
+    """Đo import-time của budget.module (best of repeat, mỗi lần một interpreter mới)."""
+    best_ms: Optional[float] = None
+    loaded: List[str] = []
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {budget.module}"],
+            cwd=str(PROJECT_ROOT),
+            capture_output=True,
+            text=True
+        )
+        if proc.returncode != 0:
+            last_line = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            return ImportResult(budget, 0.0, error=last_line[0])
+        total_ms, modules = parse_importtime(proc.stderr)
+        loaded = _top_level_names(list(modules))
+        if best_ms is None or total_ms < best_ms:
+            best_ms = total_ms
+    return ImportResult(budget, best_ms or 0.0, loaded=loaded)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check import-time budget of CLI/backend entry points")
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per target (best is reported)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply all budgets (slow CI machines)')
+    parser.add_argument('modules', nargs='*', help='Only check these modules')
+    args = parser.parse_args()
+
+    budgets = [
+        ImportBudget(b.module, b.budget_ms * args.scale, b.forbidden)
+        for b in DEFAULT_BUDGETS
+        if not args.modules or b.module in args.modules
+    ]
+
+    print_header(f"IMPORT TIME BUDGET (best of {args.repeat}, scale={args.scale})")
+    print(f"{'module':<32} {'import (ms)':>12} {'budget (ms)':>12}  status")
+
+    failed = 0
+    for budget in budgets:
+        result = measure(budget, args.repeat)
+        if result.error:
+            status = f"ERROR: {result.error}"
+        elif result.forbidden_loaded:
+            status = f"FAIL: loads {', '.join(result.forbidden_loaded)}"
+        elif not result.ok:
+            status = "FAIL: over budget"
+        else:
+            status = "ok"
+        failed += 0 if result.ok else 1
+        print(f"{budget.module:<32} {result.cumulative_ms:>12.1f} {budget.budget_ms:>12.0f}  {status}")
+
+    if failed:
+        print(f"\n❌ {failed}/{len(budgets)} target(s) vượt import-time budget")
+        sys.exit(1)
+    print(f"\n✅ {len(budgets)} target(s) trong budget")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Đã hủy bởi user")
+        sys.exit(1)
@@ -1,14 +1,25 @@
 """
 Services module for Threads automation.
+
+Path setup dùng chung: project root được đặt ở đầu sys.path một lần tại đây,
+trước khi bất kỳ sub-module nào được import, để `utils`, `config`, ... luôn
+resolve về packages của project. Sub-modules không tự sửa sys.path.
+
+Exports được import lazy để `import services.<module>` không kéo theo
+logger/safety guard khi không dùng tới.
 """
 
-from services.logger import StructuredLogger
-from services.safety_guard import (
-    SafetyGuard,
-    SafetyConfig,
-    AccountHealth,
-    RiskLevel
-)
+import sys
+from pathlib import Path
+
+_project_root = str(Path(__file__).resolve().parent.parent)
+if not sys.path or sys.path[0] != _project_root:
+    if _project_root in sys.path:
+        sys.path.remove(_project_root)
+    sys.path.insert(0, _project_root)
+
+# Import sau path setup: `utils` phải resolve về package của project
+from utils.lazy_exports import lazy_exports
 
 __all__ = [
     "StructuredLogger",
@@ -18,3 +29,12 @@ __all__ = [
     "RiskLevel"
 ]
 
+_LAZY_EXPORTS = {
+    "StructuredLogger": "services.logger",
+    "SafetyGuard": "services.safety_guard",
+    "SafetyConfig": "services.safety_guard",
+    "AccountHealth": "services.safety_guard",
+    "RiskLevel": "services.safety_guard",
+}
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
@@ -0,0 +1,154 @@
+"""
+Module: services/analytics/metrics_buffer.py
+
+Buffered metrics writer: gom kết quả scrape và flush thành multi-row upserts.
+"""
+
+# Standard library
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Set
+
+# Local
+from services.logger import StructuredLogger
+from services.analytics.storage import MetricsStorage, MetricsRow
+
+
+class MetricsWriteBuffer:
+    """
+    Buffer ghi metrics theo batch.
+
+    Flush khi:
+    - Số rows trong buffer đạt `batch_size`
+    - Row cũ nhất trong buffer đã chờ quá `flush_interval_seconds` (kiểm tra khi add)
+    - Gọi flush() trực tiếp / thoát context manager
+
+    Một lần flush = một pool checkout + một transaction (MetricsStorage.save_metrics_batch).
+
+    Lưu ý: ngưỡng thời gian chỉ được kiểm tra trong add() (không có timer nền). Nếu không
+    có add() tiếp theo, rows có thể nằm trong buffer lâu hơn flush_interval_seconds, nên
+    caller luôn phải flush() (hoặc dùng context manager) khi kết thúc, kể cả khi có lỗi.
+    """
+
+    def __init__(
+        self,
+        storage: MetricsStorage,
+        batch_size: int = 50,
+        flush_interval_seconds: float = 5.0,
+        logger: Optional[StructuredLogger] = None
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            storage: Metrics storage
+            batch_size: Số rows tối đa trước khi flush
+            flush_interval_seconds: Thời gian chờ tối đa của row cũ nhất
+            logger: Structured logger (optional)
+        """
+        self.storage = storage
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.logger = logger
+
+        self._rows: List[MetricsRow] = []
+        self._first_added_at: Optional[float] = None
+        self._failed_thread_ids: Set[str] = set()
+        self._lock = threading.Lock()
+        self.flush_count = 0
+
+    def add(
+        self,
+        thread_id: str,
+        account_id: str,
+        views: Optional[int],
+        likes: int,
+        replies: int,
+        reposts: int,
+        shares: int,
+        fetched_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Thêm metrics vào buffer (flush nếu vượt ngưỡng size/time).
+
+        Args:
+            thread_id: Thread ID
+            account_id: Account ID
+            views: View count (optional)
+            likes: Like count
+            replies: Reply count
+            reposts: Repost count
+            shares: Share count
+            fetched_at: Fetch timestamp (default: now)
+        """
+        with self._lock:
+            self._rows.append((
+                thread_id,
+                account_id,
+                views,
+                likes,
+                replies,
+                reposts,
+                shares,
+                fetched_at or datetime.now()
+            ))
+            if self._first_added_at is None:
+                self._first_added_at = time.monotonic()
+
+            should_flush = (
+                len(self._rows) >= self.batch_size
+                or time.monotonic() - self._first_added_at >= self.flush_interval_seconds
+            )
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Ghi toàn bộ rows đang chờ.
+
+        Returns:
+            True nếu batch được lưu (hoặc buffer rỗng), False nếu lỗi
+        """
+        with self._lock:
+            rows = self._rows
+            self._rows = []
+            self._first_added_at = None
+
+        if not rows:
+            return True
+
+        saved = self.storage.save_metrics_batch(rows)
+        self.flush_count += 1
+
+        if not saved:
+            with self._lock:
+                self._failed_thread_ids.update(row[0] for row in rows)
+            if self.logger:
+                self.logger.log_step(
+                    step="METRICS_BUFFER_FLUSH",
+                    result="ERROR",
+                    error="Failed to save metrics batch",
+                    rows=len(rows)
+                )
+
+        return saved
+
+    @property
+    def pending(self) -> int:
+        """Số rows đang chờ flush."""
+        with self._lock:
+            return len(self._rows)
+
+    @property
+    def failed_thread_ids(self) -> Set[str]:
+        """Thread IDs thuộc các batch flush lỗi."""
+        with self._lock:
+            return set(self._failed_thread_ids)
+
+    def __enter__(self) -> "MetricsWriteBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
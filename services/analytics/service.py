@@ -14,6 +14,7 @@ from playwright.async_api import Page
 # Local
 from services.logger import StructuredLogger
 from services.analytics.storage import MetricsStorage
+from services.analytics.metrics_buffer import MetricsWriteBuffer
 from threads.metrics_scraper import ThreadMetricsScraper
 from browser.manager import BrowserManager
 from config import Config
@@ -56,7 +57,9 @@ class MetricsService:
         thread_id: str,
         account_id: str,
         username: Optional[str] = None,
-        page: Optional[Page] = None
+        page: Optional[Page] = None,
+        writer: Optional[MetricsWriteBuffer] = None,
+        skip_recent_check: bool = False
     ) -> Dict[str, Any]:
         """
         Fetch metrics từ Threads và save vào database.
@@ -66,6 +69,8 @@ class MetricsService:
             account_id: Account ID
             username: Threads username (optional - sẽ extract từ page nếu không có)
             page: Optional Playwright page (if None, will create browser)
+            writer: Optional buffered writer (batch mode: ghi khi buffer flush)
+            skip_recent_check: Bỏ qua has_recent_metrics (caller đã check bulk)
         
         Returns:
             Dict với result:
@@ -86,7 +91,7 @@ class MetricsService:
             
             # Check if we have recent metrics (avoid duplicate fetches)
             recent_hours = self.config.analytics.recent_metrics_hours
-            if self.storage.has_recent_metrics(thread_id, hours=recent_hours):
+            if not skip_recent_check and self.storage.has_recent_metrics(thread_id, hours=recent_hours):
                 latest = self.storage.get_latest_metrics(thread_id)
                 if latest:
                     self.logger.log_step(
@@ -255,17 +260,24 @@ class MetricsService:
                     }
                 
                 if metrics_result.get("success"):
-                    # Save to database
-                    saved = self.storage.save_metrics(
-                        thread_id=metrics_result["thread_id"],
-                        account_id=metrics_result["account_id"],
-                        views=metrics_result.get("views"),
-                        likes=metrics_result.get("likes", 0),
-                        replies=metrics_result.get("replies", 0),
-                        reposts=metrics_result.get("reposts", 0),
-                        shares=metrics_result.get("shares", 0),
-                        fetched_at=metrics_result.get("fetched_at", datetime.now())
-                    )
+                    metrics_row = {
+                        "thread_id": metrics_result["thread_id"],
+                        "account_id": metrics_result["account_id"],
+                        "views": metrics_result.get("views"),
+                        "likes": metrics_result.get("likes", 0),
+                        "replies": metrics_result.get("replies", 0),
+                        "reposts": metrics_result.get("reposts", 0),
+                        "shares": metrics_result.get("shares", 0),
+                        "fetched_at": metrics_result.get("fetched_at", datetime.now())
+                    }
+                    
+                    if writer is not None:
+                        # Batch mode: buffer sẽ flush theo size/time thresholds
+                        writer.add(**metrics_row)
+                        saved = True
+                    else:
+                        # Save to database
+                        saved = self.storage.save_metrics(**metrics_row)
                     
                     if saved:
                         return {
@@ -349,6 +361,20 @@ class MetricsService:
         parallel_mode = parallel if parallel is not None else self.config.analytics.parallel_fetch_enabled
         max_workers = max_concurrent if max_concurrent is not None else self.config.analytics.max_concurrent_fetches
         
+        # Bulk recent check: 2 queries cho cả danh sách thay vì 2 queries mỗi thread
+        cached_results = self._get_cached_results(thread_ids)
+        pending_ids = [tid for tid in thread_ids if tid not in cached_results]
+        
+        if not pending_ids:
+            return [cached_results[tid] for tid in thread_ids]
+        
+        writer = MetricsWriteBuffer(
+            storage=self.storage,
+            batch_size=self.config.analytics.metrics_write_batch_size,
+            flush_interval_seconds=self.config.analytics.metrics_write_flush_interval_seconds,
+            logger=self.logger
+        )
+        
         # If no page provided, create browser manager once and reuse for all threads
         # This ensures browser context stays alive across multiple fetches
         if page is None:
@@ -367,22 +393,27 @@ class MetricsService:
                     )
         
         try:
-            if parallel_mode and len(thread_ids) > 1:
+            if parallel_mode and len(pending_ids) > 1:
                 # Parallel mode: fetch multiple threads concurrently with limit
-                results = await self._fetch_parallel(
-                    thread_ids, 
+                fetched = await self._fetch_parallel(
+                    pending_ids, 
                     account_id, 
                     username=username, 
-                    max_concurrent=max_workers
+                    max_concurrent=max_workers,
+                    writer=writer
                 )
             else:
                 # Sequential mode: fetch one by one (original implementation)
-                results = await self._fetch_sequential(
-                    thread_ids, 
+                fetched = await self._fetch_sequential(
+                    pending_ids, 
                     account_id, 
-                    username=username
+                    username=username,
+                    writer=writer
                 )
         finally:
+            # Ghi nốt các rows còn trong buffer (time threshold chỉ được check trong add())
+            writer.flush()
+            
             # Close browser manager if we created it (when page was None initially)
             if page is None and self.browser_manager and self._own_browser:
                 try:
@@ -396,13 +427,67 @@ class MetricsService:
                         account_id=account_id
                     )
         
-        return results
+        # Đánh dấu failed các threads thuộc batch flush lỗi
+        failed_ids = writer.failed_thread_ids
+        for result in fetched:
+            if result.get("success") and result.get("thread_id") in failed_ids:
+                result.update({
+                    "success": False,
+                    "metrics": None,
+                    "error": "Failed to save metrics to database"
+                })
+        
+        fetched_by_id = {result.get("thread_id"): result for result in fetched}
+        return [
+            cached_results.get(tid) or fetched_by_id[tid]
+            for tid in thread_ids
+            if tid in cached_results or tid in fetched_by_id
+        ]
+    
+    def _get_cached_results(self, thread_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build cached results cho các threads đã có metrics gần đây (bulk queries).
+        
+        Args:
+            thread_ids: List of thread IDs
+        
+        Returns:
+            Dict mapping thread_id -> cached result
+        """
+        recent_hours = self.config.analytics.recent_metrics_hours
+        recent_ids = self.storage.get_recent_thread_ids(thread_ids, hours=recent_hours)
+        if not recent_ids:
+            return {}
+        
+        latest_by_id = self.storage.get_latest_metrics_batch(recent_ids)
+        
+        cached_results = {}
+        for thread_id, latest in latest_by_id.items():
+            cached_results[thread_id] = {
+                "success": True,
+                "thread_id": thread_id,
+                "metrics": latest,
+                "error": None,
+                "cached": True
+            }
+        
+        if cached_results:
+            self.logger.log_step(
+                step="FETCH_MULTIPLE_METRICS",
+                result="SKIPPED",
+                note="Recent metrics already exist",
+                skipped=len(cached_results),
+                total=len(thread_ids)
+            )
+        
+        return cached_results
     
     async def _fetch_sequential(
         self,
         thread_ids: List[str],
         account_id: str,
-        username: Optional[str] = None
+        username: Optional[str] = None,
+        writer: Optional[MetricsWriteBuffer] = None
     ) -> List[Dict[str, Any]]:
         """Fetch metrics sequentially (one by one)."""
         results = []
@@ -415,7 +500,9 @@ class MetricsService:
                 thread_id, 
                 account_id, 
                 username=username, 
-                page=None  # Let it create page from browser_manager.context
+                page=None,  # Let it create page from browser_manager.context
+                writer=writer,
+                skip_recent_check=writer is not None
             )
             results.append(result)
             
@@ -430,7 +517,8 @@ class MetricsService:
         thread_ids: List[str],
         account_id: str,
         username: Optional[str] = None,
-        max_concurrent: int = 3
+        max_concurrent: int = 3,
+        writer: Optional[MetricsWriteBuffer] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch metrics in parallel với limit (semaphore).
@@ -451,7 +539,9 @@ class MetricsService:
                         thread_id,
                         account_id,
                         username=username,
-                        page=None  # Let it create page from browser_manager.context
+                        page=None,  # Let it create page from browser_manager.context
+                        writer=writer,
+                        skip_recent_check=writer is not None
                     )
                     return result
                 except Exception as exc:
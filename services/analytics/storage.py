@@ -5,7 +5,7 @@ MySQL storage implementation cho thread metrics.
 """
 
 # Standard library
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple, Iterable
 from datetime import datetime
 from contextlib import contextmanager
 
@@ -19,11 +19,67 @@ from services.exceptions import StorageError
 from services.storage.connection_pool import get_connection_pool
 
 
+# MySQL error code: Table doesn't exist
+_ER_NO_SUCH_TABLE = 1146
+
+# Số thread_ids tối đa trong một IN (...) query
+_IN_CLAUSE_CHUNK_SIZE = 1000
+
+_INSERT_METRICS_SQL = """
+    INSERT INTO thread_metrics 
+    (thread_id, account_id, views, likes, replies, reposts, shares, fetched_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        views = VALUES(views),
+        likes = VALUES(likes),
+        replies = VALUES(replies),
+        reposts = VALUES(reposts),
+        shares = VALUES(shares),
+        fetched_at = VALUES(fetched_at)
+"""
+
+# fetched_at phải được gán cuối cùng: MySQL evaluate assignments từ trái sang phải
+_UPSERT_LATEST_SQL = """
+    INSERT INTO thread_metrics_latest
+    (thread_id, account_id, views, likes, replies, reposts, shares, engagement, fetched_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        account_id = IF(VALUES(fetched_at) >= fetched_at, VALUES(account_id), account_id),
+        views = IF(VALUES(fetched_at) >= fetched_at, VALUES(views), views),
+        likes = IF(VALUES(fetched_at) >= fetched_at, VALUES(likes), likes),
+        replies = IF(VALUES(fetched_at) >= fetched_at, VALUES(replies), replies),
+        reposts = IF(VALUES(fetched_at) >= fetched_at, VALUES(reposts), reposts),
+        shares = IF(VALUES(fetched_at) >= fetched_at, VALUES(shares), shares),
+        engagement = IF(VALUES(fetched_at) >= fetched_at, VALUES(engagement), engagement),
+        fetched_at = GREATEST(fetched_at, VALUES(fetched_at))
+"""
+
+_UPSERT_DAILY_SQL = """
+    INSERT INTO account_metrics_daily
+    (account_id, metric_date, max_likes, max_replies, max_engagement, samples)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        max_likes = GREATEST(max_likes, VALUES(max_likes)),
+        max_replies = GREATEST(max_replies, VALUES(max_replies)),
+        max_engagement = GREATEST(max_engagement, VALUES(max_engagement)),
+        samples = samples + VALUES(samples)
+"""
+
+# Row format dùng chung cho single/batch writes:
+# (thread_id, account_id, views, likes, replies, reposts, shares, fetched_at)
+MetricsRow = Tuple[str, str, Optional[int], int, int, int, int, datetime]
+
+
 class MetricsStorage:
     """
     MySQL storage cho thread metrics.
     
     Lưu trữ metrics theo thời gian trong MySQL database.
+    
+    Rollup tables (migration 008) được cập nhật incremental trong cùng
+    transaction với save_metrics:
+    - thread_metrics_latest: metrics mới nhất mỗi thread
+    - account_metrics_daily: max likes/replies/engagement theo ngày mỗi account
     """
     
     def __init__(
@@ -53,6 +109,9 @@ class MetricsStorage:
         self.database = database
         self.logger = logger or StructuredLogger(name="metrics_storage")
         
+        # False khi rollup tables chưa được tạo (migration 008 chưa chạy)
+        self._rollups_available = True
+        
         # Get connection pool config từ MySQLStorageConfig nếu có
         try:
             from config.storage_config_loader import get_storage_config_from_env
@@ -117,20 +176,7 @@ class MetricsStorage:
         try:
             with self._pool.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    query = """
-                        INSERT INTO thread_metrics 
-                        (thread_id, account_id, views, likes, replies, reposts, shares, fetched_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        ON DUPLICATE KEY UPDATE
-                            views = VALUES(views),
-                            likes = VALUES(likes),
-                            replies = VALUES(replies),
-                            reposts = VALUES(reposts),
-                            shares = VALUES(shares),
-                            fetched_at = VALUES(fetched_at)
-                    """
-                    
-                    cursor.execute(query, (
+                    row: MetricsRow = (
                         thread_id,
                         account_id,
                         views,
@@ -139,7 +185,10 @@ class MetricsStorage:
                         reposts,
                         shares,
                         fetched_at
-                    ))
+                    )
+                    
+                    cursor.execute(_INSERT_METRICS_SQL, row)
+                    self._update_rollups(cursor, [row])
                     
                     conn.commit()
                     
@@ -165,6 +214,443 @@ class MetricsStorage:
             )
             return False
     
+    def save_metrics_batch(self, rows: List[MetricsRow]) -> bool:
+        """
+        Save nhiều metrics rows bằng multi-row upsert trong một transaction.
+        
+        Một pool checkout + một commit cho cả batch (thay vì mỗi thread một lần).
+        
+        Args:
+            rows: List of (thread_id, account_id, views, likes, replies, reposts, shares, fetched_at)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not rows:
+            return True
+        
+        now = datetime.now()
+        rows = [
+            (r[0], r[1], r[2], r[3] or 0, r[4] or 0, r[5] or 0, r[6] or 0, r[7] or now)
+            for r in rows
+        ]
+        
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # pymysql gộp executemany của INSERT ... VALUES thành multi-row statements
+                    cursor.executemany(_INSERT_METRICS_SQL, rows)
+                    self._update_rollups(cursor, rows)
+                    
+                    conn.commit()
+                    
+                    self.logger.log_step(
+                        step="SAVE_METRICS_BATCH",
+                        result="SUCCESS",
+                        rows=len(rows)
+                    )
+                    
+                    return True
+                    
+        except Exception as e:
+            self.logger.log_step(
+                step="SAVE_METRICS_BATCH",
+                result="ERROR",
+                error=f"Failed to save metrics batch: {str(e)}",
+                error_type=type(e).__name__,
+                rows=len(rows)
+            )
+            return False
+    
+    def _update_rollups(self, cursor, rows: List[MetricsRow]) -> None:
+        """
+        Cập nhật rollup tables cho metrics rows (cùng transaction với insert).
+        
+        Không raise: nếu rollup tables chưa tồn tại, đánh dấu unavailable và
+        dashboard sẽ fallback về tính từ thread_metrics.
+        """
+        if not self._rollups_available or not rows:
+            return
+        
+        latest_rows = []
+        daily_rows = []
+        for thread_id, account_id, views, likes, replies, reposts, shares, fetched_at in rows:
+            likes = likes or 0
+            replies = replies or 0
+            reposts = reposts or 0
+            shares = shares or 0
+            engagement = likes + replies + shares
+            latest_rows.append(
+                (thread_id, account_id, views, likes, replies, reposts, shares, engagement, fetched_at)
+            )
+            daily_rows.append((account_id, fetched_at.date(), likes, replies, engagement, 1))
+        
+        try:
+            cursor.executemany(_UPSERT_LATEST_SQL, latest_rows)
+            cursor.executemany(_UPSERT_DAILY_SQL, daily_rows)
+        except pymysql.err.ProgrammingError as e:
+            if e.args and e.args[0] == _ER_NO_SUCH_TABLE:
+                self._rollups_available = False
+            self.logger.log_step(
+                step="UPDATE_METRICS_ROLLUPS",
+                result="WARNING",
+                error=f"Failed to update metrics rollups: {str(e)}",
+                error_type=type(e).__name__,
+                rows=len(rows),
+                note="Run migration 008_create_metrics_rollups.sql to enable rollups"
+            )
+    
+    def get_recent_thread_ids(self, thread_ids: Iterable[str], hours: int = 1) -> Set[str]:
+        """
+        Bulk version của has_recent_metrics: trả về các thread_ids có metrics trong N giờ gần đây.
+        
+        Args:
+            thread_ids: Thread IDs cần kiểm tra
+            hours: Number of hours
+        
+        Returns:
+            Set of thread_ids có recent metrics
+        """
+        thread_ids = list(dict.fromkeys(thread_ids))
+        recent: Set[str] = set()
+        if not thread_ids:
+            return recent
+        
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    for start in range(0, len(thread_ids), _IN_CLAUSE_CHUNK_SIZE):
+                        chunk = thread_ids[start:start + _IN_CLAUSE_CHUNK_SIZE]
+                        placeholders = ", ".join(["%s"] * len(chunk))
+                        cursor.execute(f"""
+                            SELECT DISTINCT thread_id FROM thread_metrics
+                            WHERE thread_id IN ({placeholders})
+                            AND fetched_at >= DATE_SUB(NOW(), INTERVAL %s HOUR)
+                        """, [*chunk, hours])
+                        recent.update(row[0] for row in cursor.fetchall())
+            
+            return recent
+                    
+        except Exception as e:
+            self.logger.log_step(
+                step="GET_RECENT_THREAD_IDS",
+                result="ERROR",
+                error=f"Failed to check recent metrics: {str(e)}",
+                error_type=type(e).__name__,
+                thread_count=len(thread_ids)
+            )
+            return set()
+    
+    def get_latest_metrics_batch(self, thread_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Bulk version của get_latest_metrics.
+        
+        Args:
+            thread_ids: Thread IDs
+        
+        Returns:
+            Dict mapping thread_id -> latest metrics dict
+        """
+        thread_ids = list(dict.fromkeys(thread_ids))
+        latest: Dict[str, Dict[str, Any]] = {}
+        if not thread_ids:
+            return latest
+        
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    for start in range(0, len(thread_ids), _IN_CLAUSE_CHUNK_SIZE):
+                        chunk = thread_ids[start:start + _IN_CLAUSE_CHUNK_SIZE]
+                        placeholders = ", ".join(["%s"] * len(chunk))
+                        cursor.execute(f"""
+                            SELECT m.* FROM thread_metrics m
+                            JOIN (
+                                SELECT thread_id, MAX(fetched_at) as max_fetched_at
+                                FROM thread_metrics
+                                WHERE thread_id IN ({placeholders})
+                                GROUP BY thread_id
+                            ) latest
+                            ON m.thread_id = latest.thread_id
+                            AND m.fetched_at = latest.max_fetched_at
+                        """, chunk)
+                        for row in cursor.fetchall():
+                            latest[row["thread_id"]] = {
+                                "thread_id": row["thread_id"],
+                                "account_id": row["account_id"],
+                                "views": row["views"],
+                                "likes": row["likes"],
+                                "replies": row["replies"],
+                                "reposts": row.get("reposts", 0),
+                                "shares": row["shares"],
+                                "fetched_at": row["fetched_at"]
+                            }
+            
+            return latest
+                    
+        except Exception as e:
+            self.logger.log_step(
+                step="GET_LATEST_METRICS_BATCH",
+                result="ERROR",
+                error=f"Failed to get latest metrics batch: {str(e)}",
+                error_type=type(e).__name__,
+                thread_count=len(thread_ids)
+            )
+            return {}
+    
+    def get_account_rollup_summary(
+        self,
+        account_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get summary totals từ thread_metrics_latest (một aggregate query).
+        
+        Args:
+            account_id: Account ID
+            start_date: Optional start date (lọc theo fetched_at mới nhất)
+            end_date: Optional end date
+        
+        Returns:
+            Dict totals, hoặc None nếu rollups không khả dụng
+        """
+        if not self._rollups_available:
+            return None
+        
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    query = """
+                        SELECT
+                            COUNT(*) as total_posts,
+                            COALESCE(SUM(likes), 0) as total_likes,
+                            COALESCE(SUM(replies), 0) as total_replies,
+                            COALESCE(SUM(reposts), 0) as total_reposts,
+                            COALESCE(SUM(shares), 0) as total_shares,
+                            COALESCE(SUM(views), 0) as total_views,
+                            COALESCE(SUM(engagement), 0) as total_engagement
+                        FROM thread_metrics_latest
+                        WHERE account_id = %s
+                    """
+                    params: List[Any] = [account_id]
+                    query, params = self._append_date_range(query, params, start_date, end_date)
+                    
+                    cursor.execute(query, params)
+                    row = cursor.fetchone() or {}
+                    
+                    return {key: int(value or 0) for key, value in row.items()}
+                    
+        except Exception as e:
+            self._handle_rollup_error("GET_ACCOUNT_ROLLUP_SUMMARY", e, account_id)
+            return None
+    
+    def get_account_top_threads(
+        self,
+        account_id: str,
+        limit: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get top threads theo engagement từ thread_metrics_latest.
+        
+        Args:
+            account_id: Account ID
+            limit: Số threads tối đa
+            start_date: Optional start date
+            end_date: Optional end date
+        
+        Returns:
+            List of latest metrics dicts (kèm engagement), hoặc None nếu rollups không khả dụng
+        """
+        if not self._rollups_available:
+            return None
+        
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    query = """
+                        SELECT thread_id, account_id, views, likes, replies, reposts,
+                               shares, engagement, fetched_at
+                        FROM thread_metrics_latest
+                        WHERE account_id = %s
+                    """
+                    params: List[Any] = [account_id]
+                    query, params = self._append_date_range(query, params, start_date, end_date)
+                    query += " ORDER BY engagement DESC LIMIT %s"
+                    params.append(limit)
+                    
+                    cursor.execute(query, params)
+                    return list(cursor.fetchall())
+                    
+        except Exception as e:
+            self._handle_rollup_error("GET_ACCOUNT_TOP_THREADS", e, account_id)
+            return None
+    
+    def get_account_daily_metrics(
+        self,
+        account_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get daily aggregates từ account_metrics_daily.
+        
+        Args:
+            account_id: Account ID
+            start_date: Optional start date
+            end_date: Optional end date
+        
+        Returns:
+            List of {metric_date, max_likes, max_replies, max_engagement} sorted by date,
+            hoặc None nếu rollups không khả dụng
+        """
+        if not self._rollups_available:
+            return None
+        
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    query = """
+                        SELECT metric_date, max_likes, max_replies, max_engagement
+                        FROM account_metrics_daily
+                        WHERE account_id = %s
+                    """
+                    params: List[Any] = [account_id]
+                    
+                    if start_date:
+                        query += " AND metric_date >= %s"
+                        params.append(start_date.date())
+                    
+                    if end_date:
+                        query += " AND metric_date <= %s"
+                        params.append(end_date.date())
+                    
+                    query += " ORDER BY metric_date ASC"
+                    
+                    cursor.execute(query, params)
+                    return list(cursor.fetchall())
+                    
+        except Exception as e:
+            self._handle_rollup_error("GET_ACCOUNT_DAILY_METRICS", e, account_id)
+            return None
+    
+    def get_account_latest_metrics(
+        self,
+        account_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get latest metrics của mọi thread thuộc account từ thread_metrics_latest.
+
+        Args:
+            account_id: Account ID
+            start_date: Optional start date (lọc theo fetched_at mới nhất)
+            end_date: Optional end date
+
+        Returns:
+            List of latest metrics dicts, hoặc None nếu rollups không khả dụng
+        """
+        if not self._rollups_available:
+            return None
+
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    query = """
+                        SELECT thread_id, views, likes, replies, reposts, shares, fetched_at
+                        FROM thread_metrics_latest
+                        WHERE account_id = %s
+                    """
+                    params: List[Any] = [account_id]
+                    query, params = self._append_date_range(query, params, start_date, end_date)
+
+                    cursor.execute(query, params)
+                    return list(cursor.fetchall())
+
+        except Exception as e:
+            self._handle_rollup_error("GET_ACCOUNT_LATEST_METRICS", e, account_id)
+            return None
+
+    def get_account_metrics_version(self, account_id: str) -> Optional[Tuple[Any, ...]]:
+        """
+        Get version của metrics account (dùng để invalidate cache phía đọc).
+
+        Version = (fetched_at mới nhất, số rows, tổng engagement) đọc từ thread_metrics_latest
+        (1 row/thread): đổi khi có snapshot mới và cả khi metrics bị ghi lại mà không tăng
+        fetched_at. Khi chưa có rollup, chỉ dùng MAX(fetched_at) trên idx_account_fetched
+        (không scan toàn bộ history); metrics ghi đè cùng fetched_at khi đó chỉ được nhận ra
+        sau khi cache phía đọc hết TTL.
+
+        Args:
+            account_id: Account ID
+
+        Returns:
+            Version tuple, hoặc None nếu chưa có metrics / lỗi
+        """
+        if self._rollups_available:
+            query = """
+                SELECT MAX(fetched_at) as latest, COUNT(*) as row_count,
+                       COALESCE(SUM(engagement), 0) as total_engagement
+                FROM thread_metrics_latest WHERE account_id = %s
+            """
+        else:
+            query = """
+                SELECT MAX(fetched_at) as latest
+                FROM thread_metrics WHERE account_id = %s
+            """
+
+        try:
+            with self._pool.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    cursor.execute(query, (account_id,))
+                    row = cursor.fetchone()
+                    if not row or row["latest"] is None:
+                        return None
+                    if "row_count" not in row:
+                        return (row["latest"],)
+                    return row["latest"], int(row["row_count"]), int(row["total_engagement"])
+
+        except Exception as e:
+            self._handle_rollup_error("GET_ACCOUNT_METRICS_VERSION", e, account_id)
+            return None
+
+    def _append_date_range(
+        self,
+        query: str,
+        params: List[Any],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Tuple[str, List[Any]]:
+        """Append fetched_at range filter vào query."""
+        if start_date:
+            query += " AND fetched_at >= %s"
+            params.append(start_date)
+        
+        if end_date:
+            query += " AND fetched_at <= %s"
+            params.append(end_date)
+        
+        return query, params
+    
+    def _handle_rollup_error(self, step: str, error: Exception, account_id: str) -> None:
+        """Log lỗi đọc rollup và tắt rollups nếu table chưa tồn tại."""
+        if (
+            isinstance(error, pymysql.err.ProgrammingError)
+            and error.args
+            and error.args[0] == _ER_NO_SUCH_TABLE
+        ):
+            self._rollups_available = False
+        
+        self.logger.log_step(
+            step=step,
+            result="WARNING",
+            error=f"Failed to read metrics rollups: {str(error)}",
+            error_type=type(error).__name__,
+            account_id=account_id
+        )
+    
     def get_latest_metrics(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """
         Get latest metrics for a thread.
@@ -35,6 +35,11 @@ class StorageError(SchedulerError):
     ...
 
 
+class InvalidCursorError(ThreadsAutomationError, ValueError):
+    """Cursor phân trang (keyset) không hợp lệ hoặc không khớp sort order."""
+    ...
+
+
 class BrowserError(ThreadsAutomationError):
     """Exception liên quan đến browser."""
     ...
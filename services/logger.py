@@ -15,17 +15,14 @@ Features:
 """
 
 # Standard library
+import atexit
 import logging
 import json
 import sys
 import traceback
 import threading
 import time
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+import importlib.util
 import os
 from datetime import datetime
 from typing import Optional, Dict, Any, Union, List
@@ -44,6 +41,9 @@ from utils.sanitize import (
     sanitize_value
 )
 
+# psutil chỉ dùng khi đo memory (measure_operation) -> import lazy trong _get_memory_usage
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+
 
 class LogFormat(Enum):
     """Log format enumeration."""
@@ -157,10 +157,7 @@ class EnhancedLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(self.config.level)
         
-        # Clear existing handlers để tránh duplicate
-        self.logger.handlers.clear()
-        
-        # Setup handlers
+        # Setup handlers (qua registry: handlers chỉ được tạo lại khi config thay đổi)
         self._setup_handlers()
     
     def _setup_log_directory(self) -> None:
@@ -172,12 +169,36 @@ class EnhancedLogger:
             self.log_dir = Path(".")
     
     def _setup_handlers(self) -> None:
-        """Setup file và console handlers."""
+        """Setup file và console handlers (dùng lại handlers đã có của logger name này)."""
+        _LOGGER_REGISTRY.configure(self)
+    
+    def _log_file_path(self) -> Path:
+        """Đường dẫn file log theo config."""
+        if self.config.enable_rotation:
+            return self.log_dir / f"{self.name}.log"
+        return self.log_dir / f"{self.name}_{datetime.now().strftime('%Y%m%d')}.log"
+    
+    def _handler_signature(self) -> tuple:
+        """Signature của handler config - cùng signature thì dùng lại handlers."""
+        config = self.config
+        return (
+            str(self._log_file_path().resolve()),
+            config.level,
+            config.format,
+            config.include_timestamp,
+            config.include_level,
+            config.include_logger_name,
+            config.enable_rotation,
+            config.rotation_when,
+            config.rotation_interval,
+            config.backup_count,
+        )
+    
+    def _create_file_handler(self, log_file: Path) -> Optional[logging.Handler]:
+        """Tạo file handler (None nếu không mở được file)."""
         # File handler với rotation
         if self.config.enable_rotation:
             try:
-                log_file = self.log_dir / f"{self.name}.log"
-                
                 # Use TimedRotatingFileHandler for time-based rotation
                 file_handler = TimedRotatingFileHandler(
                     filename=str(log_file),
@@ -186,7 +207,6 @@ class EnhancedLogger:
                     backupCount=self.config.backup_count,
                     encoding='utf-8'
                 )
-                file_handler.setLevel(self.config.level)
                 
                 # Also add size-based rotation as secondary
                 # Note: Python's logging doesn't support both simultaneously,
@@ -194,33 +214,30 @@ class EnhancedLogger:
                 
             except (PermissionError, OSError) as e:
                 print(f"WARNING: Could not create file handler: {str(e)}, using console handler only")
-                file_handler = None
+                return None
         else:
             try:
-                log_file = self.log_dir / f"{self.name}_{datetime.now().strftime('%Y%m%d')}.log"
                 file_handler = logging.FileHandler(str(log_file), encoding='utf-8')
-                file_handler.setLevel(self.config.level)
             except (PermissionError, OSError) as e:
                 print(f"WARNING: Could not create file handler: {str(e)}, using console handler only")
-                file_handler = None
+                return None
         
-        # Console handler
+        file_handler.setLevel(self.config.level)
+        file_handler.setFormatter(self._create_formatter())
+        return file_handler
+    
+    def _create_console_handler(self) -> logging.Handler:
+        """Tạo console handler."""
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(self.config.level)
-        
-        # Formatter
+        console_handler.setFormatter(self._create_formatter())
+        return console_handler
+    
+    def _create_formatter(self) -> logging.Formatter:
+        """Tạo formatter theo config format."""
         if self.config.format == LogFormat.JSON:
-            formatter = self._create_json_formatter()
-        else:
-            formatter = self._create_text_formatter()
-        
-        # Add formatter và handlers
-        if file_handler:
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-        
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+            return self._create_json_formatter()
+        return self._create_text_formatter()
     
     def _create_text_formatter(self) -> logging.Formatter:
         """Tạo text formatter."""
@@ -337,6 +354,7 @@ class EnhancedLogger:
         if not PSUTIL_AVAILABLE:
             return None
         try:
+            import psutil
             process = psutil.Process(os.getpid())
             return process.memory_info().rss / 1024 / 1024  # Convert to MB
         except Exception:
@@ -680,3 +698,109 @@ class StructuredLogger(EnhancedLogger):
             include_stack_trace=False  # Disable stack traces by default
         )
         super().__init__(name=name, level=level, log_dir=log_dir, config=config)
+
+
+class _LoggerRegistry:
+    """
+    Registry handlers cho EnhancedLogger.
+    
+    - Handlers của mỗi logger name được tạo một lần; instance mới cùng name và
+      cùng config dùng lại handlers (không clear/mở lại file mỗi lần khởi tạo)
+    - File handlers được share theo file log (ref-counted) và đóng khi không
+      còn logger nào dùng hoặc khi shutdown()
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        # file key -> [handler, refcount]
+        self._file_handlers: Dict[tuple, List[Any]] = {}
+        # logger name -> (signature, console handler, file key)
+        self._loggers: Dict[str, tuple] = {}
+    
+    def configure(self, enhanced: "EnhancedLogger") -> None:
+        """Gắn handlers cho logger của enhanced (dùng lại nếu signature không đổi)."""
+        signature = enhanced._handler_signature()
+        logger = enhanced.logger
+        with self._lock:
+            current = self._loggers.get(enhanced.name)
+            if current is not None and current[0] == signature and current[1] in logger.handlers:
+                if current[1].stream is not sys.stdout:
+                    # sys.stdout đã bị thay (redirect/capture) -> chỉ thay console handler
+                    logger.removeHandler(current[1])
+                    console_handler = enhanced._create_console_handler()
+                    logger.addHandler(console_handler)
+                    self._loggers[enhanced.name] = (signature, console_handler, current[2])
+                return
+
+            self._detach(enhanced.name, logger)
+            # Clear existing handlers để tránh duplicate
+            logger.handlers.clear()
+            
+            file_key = signature
+            file_handler = self._acquire_file_handler(file_key, enhanced)
+            if file_handler is not None:
+                logger.addHandler(file_handler)
+            else:
+                file_key = None
+            
+            console_handler = enhanced._create_console_handler()
+            logger.addHandler(console_handler)
+            self._loggers[enhanced.name] = (signature, console_handler, file_key)
+    
+    def shutdown(self) -> None:
+        """Flush và đóng tất cả handlers đã tạo (gọi khi process shutdown)."""
+        with self._lock:
+            for name in list(self._loggers):
+                self._detach(name, logging.getLogger(name))
+            for handler, _ in self._file_handlers.values():
+                _close_handler(handler)
+            self._file_handlers.clear()
+    
+    def open_file_count(self) -> int:
+        """Số file handlers đang mở."""
+        with self._lock:
+            return len(self._file_handlers)
+    
+    def _acquire_file_handler(self, key: tuple, enhanced: "EnhancedLogger") -> Optional[logging.Handler]:
+        entry = self._file_handlers.get(key)
+        if entry is None:
+            handler = enhanced._create_file_handler(Path(key[0]))
+            if handler is None:
+                return None
+            entry = self._file_handlers[key] = [handler, 0]
+        entry[1] += 1
+        return entry[0]
+    
+    def _detach(self, name: str, logger: logging.Logger) -> None:
+        """Gỡ handlers của logger name, đóng file handler nếu không còn ai dùng."""
+        current = self._loggers.pop(name, None)
+        if current is None:
+            return
+        _, console_handler, file_key = current
+        logger.removeHandler(console_handler)
+        _close_handler(console_handler)
+        
+        entry = self._file_handlers.get(file_key) if file_key is not None else None
+        if entry is not None:
+            logger.removeHandler(entry[0])
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._file_handlers[file_key]
+                _close_handler(entry[0])
+
+
+def _close_handler(handler: logging.Handler) -> None:
+    try:
+        handler.flush()
+        handler.close()
+    except Exception:
+        pass
+
+
+_LOGGER_REGISTRY = _LoggerRegistry()
+atexit.register(_LOGGER_REGISTRY.shutdown)
+
+
+def shutdown_loggers() -> None:
+    """Flush và đóng tất cả log handlers (process shutdown)."""
+    _LOGGER_REGISTRY.shutdown()
@@ -0,0 +1,457 @@
+"""
+Module: services/near_duplicate_index.py
+
+MinHash/LSH near-duplicate index cho SafetyGuard.
+
+Features:
+- MinHash signature trên tập từ (cùng ngữ nghĩa Jaccard với SafetyGuard cũ)
+- LSH banding để lấy candidates trong thời gian sub-linear
+- Exact-match qua SHA256 của content đã normalize
+- Persist theo account (append-only JSONL) và replay khi khởi động lại
+- Nhiều processes dùng chung thư mục: append dưới file lock, đọc tiếp phần
+  đuôi file (records process khác vừa append) trước mỗi check/append
+"""
+
+# Standard library
+import hashlib
+import json
+import os
+import random
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+# fcntl chỉ có trên Linux/Unix, không có trên Windows
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Mersenne prime 2^61 - 1 cho universal hashing (a * x + b) mod p
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Seed cố định để signatures ổn định giữa các lần restart
+_DEFAULT_SEED = 1
+
+
+def _word_hash(word: str) -> int:
+    """Hash ổn định 32-bit cho một từ (không phụ thuộc PYTHONHASHSEED)."""
+    return int.from_bytes(
+        hashlib.blake2b(word.encode('utf-8'), digest_size=4).digest(),
+        'big'
+    )
+
+
+def _exact_hash(normalized: str) -> str:
+    """SHA256 của content đã normalize (exact-match key)."""
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def jaccard_similarity(words1: Set[str], words2: Set[str]) -> float:
+    """
+    Jaccard similarity giữa hai tập từ.
+
+    Args:
+        words1: Tập từ thứ nhất
+        words2: Tập từ thứ hai
+
+    Returns:
+        Similarity trong khoảng [0.0, 1.0]
+    """
+    if not words1 or not words2:
+        return 0.0
+    union = len(words1 | words2)
+    return len(words1 & words2) / union if union > 0 else 0.0
+
+
+@dataclass
+class _IndexedDocument:
+    """Document đã index (một bài đã đăng)."""
+    doc_id: int
+    content_hash: str
+    text: str
+    signature: Tuple[int, ...]
+
+
+@dataclass
+class _AccountIndex:
+    """LSH index cho một account."""
+    documents: Dict[int, _IndexedDocument] = field(default_factory=dict)
+    order: Deque[int] = field(default_factory=deque)
+    buckets: List[Dict[Tuple[int, ...], Set[int]]] = field(default_factory=list)
+    hashes: Dict[str, int] = field(default_factory=dict)
+    next_doc_id: int = 0
+    disk_records: int = 0
+    # Vị trí đã đọc tới trong file JSONL và inode của file (đổi khi bị compact)
+    disk_offset: int = 0
+    disk_inode: Optional[int] = None
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate index theo account dùng MinHash + LSH banding.
+
+    Signature có `num_perm` giá trị, chia thành `bands` băng (mỗi băng
+    `num_perm // bands` hàng). Hai document chung ít nhất một băng sẽ là
+    candidate; candidates được verify bằng Jaccard chính xác trên tập từ.
+    Với 128 perms / 32 bands, xác suất bỏ sót cặp có similarity 0.9
+    là ~1e-15, trong khi mỗi query chỉ đụng tới 32 buckets.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 32,
+        max_documents_per_account: int = 0,
+        storage_dir: Optional[Path] = None,
+        seed: int = _DEFAULT_SEED
+    ):
+        """
+        Khởi tạo index.
+
+        Args:
+            num_perm: Số hash permutations cho MinHash
+            bands: Số LSH bands (phải chia hết num_perm)
+            max_documents_per_account: Giới hạn history mỗi account (0 = không giới hạn)
+            storage_dir: Thư mục persist (None = chỉ giữ trong memory)
+            seed: Seed cho permutations (giữ cố định để đọc lại được file cũ)
+        """
+        if num_perm <= 0 or bands <= 0 or num_perm % bands != 0:
+            raise ValueError(
+                f"num_perm ({num_perm}) must be a positive multiple of bands ({bands})"
+            )
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_documents_per_account = max(0, max_documents_per_account)
+        self.storage_dir = Path(storage_dir) if storage_dir else None
+
+        rng = random.Random(seed)
+        self._permutations: List[Tuple[int, int]] = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+        self._accounts: Dict[str, _AccountIndex] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------ #
+    # Signatures
+    # ------------------------------------------------------------------ #
+
+    def signature(self, words: Set[str]) -> Tuple[int, ...]:
+        """
+        Tính MinHash signature cho tập từ.
+
+        Args:
+            words: Tập từ (đã normalize)
+
+        Returns:
+            Tuple `num_perm` giá trị min-hash
+        """
+        if not words:
+            return tuple([_MAX_HASH] * self.num_perm)
+
+        hashes = [_word_hash(w) for w in words]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        """Chia signature thành các band keys."""
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows] for i in range(self.bands)]
+
+    # ------------------------------------------------------------------ #
+    # Query / insert
+    # ------------------------------------------------------------------ #
+
+    def find_duplicate(
+        self,
+        account_id: str,
+        normalized: str,
+        threshold: float
+    ) -> Tuple[Optional[str], float]:
+        """
+        Tìm document trùng/giống nhất vượt ngưỡng.
+
+        Args:
+            account_id: Account ID
+            normalized: Content đã normalize
+            threshold: Ngưỡng Jaccard (0.0 - 1.0)
+
+        Returns:
+            Tuple of (match_type, similarity):
+            - ("exact", 1.0) nếu trùng hash
+            - ("similar", similarity) nếu có candidate >= threshold
+            - (None, 0.0) nếu không trùng
+        """
+        with self._lock:
+            index = self._get_account_index(account_id)
+
+            if _exact_hash(normalized) in index.hashes:
+                return "exact", 1.0
+
+            words = set(normalized.split())
+            if not words or not index.documents:
+                return None, 0.0
+
+            candidates: Set[int] = set()
+            for band, key in enumerate(self._band_keys(self.signature(words))):
+                bucket = index.buckets[band].get(key)
+                if bucket:
+                    candidates.update(bucket)
+
+            best = 0.0
+            for doc_id in candidates:
+                doc = index.documents.get(doc_id)
+                if doc is None:
+                    continue
+                similarity = jaccard_similarity(words, set(doc.text.split()))
+                if similarity > best:
+                    best = similarity
+
+            if best >= threshold:
+                return "similar", best
+            return None, 0.0
+
+    def add(self, account_id: str, normalized: str) -> bool:
+        """
+        Thêm content đã đăng vào index (và persist nếu có storage_dir).
+
+        Args:
+            account_id: Account ID
+            normalized: Content đã normalize
+
+        Returns:
+            True nếu được thêm mới, False nếu đã tồn tại (exact match)
+        """
+        with self._lock, self._file_lock(account_id):
+            index = self._get_account_index(account_id)
+            content_hash = _exact_hash(normalized)
+            if content_hash in index.hashes:
+                return False
+
+            signature = self.signature(set(normalized.split()))
+            self._insert(index, content_hash, normalized, signature)
+            self._append_to_disk(account_id, index, content_hash, normalized, signature)
+
+            if self.max_documents_per_account:
+                while len(index.documents) > self.max_documents_per_account:
+                    self._evict_oldest(index)
+                # Compact khi file dài gấp đôi số document còn hiệu lực (amortized O(1))
+                if index.disk_records > 2 * self.max_documents_per_account:
+                    self._rewrite_account_file(account_id, index)
+
+            return True
+
+    def remove_account(self, account_id: str) -> None:
+        """
+        Bỏ index của account khỏi memory (file trên disk được giữ nguyên).
+
+        Args:
+            account_id: Account ID
+        """
+        with self._lock:
+            self._accounts.pop(account_id, None)
+
+    def size(self, account_id: str) -> int:
+        """Số document đã index cho account."""
+        with self._lock:
+            return len(self._get_account_index(account_id).documents)
+
+    def _insert(
+        self,
+        index: _AccountIndex,
+        content_hash: str,
+        text: str,
+        signature: Tuple[int, ...]
+    ) -> None:
+        """Insert document vào các cấu trúc in-memory."""
+        doc_id = index.next_doc_id
+        index.next_doc_id += 1
+        index.documents[doc_id] = _IndexedDocument(doc_id, content_hash, text, signature)
+        index.order.append(doc_id)
+        index.hashes[content_hash] = doc_id
+        for band, key in enumerate(self._band_keys(signature)):
+            index.buckets[band].setdefault(key, set()).add(doc_id)
+
+    def _evict_oldest(self, index: _AccountIndex) -> None:
+        """Loại document cũ nhất khỏi index."""
+        doc_id = index.order.popleft()
+        doc = index.documents.pop(doc_id, None)
+        if doc is None:
+            return
+        index.hashes.pop(doc.content_hash, None)
+        for band, key in enumerate(self._band_keys(doc.signature)):
+            bucket = index.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del index.buckets[band][key]
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _get_account_index(self, account_id: str) -> _AccountIndex:
+        """Get index cho account, đã đồng bộ với file trên disk (lazy load lần đầu)."""
+        index = self._accounts.get(account_id)
+        if index is None:
+            index = self._new_account_index(account_id)
+        return self._sync_account(account_id, index)
+
+    def _new_account_index(self, account_id: str) -> _AccountIndex:
+        """Tạo index rỗng cho account (thay index cũ nếu có)."""
+        index = _AccountIndex(buckets=[{} for _ in range(self.bands)])
+        self._accounts[account_id] = index
+        return index
+
+    def _account_file(self, account_id: str) -> Optional[Path]:
+        """Đường dẫn file JSONL của account."""
+        if self.storage_dir is None:
+            return None
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in account_id)
+        return self.storage_dir / f"{safe_name}.jsonl"
+
+    @contextmanager
+    def _file_lock(self, account_id: str):
+        """Exclusive lock file của account giữa các processes (no-op nếu không persist/không có fcntl)."""
+        path = self._account_file(account_id)
+        if path is None or not HAS_FCNTL:
+            yield
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(path.with_suffix('.lock'), 'a')
+        except OSError:
+            # Persistence là best-effort, index in-memory vẫn đúng
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _sync_account(self, account_id: str, index: _AccountIndex) -> _AccountIndex:
+        """
+        Replay records mới trong file JSONL của account vào index.
+
+        Chỉ đọc từ `disk_offset` tới cuối file (records process khác vừa append);
+        nếu file đã bị process khác compact (inode đổi hoặc ngắn đi) thì load lại từ đầu.
+        """
+        path = self._account_file(account_id)
+        if path is None:
+            return index
+        try:
+            stat = path.stat()
+        except OSError:
+            return index
+
+        if index.disk_inode is not None and (
+            stat.st_ino != index.disk_inode or stat.st_size < index.disk_offset
+        ):
+            index = self._new_account_index(account_id)
+        index.disk_inode = stat.st_ino
+        if stat.st_size == index.disk_offset:
+            return index
+
+        try:
+            with open(path, 'rb') as f:
+                f.seek(index.disk_offset)
+                for raw_line in f:
+                    if not raw_line.endswith(b"\n"):
+                        # Dòng đang được ghi dở, đọc lại ở lần sync sau
+                        break
+                    index.disk_offset += len(raw_line)
+                    self._replay_record(index, raw_line)
+        except OSError:
+            return index
+
+        if self.max_documents_per_account:
+            while len(index.documents) > self.max_documents_per_account:
+                self._evict_oldest(index)
+        return index
+
+    def _replay_record(self, index: _AccountIndex, raw_line: bytes) -> None:
+        """Insert một record JSONL vào index (bỏ qua dòng hỏng và hash đã có)."""
+        line = raw_line.strip()
+        if not line:
+            return
+        index.disk_records += 1
+        try:
+            record = json.loads(line.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            # Dòng có thể bị ghi dở nếu process bị kill
+            return
+        content_hash = record.get("h")
+        text = record.get("t", "")
+        if not content_hash or content_hash in index.hashes:
+            return
+        signature = record.get("s")
+        if not isinstance(signature, list) or len(signature) != self.num_perm:
+            # Config num_perm đổi: tính lại signature
+            signature = self.signature(set(text.split()))
+        self._insert(index, content_hash, text, tuple(signature))
+
+    def _append_to_disk(
+        self,
+        account_id: str,
+        index: _AccountIndex,
+        content_hash: str,
+        text: str,
+        signature: Tuple[int, ...]
+    ) -> None:
+        """Append một record vào file JSONL của account."""
+        path = self._account_file(account_id)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps({"h": content_hash, "t": text, "s": list(signature)}, ensure_ascii=False)
+            with open(path, 'ab') as f:
+                f.write((line + "\n").encode('utf-8'))
+                index.disk_offset = f.tell()
+                index.disk_inode = os.fstat(f.fileno()).st_ino
+            index.disk_records += 1
+        except OSError:
+            # Persistence là best-effort, index in-memory vẫn đúng
+            pass
+
+    def _rewrite_account_file(self, account_id: str, index: _AccountIndex) -> None:
+        """Compact file JSONL sau khi evict (atomic rename)."""
+        path = self._account_file(account_id)
+        if path is None:
+            return
+        temp_path = path.with_suffix('.jsonl.tmp')
+        try:
+            with open(temp_path, 'wb') as f:
+                for doc_id in index.order:
+                    doc = index.documents[doc_id]
+                    f.write((json.dumps(
+                        {"h": doc.content_hash, "t": doc.text, "s": list(doc.signature)},
+                        ensure_ascii=False
+                    ) + "\n").encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+                disk_offset = f.tell()
+                disk_inode = os.fstat(f.fileno()).st_ino
+            temp_path.replace(path)
+            index.disk_records = len(index.documents)
+            index.disk_offset = disk_offset
+            index.disk_inode = disk_inode
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
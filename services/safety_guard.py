@@ -4,15 +4,30 @@ Enhanced Safety Guard Service.
 Xử lý rate limiting, duplicate detection, action spacing, và account health monitoring.
 """
 
-import hashlib
+import os
 import threading
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, Optional, Tuple
-from collections import defaultdict, deque
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 
 from services.logger import StructuredLogger
+from services.near_duplicate_index import NearDuplicateIndex
+
+# Project root (services/..) - mọi path dữ liệu mặc định neo vào đây, không theo CWD
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DUPLICATE_INDEX_DIR = _PROJECT_ROOT / "data" / "duplicate_index"
+
+
+def _default_duplicate_index_dir() -> str:
+    """Thư mục duplicate index: env DUPLICATE_INDEX_DIR (relative -> theo project root) hoặc data/duplicate_index."""
+    configured = os.getenv("DUPLICATE_INDEX_DIR", "").strip()
+    if not configured:
+        return str(DEFAULT_DUPLICATE_INDEX_DIR)
+    path = Path(configured).expanduser()
+    return str(path if path.is_absolute() else _PROJECT_ROOT / path)
 
 
 class RiskLevel(Enum):
@@ -39,8 +54,11 @@ class SafetyConfig:
     max_delay_between_posts_seconds: float = 30.0
     
     # Duplicate detection
-    duplicate_check_history_size: int = 100
+    duplicate_check_history_size: int = 1000  # Số bài gần nhất mỗi account (0 = không giới hạn)
     duplicate_similarity_threshold: float = 0.9  # 90% similarity
+    duplicate_minhash_permutations: int = 128
+    duplicate_lsh_bands: int = 32
+    duplicate_index_dir: Optional[str] = field(default_factory=_default_duplicate_index_dir)  # None = chỉ giữ trong memory
     
     # Cooldown periods
     cooldown_after_error_seconds: int = 60
@@ -64,7 +82,6 @@ class AccountHealth:
     rate_limit_violations: int = 0
     is_paused: bool = False
     paused_until: Optional[datetime] = None
-    content_history: deque = field(default_factory=lambda: deque(maxlen=100))
     action_timestamps: deque = field(default_factory=lambda: deque(maxlen=100))
 
 
@@ -102,14 +119,16 @@ class SafetyGuard:
         # Account health tracking
         self.account_health: Dict[str, AccountHealth] = {}
         
-        # Content hash tracking (for duplicate detection)
-        self.content_hashes: Dict[str, set] = defaultdict(set)  # account_id -> set of hashes
+        # Near-duplicate index (MinHash/LSH) cho duplicate detection, persist theo account
+        self.duplicate_index = NearDuplicateIndex(
+            num_perm=self.config.duplicate_minhash_permutations,
+            bands=self.config.duplicate_lsh_bands,
+            max_documents_per_account=self.config.duplicate_check_history_size,
+            storage_dir=Path(self.config.duplicate_index_dir) if self.config.duplicate_index_dir else None
+        )
         
         # Thread lock for rate limit checks to prevent race conditions
         self._rate_limit_lock = threading.Lock()
-        
-        # Maximum size for content hashes per account (prevent memory leak)
-        self._max_content_hashes_per_account = 1000
     
     def get_account_health(self, account_id: str) -> AccountHealth:
         """
@@ -231,6 +250,9 @@ class SafetyGuard:
         """
         Check if content is duplicate.
         
+        Exact match qua hash, near-duplicate qua MinHash/LSH index
+        (chỉ verify các candidates cùng bucket thay vì toàn bộ history).
+        
         Args:
             account_id: Account ID
             content: Content to check
@@ -240,18 +262,17 @@ class SafetyGuard:
         """
         # Normalize content for comparison
         normalized = self._normalize_content(content)
-        content_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
         
-        # Check against history
-        if content_hash in self.content_hashes[account_id]:
-            return False, "Duplicate content detected (exact match)"
+        match_type, similarity = self.duplicate_index.find_duplicate(
+            account_id,
+            normalized,
+            self.config.duplicate_similarity_threshold
+        )
         
-        # Check similarity against recent content
-        health = self.get_account_health(account_id)
-        for recent_content in health.content_history:
-            similarity = self._calculate_similarity(normalized, recent_content)
-            if similarity >= self.config.duplicate_similarity_threshold:
-                return False, f"Duplicate content detected ({similarity*100:.1f}% similarity)"
+        if match_type == "exact":
+            return False, "Duplicate content detected (exact match)"
+        if match_type == "similar":
+            return False, f"Duplicate content detected ({similarity*100:.1f}% similarity)"
         
         return True, None
     
@@ -318,15 +339,9 @@ class SafetyGuard:
         health.daily_posts_count += 1
         health.action_timestamps.append(now)
         
-        # Add to content history
+        # Add to duplicate index
         normalized = self._normalize_content(content)
-        content_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
-        
-        # Cleanup old hashes to prevent memory leak
-        self._cleanup_content_hashes(account_id)
-        
-        self.content_hashes[account_id].add(content_hash)
-        health.content_history.append(normalized)
+        self.duplicate_index.add(account_id, normalized)
         
         # Reset consecutive errors on success
         health.consecutive_errors = 0
@@ -344,6 +359,20 @@ class SafetyGuard:
                 daily_posts=health.daily_posts_count
             )
     
+    def record_action(self, account_id: str) -> None:
+        """
+        Record successful non-post action (like, follow, repost...).
+        
+        Tính vào rate limit window nhưng không vào daily post limit / duplicate index.
+        
+        Args:
+            account_id: Account ID
+        """
+        with self._rate_limit_lock:
+            health = self.get_account_health(account_id)
+            health.action_timestamps.append(datetime.now())
+            health.consecutive_errors = 0
+    
     def record_post_error(
         self,
         account_id: str,
@@ -433,24 +462,6 @@ class SafetyGuard:
         from utils.content import normalize_content
         return normalize_content(content)
     
-    def _cleanup_content_hashes(self, account_id: str) -> None:
-        """
-        Cleanup old content hashes to prevent memory leak.
-        
-        Args:
-            account_id: Account ID
-        """
-        if account_id in self.content_hashes:
-            hash_set = self.content_hashes[account_id]
-            if len(hash_set) > self._max_content_hashes_per_account:
-                # Keep only recent hashes (convert to list, keep last N, convert back to set)
-                # Note: sets are unordered, so we keep a subset
-                # In practice, we could use a deque or LRU cache for better control
-                hash_list = list(hash_set)
-                # Keep last N hashes
-                recent_hashes = hash_list[-self._max_content_hashes_per_account:]
-                self.content_hashes[account_id] = set(recent_hashes)
-    
     def cleanup_inactive_accounts(self, max_inactive_days: int = 30) -> int:
         """
         Cleanup AccountHealth objects for inactive accounts.
@@ -477,28 +488,10 @@ class SafetyGuard:
         # Remove inactive accounts
         for account_id in accounts_to_remove:
             del self.account_health[account_id]
-            # Also cleanup content hashes
-            if account_id in self.content_hashes:
-                del self.content_hashes[account_id]
+            # Also release in-memory duplicate index (vẫn persist trên disk)
+            self.duplicate_index.remove_account(account_id)
         
         return len(accounts_to_remove)
-    
-    def _calculate_similarity(self, content1: str, content2: str) -> float:
-        """
-        Calculate similarity between two content strings.
-        
-        Uses simple word overlap ratio.
-        """
-        words1 = set(content1.split())
-        words2 = set(content2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        
-        return intersection / union if union > 0 else 0.0
 
 
 def get_shared_safety_guard(
@@ -5,26 +5,15 @@ Execution logic cho scheduler: run_job, scheduler_loop.
 """
 
 # Standard library
-import sys
-from pathlib import Path
-
-# Add parent directory to path để có thể import utils modules
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-elif sys.path[0] != _parent_dir_str:
-    sys.path.remove(_parent_dir_str)
-    sys.path.insert(0, _parent_dir_str)
-
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, Optional
 
 # Local
 from services.logger import StructuredLogger
 from services.exceptions import StorageError
 from services.scheduler.models import ScheduledJob, JobStatus, Platform, JobType
+from services.scheduler.job_stats import JobStatsCounters
 from services.safety_guard import RiskLevel, get_shared_safety_guard
 from utils.exception_utils import (
     safe_get_exception_type_name,
@@ -46,7 +35,8 @@ class JobExecutor:
         self,
         jobs: Dict[str, ScheduledJob],
         logger: StructuredLogger,
-        save_callback: Callable[[], None]
+        save_callback: Callable[[], None],
+        job_stats: Optional[JobStatsCounters] = None
     ):
         """
         Khởi tạo job executor.
@@ -55,15 +45,22 @@ class JobExecutor:
             jobs: Dict mapping job_id -> ScheduledJob
             logger: Logger instance
             save_callback: Callback để save jobs
+            job_stats: Stats counters cập nhật mỗi khi job đổi trạng thái (tùy chọn)
         """
         self.jobs = jobs
         self.logger = logger
         self.save_jobs = save_callback
+        self.job_stats = job_stats
         self._last_save_time = datetime.min  # Track save time để tránh reload ngay sau save
 
         # Safety guard dùng singleton shared (đồng bộ với UI/SafetyAPI)
         self.safety_guard = get_shared_safety_guard(logger=self.logger)
     
+    def _track_transition(self, job: ScheduledJob) -> None:
+        """Cập nhật stats counters sau khi job đổi trạng thái."""
+        if self.job_stats is not None:
+            self.job_stats.observe(job)
+    
     def _update_job_status(self, job: ScheduledJob, message: str) -> None:
         """
         Update job status message và save ngay lập tức để UI có thể hiển thị real-time.
@@ -110,6 +107,7 @@ class JobExecutor:
                 job.error = safety_error
                 job.status_message = f"❌ Bị chặn bởi SafetyGuard (risk={risk_level.value}): {safety_error}"
                 job.completed_at = datetime.now()
+                self._track_transition(job)
 
                 # Ghi nhận high-risk nếu mức độ cao
                 if risk_level in (RiskLevel.HIGH, RiskLevel.CRITICAL):
@@ -142,6 +140,7 @@ class JobExecutor:
         # --- BẮT ĐẦU THỰC THI JOB ---
         job.status = JobStatus.RUNNING
         job.started_at = datetime.now()  # Lưu thời gian bắt đầu chạy
+        self._track_transition(job)
         self._update_job_status(job, "🔄 Đang khởi động browser...")
         
         # Create WebSocketLogger for realtime job execution logs
@@ -270,6 +269,7 @@ class JobExecutor:
             if result.success:
                 job.status = JobStatus.COMPLETED
                 job.completed_at = datetime.now()
+                self._track_transition(job)
                 job.thread_id = result.thread_id if hasattr(result, 'thread_id') else None
                 job.status_message = f"Hoàn thành thành công - Thread ID: {job.thread_id or 'N/A'}"
 
@@ -332,6 +332,7 @@ class JobExecutor:
                 if job.can_retry():
                     job.retry_count += 1
                     job.status = JobStatus.SCHEDULED
+                    self._track_transition(job)
                     # Exponential backoff: 2^retry_count minutes
                     backoff_minutes = 2 ** job.retry_count
                     job.scheduled_time = datetime.now() + timedelta(minutes=backoff_minutes)
@@ -350,6 +351,7 @@ class JobExecutor:
                     )
                 else:
                     job.status = JobStatus.FAILED
+                    self._track_transition(job)
                     # Safely get error message
                     error_msg = getattr(result, 'error', 'Unknown error')
                     job.error = error_msg
@@ -388,6 +390,7 @@ class JobExecutor:
             if job.can_retry():
                 job.retry_count += 1
                 job.status = JobStatus.SCHEDULED
+                self._track_transition(job)
                 backoff_minutes = 2 ** job.retry_count
                 job.scheduled_time = datetime.now() + timedelta(minutes=backoff_minutes)
                 error_formatted = format_exception(e)
@@ -405,6 +408,7 @@ class JobExecutor:
                 )
             else:
                 job.status = JobStatus.FAILED
+                self._track_transition(job)
                 error_formatted = format_exception(e)
                 job.error = error_formatted
                 job.status_message = f"Lỗi không thể retry sau {job.retry_count} lần thử - {error_formatted}"
@@ -627,14 +631,8 @@ class JobExecutor:
                         # Delay này giúp tránh bị SafetyGuard chặn khi có nhiều jobs cùng ready
                         job_status_after = job.status if hasattr(job, 'status') else None
                         if job_status_after == JobStatus.COMPLETED:
-                            # Lấy min_delay từ SafetyGuard config
-                            min_delay_seconds = 5.0  # Default
-                            try:
-                                from services.safety_guard import SafetyConfig
-                                safety_config = SafetyConfig()
-                                min_delay_seconds = safety_config.min_delay_between_posts_seconds
-                            except Exception:
-                                pass
+                            # Lấy min_delay từ config của SafetyGuard (không tạo SafetyConfig mới mỗi job)
+                            min_delay_seconds = self.safety_guard.config.min_delay_between_posts_seconds
                             
                             # Delay với safety buffer (1.5x để đảm bảo an toàn)
                             delay_seconds = min_delay_seconds * 1.5
@@ -0,0 +1,244 @@
+"""
+Module: services/scheduler/job_codec.py
+
+Codec dùng chung cho ScheduledJob: row/dict -> job (JSON/MySQL/SQLite storage),
+job -> storage dict, enum/datetime helpers cho API serializer và encode JSON.
+
+- Enum lookups qua bảng precomputed (không gọi Enum(value) + try/except)
+- job_to_dict() đọc fields trực tiếp thay vì dataclasses.asdict() (deepcopy)
+- encode_json() dùng orjson nếu có, fallback json stdlib
+"""
+
+# Standard library
+import json
+from dataclasses import MISSING, fields
+from datetime import date, datetime
+from enum import Enum
+from operator import itemgetter
+from typing import Any, Dict, Mapping
+
+# Third-party (optional)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Local
+from services.scheduler.models import (
+    JobPriority,
+    JobStatus,
+    JobType,
+    Platform,
+    ScheduledJob
+)
+
+# value -> member và member -> member: một dict lookup cho cả hai dạng input
+_PRIORITY_LOOKUP: Dict[Any, JobPriority] = {**{p.value: p for p in JobPriority}, **{p: p for p in JobPriority}}
+_STATUS_LOOKUP: Dict[Any, JobStatus] = {**{s.value: s for s in JobStatus}, **{s: s for s in JobStatus}}
+_PLATFORM_LOOKUP: Dict[Any, Platform] = {**{p.value: p for p in Platform}, **{p: p for p in Platform}}
+_JOB_TYPE_LOOKUP: Dict[Any, JobType] = {**{t.value: t for t in JobType}, **{t: t for t in JobType}}
+
+# member -> value (Enum.value là descriptor, chậm hơn dict lookup)
+_ENUM_VALUES: Dict[Any, Any] = {
+    member: member.value for enum_cls in (JobPriority, JobStatus, Platform, JobType) for member in enum_cls
+}
+
+_FIELD_NAMES = tuple(field.name for field in fields(ScheduledJob))
+_FIELD_COUNT = len(_FIELD_NAMES)
+_JOB_FIELDS = frozenset(_FIELD_NAMES)
+_GET_FIELDS = itemgetter(*_FIELD_NAMES)
+# Fields thiếu trong row: default của dataclass; priority/status thiếu -> default enum như from_dict
+_OPTIONAL_DEFAULTS: Dict[str, Any] = {
+    "priority": None,
+    "status": None,
+    **{field.name: field.default for field in fields(ScheduledJob) if field.default is not MISSING},
+}
+
+
+def job_from_row(row: Mapping[str, Any], strict: bool = False) -> ScheduledJob:
+    """
+    Tạo ScheduledJob từ storage row/dict (cùng semantics với ScheduledJob.from_dict).
+
+    - Datetime: ISO string hoặc datetime (từ database, giữ nguyên)
+    - Enums: value hoặc enum instance; value không hợp lệ -> default
+      (priority NORMAL, status SCHEDULED, platform THREADS, job_type POST)
+    - engagement_data: JSON string hoặc dict
+
+    Args:
+        row: Dict/row với các fields của ScheduledJob
+        strict: True -> priority/status/platform không hợp lệ raise ValueError
+            thay vì dùng default (dùng cho database rows)
+
+    Returns:
+        ScheduledJob
+
+    Raises:
+        ValueError: Nếu scheduled_time không hợp lệ, thiếu/thừa fields,
+            hoặc enum không hợp lệ khi strict=True
+    """
+    try:
+        if len(row) == _FIELD_COUNT:
+            values = _GET_FIELDS(row)
+        elif row.keys() <= _JOB_FIELDS:
+            # Row cũ thiếu optional fields -> default của dataclass
+            values = _GET_FIELDS({**_OPTIONAL_DEFAULTS, **row})
+        else:
+            raise KeyError
+    except KeyError:
+        # Thiếu/thừa fields -> để constructor báo lỗi như from_dict
+        try:
+            return ScheduledJob(**row)
+        except TypeError as e:
+            raise ValueError(f"Invalid job data: missing required fields. Error: {str(e)}") from e
+
+    (job_id, account_id, content, scheduled_time, priority_value, status_value, platform_value,
+     job_type_value, engagement_data, max_retries, retry_count, created_at, started_at,
+     completed_at, error, thread_id, status_message, link_aff) = values
+
+    if scheduled_time.__class__ is str:
+        try:
+            scheduled_time = datetime.fromisoformat(scheduled_time)
+        except ValueError as e:
+            raise ValueError(f"Invalid scheduled_time format: {scheduled_time}") from e
+    if created_at.__class__ is str:
+        created_at = _parse_optional_datetime(created_at)
+    if started_at.__class__ is str:
+        started_at = _parse_optional_datetime(started_at)
+    if completed_at.__class__ is str:
+        completed_at = _parse_optional_datetime(completed_at)
+
+    # Lookup tables chỉ chứa members và values đúng type -> miss = không hợp lệ
+    try:
+        priority = _PRIORITY_LOOKUP.get(priority_value)
+        status = _STATUS_LOOKUP.get(status_value)
+        platform = _PLATFORM_LOOKUP.get(platform_value)
+        job_type = _JOB_TYPE_LOOKUP.get(job_type_value)
+    except TypeError:
+        # Unhashable value (list/dict)
+        priority = _safe_lookup(_PRIORITY_LOOKUP, priority_value)
+        status = _safe_lookup(_STATUS_LOOKUP, status_value)
+        platform = _safe_lookup(_PLATFORM_LOOKUP, platform_value)
+        job_type = _safe_lookup(_JOB_TYPE_LOOKUP, job_type_value)
+    if priority is None:
+        priority = _enum_default(JobPriority, priority_value, JobPriority.NORMAL, strict)
+    if status is None:
+        status = _enum_default(JobStatus, status_value, JobStatus.SCHEDULED, strict)
+    if platform is None:
+        platform = _enum_default(Platform, platform_value, Platform.THREADS, strict)
+    if job_type is None:
+        job_type = JobType.POST
+
+    if engagement_data:
+        if engagement_data.__class__ is str:
+            try:
+                engagement_data = json.loads(engagement_data)
+            except ValueError:
+                engagement_data = None
+        elif not isinstance(engagement_data, dict):
+            engagement_data = None
+    else:
+        engagement_data = None
+
+    return ScheduledJob(
+        job_id, account_id, content, scheduled_time, priority, status, platform, job_type,
+        engagement_data, max_retries, retry_count, created_at, started_at, completed_at,
+        error, thread_id, status_message, link_aff
+    )
+
+
+def job_to_dict(job: ScheduledJob) -> Dict[str, Any]:
+    """
+    ScheduledJob -> dict để lưu (cùng output với ScheduledJob.to_dict).
+
+    Datetimes -> ISO string, enums -> value, engagement_data -> JSON string.
+    """
+    engagement_data = job.engagement_data
+    if engagement_data is not None:
+        try:
+            engagement_data = json.dumps(engagement_data, ensure_ascii=False)
+        except (TypeError, ValueError):
+            engagement_data = None
+
+    platform = job.platform
+    job_type = job.job_type
+    return {
+        "job_id": job.job_id,
+        "account_id": job.account_id,
+        "content": job.content,
+        "scheduled_time": datetime_to_iso(job.scheduled_time),
+        "priority": enum_value(job.priority),
+        "status": enum_value(job.status),
+        "platform": enum_value(platform) if platform else Platform.THREADS.value,
+        "job_type": enum_value(job_type) if job_type is not None else JobType.POST.value,
+        "engagement_data": engagement_data,
+        "max_retries": job.max_retries,
+        "retry_count": job.retry_count,
+        "created_at": datetime_to_iso(job.created_at),
+        "started_at": datetime_to_iso(job.started_at),
+        "completed_at": datetime_to_iso(job.completed_at),
+        "error": job.error,
+        "thread_id": job.thread_id,
+        "status_message": job.status_message,
+        "link_aff": job.link_aff,
+    }
+
+
+def enum_value(value: Any) -> Any:
+    """Enum member -> value (lookup table cho scheduler enums), object khác -> str()."""
+    try:
+        return _ENUM_VALUES[value]
+    except (KeyError, TypeError):
+        return value.value if hasattr(value, "value") else str(value)
+
+
+def datetime_to_iso(value: Any) -> Any:
+    """datetime -> ISO string, value khác giữ nguyên."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_json(data: Any) -> bytes:
+    """
+    Encode JSON (UTF-8 bytes) cho API responses, orjson nếu có.
+
+    datetime -> ISO string, Enum -> value (giống FastAPI jsonable_encoder),
+    object khác -> str().
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson không hỗ trợ một số values (ví dụ int > 64 bit) -> fallback
+            pass
+    return json.dumps(data, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _parse_optional_datetime(value: str) -> Any:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _safe_lookup(table: Dict[Any, Any], value: Any) -> Any:
+    try:
+        return table.get(value)
+    except TypeError:
+        return None
+
+
+def _enum_default(enum_cls: type, value: Any, default: Any, strict: bool) -> Any:
+    if strict and value is not None:
+        raise ValueError(f"Invalid {enum_cls.__name__} value: {value}")
+    return default
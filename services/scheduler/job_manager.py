@@ -5,18 +5,6 @@ Job management logic cho scheduler: add, remove, list, get_ready, cleanup_expire
 """
 
 # Standard library
-import sys
-from pathlib import Path
-
-# Add parent directory to path để có thể import utils modules
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-elif sys.path[0] != _parent_dir_str:
-    sys.path.remove(_parent_dir_str)
-    sys.path.insert(0, _parent_dir_str)
-
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Callable
 from uuid import uuid4
@@ -30,6 +18,7 @@ from services.exceptions import (
     StorageError,
 )
 from services.scheduler.models import ScheduledJob, JobStatus, JobPriority, Platform
+from services.scheduler.job_stats import JobStatsCounters
 from services.scheduler.job_validator import JobValidator, ValidationSeverity
 from utils.exception_utils import safe_get_exception_type_name
 
@@ -50,6 +39,7 @@ class JobManager:
         jobs: Dict[str, ScheduledJob],
         logger: StructuredLogger,
         overdue_threshold_hours: Optional[int] = None,
+        job_stats: Optional[JobStatsCounters] = None,
     ):
         """
         Khởi tạo job manager.
@@ -58,9 +48,11 @@ class JobManager:
             jobs: Dict mapping job_id -> ScheduledJob
             logger: Logger instance
             overdue_threshold_hours: Skip jobs overdue by more than this (None = catch-up all overdue jobs)
+            job_stats: Stats counters cập nhật khi add/remove/expire jobs (tùy chọn)
         """
         self.jobs = jobs
         self.logger = logger
+        self.job_stats = job_stats
         self.validator = JobValidator(logger)
         self.overdue_threshold_hours = overdue_threshold_hours
 
@@ -242,6 +234,8 @@ class JobManager:
             job.status_message = f"Đã thêm vào scheduler - sẽ chạy vào {vn_time_str}"
             # Thread-safe: Direct assignment is safe for new keys
             self.jobs[job_id] = job
+            if self.job_stats is not None:
+                self.job_stats.observe(job)
 
             # DEBUG: Verify job is in memory before saving
             if job_id not in self.jobs:
@@ -341,6 +335,8 @@ class JobManager:
             job_existed = job_id in self.jobs
             del self.jobs[job_id]
             jobs_count_after = len(self.jobs)
+            if self.job_stats is not None:
+                self.job_stats.discard(job_id)
 
             self.logger.log_step(
                 step="REMOVE_JOB",
@@ -649,6 +645,8 @@ class JobManager:
                     job, "scheduled_time"
                 ) and datetime.now() > job.scheduled_time + timedelta(hours=24):
                     job.status = JobStatus.EXPIRED
+                    if self.job_stats is not None:
+                        self.job_stats.observe(job)
                     hours_past = (
                         datetime.now() - job.scheduled_time
                     ).total_seconds() / 3600
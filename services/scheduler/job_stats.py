@@ -0,0 +1,128 @@
+"""
+Module: services/scheduler/job_stats.py
+
+Counters thống kê jobs (theo account và toàn bộ) được cập nhật tăng dần
+mỗi khi job đổi trạng thái, để stats (dashboard poll liên tục) là O(1)
+thay vì duyệt toàn bộ jobs.
+
+- observe(job): ghi nhận trạng thái hiện tại của job (delta so với lần trước)
+- discard(job_id): job bị xóa
+- reconcile(jobs): dựng lại counters từ jobs đã load từ storage
+"""
+
+# Standard library
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+# Local
+from services.scheduler.models import JobStatus, ScheduledJob
+from services.utils.datetime_utils import normalize_to_utc
+
+# Reconcile với storage định kỳ (bắt thay đổi từ process khác / ngoài scheduler)
+STATS_RECONCILE_SECONDS = 60.0
+
+_PENDING_STATUSES = (JobStatus.PENDING, JobStatus.SCHEDULED)
+
+# job_id -> (account_id, status, ngày completed UTC nếu COMPLETED)
+_Entry = Tuple[Optional[str], JobStatus, Optional[date]]
+
+
+class JobStatsCounters:
+    """
+    Status counters theo account + global, và bucket "posts today" theo ngày completed (UTC).
+
+    Key None trong counters là global (tất cả accounts). Thread-safe.
+    """
+
+    def __init__(self):
+        """Khởi tạo counters rỗng (chưa reconcile)."""
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._status_counts: Dict[Optional[str], Counter] = {None: Counter()}
+        self._completed_by_day: Dict[Optional[str], Counter] = {None: Counter()}
+        self._reconciled_at: Optional[float] = None
+
+    def observe(self, job: ScheduledJob) -> None:
+        """Ghi nhận trạng thái hiện tại của job (add hoặc transition)."""
+        entry = _entry_for(job)
+        with self._lock:
+            previous = self._entries.get(job.job_id)
+            if previous == entry:
+                return
+            if previous is not None:
+                self._apply(previous, -1)
+            self._entries[job.job_id] = entry
+            self._apply(entry, 1)
+
+    def discard(self, job_id: str) -> None:
+        """Bỏ job đã bị xóa khỏi counters."""
+        with self._lock:
+            previous = self._entries.pop(job_id, None)
+            if previous is not None:
+                self._apply(previous, -1)
+
+    def reconcile(self, jobs: Iterable[ScheduledJob]) -> None:
+        """Dựng lại counters từ danh sách jobs đầy đủ (source of truth)."""
+        entries = {job.job_id: _entry_for(job) for job in jobs}
+        with self._lock:
+            self._entries = {}
+            self._status_counts = {None: Counter()}
+            self._completed_by_day = {None: Counter()}
+            for job_id, entry in entries.items():
+                self._entries[job_id] = entry
+                self._apply(entry, 1)
+            self._reconciled_at = time.monotonic()
+
+    def reconcile_due(self, max_age_seconds: float = STATS_RECONCILE_SECONDS) -> bool:
+        """True nếu chưa reconcile lần nào hoặc lần cuối đã quá max_age_seconds."""
+        reconciled_at = self._reconciled_at
+        return reconciled_at is None or time.monotonic() - reconciled_at >= max_age_seconds
+
+    def get_stats(self, account_id: Optional[str] = None) -> Dict:
+        """
+        Stats của một account (None = tất cả accounts).
+
+        Returns:
+            Dict với total, completed, failed, pending, running, today_posts, success_rate
+        """
+        today = datetime.now(timezone.utc).date()
+        with self._lock:
+            counts = self._status_counts.get(account_id)
+            by_day = self._completed_by_day.get(account_id)
+            counts = dict(counts) if counts else {}
+            today_posts = by_day[today] if by_day else 0
+
+        total = sum(counts.values())
+        completed = counts.get(JobStatus.COMPLETED, 0)
+        return {
+            "total": total,
+            "completed": completed,
+            "failed": counts.get(JobStatus.FAILED, 0),
+            "pending": sum(counts.get(status, 0) for status in _PENDING_STATUSES),
+            "running": counts.get(JobStatus.RUNNING, 0),
+            "today_posts": today_posts,
+            "success_rate": (completed / total * 100) if total > 0 else 0.0,
+        }
+
+    def _apply(self, entry: _Entry, delta: int) -> None:
+        account_id, status, completed_day = entry
+        for key in (None, account_id) if account_id is not None else (None,):
+            counts = self._status_counts.setdefault(key, Counter())
+            counts[status] += delta
+            if counts[status] <= 0:
+                del counts[status]
+            if completed_day is not None:
+                by_day = self._completed_by_day.setdefault(key, Counter())
+                by_day[completed_day] += delta
+                if by_day[completed_day] <= 0:
+                    del by_day[completed_day]
+
+
+def _entry_for(job: ScheduledJob) -> _Entry:
+    completed_day = None
+    if job.status == JobStatus.COMPLETED and isinstance(job.completed_at, datetime):
+        completed_day = normalize_to_utc(job.completed_at).date()
+    return job.account_id, job.status, completed_day
@@ -8,7 +8,7 @@ Models cho scheduler: JobStatus, JobPriority, ScheduledJob.
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 # Local
 from services.utils.datetime_utils import ensure_utc
@@ -49,9 +49,9 @@ class JobType(Enum):
     ENGAGEMENT = "engagement"  # Engagement actions (like, comment, follow)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledJob:
-    """Job được lên lịch."""
+    """Job được lên lịch (slots: không có __dict__, ít memory hơn khi giữ nhiều jobs)."""
 
     job_id: str
     account_id: Optional[str]  # Optional account ID (can be None)
@@ -87,111 +87,9 @@ class ScheduledJob:
 
     def to_dict(self) -> Dict[str, Any]:
         """Chuyển job thành dict để lưu."""
-        try:
-            data = asdict(self)
-        except Exception:
-            # Fallback nếu asdict fails
-            data = {
-                "job_id": self.job_id,
-                "account_id": self.account_id,
-                "content": self.content,
-                "scheduled_time": self.scheduled_time,
-                "priority": self.priority,
-                "status": self.status,
-                "platform": self.platform,
-                "job_type": getattr(self, "job_type", JobType.POST),
-                "engagement_data": getattr(self, "engagement_data", None),
-                "max_retries": self.max_retries,
-                "retry_count": self.retry_count,
-                "created_at": self.created_at,
-                "started_at": self.started_at,
-                "completed_at": self.completed_at,
-                "error": self.error,
-                "thread_id": self.thread_id,
-                "status_message": self.status_message,
-                "link_aff": self.link_aff,
-            }
-
-        # Convert datetime to ISO string với error handling
-        try:
-            if isinstance(data.get("scheduled_time"), datetime):
-                data["scheduled_time"] = data["scheduled_time"].isoformat()
-        except (AttributeError, TypeError):
-            pass
-
-        try:
-            if isinstance(data.get("created_at"), datetime):
-                data["created_at"] = data["created_at"].isoformat()
-        except (AttributeError, TypeError):
-            pass
-
-        try:
-            if isinstance(data.get("completed_at"), datetime):
-                data["completed_at"] = data["completed_at"].isoformat()
-        except (AttributeError, TypeError):
-            pass
-
-        try:
-            if isinstance(data.get("started_at"), datetime):
-                data["started_at"] = data["started_at"].isoformat()
-        except (AttributeError, TypeError):
-            pass
-
-        # Convert enums to values với error handling
-        try:
-            if hasattr(self.priority, "value"):
-                data["priority"] = self.priority.value
-            else:
-                data["priority"] = str(self.priority)
-        except (AttributeError, TypeError):
-            data["priority"] = str(self.priority) if self.priority else None
-
-        try:
-            if hasattr(self.status, "value"):
-                data["status"] = self.status.value
-            else:
-                data["status"] = str(self.status)
-        except (AttributeError, TypeError):
-            data["status"] = str(self.status) if self.status else None
-
-        try:
-            if hasattr(self, "platform") and self.platform:
-                if hasattr(self.platform, "value"):
-                    data["platform"] = self.platform.value
-                else:
-                    data["platform"] = str(self.platform)
-            else:
-                # Default to THREADS nếu không có platform
-                data["platform"] = Platform.THREADS.value
-        except (AttributeError, TypeError):
-            # Default to THREADS nếu có lỗi
-            data["platform"] = Platform.THREADS.value
+        from services.scheduler.job_codec import job_to_dict
 
-        # Convert job_type to value
-        try:
-            job_type = getattr(self, "job_type", JobType.POST)
-            if hasattr(job_type, "value"):
-                data["job_type"] = job_type.value
-            else:
-                data["job_type"] = str(job_type)
-        except (AttributeError, TypeError):
-            data["job_type"] = JobType.POST.value
-
-        # Convert engagement_data to JSON string if present
-        try:
-            engagement_data = getattr(self, "engagement_data", None)
-            if engagement_data is not None:
-                import json
-
-                data["engagement_data"] = json.dumps(
-                    engagement_data, ensure_ascii=False
-                )
-            else:
-                data["engagement_data"] = None
-        except (AttributeError, TypeError, ValueError):
-            data["engagement_data"] = None
-
-        return data
+        return job_to_dict(self)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ScheduledJob":
@@ -201,123 +99,9 @@ class ScheduledJob:
         Note: scheduled_time từ database đã là UTC, không cần normalize lại.
         Chỉ normalize khi parse từ user input (Excel, form).
         """
-        # Make a copy để không modify original dict
-        job_data = data.copy()
-
-        # Convert ISO string to datetime với error handling
-        # Note: datetime từ database đã có timezone info (UTC), không cần normalize
-        try:
-            if isinstance(job_data.get("scheduled_time"), str):
-                job_data["scheduled_time"] = datetime.fromisoformat(
-                    job_data["scheduled_time"]
-                )
-        except (ValueError, TypeError) as e:
-            raise ValueError(
-                f"Invalid scheduled_time format: {job_data.get('scheduled_time')}"
-            ) from e
-
-        try:
-            if isinstance(job_data.get("created_at"), str):
-                job_data["created_at"] = datetime.fromisoformat(job_data["created_at"])
-        except (ValueError, TypeError):
-            # created_at có thể None hoặc invalid, set to None
-            job_data["created_at"] = None
-
-        try:
-            if isinstance(job_data.get("completed_at"), str):
-                job_data["completed_at"] = datetime.fromisoformat(
-                    job_data["completed_at"]
-                )
-        except (ValueError, TypeError):
-            # completed_at có thể None hoặc invalid, set to None
-            job_data["completed_at"] = None
-
-        try:
-            if isinstance(job_data.get("started_at"), str):
-                job_data["started_at"] = datetime.fromisoformat(job_data["started_at"])
-        except (ValueError, TypeError):
-            # started_at có thể None hoặc invalid, set to None
-            job_data["started_at"] = None
+        from services.scheduler.job_codec import job_from_row
 
-        # Convert values to enums với error handling
-        try:
-            priority_value = job_data.get("priority")
-            if isinstance(priority_value, JobPriority):
-                job_data["priority"] = priority_value
-            elif isinstance(priority_value, (int, str)):
-                job_data["priority"] = JobPriority(priority_value)
-            else:
-                # Default to NORMAL nếu không parse được
-                job_data["priority"] = JobPriority.NORMAL
-        except (ValueError, KeyError, TypeError):
-            # Default to NORMAL nếu không parse được
-            job_data["priority"] = JobPriority.NORMAL
-
-        try:
-            status_value = job_data.get("status")
-            if isinstance(status_value, JobStatus):
-                job_data["status"] = status_value
-            elif isinstance(status_value, str):
-                job_data["status"] = JobStatus(status_value)
-            else:
-                # Default to SCHEDULED nếu không parse được
-                job_data["status"] = JobStatus.SCHEDULED
-        except (ValueError, KeyError, TypeError):
-            # Default to SCHEDULED nếu không parse được
-            job_data["status"] = JobStatus.SCHEDULED
-
-        # Convert platform value to enum với error handling (backward compatible)
-        try:
-            platform_value = job_data.get("platform")
-            if isinstance(platform_value, Platform):
-                job_data["platform"] = platform_value
-            elif isinstance(platform_value, str):
-                job_data["platform"] = Platform(platform_value)
-            else:
-                # Default to THREADS nếu không có platform (backward compatible)
-                job_data["platform"] = Platform.THREADS
-        except (ValueError, KeyError, TypeError):
-            # Default to THREADS nếu không parse được (backward compatible)
-            job_data["platform"] = Platform.THREADS
-
-        # Convert job_type value to enum (backward compatible - default to POST)
-        try:
-            job_type_value = job_data.get("job_type")
-            if isinstance(job_type_value, JobType):
-                job_data["job_type"] = job_type_value
-            elif isinstance(job_type_value, str):
-                job_data["job_type"] = JobType(job_type_value)
-            else:
-                # Default to POST nếu không có job_type (backward compatible)
-                job_data["job_type"] = JobType.POST
-        except (ValueError, KeyError, TypeError):
-            # Default to POST nếu không parse được (backward compatible)
-            job_data["job_type"] = JobType.POST
-
-        # Parse engagement_data from JSON string if present
-        try:
-            engagement_data = job_data.get("engagement_data")
-            if engagement_data:
-                if isinstance(engagement_data, str):
-                    import json
-
-                    job_data["engagement_data"] = json.loads(engagement_data)
-                elif isinstance(engagement_data, dict):
-                    job_data["engagement_data"] = engagement_data
-                else:
-                    job_data["engagement_data"] = None
-            else:
-                job_data["engagement_data"] = None
-        except (ValueError, TypeError, json.JSONDecodeError):
-            job_data["engagement_data"] = None
-
-        try:
-            return cls(**job_data)
-        except TypeError as e:
-            # Missing required fields
-            raise ValueError(
-                f"Invalid job data: missing required fields. Error: {str(e)}"
-            ) from e
+        return job_from_row(data)
 
     def is_expired(self) -> bool:
         """
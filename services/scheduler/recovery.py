@@ -5,24 +5,13 @@ Recovery logic cho scheduler: recover stuck jobs và running jobs.
 """
 
 # Standard library
-import sys
-from pathlib import Path
-
-# Add parent directory to path để có thể import utils modules
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-elif sys.path[0] != _parent_dir_str:
-    sys.path.remove(_parent_dir_str)
-    sys.path.insert(0, _parent_dir_str)
-
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 
 # Local
 from services.logger import StructuredLogger
 from services.scheduler.models import ScheduledJob, JobStatus
+from services.scheduler.job_stats import JobStatsCounters
 from utils.exception_utils import (
     safe_get_exception_type_name
 )
@@ -37,15 +26,23 @@ class JobRecovery:
     
     def __init__(
         self,
-        logger: StructuredLogger
+        logger: StructuredLogger,
+        job_stats: Optional[JobStatsCounters] = None
     ):
         """
         Khởi tạo recovery manager.
         
         Args:
             logger: Logger instance
+            job_stats: Stats counters cập nhật mỗi khi job đổi trạng thái (tùy chọn)
         """
         self.logger = logger
+        self.job_stats = job_stats
+    
+    def _track_transition(self, job: ScheduledJob) -> None:
+        """Cập nhật stats counters sau khi job đổi trạng thái."""
+        if self.job_stats is not None:
+            self.job_stats.observe(job)
     
     def recover_stuck_jobs(
         self,
@@ -118,6 +115,7 @@ class JobRecovery:
                         max_retries = getattr(job, 'max_retries', 3)
                         job.retry_count = retry_count + 1
                         job.status = JobStatus.SCHEDULED
+                        self._track_transition(job)
                         # Exponential backoff: 2^retry_count minutes
                         backoff_minutes = 2 ** job.retry_count
                         job.scheduled_time = datetime.now() + timedelta(minutes=backoff_minutes)
@@ -166,6 +164,7 @@ class JobRecovery:
                         max_retries = getattr(job, 'max_retries', 3)
                         job.status = JobStatus.FAILED
                         job.started_at = None  # Reset started_at
+                        self._track_transition(job)
                         job.error = f"Job bị stuck {running_minutes} phút và đã hết retry ({retry_count}/{max_retries})"
                         job.status_message = f"Thất bại - {job.error}"
                         
@@ -283,6 +282,7 @@ class JobRecovery:
                         max_retries = getattr(job, 'max_retries', 3)
                         job.retry_count = retry_count + 1
                         job.status = JobStatus.SCHEDULED
+                        self._track_transition(job)
                         # Exponential backoff: 2^retry_count minutes
                         backoff_minutes = 2 ** job.retry_count
                         job.scheduled_time = datetime.now() + timedelta(minutes=backoff_minutes)
@@ -331,6 +331,7 @@ class JobRecovery:
                         max_retries = getattr(job, 'max_retries', 3)
                         job.status = JobStatus.FAILED
                         job.started_at = None  # Reset started_at
+                        self._track_transition(job)
                         job.error = f"Job bị RUNNING khi scheduler start và đã hết retry ({retry_count}/{max_retries})"
                         job.status_message = f"Thất bại - {job.error}"
                         
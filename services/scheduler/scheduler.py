@@ -6,36 +6,21 @@ Quản lý job queue với priority, datetime-based scheduling, và retry policy
 """
 
 # Standard library
-import sys
-from pathlib import Path
-
-# Add parent directory to path để có thể import utils modules
-# CRITICAL: Phải setup TRƯỚC KHI import bất kỳ module nào từ utils
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-elif sys.path[0] != _parent_dir_str:
-    sys.path.remove(_parent_dir_str)
-    sys.path.insert(0, _parent_dir_str)
-
 import asyncio
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Dict, Callable, Any
 
-# Local - Import các modules khác TRƯỚC utils
+# Local (sys.path đã được setup một lần trong services/__init__.py)
 from services.logger import StructuredLogger
 from services.scheduler.models import ScheduledJob, JobStatus, JobPriority, Platform
-
-# Import storage TRƯỚC utils để đảm bảo storage cũng có sys.path setup
 from services.scheduler.storage import JobStorage
 from services.scheduler.storage.factory import create_job_storage
 from services.scheduler.storage.base import JobStorageBase
 from services.scheduler.recovery import JobRecovery
 from services.scheduler.job_manager import JobManager
 from services.scheduler.execution import JobExecutor
-
-# Import utils SAU KHI đã import tất cả các modules khác
+from services.scheduler.job_stats import JobStatsCounters
 from utils.exception_utils import (
     safe_get_exception_type_name
 )
@@ -73,7 +58,7 @@ class Scheduler:
             storage_dir: Thư mục lưu jobs theo ngày (mặc định: ./jobs, chỉ dùng cho JSON storage)
             logger: Instance structured logger (tùy chọn)
             storage: JobStorageBase instance (nếu provided, sẽ dùng instance này thay vì tạo mới)
-            storage_type: Storage type ("json" or "mysql", None = auto-load from config)
+            storage_type: Storage type ("json", "journal", "sqlite" or "mysql", None = auto-load from config)
             mysql_host: MySQL host (None = auto-load from config)
             mysql_port: MySQL port (None = auto-load from config)
             mysql_user: MySQL user (None = auto-load from config)
@@ -86,6 +71,8 @@ class Scheduler:
         self.running = False
         self._task: Optional[asyncio.Task] = None
         self._last_save_time = datetime.min  # Track save time để tránh reload ngay sau save
+        self._jobs_version = 0  # Tăng mỗi lần jobs được load/save (dùng để invalidate caches phía đọc)
+        self.job_stats = JobStatsCounters()  # Status counters, cập nhật theo transitions + reconcile khi load
         
         # Load scheduler config để lấy overdue_threshold_hours
         self.overdue_threshold_hours = None
@@ -206,7 +193,7 @@ class Scheduler:
         
         # Initialize components với self.jobs đã được load
         try:
-            self.recovery = JobRecovery(self.logger)
+            self.recovery = JobRecovery(self.logger, job_stats=self.job_stats)
         except Exception as e:
             self.logger.log_step(
                 step="INIT_SCHEDULER",
@@ -217,7 +204,7 @@ class Scheduler:
             raise RuntimeError(f"Failed to initialize scheduler recovery: {str(e)}") from e
         
         try:
-            self.job_manager = JobManager(self.jobs, self.logger)
+            self.job_manager = JobManager(self.jobs, self.logger, job_stats=self.job_stats)
         except Exception as e:
             self.logger.log_step(
                 step="INIT_SCHEDULER",
@@ -231,7 +218,8 @@ class Scheduler:
             self.executor = JobExecutor(
                 self.jobs,
                 self.logger,
-                self._save_jobs
+                self._save_jobs,
+                job_stats=self.job_stats
             )
         except Exception as e:
             self.logger.log_step(
@@ -427,6 +415,8 @@ class Scheduler:
             # và remove_job sẽ xóa khỏi dict cũ trong khi scheduler.jobs trỏ đến dict mới
             self.jobs.clear()
             self.jobs.update(merged_jobs)
+            self._jobs_version += 1
+            self.job_stats.reconcile(self.jobs.values())
             
             # Optimize: Single pass filter thay vì multiple list comprehensions (fix N+1 filter pattern)
             running_count = 0
@@ -509,6 +499,7 @@ class Scheduler:
             self.storage.save_jobs(self.jobs)
             # Track save time để tránh reload ngay sau save
             self._last_save_time = datetime.now()
+            self._jobs_version += 1
             
             # Optimize: Single pass filter thay vì multiple list comprehensions (fix N+1 filter pattern)
             completed_count = 0
@@ -537,6 +528,18 @@ class Scheduler:
             # Re-raise để caller có thể handle (storage errors should be handled)
             raise
     
+    @property
+    def jobs_version(self) -> int:
+        """
+        Version của jobs dict, tăng sau mỗi lần load/save.
+        
+        Mọi thay đổi job (add/remove/status update) đều đi qua _save_jobs,
+        nên caches phía đọc có thể so sánh version thay vì quét lại jobs.
+        Counter chỉ có trong process này: thay đổi do process khác ghi vào
+        storage không làm tăng version (caches cần TTL riêng).
+        """
+        return self._jobs_version
+    
     # Job management methods (delegate to JobManager)
     def add_job(
         self,
@@ -5,19 +5,8 @@ Storage logic cho scheduler: load/save jobs từ file.
 """
 
 # Standard library
-import sys
 from pathlib import Path
 
-# Add parent directory to path để có thể import utils modules
-# Điều này đảm bảo Python có thể tìm thấy utils.exception_utils
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-elif sys.path[0] != _parent_dir_str:
-    sys.path.remove(_parent_dir_str)
-    sys.path.insert(0, _parent_dir_str)
-
 import json
 from datetime import datetime
 from typing import List, Dict, Optional
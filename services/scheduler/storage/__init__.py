@@ -3,6 +3,8 @@ Storage module cho scheduler.
 
 Provides storage implementations:
 - JobStorage (JSON files) - Original implementation
+- JournalJobStorage (JSON journal + snapshot) - Append-only deltas
+- SQLiteJobStorage (SQLite, WAL mode) - Embedded database
 - MySQLJobStorage (MySQL database) - New implementation
 - JobStorageBase - Abstract base class
 - Factory function for creating storage instances
@@ -13,14 +15,20 @@ All implementations follow same interface via JobStorageBase.
 # Import for backward compatibility
 from services.scheduler.storage.json_storage import JobStorage
 
+from services.scheduler.storage.journal_storage import JournalJobStorage
+from services.scheduler.storage.sqlite_storage import SQLiteJobStorage
+
 # Import base class for implementations
-from services.scheduler.storage.base import JobStorageBase
+from services.scheduler.storage.base import JobQuery, JobStorageBase
 
 # Import factory
 from services.scheduler.storage.factory import create_job_storage
 
 __all__ = [
     "JobStorage",  # JSON storage (backward compatible)
+    "JournalJobStorage",  # JSON journal + snapshot storage
+    "SQLiteJobStorage",  # SQLite (WAL) storage
     "JobStorageBase",  # Abstract base class
+    "JobQuery",  # Filters + pagination cho query_jobs/count_jobs
     "create_job_storage",  # Factory function
 ]
@@ -7,11 +7,39 @@ Defines interface cho cả JSON và MySQL storage.
 
 # Standard library
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 # Local
-from services.scheduler.models import ScheduledJob, JobStatus
+from services.scheduler.models import ScheduledJob, JobStatus, Platform
 from services.logger import StructuredLogger
+from services.utils.datetime_utils import ensure_utc
+
+
+# LIMIT khi chỉ có OFFSET (SQLite và MySQL đều cần LIMIT trước OFFSET)
+_NO_LIMIT = 2 ** 63 - 1
+
+
+@dataclass(frozen=True)
+class JobQuery:
+    """
+    Filters + pagination cho query_jobs()/count_jobs().
+
+    Kết quả sort giảm dần theo (priority, scheduled_time, job_id): priority cao và
+    job mới nhất trước, như JobManager.list_jobs. Keyset pagination: `after` là
+    job_sort_key() của job cuối trang trước; offset chỉ dùng khi không có `after`.
+    Datetimes là UTC (naive = UTC).
+    """
+
+    account_id: Optional[str] = None
+    status: Optional[JobStatus] = None
+    platform: Optional[Platform] = None
+    scheduled_from: Optional[datetime] = None  # inclusive
+    scheduled_before: Optional[datetime] = None  # exclusive
+    after: Optional[Tuple[int, datetime, str]] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
 
 
 class JobStorageBase(ABC):
@@ -30,11 +58,16 @@ class JobStorageBase(ABC):
     - get_job_by_id(): Get single job by ID
     - get_jobs_by_status(): Filter jobs by status
     - get_jobs_by_account(): Filter jobs by account
+    - query_jobs()/count_jobs(): Filter + sort + pagination (JobQuery)
     
     Attributes:
         logger: Structured logger instance (should be set by subclasses)
+        supports_queries: True nếu query_jobs()/count_jobs() chạy trong storage
+            (SQL), không phải load_jobs() + filter trong Python
     """
     
+    supports_queries: bool = False
+    
     def __init__(self, logger: StructuredLogger):
         """
         Initialize base storage.
@@ -152,6 +185,42 @@ class JobStorageBase(ABC):
         
         return filtered
     
+    def query_jobs(self, query: JobQuery) -> List[ScheduledJob]:
+        """
+        Get jobs matching query, sorted by job_sort_key() descending (optional method).
+        
+        Default implementation: Load all jobs và filter.
+        Subclasses có thể override để optimize với database queries.
+        
+        Args:
+            query: Filters + pagination
+        
+        Returns:
+            List of ScheduledJob (một trang nếu query có limit)
+        """
+        return filter_jobs(self.load_jobs().values(), query)
+    
+    def count_jobs(self, query: JobQuery) -> int:
+        """
+        Count jobs matching query filters (bỏ qua after/limit/offset) (optional method).
+        
+        Default implementation: Load all jobs và filter.
+        Subclasses có thể override để optimize với database queries.
+        
+        Args:
+            query: Filters
+        
+        Returns:
+            Number of matching jobs
+        """
+        return len(filter_jobs(self.load_jobs().values(), JobQuery(
+            account_id=query.account_id,
+            status=query.status,
+            platform=query.platform,
+            scheduled_from=query.scheduled_from,
+            scheduled_before=query.scheduled_before
+        )))
+    
     def close(self) -> None:
         """
         Close storage connection (optional cleanup).
@@ -160,3 +229,116 @@ class JobStorageBase(ABC):
         Subclasses có thể override để close database connections, etc.
         """
         pass
+
+
+def filter_jobs(jobs: Iterable[ScheduledJob], query: JobQuery) -> List[ScheduledJob]:
+    """
+    Áp dụng JobQuery lên jobs trong memory (cùng semantics với SQL implementations).
+    
+    Args:
+        jobs: Jobs để filter
+        query: Filters + pagination
+    
+    Returns:
+        List of ScheduledJob sorted by job_sort_key() descending
+    """
+    scheduled_from = ensure_utc(query.scheduled_from) if query.scheduled_from else None
+    scheduled_before = ensure_utc(query.scheduled_before) if query.scheduled_before else None
+    
+    matched = []
+    for job in jobs:
+        if query.account_id is not None and job.account_id != query.account_id:
+            continue
+        if query.status is not None and job.status != query.status:
+            continue
+        if query.platform is not None and job.platform != query.platform:
+            continue
+        if scheduled_from is not None or scheduled_before is not None:
+            if not job.scheduled_time:
+                continue
+            scheduled_time = ensure_utc(job.scheduled_time)
+            if scheduled_from is not None and scheduled_time < scheduled_from:
+                continue
+            if scheduled_before is not None and scheduled_time >= scheduled_before:
+                continue
+        matched.append(job)
+    
+    matched.sort(key=job_sort_key, reverse=True)
+    
+    if query.after is not None:
+        priority, scheduled_time, job_id = query.after
+        after = (priority, ensure_utc(scheduled_time), job_id)
+        matched = [job for job in matched if job_sort_key(job) < after]
+    elif query.offset:
+        matched = matched[query.offset:]
+    if query.limit is not None and query.limit > 0:
+        matched = matched[:query.limit]
+    return matched
+
+
+def build_job_query_sql(
+    query: JobQuery,
+    placeholder: str,
+    to_db_datetime: Callable[[datetime], Any],
+    for_count: bool = False
+) -> Tuple[str, List[Any]]:
+    """
+    Build phần SQL sau "FROM jobs" cho JobQuery (parameterized).
+    
+    Filters dùng idx_account_status / idx_status_scheduled / idx_scheduled_time;
+    ORDER BY priority DESC, scheduled_time DESC, job_id DESC (không filesort khi
+    filter theo status / account_id + status: idx_status_priority_order,
+    idx_account_status_priority_order); keyset cursor là row comparison
+    (priority, scheduled_time, job_id) < after.
+    
+    Args:
+        query: Filters + pagination
+        placeholder: "?" (SQLite) hoặc "%s" (MySQL)
+        to_db_datetime: Convert datetime -> giá trị so sánh được với cột scheduled_time
+        for_count: True -> chỉ WHERE (bỏ cursor, ORDER BY, LIMIT/OFFSET)
+    
+    Returns:
+        Tuple (sql, params)
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+    if query.account_id is not None:
+        conditions.append(f"account_id = {placeholder}")
+        params.append(query.account_id)
+    if query.status is not None:
+        conditions.append(f"status = {placeholder}")
+        params.append(query.status.value)
+    if query.platform is not None:
+        conditions.append(f"platform = {placeholder}")
+        params.append(query.platform.value)
+    if query.scheduled_from is not None:
+        conditions.append(f"scheduled_time >= {placeholder}")
+        params.append(to_db_datetime(query.scheduled_from))
+    if query.scheduled_before is not None:
+        conditions.append(f"scheduled_time < {placeholder}")
+        params.append(to_db_datetime(query.scheduled_before))
+    if query.after is not None and not for_count:
+        priority, scheduled_time, job_id = query.after
+        conditions.append(
+            f"(priority, scheduled_time, job_id) < ({placeholder}, {placeholder}, {placeholder})"
+        )
+        params.extend((priority, to_db_datetime(scheduled_time), job_id))
+    
+    sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    if for_count:
+        return sql, params
+    
+    sql += " ORDER BY priority DESC, scheduled_time DESC, job_id DESC"
+    offset = query.offset if query.after is None and query.offset else 0
+    if (query.limit is not None and query.limit > 0) or offset:
+        sql += f" LIMIT {placeholder}"
+        params.append(query.limit if query.limit is not None and query.limit > 0 else _NO_LIMIT)
+        if offset:
+            sql += f" OFFSET {placeholder}"
+            params.append(offset)
+    return sql.strip(), params
+
+
+def job_sort_key(job: ScheduledJob) -> Tuple[int, datetime, str]:
+    """Sort key (priority, scheduled_time UTC, job_id) dùng cho query_jobs() (giảm dần) và keyset cursor."""
+    return job.priority.value, ensure_utc(job.scheduled_time), job.job_id
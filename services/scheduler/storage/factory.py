@@ -2,7 +2,7 @@
 Module: services/scheduler/storage/factory.py
 
 Factory pattern để create job storage instances.
-Supports both JSON and MySQL storage types.
+Supports JSON, JSON journal, SQLite và MySQL storage types.
 """
 
 # Standard library
@@ -12,7 +12,8 @@ from typing import Optional
 # Local
 from services.scheduler.storage.base import JobStorageBase
 from services.scheduler.storage.json_storage import JobStorage
-from services.scheduler.storage.mysql_storage import MySQLJobStorage
+from services.scheduler.storage.journal_storage import JournalJobStorage
+from services.scheduler.storage.sqlite_storage import DEFAULT_DB_FILENAME, SQLiteJobStorage
 from services.logger import StructuredLogger
 
 
@@ -32,8 +33,8 @@ def create_job_storage(
     Factory function để create job storage instance.
     
     Args:
-        storage_type: Storage type ("json" or "mysql")
-        storage_dir: Directory for JSON storage (required if storage_type="json")
+        storage_type: Storage type ("json", "journal", "sqlite" or "mysql")
+        storage_dir: Directory for JSON/journal/SQLite storage (required if storage_type="json"/"journal"/"sqlite")
         logger: Structured logger (optional)
         mysql_host: MySQL host (for MySQL storage)
         mysql_port: MySQL port (for MySQL storage)
@@ -43,11 +44,11 @@ def create_job_storage(
         mysql_charset: Character set (for MySQL storage)
     
     Returns:
-        JobStorageBase instance (JobStorage or MySQLJobStorage)
+        JobStorageBase instance (JobStorage, JournalJobStorage, SQLiteJobStorage or MySQLJobStorage)
     
     Raises:
         ValueError: Nếu storage_type is invalid
-        ValueError: Nếu storage_dir is None for JSON storage
+        ValueError: Nếu storage_dir is None for JSON/journal/SQLite storage
     
     Example:
         # JSON storage
@@ -83,7 +84,32 @@ def create_job_storage(
             logger=logger
         )
     
+    elif storage_type_lower == "journal":
+        if storage_dir is None:
+            raise ValueError(
+                "storage_dir is required for journal storage type"
+            )
+        
+        return JournalJobStorage(
+            storage_dir=storage_dir,
+            logger=logger
+        )
+    
+    elif storage_type_lower == "sqlite":
+        if storage_dir is None:
+            raise ValueError(
+                "storage_dir is required for SQLite storage type"
+            )
+        
+        return SQLiteJobStorage(
+            db_path=Path(storage_dir) / DEFAULT_DB_FILENAME,
+            logger=logger
+        )
+    
     elif storage_type_lower == "mysql":
+        # Import lazy: pymysql chỉ load khi dùng MySQL storage
+        from services.scheduler.storage.mysql_storage import MySQLJobStorage
+        
         return MySQLJobStorage(
             host=mysql_host,
             port=mysql_port,
@@ -97,5 +123,5 @@ def create_job_storage(
     else:
         raise ValueError(
             f"Invalid storage_type: {storage_type}. "
-            f"Must be 'json' or 'mysql'"
+            f"Must be 'json', 'journal', 'sqlite' or 'mysql'"
         )
@@ -0,0 +1,482 @@
+"""
+Module: services/scheduler/storage/journal_storage.py
+
+Append-only journal storage cho scheduler (JSON, không cần database).
+
+Layout trong storage_dir:
+- journal_snapshot.json: snapshot toàn bộ jobs + journal_id của journal đi kèm
+- journal.jsonl: header {"journal_id": ...} + mỗi dòng một delta
+  ({"op": "put", "job": {...}} hoặc {"op": "del", "job_id": ...})
+- journal.lock: file lock cho append/compaction giữa các processes
+
+save_jobs() chỉ append các jobs thay đổi so với lần load/save trước (một write +
+fsync), thay vì rewrite toàn bộ jobs_YYYY-MM-DD_{status}.json. Khi journal đủ dài,
+compaction ghi snapshot mới (atomic rename) rồi thay journal bằng journal rỗng với
+journal_id mới. Startup = snapshot + replay journal; load_jobs() sau đó chỉ đọc
+phần tail mới append.
+"""
+
+# Standard library
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# fcntl chỉ có trên Linux/Unix, không có trên Windows
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Local
+from services.logger import StructuredLogger
+from services.exceptions import StorageError
+from services.scheduler.models import ScheduledJob
+from services.scheduler.storage.base import JobStorageBase
+from utils.exception_utils import (
+    safe_get_exception_type_name,
+    safe_get_exception_message
+)
+
+SNAPSHOT_FILENAME = "journal_snapshot.json"
+JOURNAL_FILENAME = "journal.jsonl"
+LOCK_FILENAME = "journal.lock"
+
+# Compaction khi số deltas trong journal vượt max(COMPACT_MIN_RECORDS, COMPACT_RATIO * số jobs)
+COMPACT_MIN_RECORDS = 1000
+COMPACT_RATIO = 2.0
+
+
+class JournalJobStorage(JobStorageBase):
+    """
+    Job storage dạng write-ahead journal + snapshot.
+
+    - State đã persist được giữ dưới dạng dict (job_id -> job dict)
+    - save_jobs diff với jobs của lần load/save trước của chính instance này:
+      jobs không thay đổi không được ghi lại; jobs process khác thêm/sửa mà
+      process này không sửa được giữ nguyên
+    - Lần đầu chạy trên thư mục có jobs_*.json (JobStorage) sẽ import làm snapshot
+    """
+
+    def __init__(
+        self,
+        storage_dir: Path,
+        logger: StructuredLogger,
+        compact_min_records: int = COMPACT_MIN_RECORDS,
+        compact_ratio: float = COMPACT_RATIO
+    ):
+        """
+        Khởi tạo journal storage.
+
+        Args:
+            storage_dir: Thư mục lưu snapshot/journal
+            logger: Logger instance
+            compact_min_records: Số deltas tối thiểu trước khi compaction
+            compact_ratio: Compaction khi số deltas > compact_ratio * số jobs
+        """
+        super().__init__(logger)
+
+        self.storage_dir = Path(storage_dir)
+        self.snapshot_path = self.storage_dir / SNAPSHOT_FILENAME
+        self.journal_path = self.storage_dir / JOURNAL_FILENAME
+        self.lock_path = self.storage_dir / LOCK_FILENAME
+        self.compact_min_records = compact_min_records
+        self.compact_ratio = compact_ratio
+
+        # Persisted state và vị trí đã đọc trong snapshot/journal
+        self._state: Dict[str, Dict[str, Any]] = {}
+        # job_id -> job dict của lần load/save trước của instance này (base để diff):
+        # jobs mà _refresh() đọc được từ process khác không bị xóa/ghi đè khi save
+        self._saved: Optional[Dict[str, Dict[str, Any]]] = None
+        # job_id -> (fingerprint, job dict) của lần save trước: bỏ qua to_dict() cho jobs không đổi
+        self._fingerprints: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+        self._journal_id: Optional[str] = None
+        self._journal_matches = False  # header của journal khớp journal_id của snapshot
+        self._snapshot_stamp: Optional[Tuple[int, int, int]] = None
+        self._journal_inode: Optional[int] = None
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._thread_lock = threading.RLock()
+
+        try:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self.logger.log_step(
+                step="INIT_JOURNAL_STORAGE",
+                result="ERROR",
+                error=f"Cannot create storage directory: {safe_get_exception_message(e)}",
+                error_type=safe_get_exception_type_name(e),
+                storage_dir=str(self.storage_dir)
+            )
+            raise StorageError(f"Cannot create storage directory {self.storage_dir}: {str(e)}") from e
+
+        with self._thread_lock, self._file_lock():
+            if not self.snapshot_path.exists() and not self.journal_path.exists():
+                self._import_legacy_files()
+
+    def load_jobs(self) -> Dict[str, ScheduledJob]:
+        """
+        Load jobs: snapshot + replay journal (chỉ đọc phần mới nếu snapshot không đổi).
+
+        Returns:
+            Dict mapping job_id -> ScheduledJob
+        """
+        with self._thread_lock:
+            try:
+                with self._file_lock():
+                    self._refresh()
+            except StorageError:
+                raise
+            except Exception as e:
+                self.logger.log_step(
+                    step="LOAD_JOBS",
+                    result="ERROR",
+                    error=safe_get_exception_message(e),
+                    error_type=safe_get_exception_type_name(e)
+                )
+                raise StorageError(f"Failed to load jobs: {safe_get_exception_message(e)}") from e
+
+            self._saved = dict(self._state)
+            jobs: Dict[str, ScheduledJob] = {}
+            failed_count = 0
+            for job_id, job_data in self._state.items():
+                try:
+                    jobs[job_id] = ScheduledJob.from_dict(job_data)
+                except (KeyError, ValueError, TypeError) as e:
+                    failed_count += 1
+                    self.logger.log_step(
+                        step="LOAD_JOBS",
+                        result="WARNING",
+                        error=f"Failed to load job {job_id}: {safe_get_exception_message(e)}",
+                        error_type=safe_get_exception_type_name(e)
+                    )
+
+        self.logger.log_step(
+            step="LOAD_JOBS",
+            result="SUCCESS",
+            jobs_count=len(jobs),
+            failed_count=failed_count,
+            journal_records=self._journal_records,
+            storage_dir=str(self.storage_dir)
+        )
+        return jobs
+
+    def save_jobs(self, jobs: Dict[str, ScheduledJob]) -> None:
+        """
+        Append deltas (jobs mới/thay đổi/bị xóa) vào journal.
+
+        Args:
+            jobs: Dict mapping job_id -> ScheduledJob
+
+        Raises:
+            StorageError: Nếu không thể ghi journal
+        """
+        with self._thread_lock:
+            if self._saved is None:
+                # Chưa load lần nào: diff với state trên disk (save_jobs = toàn bộ jobs)
+                with self._file_lock():
+                    self._refresh()
+                self._saved = dict(self._state)
+            saved = self._saved
+
+            records: List[Dict[str, Any]] = []
+            current: Dict[str, Dict[str, Any]] = {}
+            fingerprints: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+            for job_id, job in jobs.items():
+                try:
+                    fingerprint = _fingerprint(job)
+                    cached = self._fingerprints.get(job_id)
+                    if cached is not None and cached[0] == fingerprint and saved.get(job_id) is cached[1]:
+                        current[job_id] = cached[1]
+                        fingerprints[job_id] = cached
+                        continue
+                    job_data = _job_data(job)
+                except Exception as e:
+                    self.logger.log_step(
+                        step="SAVE_JOBS",
+                        result="WARNING",
+                        error=f"Error converting job {job_id} to dict: {safe_get_exception_message(e)}",
+                        error_type=safe_get_exception_type_name(e),
+                        job_id=job_id
+                    )
+                    # Giữ bản đã persist (không xóa job chỉ vì serialize lỗi)
+                    if job_id in saved:
+                        current[job_id] = saved[job_id]
+                    continue
+                if saved.get(job_id) != job_data:
+                    records.append({"op": "put", "job": job_data})
+                else:
+                    job_data = saved[job_id]
+                current[job_id] = job_data
+                fingerprints[job_id] = (fingerprint, job_data)
+            # Chỉ xóa jobs mà instance này đã load/save (không phải jobs process khác vừa thêm)
+            for job_id in saved.keys() - current.keys():
+                records.append({"op": "del", "job_id": job_id})
+
+            if not records:
+                self._fingerprints = fingerprints
+                self._saved = current
+                return
+
+            try:
+                with self._file_lock():
+                    self._refresh()
+                    self._append(records)
+                    for record in records:
+                        self._apply(record)
+                    if self._journal_records > max(self.compact_min_records, self.compact_ratio * len(self._state)):
+                        self._compact()
+                self._fingerprints = fingerprints
+                self._saved = current
+            except StorageError:
+                raise
+            except Exception as e:
+                self.logger.log_step(
+                    step="SAVE_JOBS",
+                    result="ERROR",
+                    error=safe_get_exception_message(e),
+                    error_type=safe_get_exception_type_name(e)
+                )
+                raise StorageError(f"Failed to save jobs: {safe_get_exception_message(e)}") from e
+
+        self.logger.log_step(
+            step="SAVE_JOBS",
+            result="SUCCESS",
+            jobs_count=len(jobs),
+            records_appended=len(records),
+            journal_records=self._journal_records
+        )
+
+    def compact(self) -> None:
+        """Ghi snapshot từ state hiện tại và bắt đầu journal mới."""
+        with self._thread_lock, self._file_lock():
+            self._refresh()
+            self._compact()
+
+    def _refresh(self) -> None:
+        """Đồng bộ state với disk (caller giữ file lock)."""
+        snapshot_stamp = _file_stamp(self.snapshot_path)
+        journal_stamp = _file_stamp(self.journal_path)
+        journal_inode = journal_stamp[0] if journal_stamp else None
+
+        reload_all = (
+            snapshot_stamp != self._snapshot_stamp
+            or journal_inode != self._journal_inode
+            or (journal_stamp is not None and journal_stamp[2] < self._journal_offset)
+        )
+        if reload_all:
+            self._load_snapshot()
+            self._snapshot_stamp = snapshot_stamp
+            self._journal_inode = journal_inode
+            self._journal_offset = 0
+            self._journal_records = 0
+
+        if journal_stamp is not None:
+            self._replay_journal()
+
+    def _load_snapshot(self) -> None:
+        """Load snapshot vào state."""
+        self._state = {}
+        self._journal_id = None
+        if not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise StorageError(f"Invalid JSON in {self.snapshot_path.name}: {str(e)}") from e
+        self._journal_id = data.get("journal_id")
+        for job_data in data.get("jobs", []):
+            if isinstance(job_data, dict) and job_data.get("job_id"):
+                self._state[job_data["job_id"]] = job_data
+
+    def _replay_journal(self) -> None:
+        """Apply deltas từ self._journal_offset tới cuối journal."""
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            chunk = f.read()
+
+        offset = self._journal_offset
+        for raw_line in chunk.splitlines(keepends=True):
+            if not raw_line.endswith(b"\n"):
+                # Dòng cuối chưa ghi xong (writer đang ghi hoặc crash giữa chừng) - đọc lại lần sau
+                break
+            offset += len(raw_line)
+            line = raw_line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                self.logger.log_step(
+                    step="REPLAY_JOURNAL",
+                    result="WARNING",
+                    error="Skipping corrupt journal record",
+                    offset=offset
+                )
+                continue
+
+            if "journal_id" in record:
+                # Header khác journal_id của snapshot: crash sau khi ghi snapshot nhưng
+                # trước khi thay journal -> deltas trong journal đã nằm trong snapshot
+                self._journal_matches = record["journal_id"] == self._journal_id
+                continue
+            if not self._journal_matches:
+                continue
+            self._apply(record)
+            self._journal_records += 1
+
+        self._journal_offset = offset
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply một delta vào state."""
+        if record.get("op") == "put" and isinstance(record.get("job"), dict):
+            self._state[record["job"]["job_id"]] = record["job"]
+        elif record.get("op") == "del":
+            self._state.pop(record.get("job_id"), None)
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Append deltas vào journal (một write + fsync)."""
+        payload = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for record in records
+        ).encode("utf-8")
+
+        if not self._journal_matches or not self.journal_path.exists():
+            self._write_journal_header()
+
+        fd = os.open(str(self.journal_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        # Records của chính mình đã được apply vào state, bỏ qua khi đọc tail
+        self._journal_offset += len(payload)
+        self._journal_records += len(records)
+
+    def _compact(self) -> None:
+        """Ghi snapshot mới rồi thay journal bằng journal rỗng (caller giữ file lock)."""
+        journal_id = uuid.uuid4().hex
+        data = {
+            "journal_id": journal_id,
+            "updated_at": datetime.now().isoformat(),
+            "jobs": list(self._state.values()),
+        }
+        _atomic_write(self.snapshot_path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        self._journal_id = journal_id
+        self._write_journal_header()
+        _fsync_dir(self.storage_dir)
+
+        records_compacted = self._journal_records
+        self._snapshot_stamp = _file_stamp(self.snapshot_path)
+        self._journal_records = 0
+        self.logger.log_step(
+            step="COMPACT_JOURNAL",
+            result="SUCCESS",
+            jobs_count=len(self._state),
+            records_compacted=records_compacted
+        )
+
+    def _write_journal_header(self) -> None:
+        """Thay journal bằng journal mới chỉ có header (journal_id của snapshot hiện tại)."""
+        if self._journal_id is None:
+            self._journal_id = uuid.uuid4().hex
+            # Snapshot rỗng để header có snapshot tương ứng
+            _atomic_write(
+                self.snapshot_path,
+                json.dumps({"journal_id": self._journal_id, "jobs": list(self._state.values())}, ensure_ascii=False).encode("utf-8")
+            )
+            self._snapshot_stamp = _file_stamp(self.snapshot_path)
+        header = (json.dumps({"journal_id": self._journal_id}) + "\n").encode("utf-8")
+        _atomic_write(self.journal_path, header)
+        self._journal_matches = True
+        self._journal_inode = _file_stamp(self.journal_path)[0]
+        self._journal_offset = len(header)
+
+    def _import_legacy_files(self) -> None:
+        """Import jobs_*.json (JobStorage) làm snapshot đầu tiên."""
+        if not any(self.storage_dir.glob("jobs_*.json")):
+            return
+        from services.scheduler.storage.json_storage import JobStorage
+
+        legacy_jobs = JobStorage(storage_dir=self.storage_dir, logger=self.logger).load_jobs()
+        self._state = {job_id: _job_data(job) for job_id, job in legacy_jobs.items()}
+        self._compact()
+        self.logger.log_step(
+            step="IMPORT_LEGACY_JOBS",
+            result="SUCCESS",
+            jobs_count=len(self._state),
+            storage_dir=str(self.storage_dir)
+        )
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock giữa các processes (no-op nếu không có fcntl)."""
+        if not HAS_FCNTL:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _job_data(job: ScheduledJob) -> Dict[str, Any]:
+    """Job dict ở dạng JSON (giống khi đọc lại từ disk) để so sánh thay đổi."""
+    return json.loads(json.dumps(job.to_dict(), ensure_ascii=False, default=str))
+
+
+def _fingerprint(job: ScheduledJob) -> tuple:
+    """Giá trị các fields của job (so sánh rẻ hơn to_dict())."""
+    values = tuple(getattr(job, name) for name in _JOB_FIELDS)
+    if job.engagement_data is not None:
+        # dict có thể bị sửa in-place -> so sánh theo nội dung
+        values += (json.dumps(job.engagement_data, sort_keys=True, default=str),)
+    return values
+
+
+_JOB_FIELDS = tuple(name for name in ScheduledJob.__dataclass_fields__ if name != "engagement_data")
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime_ns, size) hoặc None nếu file không tồn tại."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    """Ghi file qua temp file + fsync + rename."""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+    temp_path.replace(path)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Sync directory để rename được persist (bỏ qua nếu không hỗ trợ)."""
+    try:
+        dir_fd = os.open(str(directory), os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except (OSError, AttributeError):
+        pass
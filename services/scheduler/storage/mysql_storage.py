@@ -6,33 +6,25 @@ Replaces JSON file-based storage with MySQL database.
 """
 
 # Standard library
-import sys
-from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from contextlib import contextmanager
 
-# Add parent directory to path
-_parent_dir = Path(__file__).resolve().parent.parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-
 # Third-party
 import pymysql
 from pymysql.cursors import DictCursor
 
 # Local
-from services.scheduler.storage.base import JobStorageBase
+from services.scheduler.storage.base import JobQuery, JobStorageBase, build_job_query_sql
 from services.scheduler.models import (
     ScheduledJob,
-    JobStatus,
-    JobPriority,
-    Platform
+    JobStatus
 )
+from services.scheduler.job_codec import job_from_row
 from services.logger import StructuredLogger
 from services.exceptions import StorageError
 from services.storage.connection_pool import get_connection_pool
+from services.utils.datetime_utils import ensure_utc
 from utils.exception_utils import (
     safe_get_exception_type_name,
     safe_get_exception_message
@@ -56,6 +48,8 @@ class MySQLJobStorage(JobStorageBase):
         logger: Structured logger
     """
     
+    supports_queries = True
+    
     def __init__(
         self,
         host: str = "localhost",
@@ -800,138 +794,185 @@ class MySQLJobStorage(JobStorageBase):
             
             raise StorageError(f"Unexpected error getting jobs: {error_msg}") from e
     
-    def _row_to_job(self, row: Dict) -> ScheduledJob:
+    def get_contents_by_thread_ids(self, thread_ids: List[str]) -> Dict[str, str]:
         """
-        Convert database row to ScheduledJob.
+        Get post content theo thread_id (indexed lookup trên jobs.thread_id).
         
         Args:
-            row: Database row (dict)
+            thread_ids: List of thread IDs
         
         Returns:
-            ScheduledJob instance
+            Dict mapping thread_id -> content (thread không có job thì không có key)
         
         Raises:
-            ValueError: Nếu row data is invalid
-            KeyError: Nếu required fields missing
+            StorageError: Nếu có lỗi khi query
         """
+        if not thread_ids:
+            return {}
+        
         try:
-            # Parse priority
-            priority_value = row.get('priority', 2)
-            if isinstance(priority_value, int):
-                priority = JobPriority(priority_value)
-            elif isinstance(priority_value, JobPriority):
-                priority = priority_value
-            else:
-                priority = JobPriority.NORMAL
-            
-            # Parse status
-            status_value = row.get('status')
-            if isinstance(status_value, str):
-                status = JobStatus(status_value)
-            elif isinstance(status_value, JobStatus):
-                status = status_value
-            else:
-                raise ValueError(f"Invalid status value: {status_value}")
-            
-            # Parse platform
-            platform_value = row.get('platform', 'threads')
-            if isinstance(platform_value, str):
-                platform = Platform(platform_value)
-            elif isinstance(platform_value, Platform):
-                platform = platform_value
-            else:
-                platform = Platform.THREADS
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                placeholders = ", ".join(["%s"] * len(thread_ids))
+                cursor.execute(
+                    f"SELECT thread_id, content FROM jobs WHERE thread_id IN ({placeholders})",
+                    list(thread_ids)
+                )
+                return {row["thread_id"]: row["content"] for row in cursor.fetchall()}
+                
+        except Exception as e:
+            error_msg = safe_get_exception_message(e)
+            error_type = safe_get_exception_type_name(e)
             
-            # Parse job_type (backward compatible - default to POST)
-            from services.scheduler.models import JobType
-            job_type_value = row.get('job_type', 'post')
-            if isinstance(job_type_value, str):
-                try:
-                    job_type = JobType(job_type_value)
-                except ValueError:
-                    job_type = JobType.POST  # Default to POST for backward compatibility
-            elif isinstance(job_type_value, JobType):
-                job_type = job_type_value
-            else:
-                job_type = JobType.POST
+            self.logger.log_step(
+                step="GET_CONTENTS_BY_THREAD_IDS",
+                result="ERROR",
+                error=error_msg,
+                error_type=error_type,
+                thread_count=len(thread_ids)
+            )
             
-            # Parse engagement_data (JSON string to dict)
-            engagement_data = None
-            engagement_data_raw = row.get('engagement_data')
-            if engagement_data_raw:
-                if isinstance(engagement_data_raw, str):
+            raise StorageError(f"Failed to get contents by thread ids: {error_msg}") from e
+    
+    def query_jobs(self, query: JobQuery) -> List[ScheduledJob]:
+        """
+        Get jobs matching query (SQL filter/sort/LIMIT, keyset cursor).
+        
+        Dùng idx_account_status / idx_status_scheduled / idx_scheduled_time.
+        
+        Args:
+            query: Filters + pagination
+        
+        Returns:
+            List of ScheduledJob sorted by job_sort_key() descending
+        
+        Raises:
+            StorageError: Nếu có lỗi khi query
+        """
+        where, params = build_job_query_sql(query, "%s", _to_mysql_datetime)
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(f"""
+                    SELECT 
+                        job_id,
+                        account_id,
+                        content,
+                        scheduled_time,
+                        priority,
+                        status,
+                        platform,
+                        job_type,
+                        engagement_data,
+                        max_retries,
+                        retry_count,
+                        created_at,
+                        started_at,
+                        completed_at,
+                        error,
+                        thread_id,
+                        status_message,
+                        link_aff
+                    FROM jobs
+                    {where}
+                """, params)
+                
+                rows = cursor.fetchall()
+                
+                jobs = []
+                for row in rows:
                     try:
-                        import json
-                        engagement_data = json.loads(engagement_data_raw)
-                    except (json.JSONDecodeError, TypeError):
-                        engagement_data = None
-                elif isinstance(engagement_data_raw, dict):
-                    engagement_data = engagement_data_raw
-                else:
-                    engagement_data = None
-            
-            # Parse datetime fields
-            # pymysql với DictCursor returns datetime objects, not strings
-            scheduled_time = row['scheduled_time']
-            if isinstance(scheduled_time, str):
-                scheduled_time = datetime.fromisoformat(scheduled_time.replace('Z', '+00:00'))
-            elif scheduled_time is not None and not isinstance(scheduled_time, datetime):
-                # Convert other types to datetime if needed
-                scheduled_time = datetime.fromisoformat(str(scheduled_time))
-            
-            created_at = row.get('created_at')
-            if created_at:
-                if isinstance(created_at, str):
-                    created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                elif not isinstance(created_at, datetime):
-                    created_at = datetime.fromisoformat(str(created_at))
-            
-            started_at = row.get('started_at')
-            if started_at:
-                if isinstance(started_at, str):
-                    started_at = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-                elif not isinstance(started_at, datetime):
-                    started_at = datetime.fromisoformat(str(started_at))
+                        jobs.append(self._row_to_job(row))
+                    except Exception as e:
+                        self.logger.log_step(
+                            step="QUERY_JOBS",
+                            result="WARNING",
+                            error=f"Failed to parse job: {safe_get_exception_message(e)}",
+                            job_id=row.get('job_id', 'unknown')
+                        )
+                        continue
+                
+                return jobs
+                
+        except pymysql.Error as e:
+            error_msg = safe_get_exception_message(e)
+            error_type = safe_get_exception_type_name(e)
             
-            completed_at = row.get('completed_at')
-            if completed_at:
-                if isinstance(completed_at, str):
-                    completed_at = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
-                elif not isinstance(completed_at, datetime):
-                    completed_at = datetime.fromisoformat(str(completed_at))
+            self.logger.log_step(
+                step="QUERY_JOBS",
+                result="ERROR",
+                error=f"MySQL error: {error_msg}",
+                error_type=error_type,
+                account_id=query.account_id
+            )
             
-            # Set created_at if None (for old jobs that don't have created_at)
-            # Use scheduled_time as fallback, or current time if scheduled_time is also None
-            if created_at is None:
-                created_at = scheduled_time if scheduled_time else datetime.now(timezone.utc)
+            raise StorageError(f"Failed to query jobs: {error_msg}") from e
+    
+    def count_jobs(self, query: JobQuery) -> int:
+        """
+        Count jobs matching query filters (SELECT COUNT(*)).
+        
+        Args:
+            query: Filters
+        
+        Returns:
+            Number of matching jobs
+        
+        Raises:
+            StorageError: Nếu có lỗi khi query
+        """
+        where, params = build_job_query_sql(query, "%s", _to_mysql_datetime, for_count=True)
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT COUNT(*) AS total FROM jobs {where}", params)
+                row = cursor.fetchone()
+                return int(row['total']) if row else 0
+                
+        except pymysql.Error as e:
+            error_msg = safe_get_exception_message(e)
+            error_type = safe_get_exception_type_name(e)
             
-            return ScheduledJob(
-                job_id=row['job_id'],
-                account_id=row['account_id'],
-                content=row['content'],
-                scheduled_time=scheduled_time,
-                priority=priority,
-                status=status,
-                platform=platform,
-                job_type=job_type,
-                engagement_data=engagement_data,
-                max_retries=row.get('max_retries', 3),
-                retry_count=row.get('retry_count', 0),
-                created_at=created_at,
-                started_at=started_at,
-                completed_at=completed_at,
-                error=row.get('error'),
-                thread_id=row.get('thread_id'),
-                status_message=row.get('status_message'),
-                link_aff=row.get('link_aff')
+            self.logger.log_step(
+                step="COUNT_JOBS",
+                result="ERROR",
+                error=f"MySQL error: {error_msg}",
+                error_type=error_type,
+                account_id=query.account_id
             )
             
+            raise StorageError(f"Failed to count jobs: {error_msg}") from e
+    
+    def _row_to_job(self, row: Dict) -> ScheduledJob:
+        """
+        Convert database row to ScheduledJob.
+        
+        Args:
+            row: Database row (dict)
+        
+        Returns:
+            ScheduledJob instance
+        
+        Raises:
+            ValueError: Nếu row data is invalid
+            KeyError: Nếu required fields missing
+        """
+        try:
+            job = job_from_row(row, strict=True)
         except (KeyError, ValueError, TypeError) as e:
             error_msg = safe_get_exception_message(e)
             raise ValueError(
                 f"Failed to convert row to ScheduledJob: {error_msg}. "
                 f"Row data: {row}"
             ) from e
+        
+        # Set created_at if None (for old jobs that don't have created_at)
+        # Use scheduled_time as fallback, or current time if scheduled_time is also None
+        if not row.get('created_at'):
+            job.created_at = job.scheduled_time if job.scheduled_time else datetime.now(timezone.utc)
+        
+        return job
     
     def close(self) -> None:
         """
@@ -943,3 +984,8 @@ class MySQLJobStorage(JobStorageBase):
         # Connections are closed automatically via context manager
         # This method is for interface compatibility
         pass
+
+
+def _to_mysql_datetime(value: datetime) -> datetime:
+    """Datetime -> naive UTC (cột scheduled_time lưu UTC không có tzinfo)."""
+    return ensure_utc(value).replace(tzinfo=None)
@@ -0,0 +1,431 @@
+"""
+Module: services/scheduler/storage/sqlite_storage.py
+
+SQLite storage implementation cho scheduler (embedded, không cần MySQL server).
+
+- WAL mode: API process đọc song song trong khi scheduler process ghi
+- Cùng schema/indexes với bảng jobs của MySQL
+- save_jobs() chỉ upsert jobs thay đổi so với lần load/save trước
+- Datetimes lưu dạng ISO-8601 UTC (cố định microseconds) để ORDER BY đúng thứ tự
+"""
+
+# Standard library
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local
+from services.logger import StructuredLogger
+from services.exceptions import StorageError
+from services.scheduler.models import ScheduledJob, JobStatus
+from services.scheduler.storage.base import JobQuery, JobStorageBase, build_job_query_sql
+from services.utils.datetime_utils import ensure_utc
+from utils.exception_utils import (
+    safe_get_exception_type_name,
+    safe_get_exception_message
+)
+
+DEFAULT_DB_FILENAME = "jobs.db"
+
+# Thời gian chờ lock khi process khác đang ghi (giây)
+BUSY_TIMEOUT_SECONDS = 30.0
+
+JOB_COLUMNS = (
+    "job_id", "account_id", "content", "scheduled_time", "priority", "status",
+    "platform", "job_type", "engagement_data", "max_retries", "retry_count",
+    "created_at", "started_at", "completed_at", "error", "thread_id",
+    "status_message", "link_aff",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    account_id TEXT,
+    content TEXT NOT NULL,
+    scheduled_time TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 2,
+    status TEXT NOT NULL,
+    platform TEXT DEFAULT 'threads',
+    job_type TEXT DEFAULT 'post',
+    engagement_data TEXT NULL DEFAULT NULL,
+    max_retries INTEGER NOT NULL DEFAULT 3,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    started_at TEXT NULL DEFAULT NULL,
+    completed_at TEXT NULL DEFAULT NULL,
+    error TEXT NULL DEFAULT NULL,
+    thread_id TEXT NULL DEFAULT NULL,
+    status_message TEXT NULL DEFAULT NULL,
+    link_aff TEXT NULL DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_account_id ON jobs (account_id);
+CREATE INDEX IF NOT EXISTS idx_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS idx_scheduled_time ON jobs (scheduled_time);
+CREATE INDEX IF NOT EXISTS idx_completed_at ON jobs (completed_at);
+CREATE INDEX IF NOT EXISTS idx_thread_id ON jobs (thread_id);
+CREATE INDEX IF NOT EXISTS idx_account_status ON jobs (account_id, status);
+CREATE INDEX IF NOT EXISTS idx_status_scheduled ON jobs (status, scheduled_time);
+CREATE INDEX IF NOT EXISTS idx_platform ON jobs (platform);
+CREATE INDEX IF NOT EXISTS idx_job_type ON jobs (job_type);
+CREATE INDEX IF NOT EXISTS idx_account_job_type ON jobs (account_id, job_type);
+CREATE INDEX IF NOT EXISTS idx_status_priority_order ON jobs (status, priority, scheduled_time, job_id);
+CREATE INDEX IF NOT EXISTS idx_account_status_priority_order ON jobs (account_id, status, priority, scheduled_time, job_id);
+"""
+
+# user_version 1: datetimes lưu naive UTC (bỏ offset "+00:00" của bản ghi cũ)
+_SCHEMA_VERSION = 1
+_DATETIME_COLUMNS = ("scheduled_time", "created_at", "started_at", "completed_at")
+_STRIP_UTC_OFFSET = "".join(
+    f"UPDATE jobs SET {column} = substr({column}, 1, length({column}) - 6) WHERE {column} LIKE '%+00:00';\n"
+    for column in _DATETIME_COLUMNS
+)
+
+_SELECT_JOBS = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+
+_UPSERT_JOB = (
+    f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(JOB_COLUMNS))}) "
+    "ON CONFLICT(job_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in JOB_COLUMNS if column != "job_id")
+)
+
+
+class SQLiteJobStorage(JobStorageBase):
+    """
+    SQLite implementation của job storage.
+
+    Mỗi thread dùng connection riêng; writes chạy trong BEGIN IMMEDIATE
+    transaction nên an toàn khi nhiều processes cùng ghi (chờ tối đa
+    BUSY_TIMEOUT_SECONDS).
+    """
+
+    supports_queries = True
+
+    def __init__(
+        self,
+        db_path: Path,
+        logger: StructuredLogger
+    ):
+        """
+        Khởi tạo SQLite storage.
+
+        Args:
+            db_path: Đường dẫn file database (thư mục cha được tạo nếu chưa có)
+            logger: Logger instance
+        """
+        super().__init__(logger)
+
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # job_id -> row values của lần load/save trước (để chỉ upsert rows thay đổi)
+        self._saved_rows: Optional[Dict[str, Tuple[Any, ...]]] = None
+        self._save_lock = threading.Lock()
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connection()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                conn.executescript(
+                    f"BEGIN IMMEDIATE;\n{_STRIP_UTC_OFFSET}PRAGMA user_version = {_SCHEMA_VERSION};\nCOMMIT;"
+                )
+        except (sqlite3.Error, OSError) as e:
+            self.logger.log_step(
+                step="INIT_SQLITE_JOB_STORAGE",
+                result="ERROR",
+                error=safe_get_exception_message(e),
+                error_type=safe_get_exception_type_name(e),
+                db_path=str(self.db_path)
+            )
+            raise StorageError(f"Failed to initialize SQLite job storage: {safe_get_exception_message(e)}") from e
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection của thread hiện tại (autocommit, transactions explicit)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _write_transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT (rollback nếu lỗi)."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def load_jobs(self) -> Dict[str, ScheduledJob]:
+        """
+        Load tất cả jobs từ SQLite.
+
+        Returns:
+            Dict mapping job_id -> ScheduledJob
+        """
+        try:
+            rows = self._connection().execute(f"{_SELECT_JOBS} ORDER BY scheduled_time ASC").fetchall()
+        except sqlite3.Error as e:
+            self._log_error("LOAD_JOBS", e)
+            raise StorageError(f"Failed to load jobs from SQLite: {safe_get_exception_message(e)}") from e
+
+        jobs = self._rows_to_jobs(rows, step="LOAD_JOBS")
+        with self._save_lock:
+            self._saved_rows = {row["job_id"]: tuple(row) for row in rows}
+
+        self.logger.log_step(
+            step="LOAD_JOBS",
+            result="SUCCESS",
+            jobs_count=len(jobs),
+            failed_count=len(rows) - len(jobs)
+        )
+        return jobs
+
+    def save_jobs(self, jobs: Dict[str, ScheduledJob]) -> None:
+        """
+        Save jobs: upsert jobs mới/thay đổi và xóa jobs không còn trong memory (một transaction).
+
+        Args:
+            jobs: Dict mapping job_id -> ScheduledJob
+
+        Raises:
+            StorageError: Nếu có lỗi khi save
+        """
+        with self._save_lock:
+            try:
+                if self._saved_rows is None:
+                    rows = self._connection().execute(_SELECT_JOBS).fetchall()
+                    self._saved_rows = {row["job_id"]: tuple(row) for row in rows}
+                saved_rows = self._saved_rows
+
+                new_rows: Dict[str, Tuple[Any, ...]] = {}
+                changed: List[Tuple[Any, ...]] = []
+                failed_count = 0
+                for job_id, job in jobs.items():
+                    try:
+                        row = _job_to_row(job)
+                    except Exception as e:
+                        failed_count += 1
+                        self.logger.log_step(
+                            step="SAVE_JOBS",
+                            result="WARNING",
+                            error=f"Failed to save job {job_id}: {safe_get_exception_message(e)}",
+                            error_type=safe_get_exception_type_name(e),
+                            job_id=job_id
+                        )
+                        if job_id in saved_rows:
+                            new_rows[job_id] = saved_rows[job_id]
+                        continue
+                    new_rows[job_id] = row
+                    if saved_rows.get(job_id) != row:
+                        changed.append(row)
+                deleted = [(job_id,) for job_id in saved_rows.keys() - new_rows.keys()]
+
+                if changed or deleted:
+                    with self._write_transaction() as conn:
+                        conn.executemany(_UPSERT_JOB, changed)
+                        conn.executemany("DELETE FROM jobs WHERE job_id = ?", deleted)
+                self._saved_rows = new_rows
+            except sqlite3.Error as e:
+                self._log_error("SAVE_JOBS", e)
+                raise StorageError(f"Failed to save jobs to SQLite: {safe_get_exception_message(e)}") from e
+
+        self.logger.log_step(
+            step="SAVE_JOBS",
+            result="SUCCESS",
+            total_jobs=len(jobs),
+            upserted_count=len(changed),
+            deleted_count=len(deleted),
+            failed_count=failed_count
+        )
+
+    def get_job_by_id(self, job_id: str) -> Optional[ScheduledJob]:
+        """
+        Get job by ID (direct query).
+
+        Args:
+            job_id: Job ID to find
+
+        Returns:
+            ScheduledJob nếu tìm thấy, None nếu không
+        """
+        rows = self._query("GET_JOB_BY_ID", f"{_SELECT_JOBS} WHERE job_id = ?", (job_id,))
+        jobs = self._rows_to_jobs(rows, step="GET_JOB_BY_ID")
+        return next(iter(jobs.values()), None)
+
+    def get_jobs_by_status(
+        self,
+        status: JobStatus,
+        limit: Optional[int] = None
+    ) -> List[ScheduledJob]:
+        """
+        Get jobs by status (dùng idx_status_scheduled).
+
+        Args:
+            status: JobStatus to filter by
+            limit: Optional limit on number of results
+
+        Returns:
+            List of ScheduledJob với status matching, sorted by scheduled_time
+        """
+        query = f"{_SELECT_JOBS} WHERE status = ? ORDER BY scheduled_time ASC"
+        params: Tuple[Any, ...] = (status.value,)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+        rows = self._query("GET_JOBS_BY_STATUS", query, params)
+        return list(self._rows_to_jobs(rows, step="GET_JOBS_BY_STATUS").values())
+
+    def get_jobs_by_account(
+        self,
+        account_id: str,
+        status: Optional[JobStatus] = None
+    ) -> List[ScheduledJob]:
+        """
+        Get jobs by account ID (dùng idx_account_status).
+
+        Args:
+            account_id: Account ID to filter by
+            status: Optional JobStatus to filter by (if None, returns all statuses)
+
+        Returns:
+            List of ScheduledJob cho account, sorted by scheduled_time
+        """
+        if status:
+            query = f"{_SELECT_JOBS} WHERE account_id = ? AND status = ? ORDER BY scheduled_time ASC"
+            params: Tuple[Any, ...] = (account_id, status.value)
+        else:
+            query = f"{_SELECT_JOBS} WHERE account_id = ? ORDER BY scheduled_time ASC"
+            params = (account_id,)
+        rows = self._query("GET_JOBS_BY_ACCOUNT", query, params)
+        return list(self._rows_to_jobs(rows, step="GET_JOBS_BY_ACCOUNT").values())
+
+    def query_jobs(self, query: JobQuery) -> List[ScheduledJob]:
+        """
+        Get jobs matching query (SQL filter/sort/LIMIT, keyset cursor).
+
+        Args:
+            query: Filters + pagination
+
+        Returns:
+            List of ScheduledJob sorted by job_sort_key() descending
+        """
+        where, params = build_job_query_sql(query, "?", _format_datetime)
+        rows = self._query("QUERY_JOBS", f"{_SELECT_JOBS} {where}", tuple(params))
+        return list(self._rows_to_jobs(rows, step="QUERY_JOBS").values())
+
+    def count_jobs(self, query: JobQuery) -> int:
+        """
+        Count jobs matching query filters (SELECT COUNT(*)).
+
+        Args:
+            query: Filters
+
+        Returns:
+            Number of matching jobs
+        """
+        where, params = build_job_query_sql(query, "?", _format_datetime, for_count=True)
+        rows = self._query("COUNT_JOBS", f"SELECT COUNT(*) FROM jobs {where}", tuple(params))
+        return rows[0][0]
+
+    def close(self) -> None:
+        """Close tất cả connections (checkpoint WAL khi connection cuối đóng)."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def _query(self, step: str, query: str, params: Tuple[Any, ...]) -> List[sqlite3.Row]:
+        try:
+            return self._connection().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            self._log_error(step, e)
+            raise StorageError(f"Failed to query jobs: {safe_get_exception_message(e)}") from e
+
+    def _rows_to_jobs(self, rows: List[sqlite3.Row], step: str) -> Dict[str, ScheduledJob]:
+        """Convert rows -> jobs (giữ thứ tự), bỏ qua rows lỗi."""
+        jobs: Dict[str, ScheduledJob] = {}
+        for row in rows:
+            try:
+                job = ScheduledJob.from_dict(dict(row))
+                jobs[job.job_id] = job
+            except (KeyError, ValueError, TypeError) as e:
+                self.logger.log_step(
+                    step=step,
+                    result="WARNING",
+                    error=f"Failed to parse job: {safe_get_exception_message(e)}",
+                    error_type=safe_get_exception_type_name(e),
+                    job_id=row["job_id"]
+                )
+        return jobs
+
+    def _log_error(self, step: str, error: Exception) -> None:
+        self.logger.log_step(
+            step=step,
+            result="ERROR",
+            error=f"SQLite error: {safe_get_exception_message(error)}",
+            error_type=safe_get_exception_type_name(error),
+            db_path=str(self.db_path)
+        )
+
+
+def _format_datetime(value: Optional[datetime]) -> Optional[str]:
+    """
+    Datetime -> ISO-8601 naive UTC với microseconds cố định (sort theo chuỗi = sort theo thời gian).
+
+    Giống mysql_storage: không lưu tzinfo nên load_jobs trả naive datetimes như các storage khác.
+    """
+    if value is None:
+        return None
+    return ensure_utc(value).replace(tzinfo=None).isoformat(timespec="microseconds")
+
+
+def _job_to_row(job: ScheduledJob) -> Tuple[Any, ...]:
+    """ScheduledJob -> row values theo thứ tự JOB_COLUMNS."""
+    engagement_data = None
+    if job.engagement_data:
+        engagement_data = json.dumps(job.engagement_data, ensure_ascii=False)
+    job_type = getattr(job, "job_type", None)
+    return (
+        job.job_id,
+        job.account_id,
+        job.content,
+        _format_datetime(job.scheduled_time),
+        job.priority.value,
+        job.status.value,
+        job.platform.value if job.platform else "threads",
+        job_type.value if job_type else "post",
+        engagement_data,
+        job.max_retries,
+        job.retry_count,
+        _format_datetime(job.created_at),
+        _format_datetime(job.started_at),
+        _format_datetime(job.completed_at),
+        job.error,
+        job.thread_id,
+        job.status_message,
+        job.link_aff,
+    )
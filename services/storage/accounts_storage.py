@@ -5,18 +5,12 @@ MySQL storage implementation cho accounts metadata.
 """
 
 # Standard library
-import sys
 import json
-from pathlib import Path
+import threading
+import time
 from typing import List, Dict, Optional
 from contextlib import contextmanager
 
-# Add parent directory to path
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-
 # Third-party
 import pymysql
 from pymysql.cursors import DictCursor
@@ -30,6 +24,9 @@ from utils.exception_utils import (
     safe_get_exception_message
 )
 
+# Job counts theo account được cache ngắn (accounts page poll liên tục, counts lệch vài giây chấp nhận được)
+JOB_COUNTS_CACHE_TTL_SECONDS = 5.0
+
 
 class AccountStorage:
     """
@@ -90,6 +87,10 @@ class AccountStorage:
             write_timeout=write_timeout,
             logger=self.logger
         )
+        
+        # Job counts cache: (stored_at, {account_id: {status: count}})
+        self._job_counts_cache: Optional[tuple] = None
+        self._job_counts_lock = threading.Lock()
     
     @contextmanager
     def _get_connection(self):
@@ -165,6 +166,85 @@ class AccountStorage:
             )
             raise StorageError(f"Failed to list accounts: {error_msg}") from e
     
+    def get_job_counts_by_account(self, use_cache: bool = True) -> Dict[str, Dict[str, int]]:
+        """
+        Đếm jobs theo account và status bằng một query GROUP BY.
+        
+        Query đọc index idx_account_status (account_id, status), không scan rows.
+        Kết quả cache JOB_COUNTS_CACHE_TTL_SECONDS giây.
+        
+        Args:
+            use_cache: False -> luôn query lại
+        
+        Returns:
+            {account_id: {status: count}}
+        """
+        if use_cache:
+            with self._job_counts_lock:
+                cached = self._job_counts_cache
+            if cached is not None and time.monotonic() - cached[0] < JOB_COUNTS_CACHE_TTL_SECONDS:
+                return cached[1]
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT account_id, status, COUNT(*) AS count
+                    FROM jobs
+                    GROUP BY account_id, status
+                """)
+                rows = cursor.fetchall()
+        except pymysql.Error as e:
+            error_msg = safe_get_exception_message(e)
+            self.logger.log_step(
+                step="GET_JOB_COUNTS_BY_ACCOUNT",
+                result="ERROR",
+                error=f"MySQL error: {error_msg}",
+                error_type=safe_get_exception_type_name(e)
+            )
+            raise StorageError(f"Failed to count jobs by account: {error_msg}") from e
+        
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            counts.setdefault(row["account_id"], {})[row["status"]] = int(row["count"])
+        
+        with self._job_counts_lock:
+            self._job_counts_cache = (time.monotonic(), counts)
+        return counts
+    
+    def invalidate_job_counts_cache(self) -> None:
+        """Drop cached job counts (gọi sau khi thêm/xóa jobs nếu cần counts mới ngay)."""
+        with self._job_counts_lock:
+            self._job_counts_cache = None
+    
+    def list_accounts_with_job_counts(self) -> List[Dict]:
+        """
+        List active accounts kèm job counts.
+        
+        Hai queries tổng cộng (accounts + GROUP BY jobs) thay vì một COUNT(*) mỗi account.
+        Nếu query đếm jobs lỗi, vẫn trả về accounts với counts rỗng (chỉ log WARNING).
+        
+        Returns:
+            List of account dicts với thêm `jobs_count` (tổng) và `jobs_by_status`
+        """
+        accounts = self.list_accounts()
+        try:
+            counts = self.get_job_counts_by_account()
+        except StorageError as e:
+            self.logger.log_step(
+                step="LIST_ACCOUNTS_WITH_JOB_COUNTS",
+                result="WARNING",
+                error=f"Failed to count jobs, returning accounts without counts: {safe_get_exception_message(e)}",
+                error_type=safe_get_exception_type_name(e)
+            )
+            counts = {}
+        
+        for account in accounts:
+            by_status = counts.get(account["account_id"], {})
+            account["jobs_by_status"] = dict(by_status)
+            account["jobs_count"] = sum(by_status.values())
+        return accounts
+    
     def get_account(self, account_id: str) -> Optional[Dict]:
         """Get account by ID."""
         try:
@@ -5,18 +5,10 @@ MySQL storage implementation cho application configuration.
 """
 
 # Standard library
-import sys
 import json
-from pathlib import Path
 from typing import Dict, Any, Optional
 from contextlib import contextmanager
 
-# Add parent directory to path
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-
 # Third-party
 import pymysql
 from pymysql.cursors import DictCursor
@@ -152,7 +144,33 @@ class ConfigStorage:
                 error_type=safe_get_exception_type_name(e)
             )
             raise StorageError(f"Failed to parse config: {error_msg}") from e
-    
+
+    def get_version(self) -> Optional[str]:
+        """
+        Get version của config (updated_at) - query rẻ để kiểm tra config đã đổi chưa.
+
+        Returns:
+            updated_at (ISO string) hoặc None nếu chưa có config
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT updated_at
+                    FROM app_config
+                    WHERE config_key = %s
+                """, (self.CONFIG_KEY,))
+
+                row = cursor.fetchone()
+                if row and row.get("updated_at") is not None:
+                    updated_at = row["updated_at"]
+                    return updated_at.isoformat() if hasattr(updated_at, "isoformat") else str(updated_at)
+                return None
+
+        except pymysql.Error as e:
+            error_msg = safe_get_exception_message(e)
+            raise StorageError(f"Failed to get config version: {error_msg}") from e
+
     def save_config(self, config: Config) -> None:
         """Save config to MySQL."""
         try:
@@ -5,20 +5,12 @@ MySQL connection pooling for storage operations.
 Improves performance by reusing connections instead of creating new ones.
 """
 
-import sys
-from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
 from queue import Queue, Empty
 from threading import Lock
 import time
 
-# Add parent directory to path
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-
 # Third-party
 import pymysql
 import pymysql.err
@@ -5,32 +5,73 @@ MySQL storage implementation cho feed items.
 """
 
 # Standard library
-import sys
 import json
-from pathlib import Path
-from typing import List, Dict, Optional
+import base64
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Set, Tuple
 from contextlib import contextmanager
 from datetime import datetime
 
-# Add parent directory to path
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-
 # Third-party
 import pymysql
 from pymysql.cursors import DictCursor
 
 # Local
 from services.logger import StructuredLogger
-from services.exceptions import StorageError
+from services.exceptions import InvalidCursorError, StorageError
 from services.storage.connection_pool import get_connection_pool
 from utils.exception_utils import (
     safe_get_exception_type_name,
     safe_get_exception_message
 )
 
+# Sort orders hỗ trợ keyset pagination: order_by -> (column, direction).
+# Mỗi order có composite index (..., column, id) tương ứng (migration 009);
+# cột sort phải NOT NULL, nếu không predicate keyset bỏ sót rows NULL ở các page sau.
+KEYSET_ORDERS: Dict[str, Tuple[str, str]] = {
+    "fetched_at DESC": ("fetched_at", "DESC"),
+    "fetched_at ASC": ("fetched_at", "ASC"),
+    "like_count DESC": ("like_count", "DESC"),
+}
+
+# Timeout cho mỗi SELECT (optimizer hint, MySQL 5.7.8+; bản cũ bỏ qua comment)
+QUERY_TIMEOUT_MS = 25000
+
+# COUNT(*) cache: giá trị quá TTL vẫn được trả về và refresh ở background
+COUNT_CACHE_TTL_SECONDS = 60
+COUNT_CACHE_MAX_ENTRIES = 256
+
+# Full-text search trên cột generated `search_text` (migration 010):
+# username + user_display_name + text + hashtags + mentions
+SEARCH_MATCH_EXPR = "MATCH(search_text) AGAINST (%s IN BOOLEAN MODE)"
+SEARCH_ORDER = "relevance DESC"
+# Ký tự operator của BOOLEAN MODE (và '#' của hashtag) - loại bỏ khỏi input user
+_SEARCH_OPERATOR_PATTERN = re.compile(r'[+\-<>()~*"@#]+')
+# MySQL error codes khi chưa chạy migration 010 (unknown column / no FULLTEXT index)
+_SEARCH_UNAVAILABLE_ERRORS = (1054, 1191)
+
+# MySQL error code: Table doesn't exist (user_profiles trước migration 011)
+_ER_NO_SUCH_TABLE = 1146
+
+# Avatar LRU: user_id -> avatar_url (kết quả None được cache ngắn hơn)
+AVATAR_CACHE_MAX_ENTRIES = 4096
+AVATAR_CACHE_TTL_SECONDS = 600
+AVATAR_CACHE_MISS_TTL_SECONDS = 60
+
+_UPSERT_USER_PROFILE_SQL = """
+    INSERT INTO user_profiles (user_id, username, display_name, avatar_url, is_verified)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        username = VALUES(username),
+        display_name = COALESCE(VALUES(display_name), display_name),
+        avatar_url = COALESCE(VALUES(avatar_url), avatar_url),
+        is_verified = VALUES(is_verified)
+"""
+
 
 class FeedStorage:
     """
@@ -89,6 +130,21 @@ class FeedStorage:
             write_timeout=write_timeout,
             logger=self.logger
         )
+        
+        # COUNT(*) cache: (where_clause, params) -> (count, computed_at monotonic)
+        self._count_cache: "OrderedDict[Tuple[str, tuple], Tuple[int, float]]" = OrderedDict()
+        self._count_refreshing: Set[Tuple[str, tuple]] = set()
+        self._count_lock = threading.Lock()
+        self._count_executor: Optional[ThreadPoolExecutor] = None
+        
+        # False nếu feed_items chưa có search_text/FULLTEXT index -> fallback LIKE
+        self._search_index_available = True
+        
+        # Avatar LRU: user_id -> (avatar_url, expires_at monotonic)
+        self._avatar_cache: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._avatar_lock = threading.Lock()
+        # False khi user_profiles chưa được tạo (migration 011 chưa chạy)
+        self._profiles_available = True
     
     @contextmanager
     def _get_connection(self):
@@ -133,10 +189,21 @@ class FeedStorage:
         
         try:
             saved_count = 0
+            # user_id -> profile row (item sau ghi đè item trước)
+            profiles: Dict[str, Tuple] = {}
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 for item in feed_items:
+                    if item.get("user_id"):
+                        profiles[item["user_id"]] = (
+                            item["user_id"],
+                            item.get("username"),
+                            item.get("user_display_name"),
+                            item.get("user_avatar_url"),
+                            item.get("is_verified", False)
+                        )
+                    
                     # Prepare JSON fields
                     media_urls_json = json.dumps(item.get("media_urls", []), ensure_ascii=False) if item.get("media_urls") else None
                     hashtags_json = json.dumps(item.get("hashtags", []), ensure_ascii=False) if item.get("hashtags") else None
@@ -174,7 +241,7 @@ class FeedStorage:
                         account_id,
                         item.get("username"),
                         item.get("text"),
-                        item.get("like_count", 0),
+                        item.get("like_count") or 0,
                         item.get("reply_count", 0),
                         item.get("repost_count", 0),
                         item.get("share_count", 0),
@@ -201,7 +268,10 @@ class FeedStorage:
                     ))
                     saved_count += 1
                 
+                self._upsert_user_profiles(cursor, list(profiles.values()))
                 conn.commit()
+                self.invalidate_counts()
+                self._cache_avatars(profiles.values())
                 
                 self.logger.log_step(
                     step="SAVE_FEED_ITEMS",
@@ -234,26 +304,56 @@ class FeedStorage:
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         order_by: str = "fetched_at DESC",
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         Get feed items from database.
         
+        Với order_by thuộc `KEYSET_ORDERS`, kết quả được sort theo (column, id)
+        và có thể phân trang bằng `cursor` (seek trên index thay vì OFFSET).
+        
+        `filters["search"]` tìm full-text trên text, hashtags, mentions, username
+        và display name (FULLTEXT index, migration 010). Với order_by="relevance DESC"
+        kết quả được xếp theo điểm MATCH (phân trang bằng offset); không có search
+        thì order này tương đương "fetched_at DESC".
+        
         Args:
             account_id: Filter by account ID
             post_id: Filter by post ID
             username: Filter by username
             limit: Limit number of results
-            offset: Offset for pagination
-            order_by: Order by clause (default: fetched_at DESC)
+            offset: Offset for pagination (bị bỏ qua khi có cursor)
+            order_by: Order by clause (default: fetched_at DESC, hoặc "relevance DESC" khi search)
             filters: Optional FeedFilters dict with min_likes, max_likes, etc.
+            cursor: Opaque cursor từ `next_cursor` của page trước
         
         Returns:
             Dict with:
             - items: List of feed item dicts
-            - total: Total count for account_id (without filters)
-            - filtered_total: Total count with filters applied
+            - total: Total count for account_id (without filters, cached)
+            - filtered_total: Total count with filters applied (cached)
+            - next_cursor: Cursor cho page tiếp theo (None nếu hết hoặc order không hỗ trợ keyset)
+        
+        Raises:
+            InvalidCursorError: Nếu cursor không hợp lệ cho order_by hiện tại
+            StorageError: Nếu query lỗi
         """
+        normalized_order = " ".join(order_by.split())
+        search_terms = self._extract_search_terms(filters.get("search")) if filters else []
+        use_fulltext = bool(search_terms) and self._search_index_available
+        rank_by_relevance = normalized_order == SEARCH_ORDER
+        if rank_by_relevance and not use_fulltext:
+            # Không có điểm relevance -> dùng thứ tự mặc định (keyset)
+            normalized_order = order_by = "fetched_at DESC"
+            rank_by_relevance = False
+        keyset = KEYSET_ORDERS.get(normalized_order)
+        cursor_values = None
+        if cursor:
+            if not keyset:
+                raise InvalidCursorError(f"Cursor pagination is not supported for order '{order_by}'")
+            cursor_values = self._decode_cursor(cursor, normalized_order)
+        
         try:
             self.logger.log_step(
                 step="GET_FEED_ITEMS_START",
@@ -262,27 +362,12 @@ class FeedStorage:
                 post_id=post_id,
                 username=username,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                has_cursor=cursor is not None
             )
-            print(f"[FeedStorage] get_feed_items: Starting query for account_id={account_id}")
-            
-            # Get connection with timeout protection
-            import signal
-            import threading
-            
-            connection_timeout = 5  # 5 seconds timeout for getting connection
-            query_timeout = 25  # 25 seconds timeout for query execution
             
             with self._get_connection() as conn:
-                print(f"[FeedStorage] get_feed_items: Got connection, setting query timeout")
-                cursor = conn.cursor()
-                # Set query timeout (MySQL 5.7.8+)
-                query_timeout = 25  # 25 seconds timeout for query execution
-                try:
-                    cursor.execute("SET SESSION max_execution_time = %s", (query_timeout * 1000,))  # milliseconds
-                    print(f"[FeedStorage] get_feed_items: Query timeout set to {query_timeout}s")
-                except Exception as e:
-                    print(f"[FeedStorage] Warning: Could not set query timeout (MySQL version may not support it): {e}")
+                cursor_obj = conn.cursor()
                 
                 # Build base WHERE clause (account_id, post_id, username)
                 base_where_conditions = []
@@ -303,10 +388,7 @@ class FeedStorage:
                 base_where_clause = " AND ".join(base_where_conditions) if base_where_conditions else "1=1"
                 
                 # Get total count (without filters, only base conditions)
-                total_count_query = f"SELECT COUNT(*) as total FROM feed_items WHERE {base_where_clause}"
-                cursor.execute(total_count_query, base_params)
-                total_count_result = cursor.fetchone()
-                total_count = total_count_result['total'] if total_count_result else 0
+                total_count = self._get_cached_count(cursor_obj, base_where_clause, base_params)
                 
                 # Build filter WHERE conditions
                 filter_where_conditions = base_where_conditions.copy()
@@ -347,6 +429,18 @@ class FeedStorage:
                         filter_where_conditions.append("text LIKE %s")
                         filter_params.append(f"%{filters['text_contains']}%")
                     
+                    if use_fulltext:
+                        filter_where_conditions.append(SEARCH_MATCH_EXPR)
+                        filter_params.append(self._build_boolean_query(search_terms))
+                    elif search_terms:
+                        # Fallback khi chưa có FULLTEXT index: mỗi term phải khớp một cột
+                        for term in search_terms:
+                            filter_where_conditions.append(
+                                "(text LIKE %s OR username LIKE %s OR user_display_name LIKE %s"
+                                " OR CAST(hashtags AS CHAR) LIKE %s OR CAST(mentions AS CHAR) LIKE %s)"
+                            )
+                            filter_params.extend([f"%{term}%"] * 5)
+                    
                     if filters.get("after_timestamp") is not None:
                         filter_where_conditions.append("timestamp >= %s")
                         filter_params.append(filters["after_timestamp"])
@@ -359,14 +453,38 @@ class FeedStorage:
                 where_clause = " AND ".join(filter_where_conditions) if filter_where_conditions else "1=1"
                 
                 # Get filtered count (with filters applied)
-                filtered_count_query = f"SELECT COUNT(*) as total FROM feed_items WHERE {where_clause}"
-                cursor.execute(filtered_count_query, filter_params)
-                filtered_count_result = cursor.fetchone()
-                filtered_total = filtered_count_result['total'] if filtered_count_result else 0
+                if where_clause == base_where_clause:
+                    filtered_total = total_count
+                else:
+                    filtered_total = self._get_cached_count(cursor_obj, where_clause, filter_params)
+                
+                # Page conditions: seek sau cursor (keyset) thay vì OFFSET
+                page_conditions = filter_where_conditions.copy()
+                query_params = filter_params.copy()
+                order_clause = order_by
+                select_params = []
+                relevance_select = ""
                 
-                # Build main query
+                if rank_by_relevance:
+                    relevance_select = f",\n                        {SEARCH_MATCH_EXPR} AS relevance"
+                    select_params.append(self._build_boolean_query(search_terms))
+                    order_clause = "relevance DESC, id DESC"
+                elif keyset:
+                    column, direction = keyset
+                    order_clause = f"{column} {direction}, id {direction}"
+                    if cursor_values is not None:
+                        comparator = "<" if direction == "DESC" else ">"
+                        cursor_value, cursor_id = cursor_values
+                        page_conditions.append(
+                            f"({column} {comparator} %s OR ({column} = %s AND id {comparator} %s))"
+                        )
+                        query_params.extend([cursor_value, cursor_value, cursor_id])
+                
+                page_where_clause = " AND ".join(page_conditions) if page_conditions else "1=1"
+                
+                # Build main query (MAX_EXECUTION_TIME hint thay vì SET SESSION mỗi lần gọi)
                 query = f"""
-                    SELECT 
+                    SELECT /*+ MAX_EXECUTION_TIME({QUERY_TIMEOUT_MS}) */
                         id, post_id, account_id, username, text,
                         like_count, reply_count, repost_count, share_count, view_count,
                         media_urls, timestamp, timestamp_iso,
@@ -374,18 +492,19 @@ class FeedStorage:
                         post_url, shortcode, is_reply, parent_post_id, thread_id,
                         quoted_post, hashtags, mentions, links,
                         media_type, video_duration, fetched_at,
-                        created_at, updated_at
+                        created_at, updated_at{relevance_select}
                     FROM feed_items
-                    WHERE {where_clause}
-                    ORDER BY {order_by}
+                    WHERE {page_where_clause}
+                    ORDER BY {order_clause}
                 """
                 
-                query_params = filter_params.copy()
-                if limit:
+                # Keyset: lấy thêm 1 row để biết còn page tiếp theo không
+                fetch_limit = limit + 1 if (limit and keyset) else limit
+                if fetch_limit:
                     query += " LIMIT %s"
-                    query_params.append(limit)
+                    query_params.append(fetch_limit)
                     
-                    if offset:
+                    if offset and cursor_values is None:
                         query += " OFFSET %s"
                         query_params.append(offset)
                 
@@ -393,31 +512,29 @@ class FeedStorage:
                     step="GET_FEED_ITEMS_EXECUTE",
                     result="IN_PROGRESS",
                     query=query[:200],  # Log first 200 chars
-                    params_count=len(query_params),
+                    params_count=len(select_params) + len(query_params),
                     total_count=total_count
                 )
                 
-                print(f"[FeedStorage] get_feed_items: Executing query with {len(query_params)} params")
-                print(f"[FeedStorage] get_feed_items: Query: {query[:100]}...")
-                print(f"[FeedStorage] get_feed_items: Total count: {total_count}")
-                
-                import time
                 start_time = time.time()
-                cursor.execute(query, query_params)
+                cursor_obj.execute(query, select_params + query_params)
+                rows = cursor_obj.fetchall()
                 execute_time = time.time() - start_time
-                print(f"[FeedStorage] get_feed_items: Query executed in {execute_time:.2f}s")
                 
-                start_time = time.time()
-                rows = cursor.fetchall()
-                fetch_time = time.time() - start_time
-                print(f"[FeedStorage] get_feed_items: Fetched {len(rows)} rows in {fetch_time:.2f}s")
+                next_cursor = None
+                if keyset and limit and len(rows) > limit:
+                    rows = rows[:limit]
+                    last_row = rows[-1]
+                    next_cursor = self._encode_cursor(normalized_order, last_row[keyset[0]], last_row["id"])
                 
                 self.logger.log_step(
                     step="GET_FEED_ITEMS_FETCHED",
                     result="SUCCESS",
                     rows_count=len(rows),
                     total_count=total_count,
-                    filtered_total=filtered_total
+                    filtered_total=filtered_total,
+                    has_next_cursor=next_cursor is not None,
+                    query_time_seconds=round(execute_time, 3)
                 )
                 
                 # Parse JSON fields
@@ -443,10 +560,31 @@ class FeedStorage:
                 return {
                     "items": feed_items,
                     "total": total_count,
-                    "filtered_total": filtered_total
+                    "filtered_total": filtered_total,
+                    "next_cursor": next_cursor
                 }
                 
         except pymysql.Error as e:
+            if use_fulltext and e.args and e.args[0] in _SEARCH_UNAVAILABLE_ERRORS:
+                # Chưa chạy migration 010 -> tắt FULLTEXT và retry bằng LIKE
+                self._search_index_available = False
+                self.logger.log_step(
+                    step="FEED_SEARCH_INDEX_UNAVAILABLE",
+                    result="WARNING",
+                    error=safe_get_exception_message(e),
+                    note="Run docker/mysql/migrations/010_add_feed_items_search_index.sql"
+                )
+                return self.get_feed_items(
+                    account_id=account_id,
+                    post_id=post_id,
+                    username=username,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    filters=filters,
+                    cursor=cursor
+                )
+            
             error_msg = safe_get_exception_message(e)
             self.logger.log_step(
                 step="GET_FEED_ITEMS",
@@ -459,6 +597,147 @@ class FeedStorage:
             )
             raise StorageError(f"Failed to get feed items: {error_msg}") from e
     
+    # ------------------------------------------------------------------ #
+    # Full-text search
+    # ------------------------------------------------------------------ #
+    
+    @staticmethod
+    def _extract_search_terms(search: Optional[str]) -> List[str]:
+        """Tách search string thành terms (bỏ operator BOOLEAN MODE, '#', '@')."""
+        if not search:
+            return []
+        return _SEARCH_OPERATOR_PATTERN.sub(" ", search).split()
+    
+    @staticmethod
+    def _build_boolean_query(terms: List[str]) -> str:
+        """
+        Build BOOLEAN MODE query: mọi term bắt buộc, match theo prefix.
+        
+        Ví dụ: ["python", "async"] -> "+python* +async*"
+        """
+        return " ".join(f"+{term}*" for term in terms)
+    
+    # ------------------------------------------------------------------ #
+    # Keyset cursors
+    # ------------------------------------------------------------------ #
+    
+    @staticmethod
+    def _encode_cursor(order: str, value, row_id: int) -> str:
+        """Encode (sort value, id) thành opaque cursor string."""
+        if isinstance(value, datetime):
+            value = {"dt": value.isoformat()}
+        payload = json.dumps({"o": order, "v": value, "id": row_id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str, order: str) -> Tuple[object, int]:
+        """
+        Decode cursor thành (sort value, id).
+        
+        Raises:
+            InvalidCursorError: Nếu cursor hỏng hoặc được tạo cho order khác
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            value = payload["v"]
+            if isinstance(value, dict):
+                value = datetime.fromisoformat(value["dt"])
+            row_id = int(payload["id"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+        
+        if payload.get("o") != order:
+            raise InvalidCursorError(f"Cursor was created for order '{payload.get('o')}', not '{order}'")
+        
+        return value, row_id
+    
+    # ------------------------------------------------------------------ #
+    # Count cache
+    # ------------------------------------------------------------------ #
+    
+    def _count_rows(self, cursor, where_clause: str, params: List) -> int:
+        """COUNT(*) cho WHERE clause."""
+        cursor.execute(
+            f"SELECT /*+ MAX_EXECUTION_TIME({QUERY_TIMEOUT_MS}) */ COUNT(*) as total "
+            f"FROM feed_items WHERE {where_clause}",
+            params
+        )
+        result = cursor.fetchone()
+        return result['total'] if result else 0
+    
+    def _get_cached_count(self, cursor, where_clause: str, params: List) -> int:
+        """
+        Get COUNT(*) từ cache.
+        
+        - Chưa có trong cache: đếm đồng bộ (dùng connection hiện tại)
+        - Đã stale (quá TTL hoặc có save mới): trả giá trị cũ, refresh ở background
+        """
+        key = (where_clause, tuple(params))
+        
+        with self._count_lock:
+            entry = self._count_cache.get(key)
+            if entry is not None:
+                self._count_cache.move_to_end(key)
+        
+        if entry is None:
+            count = self._count_rows(cursor, where_clause, params)
+            self._store_count(key, count)
+            return count
+        
+        count, computed_at = entry
+        if time.monotonic() - computed_at > COUNT_CACHE_TTL_SECONDS:
+            self._schedule_count_refresh(key)
+        
+        return count
+    
+    def _store_count(self, key: Tuple[str, tuple], count: int) -> None:
+        """Lưu count vào cache (LRU bounded)."""
+        with self._count_lock:
+            self._count_cache[key] = (count, time.monotonic())
+            self._count_cache.move_to_end(key)
+            while len(self._count_cache) > COUNT_CACHE_MAX_ENTRIES:
+                self._count_cache.popitem(last=False)
+    
+    def _schedule_count_refresh(self, key: Tuple[str, tuple]) -> None:
+        """Refresh count ở background thread (single-flight theo key)."""
+        with self._count_lock:
+            if key in self._count_refreshing:
+                return
+            self._count_refreshing.add(key)
+            if self._count_executor is None:
+                self._count_executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="feed-count-refresh"
+                )
+            executor = self._count_executor
+        
+        executor.submit(self._refresh_count, key)
+    
+    def _refresh_count(self, key: Tuple[str, tuple]) -> None:
+        """Background task: đếm lại và cập nhật cache."""
+        where_clause, params = key
+        try:
+            with self._get_connection() as conn:
+                count = self._count_rows(conn.cursor(), where_clause, list(params))
+            self._store_count(key, count)
+        except Exception as e:
+            self.logger.log_step(
+                step="REFRESH_FEED_COUNT",
+                result="WARNING",
+                error=f"Failed to refresh feed count: {str(e)}",
+                error_type=safe_get_exception_type_name(e)
+            )
+        finally:
+            with self._count_lock:
+                self._count_refreshing.discard(key)
+    
+    def invalidate_counts(self) -> None:
+        """Đánh dấu mọi cached count là stale (refresh async ở lần đọc tiếp theo)."""
+        with self._count_lock:
+            for key, (count, _) in self._count_cache.items():
+                self._count_cache[key] = (count, float("-inf"))
+    
     def get_latest_feed_items(
         self,
         account_id: str,
@@ -547,25 +826,27 @@ class FeedStorage:
         """
         Get avatar URL from database for a specific user.
         
+        Đọc từ LRU cache trước, miss thì một lookup theo primary key trên
+        user_profiles (fallback feed_items nếu chưa chạy migration 011).
+        
         Args:
             user_id: User ID
         
         Returns:
             Avatar URL or None if not found
         """
-        try:
-            # Query for user_id in recent items
-            result = self.get_feed_items(limit=100)
-            
-            items = result.get("items", [])
-            for item in items:
-                if item.get("user_id") == user_id:
-                    avatar_url = item.get("user_avatar_url")
-                    if avatar_url:
-                        return avatar_url
-            
+        if not user_id:
             return None
-            
+        
+        now = time.monotonic()
+        with self._avatar_lock:
+            entry = self._avatar_cache.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._avatar_cache.move_to_end(user_id)
+                return entry[0]
+        
+        try:
+            avatar_url = self._query_avatar_url(user_id)
         except Exception as e:
             self.logger.log_step(
                 step="GET_AVATAR_URL",
@@ -574,3 +855,81 @@ class FeedStorage:
                 user_id=user_id
             )
             return None
+        
+        ttl = AVATAR_CACHE_TTL_SECONDS if avatar_url else AVATAR_CACHE_MISS_TTL_SECONDS
+        self._store_avatar(user_id, avatar_url, ttl)
+        return avatar_url
+    
+    def _query_avatar_url(self, user_id: str) -> Optional[str]:
+        """Lookup avatar_url cho một user (user_profiles, fallback feed_items)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            if self._profiles_available:
+                try:
+                    cursor.execute(
+                        "SELECT avatar_url FROM user_profiles WHERE user_id = %s",
+                        (user_id,)
+                    )
+                    row = cursor.fetchone()
+                    return row["avatar_url"] if row else None
+                except pymysql.err.ProgrammingError as e:
+                    if not (e.args and e.args[0] == _ER_NO_SUCH_TABLE):
+                        raise
+                    self._profiles_available = False
+                    self.logger.log_step(
+                        step="GET_AVATAR_URL",
+                        result="WARNING",
+                        error=safe_get_exception_message(e),
+                        note="Run migration 011_create_user_profiles.sql to enable user_profiles"
+                    )
+            
+            cursor.execute(
+                f"""
+                SELECT /*+ MAX_EXECUTION_TIME({QUERY_TIMEOUT_MS}) */ user_avatar_url
+                FROM feed_items
+                WHERE user_id = %s AND user_avatar_url IS NOT NULL
+                ORDER BY fetched_at DESC
+                LIMIT 1
+                """,
+                (user_id,)
+            )
+            row = cursor.fetchone()
+            return row["user_avatar_url"] if row else None
+    
+    def _upsert_user_profiles(self, cursor, rows: List[Tuple]) -> None:
+        """
+        Upsert user_profiles trong transaction của save_feed_items.
+        
+        Lỗi (vd. table chưa tồn tại) chỉ được log, không làm hỏng việc lưu feed items.
+        """
+        if not self._profiles_available or not rows:
+            return
+        
+        try:
+            cursor.executemany(_UPSERT_USER_PROFILE_SQL, rows)
+        except pymysql.err.ProgrammingError as e:
+            if e.args and e.args[0] == _ER_NO_SUCH_TABLE:
+                self._profiles_available = False
+            self.logger.log_step(
+                step="UPSERT_USER_PROFILES",
+                result="WARNING",
+                error=safe_get_exception_message(e),
+                error_type=safe_get_exception_type_name(e),
+                rows=len(rows),
+                note="Run migration 011_create_user_profiles.sql to enable user_profiles"
+            )
+    
+    def _cache_avatars(self, rows) -> None:
+        """Write-through: cập nhật LRU với avatar mới vừa lưu."""
+        for user_id, _, _, avatar_url, _ in rows:
+            if avatar_url:
+                self._store_avatar(user_id, avatar_url, AVATAR_CACHE_TTL_SECONDS)
+    
+    def _store_avatar(self, user_id: str, avatar_url: Optional[str], ttl: float) -> None:
+        """Lưu avatar vào LRU (evict entry ít dùng nhất khi đầy)."""
+        with self._avatar_lock:
+            self._avatar_cache[user_id] = (avatar_url, time.monotonic() + ttl)
+            self._avatar_cache.move_to_end(user_id)
+            while len(self._avatar_cache) > AVATAR_CACHE_MAX_ENTRIES:
+                self._avatar_cache.popitem(last=False)
@@ -5,18 +5,10 @@ MySQL storage implementation cho selectors.
 """
 
 # Standard library
-import sys
 import json
-from pathlib import Path
 from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
 
-# Add parent directory to path
-_parent_dir = Path(__file__).resolve().parent.parent.parent
-_parent_dir_str = str(_parent_dir)
-if _parent_dir_str not in sys.path:
-    sys.path.insert(0, _parent_dir_str)
-
 # Third-party
 import pymysql
 from pymysql.cursors import DictCursor
@@ -0,0 +1,99 @@
+"""
+Unit tests for account storage job counts.
+"""
+
+import pytest
+from contextlib import contextmanager
+from unittest.mock import ANY, MagicMock, patch
+
+import pymysql
+
+from services.storage import accounts_storage
+from services.storage.accounts_storage import AccountStorage
+
+
+class _FakePool:
+    """Connection pool stub: records executed queries, returns rows by table."""
+
+    def __init__(self, accounts, job_counts):
+        self.queries = []
+        self.cursor = MagicMock()
+        self.cursor.execute.side_effect = lambda query, *args: self.queries.append(" ".join(query.split()))
+        self.cursor.fetchall.side_effect = lambda: job_counts if "GROUP BY" in self.queries[-1] else accounts
+
+    @contextmanager
+    def get_connection(self):
+        conn = MagicMock()
+        conn.cursor.return_value = self.cursor
+        yield conn
+
+
+@pytest.fixture
+def pool():
+    accounts = [
+        {"account_id": "account_01", "profile_path": "/p/1", "is_active": True, "metadata": '{"name": "A"}'},
+        {"account_id": "account_02", "profile_path": "/p/2", "is_active": True, "metadata": None},
+    ]
+    job_counts = [
+        {"account_id": "account_01", "status": "scheduled", "count": 3},
+        {"account_id": "account_01", "status": "completed", "count": 2},
+        {"account_id": "orphan", "status": "failed", "count": 1},
+    ]
+    return _FakePool(accounts, job_counts)
+
+
+@pytest.fixture
+def storage(pool, mock_logger):
+    with patch.object(accounts_storage, "get_connection_pool", return_value=pool):
+        yield AccountStorage(logger=mock_logger)
+
+
+class TestAccountJobCounts:
+    """Test grouped job counts for account listing."""
+
+    def test_list_accounts_with_job_counts(self, storage, pool):
+        """Listing runs two queries regardless of account count."""
+        accounts = storage.list_accounts_with_job_counts()
+
+        assert len(pool.queries) == 2
+        assert pool.queries[1] == "SELECT account_id, status, COUNT(*) AS count FROM jobs GROUP BY account_id, status"
+        assert accounts[0]["jobs_count"] == 5
+        assert accounts[0]["jobs_by_status"] == {"scheduled": 3, "completed": 2}
+        assert accounts[0]["metadata"] == {"name": "A"}
+        assert accounts[1]["jobs_count"] == 0
+        assert accounts[1]["jobs_by_status"] == {}
+
+    def test_list_accounts_when_job_counts_fail(self, storage, pool):
+        """A failing GROUP BY still lists accounts, with empty counts."""
+        def execute(query, *args):
+            pool.queries.append(" ".join(query.split()))
+            if "GROUP BY" in query:
+                raise pymysql.err.OperationalError(2013, "Lost connection")
+        pool.cursor.execute.side_effect = execute
+
+        accounts = storage.list_accounts_with_job_counts()
+
+        assert [account["account_id"] for account in accounts] == ["account_01", "account_02"]
+        assert all(account["jobs_count"] == 0 for account in accounts)
+        assert all(account["jobs_by_status"] == {} for account in accounts)
+        storage.logger.log_step.assert_any_call(
+            step="LIST_ACCOUNTS_WITH_JOB_COUNTS", result="WARNING",
+            error=ANY, error_type="StorageError"
+        )
+
+    def test_job_counts_cached(self, storage, pool, monkeypatch):
+        """Counts are reused within the TTL, re-queried after it or on invalidate."""
+        now = [1000.0]
+        monkeypatch.setattr(accounts_storage.time, "monotonic", lambda: now[0])
+
+        first = storage.get_job_counts_by_account()
+        now[0] += accounts_storage.JOB_COUNTS_CACHE_TTL_SECONDS / 2
+        assert storage.get_job_counts_by_account() is first
+        assert len(pool.queries) == 1
+
+        now[0] += accounts_storage.JOB_COUNTS_CACHE_TTL_SECONDS
+        storage.get_job_counts_by_account()
+        storage.invalidate_job_counts_cache()
+        storage.get_job_counts_by_account()
+        storage.get_job_counts_by_account(use_cache=False)
+        assert len(pool.queries) == 4
@@ -0,0 +1,133 @@
+"""
+Unit tests for content-performance correlation in AnalyticsAPI.
+"""
+
+import re
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from backend.api.adapters.analytics_adapter import AnalyticsAPI, _EMOJI_PATTERN
+
+
+def _reference_correlation(jobs, latest_metrics):
+    """Tính theo từng row như implementation trước khi vectorize."""
+    correlation_data = []
+    top_posts = []
+    for job in jobs:
+        thread_id = job.get("thread_id")
+        metrics = latest_metrics.get(thread_id) if thread_id else None
+        content = job.get("content", "")
+        if not thread_id or not metrics or not content:
+            continue
+
+        length = len(content)
+        hashtag_count = len(re.findall(r"#\w+", content))
+        emoji_count = len(re.findall(_EMOJI_PATTERN, content))
+        engagement = metrics["likes"] + metrics["replies"] + metrics["shares"]
+        correlation_data.append({
+            "thread_id": thread_id,
+            "content_length": length,
+            "word_count": len(content.split()),
+            "hashtag_count": hashtag_count,
+            "emoji_count": emoji_count,
+            "likes": metrics["likes"],
+            "replies": metrics["replies"],
+            "shares": metrics["shares"],
+            "engagement": engagement,
+            "completed_at": job.get("completed_at")
+        })
+        if engagement > 0:
+            top_posts.append({"length": length, "hashtag_count": hashtag_count,
+                              "emoji_count": emoji_count, "engagement": engagement})
+
+    top_posts.sort(key=lambda post: post["engagement"], reverse=True)
+    top_performers = top_posts[:max(1, int(len(top_posts) * 0.2))]
+    avg_length_top = sum(p["length"] for p in top_performers) / len(top_performers)
+    avg_hashtags_top = sum(p["hashtag_count"] for p in top_performers) / len(top_performers)
+    avg_emojis_top = sum(p["emoji_count"] for p in top_performers) / len(top_performers)
+    insights = {
+        "optimal_length": {"min": int(avg_length_top * 0.8), "max": int(avg_length_top * 1.2), "avg": int(avg_length_top)},
+        "optimal_hashtags": {"min": max(0, int(avg_hashtags_top * 0.8)), "max": int(avg_hashtags_top * 1.2),
+                             "avg": round(avg_hashtags_top, 1)},
+        "optimal_emojis": {"min": max(0, int(avg_emojis_top * 0.8)), "max": int(avg_emojis_top * 1.2),
+                           "avg": round(avg_emojis_top, 1)},
+        "avg_length_top_posts": int(avg_length_top),
+        "avg_hashtags_top_posts": round(avg_hashtags_top, 1),
+        "avg_emojis_top_posts": round(avg_emojis_top, 1),
+        "avg_length_all": int(sum(d["content_length"] for d in correlation_data) / len(correlation_data))
+    }
+    return correlation_data, insights
+
+
+@pytest.fixture
+def jobs():
+    return [
+        {"thread_id": "t1", "content": "Hello world #sale #deal 😀😀 🚀", "completed_at": "2026-01-01T09:15:00"},
+        {"thread_id": "t2", "content": "Plain   text\twith  spaces", "completed_at": "2026-01-01T10:00:00+00:00"},
+        {"thread_id": None, "content": "no thread id", "completed_at": None},
+        {"thread_id": "t3", "content": "", "completed_at": "2026-01-02T09:00:00"},
+        {"thread_id": "t4", "content": "Mua ngay #khuyenmai ✨ link ở bio", "completed_at": None},
+        {"thread_id": "t5", "content": "không có metrics", "completed_at": "2026-01-02T11:00:00"},
+        {"thread_id": "t6", "content": "#a #b #c ngắn", "completed_at": "2026-01-03T21:30:00"},
+        {"thread_id": "t7", "content": "zero engagement post", "completed_at": "2026-01-03T22:00:00"},
+    ]
+
+
+@pytest.fixture
+def latest_metrics():
+    return {
+        "t1": {"thread_id": "t1", "likes": 40, "replies": 5, "shares": 3},
+        "t2": {"thread_id": "t2", "likes": 10, "replies": 1, "shares": 0},
+        "t3": {"thread_id": "t3", "likes": 99, "replies": 0, "shares": 0},
+        "t4": {"thread_id": "t4", "likes": 25, "replies": 2, "shares": 1},
+        "t6": {"thread_id": "t6", "likes": 7, "replies": 0, "shares": 0},
+        "t7": {"thread_id": "t7", "likes": 0, "replies": 0, "shares": 0},
+    }
+
+
+@pytest.fixture
+def analytics_api(latest_metrics, mock_logger):
+    api = AnalyticsAPI.__new__(AnalyticsAPI)
+    api.logger = mock_logger
+    api.storage = Mock()
+    api.storage.get_account_metrics_version.return_value = ("2026-01-04 00:00:00", 6, 193)
+    api.storage.get_account_latest_metrics.return_value = list(latest_metrics.values())
+    api._correlation_cache = {}
+    api._correlation_cache_lock = threading.Lock()
+    return api
+
+
+class TestContentPerformanceCorrelation:
+    """Test vectorized correlation and its cache."""
+
+    def test_matches_per_row_computation(self, analytics_api, jobs, latest_metrics):
+        """Records and insights equal the previous per-row computation."""
+        expected_data, expected_insights = _reference_correlation(jobs, latest_metrics)
+
+        result = analytics_api.get_content_performance_correlation("account_01", jobs)
+
+        records = [
+            {key: value for key, value in record.items() if key != "posting_hour"}
+            for record in result["correlation_data"]
+        ]
+        assert records == expected_data
+        # completed_at lưu UTC, posting_hour theo giờ Việt Nam (UTC+7)
+        assert [r["posting_hour"] for r in result["correlation_data"]] == [16, 17, None, 4, 5]
+        for key, value in expected_insights.items():
+            assert result["insights"][key] == value
+
+    def test_cache_invalidated_on_content_change(self, analytics_api, jobs):
+        """Same jobs count but different content or metrics version recomputes."""
+        first = analytics_api.get_content_performance_correlation("account_01", jobs)
+        assert analytics_api.get_content_performance_correlation("account_01", list(jobs)) is first
+
+        edited = [dict(job) for job in jobs]
+        edited[0]["content"] = "Hello"
+        second = analytics_api.get_content_performance_correlation("account_01", edited)
+        assert second is not first
+        assert second["correlation_data"][0]["content_length"] == 5
+
+        analytics_api.storage.get_account_metrics_version.return_value = ("2026-01-04 00:00:00", 6, 200)
+        assert analytics_api.get_content_performance_correlation("account_01", edited) is not second
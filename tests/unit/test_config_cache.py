@@ -0,0 +1,116 @@
+"""
+Unit tests for ConfigCache.
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from config import config_cache as cache_module
+from config.config import Config, RunMode
+from config.config_cache import ConfigCache
+
+
+class FakeClock:
+    """Controllable time.monotonic replacement."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeSource:
+    """Config source với version đếm được số lần load/probe."""
+
+    def __init__(self):
+        self.version = 1
+        self.loads = 0
+        self.probes = 0
+
+    def load(self):
+        self.loads += 1
+        return Config(mode=RunMode.SAFE), self.version
+
+    def probe(self):
+        self.probes += 1
+        return self.version
+
+
+class TestConfigCache:
+    """Test ConfigCache."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Patch time used by config_cache."""
+        fake = FakeClock()
+        monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=fake.monotonic))
+        return fake
+
+    @pytest.fixture
+    def source(self):
+        """Fake config source."""
+        return FakeSource()
+
+    @pytest.fixture
+    def cache(self, clock, source):
+        """Cache với check interval 5s."""
+        return ConfigCache(loader=source.load, version_probe=source.probe, check_interval_seconds=5)
+
+    def test_reads_are_served_from_snapshot(self, cache, source, clock):
+        """Config loads once; version is only probed after the check interval."""
+        first = cache.get()
+        for _ in range(100):
+            assert cache.get() is first
+        assert source.loads == 1
+        assert source.probes == 0
+
+        clock.now += 6
+        assert cache.get() is first
+        assert source.loads == 1
+        assert source.probes == 1
+
+    def test_version_change_reloads_and_notifies(self, cache, source, clock):
+        """A new version triggers reload and subscriber notification."""
+        first = cache.get()
+        changes = []
+        cache.subscribe(lambda new, old: changes.append((new, old)))
+
+        source.version = 2
+        assert cache.get() is first
+
+        clock.now += 6
+        second = cache.get()
+        assert second is not first
+        assert changes == [(second, first)]
+
+    def test_invalidate(self, cache, source):
+        """invalidate() forces a reload; invalidate(config) swaps the snapshot directly."""
+        cache.get()
+        cache.invalidate()
+        cache.get()
+        assert source.loads == 2
+
+        changes = []
+        unsubscribe = cache.subscribe(lambda new, old: changes.append(new.mode))
+        saved = Config(mode=RunMode.FAST)
+        cache.invalidate(saved)
+        assert cache.get() is saved
+        assert changes == [RunMode.FAST]
+        assert source.loads == 2
+
+        unsubscribe()
+        cache.invalidate(Config())
+        assert len(changes) == 1
+
+    def test_failed_reload_keeps_snapshot(self, cache, source, clock):
+        """Reload errors keep serving the previous snapshot."""
+        first = cache.get()
+
+        def failing():
+            raise RuntimeError("db down")
+
+        cache._loader = failing
+        source.version = 2
+        clock.now += 6
+        assert cache.get() is first
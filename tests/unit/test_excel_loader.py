@@ -0,0 +1,81 @@
+"""
+Unit tests for Excel loader.
+"""
+
+import pytest
+import pandas as pd
+from datetime import datetime
+
+from content.excel_loader import ExcelLoader, ExcelLoadError
+
+
+class TestExcelLoader:
+    """Test columnar Excel loading."""
+
+    @pytest.fixture
+    def loader(self, mock_logger):
+        """Create loader instance."""
+        return ExcelLoader(logger=mock_logger)
+
+    @pytest.fixture
+    def excel_file(self, tmp_path):
+        """Excel file with valid and invalid rows."""
+        df = pd.DataFrame({
+            " Content ": ["hello", "  spaced ", None, "x" * 501, "ok", "ok2", "ok3"],
+            "scheduled_time": [
+                "2025-12-25 15:20:00", "2025-12-25T15:20:00", None, None,
+                "25/12/2025", datetime(2026, 1, 1, 9, 30), "2025-12-26"
+            ],
+            "priority": ["high", None, None, None, None, "bad", None],
+            "platform": [None, "facebook", None, None, None, None, None],
+            "link_aff": ["https://example.com", "nan", None, None, None, None, None],
+            "cta": [None, "cta!", None, None, None, None, None],
+        })
+        path = tmp_path / "posts.xlsx"
+        df.to_excel(path, index=False)
+        return path
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_load_from_file(self, loader, excel_file, streaming):
+        """Valid rows are returned with only present optional keys."""
+        posts = loader.load_from_file(excel_file, streaming=streaming)
+
+        assert posts == [
+            {
+                "content": "hello",
+                "link_aff": "https://example.com",
+                "scheduled_time": datetime(2025, 12, 25, 15, 20),
+                "priority": "HIGH",
+            },
+            {
+                "content": "spaced\ncta!",
+                "scheduled_time": datetime(2025, 12, 25, 15, 20),
+                "platform": "FACEBOOK",
+            },
+            {"content": "ok3", "scheduled_time": datetime(2025, 12, 26)},
+        ]
+
+    def test_process_dataframe_error_mask(self, loader):
+        """Errors are reported per row, first failing check wins."""
+        df = pd.DataFrame({
+            "content": ["", "x" * 501, "ok", "ok", "ok"],
+            "scheduled_time": [None, "garbage", "garbage", None, "2025-01-01 10:00"],
+            "priority": [None, None, "LOW", "bad", None],
+        })
+
+        posts_df, errors = loader.process_dataframe(df)
+
+        assert errors.notna().tolist() == [True, True, True, True, False]
+        assert errors[0].startswith("Content không được để trống")
+        assert errors[1].startswith("Content quá dài (501 ký tự)")
+        assert errors[2].startswith("Scheduled_time không hợp lệ")
+        assert errors[3].startswith("Priority không hợp lệ: BAD")
+        assert posts_df.loc[4, "scheduled_time"] == datetime(2025, 1, 1, 10, 0)
+
+    def test_missing_required_column(self, loader, tmp_path):
+        """Missing content column raises ExcelLoadError."""
+        path = tmp_path / "bad.xlsx"
+        pd.DataFrame({"priority": ["LOW"]}).to_excel(path, index=False)
+
+        with pytest.raises(ExcelLoadError, match="Thiếu cột bắt buộc"):
+            loader.load_from_file(path)
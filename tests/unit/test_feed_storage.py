@@ -0,0 +1,257 @@
+"""
+Unit tests for FeedStorage keyset cursors, search query building and avatar lookup.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pymysql
+import pytest
+
+from services.storage.feed_storage import FeedStorage
+
+
+def _make_storage(cursor):
+    """FeedStorage without a connection pool, using the given mock cursor."""
+    storage = FeedStorage.__new__(FeedStorage)
+    storage.logger = Mock()
+    storage._avatar_cache = OrderedDict()
+    storage._avatar_lock = threading.Lock()
+    storage._profiles_available = True
+    storage._search_index_available = True
+    storage._count_cache = OrderedDict()
+    storage._count_refreshing = set()
+    storage._count_lock = threading.Lock()
+    storage._count_executor = None
+
+    conn = Mock()
+    conn.cursor.return_value = cursor
+
+    @contextmanager
+    def get_connection():
+        yield conn
+
+    storage._get_connection = get_connection
+    return storage
+
+
+class _SqliteCursor:
+    """
+    pymysql-like DictCursor trên sqlite in-memory: `%s` -> `?`,
+    datetime lưu dạng ISO text (so sánh theo thứ tự chuỗi vẫn đúng).
+    """
+
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+        self.queries = []
+
+    def execute(self, query, params=()):
+        self.queries.append(query)
+        params = [value.isoformat(sep=" ") if isinstance(value, datetime) else value for value in params]
+        self._cursor.execute(query.replace("%s", "?"), params)
+
+    def _to_dict(self, row):
+        item = dict(row)
+        if isinstance(item.get("fetched_at"), str):
+            item["fetched_at"] = datetime.fromisoformat(item["fetched_at"])
+        return item
+
+    def fetchall(self):
+        return [self._to_dict(row) for row in self._cursor.fetchall()]
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._to_dict(row) if row is not None else None
+
+
+@pytest.fixture
+def sqlite_cursor():
+    """feed_items table với nhiều row trùng fetched_at / like_count."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    columns = [
+        "post_id", "account_id", "username", "text", "like_count", "reply_count", "repost_count",
+        "share_count", "view_count", "media_urls", "timestamp", "timestamp_iso", "user_id",
+        "user_display_name", "user_avatar_url", "is_verified", "post_url", "shortcode", "is_reply",
+        "parent_post_id", "thread_id", "quoted_post", "hashtags", "mentions", "links", "media_type",
+        "video_duration", "fetched_at", "created_at", "updated_at",
+    ]
+    conn.execute(f"CREATE TABLE feed_items (id INTEGER PRIMARY KEY, {', '.join(columns)})")
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    for row_id in range(1, 24):
+        conn.execute(
+            "INSERT INTO feed_items (id, post_id, account_id, text, like_count, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (row_id, f"post_{row_id}", "account_01" if row_id != 7 else "account_02",
+             f"post {row_id}", row_id % 4, (base + timedelta(minutes=row_id // 3)).isoformat(sep=" "))
+        )
+    return _SqliteCursor(conn)
+
+
+class TestFeedStorageCursor:
+    """Test cursor encoding used by keyset pagination."""
+
+    def test_datetime_cursor_roundtrip(self):
+        """fetched_at cursors decode back to the same datetime and id."""
+        fetched_at = datetime(2026, 1, 2, 3, 4, 5)
+        cursor = FeedStorage._encode_cursor("fetched_at DESC", fetched_at, 42)
+
+        assert FeedStorage._decode_cursor(cursor, "fetched_at DESC") == (fetched_at, 42)
+
+    def test_int_cursor_roundtrip(self):
+        """like_count cursors keep integer sort values."""
+        cursor = FeedStorage._encode_cursor("like_count DESC", 17, 7)
+
+        assert FeedStorage._decode_cursor(cursor, "like_count DESC") == (17, 7)
+
+    def test_cursor_rejected_for_other_order(self):
+        """A cursor cannot be reused with a different sort order."""
+        cursor = FeedStorage._encode_cursor("fetched_at DESC", datetime(2026, 1, 1), 1)
+
+        with pytest.raises(ValueError):
+            FeedStorage._decode_cursor(cursor, "like_count DESC")
+
+    def test_malformed_cursor(self):
+        """Garbage cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            FeedStorage._decode_cursor("not-a-cursor", "fetched_at DESC")
+
+
+    @pytest.mark.parametrize("order_by", ["fetched_at DESC", "fetched_at ASC", "like_count DESC"])
+    def test_pages_follow_cursor_without_overlap(self, sqlite_cursor, order_by):
+        """Walking next_cursor covers every row once, in the same order as a single query."""
+        storage = _make_storage(sqlite_cursor)
+        expected = [
+            item["id"] for item in storage.get_feed_items(account_id="account_01", limit=None, order_by=order_by)["items"]
+        ]
+
+        pages = []
+        cursor = None
+        while True:
+            result = storage.get_feed_items(account_id="account_01", limit=5, order_by=order_by, cursor=cursor)
+            pages.append([item["id"] for item in result["items"]])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+
+        walked = [row_id for page in pages for row_id in page]
+        assert len(expected) == 22
+        assert walked == expected
+        assert len(set(walked)) == len(walked)
+        assert [len(page) for page in pages] == [5, 5, 5, 5, 2]
+        assert result["filtered_total"] == 22
+        assert not any("OFFSET" in query for query in sqlite_cursor.queries)
+
+    def test_null_like_count_saved_as_zero(self):
+        """like_count is NOT NULL (migration 009) so keyset pages never skip rows."""
+        cursor = Mock()
+        storage = _make_storage(cursor)
+
+        storage.save_feed_items("account_01", [{"post_id": "p1", "like_count": None}])
+
+        params = cursor.execute.call_args_list[0][0][1]
+        assert params[4] == 0
+
+
+class TestFeedStorageSearch:
+    """Test full-text search query building."""
+
+    def test_boolean_query_requires_all_terms(self):
+        """Every term is required and prefix-matched."""
+        terms = FeedStorage._extract_search_terms("python  async")
+
+        assert FeedStorage._build_boolean_query(terms) == "+python* +async*"
+
+    def test_operators_stripped(self):
+        """Boolean-mode operators, hashtags and mentions are not passed through."""
+        terms = FeedStorage._extract_search_terms('#launch @alice -"beta" (x)~')
+
+        assert terms == ["launch", "alice", "beta", "x"]
+
+    def test_empty_search(self):
+        """Operator-only input yields no terms."""
+        assert FeedStorage._extract_search_terms("+-*") == []
+        assert FeedStorage._extract_search_terms(None) == []
+
+
+    @staticmethod
+    def _main_query(cursor):
+        """(query, params) của SELECT chính (bỏ qua COUNT queries)."""
+        for call in cursor.execute.call_args_list:
+            query, params = call[0]
+            if "FROM feed_items" in query and "COUNT(*)" not in query:
+                return " ".join(query.split()), params
+        raise AssertionError("main SELECT was not executed")
+
+    def test_search_query_ranked_with_text_contains_substring(self):
+        """search uses MATCH ranked by relevance; text_contains stays a substring LIKE."""
+        cursor = Mock()
+        cursor.fetchone.return_value = {"total": 0}
+        cursor.fetchall.return_value = []
+        storage = _make_storage(cursor)
+
+        storage.get_feed_items(
+            account_id="account_01", limit=20, order_by="relevance DESC",
+            filters={"text_contains": "sale", "search": "#python async"}
+        )
+
+        query, params = self._main_query(cursor)
+        assert "MATCH(search_text) AGAINST (%s IN BOOLEAN MODE) AS relevance" in query
+        assert "account_id = %s AND text LIKE %s AND MATCH(search_text) AGAINST (%s IN BOOLEAN MODE)" in query
+        assert query.endswith("ORDER BY relevance DESC, id DESC LIMIT %s")
+        assert params == ["+python* +async*", "account_01", "%sale%", "+python* +async*", 20]
+
+    def test_search_falls_back_to_like_without_index(self):
+        """Without the FULLTEXT index every term must match one of the searchable columns."""
+        cursor = Mock()
+        cursor.fetchone.return_value = {"total": 0}
+        cursor.fetchall.return_value = []
+        storage = _make_storage(cursor)
+        storage._search_index_available = False
+
+        storage.get_feed_items(limit=20, order_by="relevance DESC", filters={"search": "python"})
+
+        query, params = self._main_query(cursor)
+        assert "MATCH" not in query
+        assert "(text LIKE %s OR username LIKE %s OR user_display_name LIKE %s" in query
+        assert "ORDER BY fetched_at DESC, id DESC" in query
+        assert params == ["%python%"] * 5 + [21]
+
+
+class TestFeedStorageAvatar:
+    """Test avatar lookup via user_profiles and the LRU cache."""
+
+    def test_lookup_cached(self):
+        """Second lookup for the same user is served from memory."""
+        cursor = Mock()
+        cursor.fetchone.return_value = {"avatar_url": "https://cdn/a.jpg"}
+        storage = _make_storage(cursor)
+
+        assert storage.get_avatar_url("u1") == "https://cdn/a.jpg"
+        assert storage.get_avatar_url("u1") == "https://cdn/a.jpg"
+        assert cursor.execute.call_count == 1
+        assert "user_profiles" in cursor.execute.call_args[0][0]
+
+    def test_missing_table_falls_back_to_feed_items(self):
+        """Without migration 011 the lookup queries feed_items by user_id."""
+        cursor = Mock()
+        cursor.execute.side_effect = [
+            pymysql.err.ProgrammingError(1146, "Table 'user_profiles' doesn't exist"),
+            None,
+        ]
+        cursor.fetchone.return_value = {"user_avatar_url": "https://cdn/b.jpg"}
+        storage = _make_storage(cursor)
+
+        assert storage.get_avatar_url("u2") == "https://cdn/b.jpg"
+        assert storage._profiles_available is False
+        assert "feed_items" in cursor.execute.call_args[0][0]
+
+    def test_saved_profiles_written_through(self):
+        """Avatars from saved feed items populate the cache."""
+        storage = _make_storage(Mock())
+        storage._cache_avatars([("u3", "user3", "User 3", "https://cdn/c.jpg", False)])
+
+        assert storage.get_avatar_url("u3") == "https://cdn/c.jpg"
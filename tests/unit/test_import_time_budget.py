@@ -0,0 +1,50 @@
+"""
+Unit tests for the import-time budget check.
+"""
+
+from scripts.analysis import import_time_budget
+from scripts.analysis.import_time_budget import ImportBudget, ImportResult, parse_importtime
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:       300 |        500 |   pandas._libs
+import time:      1000 |       1500 | pandas
+import time:        80 |         80 |   config.settings
+import time:       200 |        280 | config
+"""
+
+
+class TestParseImporttime:
+    """Test parsing of `python -X importtime` output."""
+
+    def test_parse_importtime(self):
+        """Total sums top-level cumulative times only; nested modules are listed."""
+        total_ms, modules = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert total_ms == 1.9
+        assert modules["pandas._libs"] == 0.5
+        assert set(modules) == {"_io", "pandas._libs", "pandas", "config.settings", "config"}
+
+    def test_result_flags_forbidden_and_budget(self):
+        """Result fails when over budget or when a forbidden module is loaded."""
+        budget = ImportBudget("cli.commands.jobs", 100, forbidden=("pandas", "playwright"))
+
+        assert ImportResult(budget, 50.0, loaded=["config"]).ok
+        assert not ImportResult(budget, 150.0, loaded=["config"]).ok
+        heavy = ImportResult(budget, 50.0, loaded=["config", "pandas"])
+        assert heavy.forbidden_loaded == ["pandas"]
+        assert not heavy.ok
+
+
+class TestCliImportBudget:
+    """Test CLI entry points do not load heavy dependencies at import."""
+
+    def test_cli_commands_do_not_load_heavy_modules(self):
+        """Importing CLI command modules keeps pandas/playwright unloaded."""
+        for module in ("main", "cli.commands.jobs", "cli.commands.excel"):
+            result = import_time_budget.measure(ImportBudget(module, float("inf")), repeat=1)
+
+            assert result.error is None, result.error
+            assert result.forbidden_loaded == []
@@ -0,0 +1,104 @@
+"""
+Unit tests for ScheduledJob codec.
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+
+from services.scheduler import job_codec
+from services.scheduler.job_codec import encode_json, job_from_row, job_to_dict
+from services.scheduler.models import JobPriority, JobStatus, JobType, Platform, ScheduledJob
+
+
+@pytest.fixture
+def job():
+    """Job with every optional field populated."""
+    return ScheduledJob(
+        job_id="job1",
+        account_id="account_01",
+        content="Xin chào",
+        scheduled_time=datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc),
+        priority=JobPriority.HIGH,
+        status=JobStatus.RUNNING,
+        platform=Platform.FACEBOOK,
+        job_type=JobType.ENGAGEMENT,
+        engagement_data={"like_criteria": {"min_likes": 5}},
+        retry_count=1,
+        created_at=datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc),
+        started_at=datetime(2025, 1, 1, 10, 0, 5, tzinfo=timezone.utc),
+        thread_id="thread_1",
+        link_aff="https://example.com"
+    )
+
+
+class TestJobCodec:
+    """Test row/dict <-> ScheduledJob conversion."""
+
+    def test_slots(self, job):
+        """ScheduledJob has no per-instance __dict__."""
+        assert not hasattr(job, "__dict__")
+
+    def test_to_dict_values_and_order(self, job):
+        """to_dict keeps field order and converts datetimes, enums and engagement data."""
+        data = job.to_dict()
+
+        assert list(data) == list(ScheduledJob.__dataclass_fields__)
+        assert data["scheduled_time"] == "2025-01-01T10:00:00+00:00"
+        assert data["priority"] == 3
+        assert data["status"] == "running"
+        assert data["platform"] == "facebook"
+        assert data["job_type"] == "engagement"
+        assert data["engagement_data"] == '{"like_criteria": {"min_likes": 5}}'
+        assert data["completed_at"] is None
+
+    def test_round_trip(self, job):
+        """from_dict(to_dict(job)) restores the job."""
+        assert ScheduledJob.from_dict(job.to_dict()) == job
+
+    def test_invalid_enums_fall_back_to_defaults(self, job):
+        """Unknown values use the same defaults as before; strict mode raises."""
+        row = dict(job_to_dict(job), priority="2", status="bogus", platform=None, job_type="x")
+
+        loaded = job_from_row(row)
+
+        assert loaded.priority == JobPriority.NORMAL
+        assert loaded.status == JobStatus.SCHEDULED
+        assert loaded.platform == Platform.THREADS
+        assert loaded.job_type == JobType.POST
+        with pytest.raises(ValueError, match="JobStatus"):
+            job_from_row(dict(row, priority=2), strict=True)
+
+    def test_partial_and_invalid_rows(self, job):
+        """Missing optional fields use defaults; bad datetimes and missing/extra fields behave as from_dict."""
+        row = {key: value for key, value in job_to_dict(job).items() if key not in ("priority", "status", "retry_count", "link_aff")}
+        row["completed_at"] = "not-a-date"
+
+        loaded = job_from_row(row)
+
+        assert loaded.priority == JobPriority.NORMAL
+        assert loaded.status == JobStatus.SCHEDULED
+        assert loaded.retry_count == 0
+        assert loaded.completed_at is None
+        with pytest.raises(ValueError, match="scheduled_time"):
+            job_from_row(dict(row, scheduled_time="not-a-date"))
+        with pytest.raises(ValueError, match="missing required fields"):
+            job_from_row({"job_id": "job1"})
+        with pytest.raises(ValueError, match="missing required fields"):
+            job_from_row(dict(job_to_dict(job), unknown=1))
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_encode_json(self, monkeypatch, use_orjson):
+        """encode_json matches jsonable_encoder output with and without orjson."""
+        if use_orjson and not job_codec.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(job_codec, "ORJSON_AVAILABLE", use_orjson)
+        payload = {
+            "data": [{"status": JobStatus.RUNNING, "at": datetime(2025, 1, 1, tzinfo=timezone.utc), "content": "Xin chào"}],
+            "total": 1
+        }
+
+        assert json.loads(encode_json(payload)) == {
+            "data": [{"status": "running", "at": "2025-01-01T00:00:00+00:00", "content": "Xin chào"}],
+            "total": 1
+        }
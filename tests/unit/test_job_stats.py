@@ -0,0 +1,98 @@
+"""
+Unit tests for incremental job stats counters.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from services.scheduler import job_stats
+from services.scheduler.job_stats import JobStatsCounters
+from services.scheduler.models import JobPriority, JobStatus, ScheduledJob
+
+
+def _job(job_id, account_id, status, completed_at=None):
+    return ScheduledJob(
+        job_id=job_id,
+        account_id=account_id,
+        content=f"content {job_id}",
+        scheduled_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        priority=JobPriority.NORMAL,
+        status=status,
+        completed_at=completed_at
+    )
+
+
+def _full_scan_stats(jobs, account_id=None):
+    """Reference: đếm bằng cách duyệt toàn bộ jobs (get_stats cũ)."""
+    jobs = [j for j in jobs if account_id is None or j.account_id == account_id]
+    today = datetime.now(timezone.utc).date()
+    total = len(jobs)
+    completed = sum(1 for j in jobs if j.status == JobStatus.COMPLETED)
+    return {
+        "total": total,
+        "completed": completed,
+        "failed": sum(1 for j in jobs if j.status == JobStatus.FAILED),
+        "pending": sum(1 for j in jobs if j.status in (JobStatus.PENDING, JobStatus.SCHEDULED)),
+        "running": sum(1 for j in jobs if j.status == JobStatus.RUNNING),
+        "today_posts": sum(
+            1 for j in jobs
+            if j.status == JobStatus.COMPLETED and j.completed_at
+            and job_stats.normalize_to_utc(j.completed_at).date() == today
+        ),
+        "success_rate": (completed / total * 100) if total else 0.0,
+    }
+
+
+@pytest.fixture
+def jobs():
+    now = datetime.now(timezone.utc)
+    return [
+        _job("j1", "account_01", JobStatus.SCHEDULED),
+        _job("j2", "account_01", JobStatus.COMPLETED, completed_at=now),
+        _job("j3", "account_01", JobStatus.COMPLETED, completed_at=now - timedelta(days=2)),
+        _job("j4", "account_02", JobStatus.FAILED),
+        _job("j5", "account_02", JobStatus.RUNNING),
+    ]
+
+
+class TestJobStatsCounters:
+    """Test counters stay equal to a full scan across transitions."""
+
+    def test_reconcile_matches_full_scan(self, jobs):
+        """Reconciled counters equal the full-scan stats, per account and global."""
+        counters = JobStatsCounters()
+        counters.reconcile(jobs)
+
+        for account_id in (None, "account_01", "account_02", "missing"):
+            assert counters.get_stats(account_id) == _full_scan_stats(jobs, account_id)
+
+    def test_transitions(self, jobs):
+        """observe/discard apply deltas; repeated observe is a no-op."""
+        counters = JobStatsCounters()
+        for job in jobs:
+            counters.observe(job)
+
+        jobs[0].status = JobStatus.RUNNING
+        counters.observe(jobs[0])
+        jobs[0].status = JobStatus.COMPLETED
+        jobs[0].completed_at = datetime.now()
+        counters.observe(jobs[0])
+        counters.observe(jobs[0])
+        counters.discard(jobs[3].job_id)
+        counters.discard("unknown")
+        remaining = [job for job in jobs if job.job_id != "j4"]
+
+        for account_id in (None, "account_01", "account_02"):
+            assert counters.get_stats(account_id) == _full_scan_stats(remaining, account_id)
+
+    def test_reconcile_due(self, jobs, monkeypatch):
+        """Counters need reconcile before first use and after the interval."""
+        now = [100.0]
+        monkeypatch.setattr(job_stats.time, "monotonic", lambda: now[0])
+        counters = JobStatsCounters()
+
+        assert counters.reconcile_due()
+        counters.reconcile(jobs)
+        assert not counters.reconcile_due()
+        now[0] += job_stats.STATS_RECONCILE_SECONDS
+        assert counters.reconcile_due()
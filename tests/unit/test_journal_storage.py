@@ -0,0 +1,132 @@
+"""
+Unit tests for journal job storage.
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from services.scheduler.models import JobPriority, JobStatus, ScheduledJob
+from services.scheduler.storage import create_job_storage
+from services.scheduler.storage.journal_storage import JournalJobStorage
+from services.scheduler.storage.json_storage import JobStorage
+
+
+def _job(job_id: str, status: JobStatus = JobStatus.SCHEDULED) -> ScheduledJob:
+    return ScheduledJob(
+        job_id=job_id,
+        account_id="account_01",
+        content=f"content {job_id}",
+        scheduled_time=datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc) + timedelta(minutes=int(job_id[-1])),
+        priority=JobPriority.NORMAL,
+        status=status
+    )
+
+
+class TestJournalJobStorage:
+    """Test journal storage operations."""
+
+    @pytest.fixture
+    def storage(self, tmp_path, mock_logger):
+        """Create storage instance."""
+        return JournalJobStorage(storage_dir=tmp_path, logger=mock_logger)
+
+    def _journal_lines(self, storage):
+        return storage.journal_path.read_text(encoding="utf-8").splitlines()
+
+    def test_save_appends_only_changes(self, storage, tmp_path, mock_logger):
+        """Status change of one job appends one record; replay restores state."""
+        jobs = {job_id: _job(job_id) for job_id in ("job1", "job2", "job3")}
+        storage.save_jobs(jobs)
+        lines_after_first_save = len(self._journal_lines(storage))
+
+        jobs["job2"].status = JobStatus.COMPLETED
+        storage.save_jobs(jobs)
+        storage.save_jobs(jobs)
+
+        new_lines = self._journal_lines(storage)[lines_after_first_save:]
+        assert len(new_lines) == 1
+        assert json.loads(new_lines[0])["job"]["job_id"] == "job2"
+
+        reloaded = JournalJobStorage(storage_dir=tmp_path, logger=mock_logger).load_jobs()
+        assert set(reloaded) == {"job1", "job2", "job3"}
+        assert reloaded["job2"].status == JobStatus.COMPLETED
+
+    def test_deleted_jobs_are_removed(self, storage, tmp_path, mock_logger):
+        """Jobs missing from save_jobs are journaled as deletes."""
+        jobs = {job_id: _job(job_id) for job_id in ("job1", "job2")}
+        storage.save_jobs(jobs)
+        del jobs["job1"]
+        storage.save_jobs(jobs)
+
+        reloaded = JournalJobStorage(storage_dir=tmp_path, logger=mock_logger).load_jobs()
+        assert set(reloaded) == {"job2"}
+
+    def test_compaction(self, tmp_path, mock_logger):
+        """Compaction writes a snapshot and resets the journal."""
+        storage = JournalJobStorage(storage_dir=tmp_path, logger=mock_logger, compact_min_records=5, compact_ratio=0)
+        jobs = {"job1": _job("job1")}
+        for i in range(6):
+            jobs["job1"].retry_count = i
+            storage.save_jobs(jobs)
+
+        assert storage.snapshot_path.exists()
+        assert len(self._journal_lines(storage)) < 6
+
+        reloaded = JournalJobStorage(storage_dir=tmp_path, logger=mock_logger).load_jobs()
+        assert reloaded["job1"].retry_count == 5
+
+    def test_incremental_load_sees_other_writer(self, storage, tmp_path, mock_logger):
+        """A second instance's appends are picked up by load_jobs."""
+        storage.save_jobs({"job1": _job("job1")})
+        assert set(storage.load_jobs()) == {"job1"}
+
+        other = JournalJobStorage(storage_dir=tmp_path, logger=mock_logger)
+        jobs = other.load_jobs()
+        jobs["job2"] = _job("job2")
+        other.save_jobs(jobs)
+
+        assert set(storage.load_jobs()) == {"job1", "job2"}
+
+    def test_save_keeps_other_writers_jobs(self, storage, tmp_path, mock_logger):
+        """Saving never deletes or overwrites jobs another instance added/changed since our load."""
+        storage.save_jobs({"job1": _job("job1"), "job2": _job("job2")})
+        jobs = storage.load_jobs()
+
+        other = JournalJobStorage(storage_dir=tmp_path, logger=mock_logger)
+        other_jobs = other.load_jobs()
+        other_jobs["job2"].status = JobStatus.COMPLETED
+        other_jobs["job3"] = _job("job3")
+        other.save_jobs(other_jobs)
+
+        # save_jobs refreshes from disk before appending (picks up job3 and the completed job2)
+        jobs["job1"].status = JobStatus.RUNNING
+        storage.save_jobs(jobs)
+        jobs["job1"].retry_count = 1
+        storage.save_jobs(jobs)
+
+        reloaded = JournalJobStorage(storage_dir=tmp_path, logger=mock_logger).load_jobs()
+        assert set(reloaded) == {"job1", "job2", "job3"}
+        assert reloaded["job1"].status == JobStatus.RUNNING
+        assert reloaded["job2"].status == JobStatus.COMPLETED
+
+    def test_stale_journal_after_crash_is_ignored(self, storage, tmp_path, mock_logger):
+        """Journal whose header does not match the snapshot is already compacted."""
+        storage.save_jobs({"job1": _job("job1")})
+        stale_journal = storage.journal_path.read_bytes()
+        storage.compact()
+        storage.save_jobs({})
+        # Crash giữa snapshot và thay journal: journal cũ còn lại
+        storage.compact()
+        storage.journal_path.write_bytes(stale_journal)
+
+        assert JournalJobStorage(storage_dir=tmp_path, logger=mock_logger).load_jobs() == {}
+
+    def test_imports_legacy_json_files(self, tmp_path, mock_logger):
+        """Existing jobs_*.json files are imported into the first snapshot."""
+        JobStorage(storage_dir=tmp_path, logger=mock_logger).save_jobs({"job1": _job("job1")})
+
+        storage = create_job_storage(storage_type="journal", storage_dir=tmp_path, logger=mock_logger)
+
+        assert isinstance(storage, JournalJobStorage)
+        assert set(storage.load_jobs()) == {"job1"}
@@ -0,0 +1,36 @@
+"""
+Unit tests for lazy package exports.
+"""
+
+import sys
+import types
+
+import pytest
+
+from utils.lazy_exports import lazy_exports
+
+
+@pytest.fixture
+def package(monkeypatch):
+    """Throwaway package exporting OrderedDict lazily from collections."""
+    module = types.ModuleType("lazy_pkg")
+    module.__getattr__ = lazy_exports("lazy_pkg", {"OrderedDict": "collections"})
+    monkeypatch.setitem(sys.modules, "lazy_pkg", module)
+    return module
+
+
+class TestLazyExports:
+    """Test lazy_exports()."""
+
+    def test_export_imported_and_cached(self, package):
+        """First access imports the export and caches it on the package."""
+        from collections import OrderedDict
+
+        assert "OrderedDict" not in vars(package)
+        assert package.OrderedDict is OrderedDict
+        assert vars(package)["OrderedDict"] is OrderedDict
+
+    def test_unknown_name(self, package):
+        """Names outside the exports raise AttributeError."""
+        with pytest.raises(AttributeError, match="lazy_pkg"):
+            package.missing
@@ -0,0 +1,45 @@
+"""
+Unit tests for logger handler registry.
+"""
+
+import logging
+
+from services.logger import StructuredLogger, _LOGGER_REGISTRY, shutdown_loggers
+
+
+class TestLoggerRegistry:
+    """Test handler reuse across logger instances."""
+
+    def test_instances_share_handlers(self, tmp_path):
+        """Same name and config reuse the same handlers and file."""
+        first = StructuredLogger(name="registry_test_shared", log_dir=str(tmp_path))
+        handlers = list(first.logger.handlers)
+        open_files = _LOGGER_REGISTRY.open_file_count()
+
+        for _ in range(20):
+            StructuredLogger(name="registry_test_shared", log_dir=str(tmp_path))
+
+        assert logging.getLogger("registry_test_shared").handlers == handlers
+        assert _LOGGER_REGISTRY.open_file_count() == open_files
+
+    def test_config_change_closes_old_file_handler(self, tmp_path):
+        """A different log file releases and closes the previous file handler."""
+        first = StructuredLogger(name="registry_test_moved", log_dir=str(tmp_path / "a"))
+        old_file_handler = next(h for h in first.logger.handlers if isinstance(h, logging.FileHandler))
+
+        StructuredLogger(name="registry_test_moved", log_dir=str(tmp_path / "b"))
+
+        assert old_file_handler.stream is None
+        assert old_file_handler not in logging.getLogger("registry_test_moved").handlers
+        assert len(logging.getLogger("registry_test_moved").handlers) == 2
+
+    def test_shutdown_closes_handlers(self, tmp_path):
+        """shutdown_loggers() closes and detaches all registered handlers."""
+        log = StructuredLogger(name="registry_test_shutdown", log_dir=str(tmp_path))
+        file_handler = next(h for h in log.logger.handlers if isinstance(h, logging.FileHandler))
+
+        shutdown_loggers()
+
+        assert file_handler.stream is None
+        assert _LOGGER_REGISTRY.open_file_count() == 0
+        assert logging.getLogger("registry_test_shutdown").handlers == []
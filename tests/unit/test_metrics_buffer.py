@@ -0,0 +1,51 @@
+"""
+Unit tests for MetricsWriteBuffer.
+"""
+
+from unittest.mock import Mock
+
+from services.analytics.metrics_buffer import MetricsWriteBuffer
+
+
+class TestMetricsWriteBuffer:
+    """Test buffered metrics writes."""
+
+    def test_flushes_when_batch_size_reached(self):
+        """Buffer flushes one multi-row batch once batch_size rows are queued."""
+        storage = Mock()
+        storage.save_metrics_batch.return_value = True
+        buffer = MetricsWriteBuffer(storage, batch_size=3, flush_interval_seconds=60)
+
+        for i in range(2):
+            buffer.add(f"thread_{i}", "account_01", 10, 1, 0, 0, 0)
+        storage.save_metrics_batch.assert_not_called()
+        assert buffer.pending == 2
+
+        buffer.add("thread_2", "account_01", 10, 1, 0, 0, 0)
+        storage.save_metrics_batch.assert_called_once()
+        rows = storage.save_metrics_batch.call_args[0][0]
+        assert [row[0] for row in rows] == ["thread_0", "thread_1", "thread_2"]
+        assert buffer.pending == 0
+
+    def test_context_manager_flushes_remaining(self):
+        """Exiting the context flushes partial batches."""
+        storage = Mock()
+        storage.save_metrics_batch.return_value = True
+
+        with MetricsWriteBuffer(storage, batch_size=10, flush_interval_seconds=60) as buffer:
+            buffer.add("thread_0", "account_01", None, 1, 2, 3, 4)
+
+        storage.save_metrics_batch.assert_called_once()
+        assert buffer.flush_count == 1
+
+    def test_failed_flush_tracks_thread_ids(self):
+        """Failed batches are reported through failed_thread_ids."""
+        storage = Mock()
+        storage.save_metrics_batch.return_value = False
+        buffer = MetricsWriteBuffer(storage, batch_size=10, flush_interval_seconds=60)
+
+        buffer.add("thread_0", "account_01", 10, 1, 0, 0, 0)
+        buffer.add("thread_1", "account_01", 10, 1, 0, 0, 0)
+
+        assert buffer.flush() is False
+        assert buffer.failed_thread_ids == {"thread_0", "thread_1"}
@@ -0,0 +1,227 @@
+"""
+Unit tests for metrics rollups (migration 008) used by the account dashboard.
+"""
+
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pymysql
+
+from services.analytics import storage as metrics_storage_module
+from services.analytics.storage import MetricsStorage
+from backend.api.adapters.analytics_adapter import AnalyticsAPI
+
+
+class _RollupTables:
+    """
+    In-memory model của rollup tables, áp dụng đúng semantics của các upsert:
+    - thread_metrics_latest: giữ row có fetched_at mới nhất
+    - account_metrics_daily: GREATEST theo từng cột, cộng dồn samples
+    """
+
+    def __init__(self):
+        self.latest = {}
+        self.daily = {}
+
+    def executemany(self, query, rows):
+        if "thread_metrics_latest" in query:
+            for thread_id, account_id, views, likes, replies, reposts, shares, engagement, fetched_at in rows:
+                current = self.latest.get(thread_id)
+                if current is None or fetched_at >= current["fetched_at"]:
+                    self.latest[thread_id] = {
+                        "thread_id": thread_id, "account_id": account_id, "views": views,
+                        "likes": likes, "replies": replies, "reposts": reposts, "shares": shares,
+                        "engagement": engagement, "fetched_at": fetched_at,
+                    }
+        elif "account_metrics_daily" in query:
+            for account_id, metric_date, likes, replies, engagement, samples in rows:
+                current = self.daily.setdefault(
+                    (account_id, metric_date),
+                    {"metric_date": metric_date, "max_likes": 0, "max_replies": 0, "max_engagement": 0, "samples": 0}
+                )
+                current["max_likes"] = max(current["max_likes"], likes)
+                current["max_replies"] = max(current["max_replies"], replies)
+                current["max_engagement"] = max(current["max_engagement"], engagement)
+                current["samples"] += samples
+
+    def execute(self, query, params=None):
+        """Raw insert vào thread_metrics: không cần cho rollups."""
+
+
+class _FakePool:
+    """Connection pool stub: mọi cursor ghi vào cùng _RollupTables."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    @contextmanager
+    def get_connection(self):
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = self.cursor
+        yield conn
+
+
+class _FakeMetricsStorage:
+    """MetricsStorage stub cho AnalyticsAPI: history thô + rollup reads từ _RollupTables."""
+
+    def __init__(self, history, tables=None):
+        self.history = history
+        self.tables = tables
+
+    def get_account_metrics_history(self, account_id, start_date=None, end_date=None):
+        return [
+            row for row in self.history
+            if row["account_id"] == account_id and start_date <= row["fetched_at"] <= end_date
+        ]
+
+    def _latest_rows(self, account_id, start_date, end_date):
+        return [
+            row for row in self.tables.latest.values()
+            if row["account_id"] == account_id and start_date <= row["fetched_at"] <= end_date
+        ]
+
+    def get_account_rollup_summary(self, account_id, start_date=None, end_date=None):
+        if self.tables is None:
+            return None
+        rows = self._latest_rows(account_id, start_date, end_date)
+        totals = {"total_posts": len(rows)}
+        for column in ("likes", "replies", "reposts", "shares", "views", "engagement"):
+            totals[f"total_{column}"] = sum(row[column] or 0 for row in rows)
+        return totals
+
+    def get_account_top_threads(self, account_id, limit=10, start_date=None, end_date=None):
+        rows = self._latest_rows(account_id, start_date, end_date)
+        return sorted(rows, key=lambda row: row["engagement"], reverse=True)[:limit]
+
+    def get_account_daily_metrics(self, account_id, start_date=None, end_date=None):
+        return sorted(
+            (
+                row for (row_account, metric_date), row in self.tables.daily.items()
+                if row_account == account_id and start_date.date() <= metric_date <= end_date.date()
+            ),
+            key=lambda row: row["metric_date"]
+        )
+
+
+class _FakeJobStorage:
+    """MySQLJobStorage stub: content lookup theo thread_id."""
+
+    def get_contents_by_thread_ids(self, thread_ids):
+        return {thread_id: f"content of {thread_id}" for thread_id in thread_ids}
+
+
+@pytest.fixture
+def history():
+    """Raw thread_metrics rows: nhiều snapshot mỗi thread, trải trên nhiều ngày."""
+    base = datetime.now().replace(microsecond=0) - timedelta(days=3)
+    rows = []
+    for index in range(6):
+        thread_id = f"thread_{index}"
+        for snapshot in range(3):
+            likes = index * 10 + snapshot * 3
+            rows.append({
+                "thread_id": thread_id,
+                "account_id": "account_01",
+                "views": None if index == 0 else likes * 20,
+                "likes": likes,
+                "replies": index + snapshot,
+                "reposts": snapshot,
+                "shares": index % 2,
+                "fetched_at": base + timedelta(days=snapshot, hours=index),
+            })
+    # Snapshot cũ đến sau (out of order) không được ghi đè latest
+    rows.append(dict(rows[-1], likes=0, fetched_at=rows[-1]["fetched_at"] - timedelta(hours=1)))
+    return rows
+
+
+@pytest.fixture
+def rollup_tables(history, mock_logger):
+    """Rollup tables được dựng bằng MetricsStorage.save_metrics_batch thật."""
+    tables = _RollupTables()
+    with patch.object(metrics_storage_module, "get_connection_pool", return_value=_FakePool(tables)):
+        storage = MetricsStorage(logger=mock_logger)
+        assert storage.save_metrics_batch([
+            (row["thread_id"], row["account_id"], row["views"], row["likes"], row["replies"],
+             row["reposts"], row["shares"], row["fetched_at"])
+            for row in history
+        ])
+    return tables
+
+
+def _analytics_api(storage, mock_logger):
+    api = AnalyticsAPI.__new__(AnalyticsAPI)
+    api.logger = mock_logger
+    api.storage = storage
+    api._job_storage = _FakeJobStorage()
+    return api
+
+
+class TestMetricsRollups:
+    """Test rollup-based dashboard matches the raw thread_metrics computation."""
+
+    def test_dashboard_from_rollups_matches_raw_history(self, history, rollup_tables, mock_logger):
+        """Summary, top posts and charts are identical on both paths."""
+        raw = _analytics_api(_FakeMetricsStorage(history), mock_logger).get_account_dashboard_data("account_01")
+        rollup = _analytics_api(
+            _FakeMetricsStorage(history, rollup_tables), mock_logger
+        ).get_account_dashboard_data("account_01")
+
+        assert rollup["summary"] == raw["summary"]
+        assert rollup["top_posts"] == raw["top_posts"]
+        assert rollup["charts"] == raw["charts"]
+        assert raw["summary"]["total_posts"] == 6
+        assert rollup["top_posts"][0]["content"] == f"content of {rollup['top_posts'][0]['thread_id']}"
+
+    def test_first_day_of_range_matches_raw_history(self, mock_logger):
+        """Snapshot đầu ngày đầu tiên (trước now - days) nằm trong cả hai path."""
+        first_day = (datetime.now() - timedelta(days=2)).replace(hour=0, minute=0, second=0, microsecond=0)
+        history = [
+            {"thread_id": "thread_0", "account_id": "account_01", "views": 100, "likes": 9,
+             "replies": 2, "reposts": 0, "shares": 1, "fetched_at": first_day},
+            {"thread_id": "thread_1", "account_id": "account_01", "views": 50, "likes": 4,
+             "replies": 1, "reposts": 0, "shares": 0, "fetched_at": first_day + timedelta(days=1)},
+        ]
+        tables = _RollupTables()
+        with patch.object(metrics_storage_module, "get_connection_pool", return_value=_FakePool(tables)):
+            assert MetricsStorage(logger=mock_logger).save_metrics_batch([
+                (row["thread_id"], row["account_id"], row["views"], row["likes"], row["replies"],
+                 row["reposts"], row["shares"], row["fetched_at"])
+                for row in history
+            ])
+
+        raw = _analytics_api(_FakeMetricsStorage(history), mock_logger).get_account_dashboard_data("account_01", days=2)
+        rollup = _analytics_api(
+            _FakeMetricsStorage(history, tables), mock_logger
+        ).get_account_dashboard_data("account_01", days=2)
+
+        assert rollup["charts"] == raw["charts"]
+        assert rollup["summary"] == raw["summary"]
+        assert raw["charts"]["likes_over_time"][0] == {"date": str(first_day.date()), "likes": 9}
+
+    def test_missing_rollup_tables_disable_rollups(self, mock_logger):
+        """ER_NO_SUCH_TABLE on rollup upsert disables rollups without failing the write."""
+        cursor = MagicMock()
+        cursor.executemany.side_effect = pymysql.err.ProgrammingError(1146, "Table doesn't exist")
+        with patch.object(metrics_storage_module, "get_connection_pool", return_value=_FakePool(cursor)):
+            storage = MetricsStorage(logger=mock_logger)
+            assert storage.save_metrics("thread_0", "account_01", None, 1, 2, 3, 4)
+
+        assert storage._rollups_available is False
+        assert storage.get_account_rollup_summary("account_01") is None
+
+    def test_metrics_version_without_rollups_skips_history_scan(self, mock_logger):
+        """Không có rollup: version chỉ là MAX(fetched_at), không COUNT/SUM trên thread_metrics."""
+        latest = datetime(2026, 1, 4)
+        cursor = MagicMock()
+        cursor.fetchone.return_value = {"latest": latest}
+        with patch.object(metrics_storage_module, "get_connection_pool", return_value=_FakePool(cursor)):
+            storage = MetricsStorage(logger=mock_logger)
+            storage._rollups_available = False
+            version = storage.get_account_metrics_version("account_01")
+
+        query = cursor.execute.call_args[0][0]
+        assert version == (latest,)
+        assert "FROM thread_metrics " in query
+        assert "COUNT" not in query and "SUM" not in query
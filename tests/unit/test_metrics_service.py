@@ -27,6 +27,9 @@ class TestMetricsService:
         storage.has_recent_metrics = Mock(return_value=False)
         storage.get_latest_metrics = Mock(return_value=None)
         storage.save_metrics = Mock(return_value=True)
+        storage.get_recent_thread_ids = Mock(return_value=set())
+        storage.get_latest_metrics_batch = Mock(return_value={})
+        storage.save_metrics_batch = Mock(return_value=True)
         return storage
     
     @pytest.fixture
@@ -52,6 +55,10 @@ class TestMetricsService:
         config.analytics.page_load_alt_delay_seconds = 0.5
         config.analytics.username_extraction_timeout_seconds = 10
         config.analytics.delay_between_fetches_seconds = 0.1  # Short delay for testing
+        config.analytics.parallel_fetch_enabled = False
+        config.analytics.max_concurrent_fetches = 3
+        config.analytics.metrics_write_batch_size = 2
+        config.analytics.metrics_write_flush_interval_seconds = 60
         config.platform = Mock()
         config.platform.threads_post_url_template = "https://www.threads.com/@{username}/post/{thread_id}"
         config.platform.threads_post_fallback_template = "https://www.threads.net/post/{thread_id}"
@@ -426,16 +433,22 @@ class TestMetricsService:
     @pytest.mark.asyncio
     async def test_fetch_multiple_metrics(
         self,
-        service: MetricsService,
+        service_with_browser: MetricsService,
+        mock_browser_manager: Mock,
         mock_page: Mock,
         mock_storage: Mock
     ):
         """Test fetching metrics for multiple threads."""
-        thread_ids = ["123456789", "987654321", "111222333"]
+        thread_ids = ["123456789", "987654321", "111222333", "444555666"]
+        mock_browser_manager.context.new_page = AsyncMock(return_value=mock_page)
+        
+        # Thread cuối đã có metrics gần đây -> trả về cached, không scrape
+        mock_storage.get_recent_thread_ids = Mock(return_value={"444555666"})
+        mock_storage.get_latest_metrics_batch = Mock(return_value={"444555666": {"likes": 7}})
         
         # Setup mock scraper results
         mock_results = []
-        for thread_id in thread_ids:
+        for thread_id in thread_ids[:3]:
             mock_results.append({
                 "success": True,
                 "thread_id": thread_id,
@@ -446,13 +459,14 @@ class TestMetricsService:
                 "error": None
             })
         
-        with patch('services.analytics.service.ThreadMetricsScraper') as mock_scraper_class:
+        with patch('services.analytics.service.ThreadMetricsScraper') as mock_scraper_class, \
+             patch('asyncio.sleep', new=AsyncMock()):
             mock_scraper = Mock()
             mock_scraper.fetch_metrics = AsyncMock(side_effect=mock_results)
             mock_scraper_class.return_value = mock_scraper
             
             # Execute
-            results = await service.fetch_multiple_metrics(
+            results = await service_with_browser.fetch_multiple_metrics(
                 thread_ids=thread_ids,
                 account_id="account_01",
                 username="testuser",
@@ -460,13 +474,77 @@ class TestMetricsService:
             )
         
         # Assertions
-        assert len(results) == 3
+        assert len(results) == 4
         for i, result in enumerate(results):
             assert result["success"] is True
             assert result["thread_id"] == thread_ids[i]
+        assert results[3]["cached"] is True
+        assert mock_scraper.fetch_metrics.call_count == 3
+        
+        # Bulk recent check thay vì has_recent_metrics mỗi thread
+        mock_storage.get_recent_thread_ids.assert_called_once_with(thread_ids, hours=1)
+        mock_storage.has_recent_metrics.assert_not_called()
+        
+        # Writes được buffer: một batch khi đủ batch_size (2), phần còn lại flush khi kết thúc
+        mock_storage.save_metrics.assert_not_called()
+        batches = [call[0][0] for call in mock_storage.save_metrics_batch.call_args_list]
+        assert [[row[0] for row in batch] for batch in batches] == [thread_ids[:2], thread_ids[2:3]]
+    
+    @pytest.mark.asyncio
+    async def test_fetch_multiple_metrics_flush_failure_marks_results(
+        self,
+        service_with_browser: MetricsService,
+        mock_browser_manager: Mock,
+        mock_page: Mock,
+        mock_storage: Mock
+    ):
+        """Test threads in a failed batch flush are reported as failed."""
+        thread_ids = ["123456789", "987654321"]
+        mock_browser_manager.context.new_page = AsyncMock(return_value=mock_page)
+        mock_storage.save_metrics_batch = Mock(return_value=False)
+        
+        with patch('services.analytics.service.ThreadMetricsScraper') as mock_scraper_class, \
+             patch('asyncio.sleep', new=AsyncMock()):
+            mock_scraper = Mock()
+            mock_scraper.fetch_metrics = AsyncMock(side_effect=[
+                {"success": True, "thread_id": tid, "account_id": "account_01", "likes": 1, "error": None}
+                for tid in thread_ids
+            ])
+            mock_scraper_class.return_value = mock_scraper
+            
+            results = await service_with_browser.fetch_multiple_metrics(
+                thread_ids=thread_ids,
+                account_id="account_01",
+                username="testuser",
+                page=mock_page
+            )
+        
+        assert [result["success"] for result in results] == [False, False]
+        assert all("database" in result["error"].lower() for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_fetch_multiple_metrics_flushes_on_exception(
+        self,
+        service_with_browser: MetricsService,
+        mock_storage: Mock
+    ):
+        """Test buffered rows are flushed even when fetching raises."""
+        async def failing_fetch(thread_ids, account_id, username=None, writer=None):
+            writer.add(thread_ids[0], account_id, None, 1, 0, 0, 0)
+            raise RuntimeError("Browser crashed")
+        
+        with patch.object(service_with_browser, '_fetch_sequential', side_effect=failing_fetch):
+            with pytest.raises(RuntimeError):
+                await service_with_browser.fetch_multiple_metrics(
+                    thread_ids=["123456789", "987654321"],
+                    account_id="account_01",
+                    username="testuser",
+                    page=Mock()
+                )
         
-        # Verify delay between fetches (via asyncio.sleep)
-        # Note: Actual delay testing requires mocking asyncio.sleep
+        mock_storage.save_metrics_batch.assert_called_once()
+        rows = mock_storage.save_metrics_batch.call_args[0][0]
+        assert [row[0] for row in rows] == ["123456789"]
     
     @pytest.mark.asyncio
     async def test_fetch_and_save_metrics_exception_handling(
@@ -0,0 +1,109 @@
+"""
+Unit tests for NearDuplicateIndex (MinHash/LSH).
+"""
+
+import pytest
+
+from services.near_duplicate_index import NearDuplicateIndex
+from services.safety_guard import DEFAULT_DUPLICATE_INDEX_DIR, SafetyGuard, SafetyConfig
+
+
+class TestNearDuplicateIndex:
+    """Test near-duplicate index operations."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Create index persisted under tmp_path."""
+        return NearDuplicateIndex(storage_dir=tmp_path)
+
+    def test_exact_match(self, index):
+        """Exact content is detected via hash."""
+        index.add("account_01", "hello threads world")
+
+        match_type, similarity = index.find_duplicate("account_01", "hello threads world", 0.9)
+        assert match_type == "exact"
+        assert similarity == 1.0
+
+    def test_near_duplicate(self, index):
+        """Content above threshold is detected as similar."""
+        words = [f"word{i}" for i in range(20)]
+        index.add("account_01", " ".join(words))
+
+        # 19/20 shared words, 1 extra -> Jaccard = 19/21 ~ 0.905
+        near = words[:19] + ["extra"]
+        match_type, similarity = index.find_duplicate("account_01", " ".join(near), 0.9)
+        assert match_type == "similar"
+        assert similarity >= 0.9
+
+    def test_distinct_content_allowed(self, index):
+        """Unrelated content and other accounts are not duplicates."""
+        index.add("account_01", "morning coffee and code review")
+
+        assert index.find_duplicate("account_01", "weekend hiking trip photos", 0.9) == (None, 0.0)
+        assert index.find_duplicate("account_02", "morning coffee and code review", 0.9) == (None, 0.0)
+
+    def test_persists_across_restarts(self, tmp_path):
+        """Index is replayed from disk by a new instance."""
+        NearDuplicateIndex(storage_dir=tmp_path).add("account_01", "persisted post content")
+
+        reloaded = NearDuplicateIndex(storage_dir=tmp_path)
+        assert reloaded.size("account_01") == 1
+        assert reloaded.find_duplicate("account_01", "persisted post content", 0.9)[0] == "exact"
+
+    def test_max_documents_evicts_oldest(self, tmp_path):
+        """Bounded history evicts oldest entries and compacts the file."""
+        index = NearDuplicateIndex(max_documents_per_account=2, storage_dir=tmp_path)
+        for i in range(5):
+            index.add("account_01", f"post number {i} unique")
+
+        assert index.size("account_01") == 2
+        assert index.find_duplicate("account_01", "post number 0 unique", 0.9) == (None, 0.0)
+        assert index.find_duplicate("account_01", "post number 4 unique", 0.9)[0] == "exact"
+        assert NearDuplicateIndex(max_documents_per_account=2, storage_dir=tmp_path).size("account_01") == 2
+
+    def test_processes_share_appended_records(self, tmp_path):
+        """Records appended by another instance are read from the file tail on the next check."""
+        first = NearDuplicateIndex(storage_dir=tmp_path)
+        second = NearDuplicateIndex(storage_dir=tmp_path)
+        assert first.find_duplicate("account_01", "first process post", 0.9) == (None, 0.0)
+
+        second.add("account_01", "first process post")
+        assert first.find_duplicate("account_01", "first process post", 0.9)[0] == "exact"
+        assert first.add("account_01", "first process post") is False
+
+        first.add("account_01", "second process post")
+        assert second.size("account_01") == 2
+        assert (tmp_path / "account_01.jsonl").read_text(encoding="utf-8").count("\n") == 2
+
+    def test_reload_after_other_instance_compacts(self, tmp_path):
+        """An instance whose file was compacted by another instance reloads it from scratch."""
+        first = NearDuplicateIndex(max_documents_per_account=2, storage_dir=tmp_path)
+        second = NearDuplicateIndex(max_documents_per_account=2, storage_dir=tmp_path)
+        first.add("account_01", "post number 0 unique")
+        assert second.size("account_01") == 1
+
+        for i in range(1, 6):
+            first.add("account_01", f"post number {i} unique")
+
+        assert second.size("account_01") == 2
+        assert second.find_duplicate("account_01", "post number 0 unique", 0.9) == (None, 0.0)
+        assert second.find_duplicate("account_01", "post number 5 unique", 0.9)[0] == "exact"
+
+    def test_safety_guard_default_dir_anchored_to_project(self, monkeypatch):
+        """Default index dir comes from DUPLICATE_INDEX_DIR, resolved against the project root."""
+        monkeypatch.delenv("DUPLICATE_INDEX_DIR", raising=False)
+        assert SafetyConfig().duplicate_index_dir == str(DEFAULT_DUPLICATE_INDEX_DIR)
+        assert DEFAULT_DUPLICATE_INDEX_DIR.is_absolute()
+
+        monkeypatch.setenv("DUPLICATE_INDEX_DIR", "var/dup")
+        assert SafetyConfig().duplicate_index_dir == str(DEFAULT_DUPLICATE_INDEX_DIR.parent.parent / "var" / "dup")
+        assert SafetyConfig().duplicate_check_history_size > 0
+
+    def test_safety_guard_uses_index(self, tmp_path):
+        """SafetyGuard blocks content recorded as posted."""
+        guard = SafetyGuard(config=SafetyConfig(duplicate_index_dir=str(tmp_path)))
+        guard.record_post_success("account_01", "Same   content posted")
+
+        allowed, message = guard.check_duplicate_content("account_01", "same content posted")
+        assert allowed is False
+        assert "duplicate" in message.lower()
@@ -0,0 +1,216 @@
+"""
+Unit tests for SQLite job storage.
+"""
+
+import sqlite3
+import threading
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from services.scheduler.job_manager import JobManager
+from services.scheduler.models import JobPriority, JobStatus, ScheduledJob
+from services.scheduler.storage import create_job_storage
+from services.scheduler.storage.base import JobQuery, build_job_query_sql, filter_jobs, job_sort_key
+from services.scheduler.storage.sqlite_storage import SQLiteJobStorage, _format_datetime
+
+
+def _job(job_id: str, account_id: str = "account_01", status: JobStatus = JobStatus.SCHEDULED, minutes: int = 0) -> ScheduledJob:
+    return ScheduledJob(
+        job_id=job_id,
+        account_id=account_id,
+        content=f"content {job_id}",
+        scheduled_time=datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc) + timedelta(minutes=minutes),
+        priority=JobPriority.NORMAL,
+        status=status,
+        engagement_data={"like_criteria": {"min_likes": 5}} if job_id == "job1" else None
+    )
+
+
+class TestSQLiteJobStorage:
+    """Test SQLite storage operations."""
+
+    @pytest.fixture
+    def storage(self, tmp_path, mock_logger):
+        """Create storage instance."""
+        storage = create_job_storage(storage_type="sqlite", storage_dir=tmp_path, logger=mock_logger)
+        yield storage
+        storage.close()
+
+    @pytest.fixture
+    def jobs(self):
+        """Jobs across two accounts and statuses."""
+        return {
+            "job1": _job("job1", minutes=30),
+            "job2": _job("job2", minutes=10),
+            "job3": _job("job3", account_id="account_02", status=JobStatus.COMPLETED, minutes=20),
+        }
+
+    def test_wal_mode_and_indexes(self, storage):
+        """Database runs in WAL mode with the MySQL jobs indexes."""
+        conn = sqlite3.connect(str(storage.db_path))
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        finally:
+            conn.close()
+        assert {"idx_account_status", "idx_status_scheduled", "idx_thread_id"} <= indexes
+
+    def test_round_trip(self, storage, jobs, tmp_path, mock_logger):
+        """Jobs survive save/load including engagement data and timezone."""
+        storage.save_jobs(jobs)
+
+        loaded = SQLiteJobStorage(db_path=storage.db_path, logger=mock_logger).load_jobs()
+
+        assert list(loaded) == ["job2", "job3", "job1"]
+        assert loaded["job1"].engagement_data == {"like_criteria": {"min_likes": 5}}
+        assert loaded["job1"].scheduled_time == jobs["job1"].scheduled_time.replace(tzinfo=None)
+        assert loaded["job1"].scheduled_time.tzinfo is None
+        assert loaded["job3"].status == JobStatus.COMPLETED
+
+    def test_legacy_offset_rows_load_naive(self, storage, jobs, mock_logger):
+        """Rows stored with a +00:00 offset are rewritten to naive UTC on open."""
+        storage.save_jobs(jobs)
+        conn = sqlite3.connect(str(storage.db_path))
+        try:
+            conn.execute("UPDATE jobs SET scheduled_time = scheduled_time || '+00:00'")
+            conn.execute("PRAGMA user_version = 0")
+            conn.commit()
+        finally:
+            conn.close()
+
+        reopened = SQLiteJobStorage(db_path=storage.db_path, logger=mock_logger)
+        try:
+            loaded = reopened.load_jobs()
+        finally:
+            reopened.close()
+
+        assert loaded["job1"].scheduled_time == datetime(2025, 1, 1, 10, 30)
+
+    def test_cleanup_expired_jobs_after_load(self, storage, jobs, mock_logger):
+        """JobManager compares loaded jobs against naive datetime.now() without errors."""
+        storage.save_jobs(jobs)
+        manager = JobManager(storage.load_jobs(), mock_logger)
+
+        assert manager.cleanup_expired_jobs() == 2
+        assert manager.jobs["job1"].status == JobStatus.EXPIRED
+        assert manager.jobs["job3"].status == JobStatus.COMPLETED
+
+    def test_queries(self, storage, jobs):
+        """Status/account queries filter and sort in SQL."""
+        storage.save_jobs(jobs)
+
+        assert [job.job_id for job in storage.get_jobs_by_status(JobStatus.SCHEDULED)] == ["job2", "job1"]
+        assert [job.job_id for job in storage.get_jobs_by_status(JobStatus.SCHEDULED, limit=1)] == ["job2"]
+        assert [job.job_id for job in storage.get_jobs_by_account("account_02")] == ["job3"]
+        assert storage.get_jobs_by_account("account_01", status=JobStatus.COMPLETED) == []
+        assert storage.get_job_by_id("job3").account_id == "account_02"
+        assert storage.get_job_by_id("missing") is None
+
+    def test_query_jobs_matches_in_memory_filter(self, storage, jobs):
+        """SQL query_jobs/count_jobs give the same results as filter_jobs."""
+        jobs["job4"] = _job("job4", minutes=10)
+        storage.save_jobs(jobs)
+        base = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+        queries = [
+            JobQuery(),
+            JobQuery(status=JobStatus.SCHEDULED, limit=2),
+            JobQuery(account_id="account_01", status=JobStatus.SCHEDULED),
+            JobQuery(scheduled_from=base + timedelta(minutes=15), scheduled_before=base + timedelta(minutes=30)),
+            JobQuery(after=(JobPriority.NORMAL.value, base + timedelta(minutes=10), "job2"), limit=2),
+            JobQuery(limit=2, offset=1),
+        ]
+
+        for query in queries:
+            expected = [job.job_id for job in filter_jobs(jobs.values(), query)]
+            assert [job.job_id for job in storage.query_jobs(query)] == expected, query
+            assert storage.count_jobs(query) == len(filter_jobs(jobs.values(), JobQuery(
+                account_id=query.account_id,
+                status=query.status,
+                scheduled_from=query.scheduled_from,
+                scheduled_before=query.scheduled_before
+            )))
+
+    def test_query_order_priority_then_newest(self, storage, jobs):
+        """Pages list higher priority first, then newest scheduled_time, then job_id (all descending)."""
+        jobs["job4"] = _job("job4", minutes=5)
+        jobs["job4"].priority = JobPriority.HIGH
+        jobs["job5"] = _job("job5", minutes=30)
+        storage.save_jobs(jobs)
+        expected = ["job4", "job5", "job1", "job3", "job2"]
+
+        assert [job.job_id for job in filter_jobs(jobs.values(), JobQuery())] == expected
+        assert [job.job_id for job in storage.query_jobs(JobQuery())] == expected
+
+        walked = []
+        after = None
+        while True:
+            page = storage.query_jobs(JobQuery(after=after, limit=2))
+            if not page:
+                break
+            walked.extend(job.job_id for job in page)
+            after = job_sort_key(page[-1])
+        assert walked == expected
+
+    def test_query_uses_indexes(self, storage):
+        """Filtered page queries search an index instead of scanning the table, without sorting."""
+        conn = sqlite3.connect(str(storage.db_path))
+        try:
+            for query in (
+                JobQuery(status=JobStatus.SCHEDULED, limit=20),
+                JobQuery(account_id="account_01", status=JobStatus.SCHEDULED, limit=20),
+                JobQuery(account_id="account_01", limit=20),
+            ):
+                where, params = build_job_query_sql(query, "?", _format_datetime)
+                plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM jobs {where}", params))
+                assert "SEARCH jobs USING INDEX" in plan, plan
+            for query in (
+                JobQuery(status=JobStatus.SCHEDULED, limit=20),
+                JobQuery(account_id="account_01", status=JobStatus.SCHEDULED, limit=20),
+                JobQuery(status=JobStatus.SCHEDULED, after=(2, datetime(2025, 1, 1, 10, 0), "job2"), limit=20),
+            ):
+                where, params = build_job_query_sql(query, "?", _format_datetime)
+                plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM jobs {where}", params))
+                assert "TEMP B-TREE" not in plan, plan
+        finally:
+            conn.close()
+
+    def test_incremental_save(self, storage, jobs, mock_logger):
+        """Only changed jobs are upserted; missing jobs are deleted."""
+        storage.save_jobs(jobs)
+
+        jobs["job2"].status = JobStatus.RUNNING
+        del jobs["job3"]
+        mock_logger.log_step.reset_mock()
+        storage.save_jobs(jobs)
+
+        summary = mock_logger.log_step.call_args.kwargs
+        assert summary["upserted_count"] == 1
+        assert summary["deleted_count"] == 1
+        assert set(storage.load_jobs()) == {"job1", "job2"}
+        assert storage.get_job_by_id("job2").status == JobStatus.RUNNING
+
+    def test_concurrent_writers(self, storage, mock_logger):
+        """Two storage instances (processes) writing different jobs do not clobber each other."""
+        other = SQLiteJobStorage(db_path=storage.db_path, logger=mock_logger)
+        storage.load_jobs()
+        other.load_jobs()
+        errors = []
+
+        def write(target, prefix):
+            try:
+                jobs = {}
+                for i in range(20):
+                    jobs[f"{prefix}{i}"] = _job(f"{prefix}{i}", minutes=i)
+                    target.save_jobs(jobs)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(storage, "a")), threading.Thread(target=write, args=(other, "b"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        other.close()
+
+        assert errors == []
+        assert len(storage.load_jobs()) == 40
@@ -0,0 +1,40 @@
+"""
+Module: utils/lazy_exports.py
+
+Lazy exports cho package __init__ (PEP 562): export chỉ được import từ
+sub-module ở lần truy cập đầu tiên, để import package không kéo theo
+dependencies nặng của mọi sub-module.
+"""
+
+# Standard library
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Tạo module-level `__getattr__` cho package.
+
+    Giá trị được cache vào namespace của package sau lần import đầu
+    (các lần truy cập sau không đi qua `__getattr__`).
+
+    Args:
+        package: `__name__` của package
+        exports: Tên export -> module chứa export đó
+
+    Returns:
+        Hàm `__getattr__(name)`
+
+    Example:
+        >>> __getattr__ = lazy_exports(__name__, {"Scheduler": "services.scheduler.scheduler"})
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module_name), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__